@@ -4,7 +4,10 @@ serialized alignments file. """
 from __future__ import annotations
 import logging
 import os
+import pickle
+import struct
 import typing as T
+import zlib
 from datetime import datetime
 
 import numpy as np
@@ -12,6 +15,7 @@ import numpy as np
 from lib.serializer import get_serializer, get_serializer_from_filename
 from lib.utils import FaceswapError
 
+from .columnar import ColumnarStore, is_columnar, LazyAlignments, save_columnar
 from .thumbnails import Thumbnails
 from .updater import (FileStructure, IdentityAndVideoMeta, LandmarkRename, Legacy, ListToNumpy,
                       MaskCentering, VideoExtension)
@@ -101,11 +105,15 @@ class Alignments():
     filename: str, optional
         The filename of the ``.fsa`` alignments file. If not provided then the given folder will be
         checked for a default alignments file filename. Default: "alignments"
+    columnar: bool, optional
+        ``True`` to save the alignments in the columnar binary format. ``False`` to save in the
+        legacy compressed format, unless the loaded alignments file is already columnar.
+        Default: ``False``
     """
-    def __init__(self, folder: str, filename: str = "alignments") -> None:
-        logger.debug("Initializing %s: (folder: '%s', filename: '%s')",
-                     self.__class__.__name__, folder, filename)
-        self._io = _IO(self, folder, filename)
+    def __init__(self, folder: str, filename: str = "alignments", columnar: bool = False) -> None:
+        logger.debug("Initializing %s: (folder: '%s', filename: '%s', columnar: %s)",
+                     self.__class__.__name__, folder, filename, columnar)
+        self._io = _IO(self, folder, filename, columnar)
         self._data = self._load()
         self._io.update_legacy()
 
@@ -125,7 +133,10 @@ class Alignments():
     @property
     def faces_count(self) -> int:
         """ int: The total number of faces that appear in the alignments :attr:`data`. """
-        retval = sum(len(val["faces"]) for val in self._data.values())
+        if isinstance(self._data, LazyAlignments):
+            retval = sum(self._data.face_count(key) for key in self._data)
+        else:
+            retval = sum(len(val["faces"]) for val in self._data.values())
         logger.trace(retval)  # type:ignore[attr-defined]
         return retval
 
@@ -136,8 +147,14 @@ class Alignments():
 
     @property
     def data(self) -> dict[str, AlignmentDict]:
-        """ dict: The loaded alignments :attr:`file` in dictionary form. """
-        return self._data
+        """ dict: The loaded alignments :attr:`file` in dictionary form.
+
+        Notes
+        -----
+        For alignments files stored in the columnar format this is a dictionary compatible
+        :class:`~lib.align.columnar.LazyAlignments` view, which only decodes each frame the first
+        time that it is accessed. """
+        return T.cast(dict[str, AlignmentDict], self._data)
 
     @property
     def have_alignments_file(self) -> bool:
@@ -174,12 +191,17 @@ class Alignments():
         """ dict: The mask type names stored in the alignments :attr:`data` as key with the number
         of faces which possess the mask type as value. """
         masks: dict[str, int] = {}
-        for val in self._data.values():
-            for face in val["faces"]:
-                if face.get("mask", None) is None:
-                    masks["none"] = masks.get("none", 0) + 1
-                for key in face.get("mask", {}):
-                    masks[key] = masks.get(key, 0) + 1
+        if isinstance(self._data, LazyAlignments):
+            lazy = self._data
+            all_masks = (mask for key in lazy for mask in lazy.masks(key))
+        else:
+            all_masks = (face.get("mask", None)
+                         for val in self._data.values() for face in val["faces"])
+        for mask in all_masks:
+            if mask is None:
+                masks["none"] = masks.get("none", 0) + 1
+            for key in mask or {}:
+                masks[key] = masks.get(key, 0) + 1
         return masks
 
     @property
@@ -189,10 +211,12 @@ class Alignments():
         retval: dict[str, list[int] | list[float] | None] = {"pts_time": None, "keyframes": None}
         pts_time: list[float] = []
         keyframes: list[int] = []
+        lazy = isinstance(self._data, LazyAlignments)
         for idx, key in enumerate(sorted(self.data)):
-            if not self.data[key].get("video_meta", {}):
+            meta = (T.cast(LazyAlignments, self._data).video_meta(key) if lazy
+                    else self.data[key].get("video_meta", {}))
+            if not meta:
                 return retval
-            meta = self.data[key]["video_meta"]
             pts_time.append(T.cast(float, meta["pts_time"]))
             if meta["keyframe"]:
                 keyframes.append(idx)
@@ -228,6 +252,21 @@ class Alignments():
         the location :attr:`file`. """
         return self._io.save()
 
+    def save_frames(self, frame_names: list[str]) -> None:
+        """ Append the alignments for the given frames to a journal alongside the alignments
+        :attr:`file` rather than re-writing the whole file.
+
+        The journal is replayed when the alignments file is next loaded, and is compacted into the
+        alignments file on the next call to :func:`save`.
+
+        Parameters
+        ----------
+        frame_names: list[str]
+            The names of the frames in :attr:`data` that have been added or updated since the last
+            save
+        """
+        return self._io.append(frame_names)
+
     def backup(self) -> None:
         """ Create a backup copy of the alignments :attr:`file`.
 
@@ -285,6 +324,37 @@ class Alignments():
                 "alignments file for your requested video.")
         self._io.save()
 
+    def update_video_meta_data(self,
+                               video_meta_data: dict[str, list[int] | list[float] | None] | None
+                               ) -> None:
+        """ Store a keyframe index that was generated whilst reading a video, if the alignments
+        file does not already hold one, so that the video does not need to be analyzed again on
+        the next run.
+
+        Failure to store the index is not fatal, so any mismatch between the video and the
+        alignments file is logged as a warning.
+
+        Parameters
+        ----------
+        video_meta_data: dict or ``None``
+            The `pts_time` and `keyframes` generated for the input video. ``None`` or empty
+            values are ignored
+        """
+        if (not video_meta_data
+                or not video_meta_data.get("pts_time")
+                or video_meta_data.get("keyframes") is None
+                or not self.data
+                or self.video_meta_data["pts_time"] is not None):
+            logger.debug("Not updating video meta data (have_index: %s)",
+                         bool(video_meta_data and video_meta_data.get("pts_time")))
+            return
+        try:
+            self.save_video_meta_data(T.cast(list[float], video_meta_data["pts_time"]),
+                                      T.cast(list[int], video_meta_data["keyframes"]))
+        except FaceswapError as err:
+            logger.warning("Unable to store the video keyframe index in the alignments file: %s",
+                           str(err).splitlines()[0])
+
     @classmethod
     def _pad_leading_frames(cls, pts_time: list[float], keyframes: list[int]) -> tuple[list[float],
                                                                                        list[int]]:
@@ -447,8 +517,11 @@ class Alignments():
         int
             The number of faces that appear in the given frame_name
         """
-        frame_data = self._data.get(frame_name, T.cast(AlignmentDict, {}))
-        retval = len(frame_data.get("faces", []))
+        if isinstance(self._data, LazyAlignments):
+            retval = self._data.face_count(frame_name) if frame_name in self._data else 0
+        else:
+            frame_data = self._data.get(frame_name, T.cast(AlignmentDict, {}))
+            retval = len(frame_data.get("faces", []))
         logger.trace(retval)  # type:ignore[attr-defined]
         return retval
 
@@ -618,13 +691,18 @@ class _IO():
         The folder that contains the alignments ``.fsa`` file
     filename: str
         The filename of the ``.fsa`` alignments file.
+    columnar: bool
+        ``True`` to save the alignments in the columnar binary format
     """
-    def __init__(self, alignments: Alignments, folder: str, filename: str) -> None:
-        logger.debug("Initializing %s: (alignments: %s)", self.__class__.__name__, alignments)
+    def __init__(self, alignments: Alignments, folder: str, filename: str, columnar: bool) -> None:
+        logger.debug("Initializing %s: (alignments: %s, columnar: %s)",
+                     self.__class__.__name__, alignments, columnar)
         self._alignments = alignments
+        self._columnar = columnar
         self._serializer = get_serializer("compressed")
         self._file = self._get_location(folder, filename)
         self._version: float = _VERSION
+        self._journal = _Journal(f"{self._file}.journal")
 
     @property
     def file(self) -> str:
@@ -638,9 +716,9 @@ class _IO():
 
     @property
     def have_alignments_file(self) -> bool:
-        """ bool: ``True`` if an alignments file exists at location :attr:`file` otherwise
-        ``False``. """
-        retval = os.path.exists(self._file)
+        """ bool: ``True`` if an alignments file, or an uncompacted journal for it, exists at
+        location :attr:`file` otherwise ``False``. """
+        retval = os.path.exists(self._file) or self._journal.exists
         logger.trace(retval)  # type:ignore[attr-defined]
         return retval
 
@@ -734,7 +812,13 @@ class _IO():
 
     def update_legacy(self) -> None:
         """ Check whether the alignments are legacy, and if so update them to current alignments
-        format. """
+        format.
+
+        Columnar alignments files are only ever written from up to date alignments, so are not
+        checked. """
+        if isinstance(self._alignments.data, LazyAlignments):
+            logger.debug("Columnar alignments. Not checking for legacy updates")
+            return
         updates = [updater.is_updated for updater in (FileStructure(self._alignments),
                                                       LandmarkRename(self._alignments),
                                                       ListToNumpy(self._alignments),
@@ -755,6 +839,13 @@ class _IO():
         Populates :attr:`_version` with the alignment file's loaded version as well as returning
         the serialized data.
 
+        Columnar alignments files are returned as a lazily decoded
+        :class:`~lib.align.columnar.LazyAlignments` view. Legacy compressed alignments files are
+        fully deserialized.
+
+        Any frames held in an uncompacted journal for the alignments file (for example from an
+        interrupted extraction) are replayed over the loaded data.
+
         Returns
         -------
         dict:
@@ -764,24 +855,63 @@ class _IO():
         if not self.have_alignments_file:
             raise FaceswapError(f"Error: Alignments file not found at {self._file}")
 
+        data: dict[str, AlignmentDict] = self._load_file() if os.path.exists(self._file) else {}
+        self._journal.replay(data)
+        logger.debug("Loaded alignments")
+        return data
+
+    def _load_file(self) -> dict[str, AlignmentDict]:
+        """ Load the alignments data from the alignments :attr:`file`.
+
+        Returns
+        -------
+        dict:
+            The loaded alignments data
+        """
         logger.info("Reading alignments from: '%s'", self._file)
+        if is_columnar(self._file):
+            store = ColumnarStore(self._file)
+            self._version = store.version
+            logger.debug("Loaded columnar alignments")
+            return T.cast(dict[str, AlignmentDict], LazyAlignments(store))
+
         data = self._serializer.load(self._file)
         meta = data.get("__meta__", {"version": 1.0})
         self._version = meta["version"]
-        data = data.get("__data__", data)
-        logger.debug("Loaded alignments")
-        return data
+        return data.get("__data__", data)
 
     def save(self) -> None:
         """ Write the contents of :attr:`data` and :attr:`_meta` to a serialized ``.fsa`` file at
-        the location :attr:`file`. """
+        the location :attr:`file`.
+
+        Alignments are written in the legacy compressed format unless the columnar format has been
+        requested or the alignments were loaded from a columnar file. For columnar files, frames
+        that have not been accessed since the file was loaded are copied to the new file without
+        being decoded. Any journal for the alignments file is compacted into the saved file and
+        then removed. """
         logger.debug("Saving alignments")
         logger.info("Writing alignments to: '%s'", self._file)
-        data = {"__meta__": {"version": self._version},
-                "__data__": self._alignments.data}
-        self._serializer.save(self._file, data)
+        data = self._alignments.data
+        if self._columnar or isinstance(data, LazyAlignments):
+            save_columnar(self._file, data, self._version)
+        else:
+            self._serializer.save(self._file, {"__meta__": {"version": self._version},
+                                               "__data__": data})
+        self._journal.remove()
         logger.debug("Saved alignments")
 
+    def append(self, frame_names: list[str]) -> None:
+        """ Append the current alignments for the given frames to the journal for the alignments
+        file, without rewriting the alignments file itself.
+
+        Parameters
+        ----------
+        frame_names: list[str]
+            The names of the frames in :attr:`data` to write to the journal
+        """
+        data = self._alignments.data
+        self._journal.append([(name, data[name]) for name in frame_names])
+
     def backup(self) -> None:
         """ Create a backup copy of the alignments :attr:`file`.
 
@@ -808,3 +938,95 @@ class _IO():
         logger.info("Backing up original alignments to '%s'", dst)
         os.rename(src, dst)
         logger.debug("Backed up alignments")
+
+
+class _Journal():
+    """ An append-only sidecar log of frame alignments for an alignments file.
+
+    Frames are appended as individually checksummed records, so writing to the journal does not
+    require the whole alignments file to be re-serialized. Loading the alignments file replays the
+    journal over the loaded data, and saving the alignments file compacts the journal into it.
+
+    Parameters
+    ----------
+    filename: str
+        Full path to the journal file
+    """
+    _magic = b"FSAJRN01"
+    _record = struct.Struct("<II")
+
+    def __init__(self, filename: str) -> None:
+        logger.debug("Initializing %s: (filename: '%s')", self.__class__.__name__, filename)
+        self._file = filename
+        self._is_replayed = False
+
+    @property
+    def exists(self) -> bool:
+        """ bool: ``True`` if the journal file exists otherwise ``False`` """
+        return os.path.exists(self._file)
+
+    def replay(self, data: dict[str, AlignmentDict]) -> None:
+        """ Apply the frames held in the journal to the given alignments data.
+
+        Reading stops at the first incomplete or corrupt record, which will exist if the journal
+        was being written when the process was interrupted.
+
+        Parameters
+        ----------
+        data: dict
+            The alignments data to update with the frames from the journal
+        """
+        if not self.exists:
+            return
+        count = 0
+        with open(self._file, "rb") as journal:
+            if journal.read(len(self._magic)) != self._magic:
+                logger.warning("Ignoring invalid alignments journal: '%s'", self._file)
+                return
+            while True:
+                header = journal.read(self._record.size)
+                if not header:
+                    break
+                complete = len(header) == self._record.size
+                length, checksum = self._record.unpack(header) if complete else (0, 0)
+                payload = journal.read(length)
+                if length == 0 or len(payload) != length or zlib.crc32(payload) != checksum:
+                    logger.warning("Discarding incomplete record at the end of the alignments "
+                                   "journal: '%s'", self._file)
+                    break
+                frame_name, frame = pickle.loads(payload)
+                data[frame_name] = frame
+                count += 1
+        self._is_replayed = True
+        logger.info("Recovered %s frame(s) from alignments journal: '%s'", count, self._file)
+
+    def append(self, frames: list[tuple[str, AlignmentDict]]) -> None:
+        """ Append frames to the journal.
+
+        A journal that exists but has not been replayed into the current alignments (for example
+        from a previous extraction that is not being resumed) is overwritten.
+
+        Parameters
+        ----------
+        frames: list[tuple[str, dict]]
+            The frame names and their alignments to append to the journal
+        """
+        mode = "ab" if self._is_replayed and self.exists else "wb"
+        with open(self._file, mode) as journal:
+            if mode == "wb":
+                journal.write(self._magic)
+            for frame in frames:
+                payload = pickle.dumps(frame, protocol=4)
+                journal.write(self._record.pack(len(payload), zlib.crc32(payload)))
+                journal.write(payload)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._is_replayed = True
+        logger.debug("Appended %s frame(s) to alignments journal", len(frames))
+
+    def remove(self) -> None:
+        """ Remove the journal once it has been compacted into the alignments file """
+        if self.exists:
+            logger.debug("Removing alignments journal: '%s'", self._file)
+            os.remove(self._file)
+        self._is_replayed = False
@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+""" Columnar binary storage for alignments files.
+
+Face bounding boxes and landmarks are held as contiguous numpy arrays and are read into memory on
+load. Thumbnails, masks and the remaining face data (such as identities) are each stored as
+individually serialized blobs in a separate section of the file which is memory mapped and only
+decoded when they are accessed. Masks can be decoded for a frame without decoding any of its other
+blobs.
+
+File layout::
+
+    [magic][blob section][column arrays][header][header offset][header length][magic]
+
+The header is a compressed pickle holding the alignments version, the frame names and the
+location of each column array within the file.
+"""
+from __future__ import annotations
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import typing as T
+import zlib
+
+from collections.abc import MutableMapping
+
+import numpy as np
+
+if T.TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+    from .alignments import AlignmentDict, AlignmentFileDict, MaskAlignmentsFileDict
+
+logger = logging.getLogger(__name__)
+
+_FaceBlobs = tuple[bytes | None, bytes | None, bytes]
+
+_MAGIC = b"FSACOL01"
+_TRAILER = struct.Struct("<QQ8s")
+_CORE_KEYS = ("x", "y", "w", "h", "landmarks_xy", "thumb", "mask")
+
+
+def is_columnar(filename: str) -> bool:
+    """ Check whether a file is a columnar alignments file.
+
+    Parameters
+    ----------
+    filename: str
+        Full path to the file to check
+
+    Returns
+    -------
+    bool
+        ``True`` if the file is a columnar alignments file otherwise ``False``
+    """
+    if not os.path.isfile(filename):
+        return False
+    with open(filename, "rb") as in_file:
+        retval = in_file.read(len(_MAGIC)) == _MAGIC
+    logger.debug("'%s': %s", filename, retval)
+    return retval
+
+
+class ColumnarStore():
+    """ Read access to a columnar alignments file.
+
+    The column arrays are read into memory. The blob section is memory mapped and blobs are only
+    read and decoded when requested.
+
+    Parameters
+    ----------
+    filename: str
+        Full path to the columnar alignments file to load
+    """
+    def __init__(self, filename: str) -> None:
+        logger.debug("Initializing %s: (filename: '%s')", self.__class__.__name__, filename)
+        self._filename = filename
+        self._file = open(filename, "rb")  # pylint:disable=consider-using-with
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._read_header()
+        self._version: float = header["version"]
+        self._frames: list[str] = header["frames"]
+        self._index = {name: idx for idx, name in enumerate(self._frames)}
+        self._columns = {name: self._read_column(*info)
+                         for name, info in header["columns"].items()}
+        logger.debug("Initialized %s: (version: %s, frames: %s, faces: %s)",
+                     self.__class__.__name__, self._version, len(self._frames),
+                     len(self._columns["bbox"]))
+
+    @property
+    def version(self) -> float:
+        """ float: The alignments version stored in the file """
+        return self._version
+
+    @property
+    def frames(self) -> list[str]:
+        """ list[str]: The frame names, in the order that they are stored in the file """
+        return self._frames
+
+    @property
+    def bboxes(self) -> np.ndarray:
+        """ :class:`numpy.ndarray`: The (`x`, `y`, `w`, `h`) bounding box of every face in the file
+        in frame order """
+        return self._columns["bbox"]
+
+    def _read_header(self) -> dict[str, T.Any]:
+        """ Read the header from the end of the file.
+
+        Returns
+        -------
+        dict
+            The alignments version, frame names and column locations
+        """
+        offset, length, magic = _TRAILER.unpack(self._mmap[-_TRAILER.size:])
+        if magic != _MAGIC or self._mmap[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"'{self._filename}' is not a valid columnar alignments file")
+        return pickle.loads(zlib.decompress(self._mmap[offset:offset + length]))
+
+    def _read_column(self, offset: int, dtype: str, shape: tuple[int, ...]) -> np.ndarray:
+        """ Read a column array from the file into memory.
+
+        Parameters
+        ----------
+        offset: int
+            The location of the array within the file
+        dtype: str
+            The dtype of the array
+        shape: tuple
+            The shape of the array
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The column array
+        """
+        count = int(np.prod(shape))
+        self._file.seek(offset)
+        return np.fromfile(self._file, dtype=dtype, count=count).reshape(shape)
+
+    def _face_slice(self, frame_name: str) -> slice:
+        """ Obtain the range of faces belonging to a frame.
+
+        Parameters
+        ----------
+        frame_name: str
+            The frame to obtain the face range for
+
+        Returns
+        -------
+        slice
+            The slice into the face columns for the frame
+        """
+        idx = self._index[frame_name]
+        offsets = self._columns["face_offsets"]
+        return slice(int(offsets[idx]), int(offsets[idx + 1]))
+
+    def _blob(self, offset: int, length: int) -> bytes | None:
+        """ Read a raw blob from the memory mapped blob section.
+
+        Parameters
+        ----------
+        offset: int
+            The location of the blob within the file
+        length: int
+            The size of the blob in bytes. `-1` if the blob does not exist
+
+        Returns
+        -------
+        bytes or ``None``
+            The raw serialized blob or ``None`` if the blob does not exist
+        """
+        if length < 0:
+            return None
+        return self._mmap[offset:offset + length]
+
+    def face_count(self, frame_name: str) -> int:
+        """ Obtain the number of faces in a frame without decoding the frame.
+
+        Parameters
+        ----------
+        frame_name: str
+            The frame to obtain the face count for
+
+        Returns
+        -------
+        int
+            The number of faces in the frame
+        """
+        face_slice = self._face_slice(frame_name)
+        return face_slice.stop - face_slice.start
+
+    def video_meta(self, frame_name: str) -> dict[str, float | int]:
+        """ Obtain the video meta data for a frame without decoding the frame.
+
+        Parameters
+        ----------
+        frame_name: str
+            The frame to obtain the video meta data for
+
+        Returns
+        -------
+        dict
+            The `pts_time` and `keyframe` for the frame or an empty dictionary if the frame does
+            not have video meta data
+        """
+        idx = self._index[frame_name]
+        keyframe = int(self._columns["keyframe"][idx])
+        if keyframe < 0:
+            return {}
+        return {"pts_time": float(self._columns["pts_time"][idx]), "keyframe": bool(keyframe)}
+
+    def landmarks(self, frame_name: str) -> list[np.ndarray]:
+        """ Obtain the landmarks for each face in a frame without decoding the frame.
+
+        Parameters
+        ----------
+        frame_name: str
+            The frame to obtain the landmarks for
+
+        Returns
+        -------
+        list[:class:`numpy.ndarray`]
+            The landmarks for each face in the frame
+        """
+        offsets = self._columns["landmark_offsets"]
+        points = self._columns["landmarks"]
+        face_slice = self._face_slice(frame_name)
+        return [points[offsets[idx]:offsets[idx + 1]]
+                for idx in range(face_slice.start, face_slice.stop)]
+
+    def masks(self, frame_name: str) -> list[dict[str, MaskAlignmentsFileDict] | None]:
+        """ Decode the masks for each face in a frame without decoding any other face data.
+
+        Parameters
+        ----------
+        frame_name: str
+            The frame to decode the masks for
+
+        Returns
+        -------
+        list[dict | ``None``]
+            The masks for each face in the frame. ``None`` for any face which does not have a
+            mask entry
+        """
+        face_slice = self._face_slice(frame_name)
+        blobs = [self._blob(*info[2:4])
+                 for info in self._columns["blob_index"][face_slice].tolist()]
+        return [None if blob is None else pickle.loads(blob) for blob in blobs]
+
+    def raw_frame(self, frame_name: str
+                  ) -> tuple[np.ndarray, list[np.ndarray], list[_FaceBlobs],
+                             dict[str, float | int]]:
+        """ Obtain the undecoded contents of a frame for copying to a new file.
+
+        Parameters
+        ----------
+        frame_name: str
+            The frame to obtain the contents for
+
+        Returns
+        -------
+        bboxes: :class:`numpy.ndarray`
+            The bounding boxes for each face in the frame
+        landmarks: list[:class:`numpy.ndarray`]
+            The landmarks for each face in the frame
+        blobs: list[tuple[bytes | None, bytes | None, bytes]]
+            The serialized thumbnail, the serialized masks and the serialized remaining face data
+            for each face in the frame
+        video_meta: dict
+            The video meta data for the frame
+        """
+        face_slice = self._face_slice(frame_name)
+        blobs = [(self._blob(*info[:2]),
+                  self._blob(*info[2:4]),
+                  T.cast(bytes, self._blob(*info[4:])))
+                 for info in self._columns["blob_index"][face_slice].tolist()]
+        return (self._columns["bbox"][face_slice],
+                self.landmarks(frame_name),
+                blobs,
+                self.video_meta(frame_name))
+
+    def get_frame(self, frame_name: str) -> AlignmentDict:
+        """ Decode a frame from the file.
+
+        Parameters
+        ----------
+        frame_name: str
+            The frame to decode
+
+        Returns
+        -------
+        dict
+            The alignments for the frame in standard alignments dictionary format
+        """
+        bboxes, landmarks, blobs, video_meta = self.raw_frame(frame_name)
+        faces: list[AlignmentFileDict] = []
+        for bbox, points, (thumb, mask, extra) in zip(bboxes.tolist(), landmarks, blobs):
+            face = T.cast("AlignmentFileDict", {"x": bbox[0],
+                                                "y": bbox[1],
+                                                "w": bbox[2],
+                                                "h": bbox[3],
+                                                "landmarks_xy": points.copy()})
+            face.update(pickle.loads(extra))
+            if mask is not None:
+                face["mask"] = pickle.loads(mask)
+            face["thumb"] = None if thumb is None else pickle.loads(thumb)
+            faces.append(face)
+        return {"faces": faces, "video_meta": video_meta}
+
+    def close(self) -> None:
+        """ Release the memory map and the underlying file """
+        self._mmap.close()
+        self._file.close()
+        logger.debug("Closed columnar store: '%s'", self._filename)
+
+
+class LazyAlignments(MutableMapping):  # pylint:disable=too-many-ancestors
+    """ A dictionary compatible view of a columnar alignments file.
+
+    Frames are only decoded from the underlying :class:`ColumnarStore` the first time that they
+    are accessed. Decoded frames are held by the view, so any changes made to them are kept and
+    will be written out when the alignments are saved. Frames that have not been accessed are
+    copied to a new file without being decoded.
+
+    Parameters
+    ----------
+    store: :class:`ColumnarStore`
+        The columnar alignments file to provide the view of
+    """
+    def __init__(self, store: ColumnarStore) -> None:
+        self._store = store
+        self._keys: dict[str, None] = dict.fromkeys(store.frames)
+        self._loaded: dict[str, AlignmentDict] = {}
+
+    @property
+    def store(self) -> ColumnarStore:
+        """ :class:`ColumnarStore`: The columnar alignments file that backs this view """
+        return self._store
+
+    def __getitem__(self, key: str) -> AlignmentDict:
+        if key not in self._loaded:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._loaded[key] = self._store.get_frame(key)
+        return self._loaded[key]
+
+    def __setitem__(self, key: str, value: AlignmentDict) -> None:
+        self._keys[key] = None
+        self._loaded[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._keys[key]
+        self._loaded.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def is_loaded(self, key: str) -> bool:
+        """ Check whether a frame has been decoded from the underlying file.
+
+        Parameters
+        ----------
+        key: str
+            The frame name to check
+
+        Returns
+        -------
+        bool
+            ``True`` if the frame has been decoded or added to the view
+        """
+        return key in self._loaded
+
+    def face_count(self, key: str) -> int:
+        """ Obtain the number of faces in a frame, without decoding it if it has not already been
+        decoded.
+
+        Parameters
+        ----------
+        key: str
+            The frame name to obtain the face count for
+
+        Returns
+        -------
+        int
+            The number of faces in the frame
+        """
+        if key in self._loaded:
+            return len(self._loaded[key]["faces"])
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._store.face_count(key)
+
+    def video_meta(self, key: str) -> dict[str, float | int]:
+        """ Obtain the video meta data for a frame, without decoding it if it has not already been
+        decoded.
+
+        Parameters
+        ----------
+        key: str
+            The frame name to obtain the video meta data for
+
+        Returns
+        -------
+        dict
+            The video meta data for the frame
+        """
+        if key in self._loaded:
+            return self._loaded[key].get("video_meta", {})
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._store.video_meta(key)
+
+    def masks(self, key: str) -> list[dict[str, MaskAlignmentsFileDict] | None]:
+        """ Obtain the masks for each face in a frame, decoding only the masks if the frame has not
+        already been decoded.
+
+        Parameters
+        ----------
+        key: str
+            The frame name to obtain the masks for
+
+        Returns
+        -------
+        list[dict | ``None``]
+            The masks for each face in the frame. ``None`` for any face which does not have a
+            mask entry
+        """
+        if key in self._loaded:
+            return [face.get("mask") for face in self._loaded[key]["faces"]]
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._store.masks(key)
+
+    def rebind(self, store: ColumnarStore) -> None:
+        """ Point the view at a newly written columnar file.
+
+        Parameters
+        ----------
+        store: :class:`ColumnarStore`
+            The newly written columnar alignments file. Must contain every frame in this view
+        """
+        logger.debug("Rebinding view to new store")
+        self._store = store
+
+
+class _ColumnarWriter():
+    """ Collects alignments for writing to a columnar alignments file.
+
+    Face blobs are streamed straight into the output file as they are added, with the column
+    arrays and the header written when the file is finalized.
+
+    Parameters
+    ----------
+    out_file: :class:`io.BufferedWriter`
+        The open binary file to write the alignments to
+    """
+    def __init__(self, out_file: T.BinaryIO) -> None:
+        self._file = out_file
+        self._file.write(_MAGIC)
+        self._frames: list[str] = []
+        self._face_offsets: list[int] = [0]
+        self._pts_time: list[float] = []
+        self._keyframe: list[int] = []
+        self._bboxes: list[list[int]] = []
+        self._landmarks: list[np.ndarray] = []
+        self._blob_index: list[tuple[int, int, int, int, int, int]] = []
+
+    def _write_blob(self, blob: bytes | None) -> tuple[int, int]:
+        """ Write a blob to the blob section of the file.
+
+        Parameters
+        ----------
+        blob: bytes or ``None``
+            The serialized blob to write
+
+        Returns
+        -------
+        tuple[int, int]
+            The offset and length of the written blob. `(0, -1)` if the blob is ``None``
+        """
+        if blob is None:
+            return 0, -1
+        offset = self._file.tell()
+        self._file.write(blob)
+        return offset, len(blob)
+
+    def add_raw_frame(self,
+                      frame_name: str,
+                      bboxes: np.ndarray,
+                      landmarks: list[np.ndarray],
+                      blobs: list[_FaceBlobs],
+                      video_meta: dict[str, float | int]) -> None:
+        """ Add a frame that is already in columnar form.
+
+        Parameters
+        ----------
+        frame_name: str
+            The name of the frame
+        bboxes: :class:`numpy.ndarray`
+            The (`x`, `y`, `w`, `h`) bounding boxes for each face in the frame
+        landmarks: list[:class:`numpy.ndarray`]
+            The landmarks for each face in the frame
+        blobs: list[tuple[bytes | None, bytes | None, bytes]]
+            The serialized thumbnail, the serialized masks and the serialized remaining face data
+            for each face
+        video_meta: dict
+            The video meta data for the frame
+        """
+        self._frames.append(frame_name)
+        self._face_offsets.append(self._face_offsets[-1] + len(blobs))
+        self._keyframe.append(int(video_meta["keyframe"]) if video_meta else -1)
+        self._pts_time.append(float(video_meta["pts_time"]) if video_meta else np.nan)
+        self._bboxes.extend(np.asarray(bboxes).tolist())
+        self._landmarks.extend(np.asarray(pts, dtype="float32").reshape(-1, 2)
+                               for pts in landmarks)
+        for thumb, mask, extra in blobs:
+            self._blob_index.append((*self._write_blob(thumb),
+                                     *self._write_blob(mask),
+                                     *self._write_blob(extra)))
+
+    @classmethod
+    def _serialize(cls, item: T.Any) -> bytes | None:
+        """ Serialize an item for storing as a blob.
+
+        Parameters
+        ----------
+        item: Any
+            The item to serialize
+
+        Returns
+        -------
+        bytes or ``None``
+            The serialized item or ``None`` if the item is ``None``
+        """
+        return None if item is None else pickle.dumps(item, protocol=4)
+
+    def add_frame(self, frame_name: str, frame: AlignmentDict) -> None:
+        """ Add a frame in standard alignments dictionary format.
+
+        Parameters
+        ----------
+        frame_name: str
+            The name of the frame
+        frame: dict
+            The alignments for the frame
+        """
+        faces = frame["faces"]
+        blobs = [(self._serialize(face.get("thumb")),
+                  self._serialize(face.get("mask")) if "mask" in face else None,
+                  T.cast(bytes, self._serialize({k: v for k, v in face.items()
+                                                 if k not in _CORE_KEYS})))
+                 for face in faces]
+        self.add_raw_frame(frame_name,
+                           np.array([[face["x"], face["y"], face["w"], face["h"]]
+                                     for face in faces], dtype="int32").reshape(-1, 4),
+                           [T.cast(np.ndarray, face["landmarks_xy"]) for face in faces],
+                           blobs,
+                           frame.get("video_meta", {}))
+
+    def _write_column(self, array: np.ndarray) -> tuple[int, str, tuple[int, ...]]:
+        """ Write a column array to the file, aligned to 64 bytes.
+
+        Parameters
+        ----------
+        array: :class:`numpy.ndarray`
+            The column array to write
+
+        Returns
+        -------
+        tuple
+            The offset, dtype and shape of the written array
+        """
+        padding = -self._file.tell() % 64
+        self._file.write(b"\0" * padding)
+        offset = self._file.tell()
+        self._file.write(np.ascontiguousarray(array).tobytes())
+        return offset, array.dtype.str, array.shape
+
+    def finalize(self, version: float) -> None:
+        """ Write the column arrays and the header to the file.
+
+        Parameters
+        ----------
+        version: float
+            The alignments version to store in the file
+        """
+        landmarks = (np.concatenate(self._landmarks) if self._landmarks
+                     else np.empty((0, 2), dtype="float32"))
+        landmark_offsets = np.cumsum([0] + [len(pts) for pts in self._landmarks], dtype="int64")
+        columns = {
+            "face_offsets": np.array(self._face_offsets, dtype="int64"),
+            "pts_time": np.array(self._pts_time, dtype="float64"),
+            "keyframe": np.array(self._keyframe, dtype="int8"),
+            "bbox": np.array(self._bboxes, dtype="int32").reshape(-1, 4),
+            "landmark_offsets": landmark_offsets,
+            "landmarks": landmarks,
+            "blob_index": np.array(self._blob_index, dtype="int64").reshape(-1, 6)}
+        header = {"version": version,
+                  "frames": self._frames,
+                  "columns": {name: self._write_column(array) for name, array in columns.items()}}
+        encoded = zlib.compress(pickle.dumps(header, protocol=4))
+        offset = self._file.tell()
+        self._file.write(encoded)
+        self._file.write(_TRAILER.pack(offset, len(encoded), _MAGIC))
+        logger.debug("Finalized columnar alignments: (frames: %s, faces: %s, bytes: %s)",
+                     len(self._frames), len(self._bboxes), self._file.tell())
+
+
+def save_columnar(filename: str,
+                  data: Mapping[str, AlignmentDict],
+                  version: float) -> Mapping[str, AlignmentDict]:
+    """ Write alignments to a columnar alignments file.
+
+    The file is written to a temporary location and then moved into place. Frames from a
+    :class:`LazyAlignments` view that have not been decoded are copied across without being
+    decoded, and the view is then re-pointed at the newly written file.
+
+    Parameters
+    ----------
+    filename: str
+        Full path to the file to write the alignments to
+    data: dict or :class:`LazyAlignments`
+        The alignments to write
+    version: float
+        The alignments version to store in the file
+
+    Returns
+    -------
+    dict or :class:`LazyAlignments`
+        The given alignments data, re-pointed at the new file if it is a :class:`LazyAlignments`
+        view
+    """
+    lazy = data if isinstance(data, LazyAlignments) else None
+    handle, temp_file = tempfile.mkstemp(prefix=".", suffix=".tmp",
+                                         dir=os.path.dirname(os.path.abspath(filename)))
+    try:
+        with os.fdopen(handle, "wb") as out_file:
+            writer = _ColumnarWriter(out_file)
+            for key in data:
+                if lazy is not None and not lazy.is_loaded(key):
+                    writer.add_raw_frame(key, *lazy.store.raw_frame(key))
+                else:
+                    writer.add_frame(key, data[key])
+            writer.finalize(version)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+    if lazy is not None:
+        lazy.store.close()  # The mapped file must be released before it can be replaced
+    try:
+        os.replace(temp_file, filename)
+    finally:
+        if lazy is not None:
+            lazy.rebind(ColumnarStore(filename))
+    return data
@@ -219,6 +219,18 @@ class FaceSwapArgs():
             "default": None,
             "group": _("Global Options"),
             "help": _("Path to store the logfile. Leave blank to store in the faceswap folder")})
+        global_args.append({
+            "opts": ("-U", "--face-index"),
+            "action": "store_true",
+            "dest": "face_index",
+            "default": False,
+            "group": _("Global Options"),
+            "help": _(
+                "Store the metadata read from the headers of extracted faces in an index file "
+                "within each faces folder. Subsequent reads of the folder only need to read faces "
+                "that have been added or changed since the index was last updated, which can "
+                "significantly speed up loading large folders of faces, particularly from network "
+                "storage.")})
         # These are hidden arguments to indicate that the GUI/Colab is being used
         global_args.append({
             "opts": ("-gui", "--gui"),
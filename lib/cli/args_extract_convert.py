@@ -124,6 +124,21 @@ class ExtractArgs(ExtractConvertArgs):
                 "R|If selected then the input_dir should be a parent folder containing multiple "
                 "videos and/or folders of images you wish to extract from. The faces will be "
                 "output to separate sub-folders in the output_dir.")})
+        argument_list.append({
+            "opts": ("-sb", "--stream-batch"),
+            "action": "store_true",
+            "dest": "stream_batch",
+            "default": False,
+            "group": _("Data"),
+            "help": _(
+                "R|Only used with batch mode. If selected then the frames from all of the inputs "
+                "are fed through a single run of the extraction pipeline, rather than starting "
+                "the pipeline afresh for each input. This keeps the GPU busy across the "
+                "boundaries between inputs, which can be significantly faster when extracting "
+                "from many small inputs. The alignments and faces are still output separately for "
+                "each input. Only available when all of the plugins can be loaded at the same "
+                "time and no 'external' plugins are selected, otherwise the inputs are processed "
+                "one at a time.")})
         argument_list.append({
             "opts": ("-D", "--detector"),
             "action": Radio,
@@ -343,11 +358,13 @@ class ExtractArgs(ExtractConvertArgs):
             "default": 0,
             "group": _("output"),
             "help": _(
-                "Automatically save the alignments file after a set amount of frames. By default "
-                "the alignments file is only saved at the end of the extraction process. NB: If "
-                "extracting in 2 passes then the alignments file will only start to be saved out "
-                "during the second pass. WARNING: Don't interrupt the script when writing the "
-                "file because it might get corrupted. Set to 0 to turn off")})
+                "Automatically save the alignments after a set amount of frames. By default "
+                "the alignments file is only saved at the end of the extraction process. Newly "
+                "extracted frames are appended to a journal file next to the alignments file, "
+                "which is merged into the alignments file when extraction completes. If "
+                "extraction is interrupted, re-running with 'skip existing' will resume from the "
+                "journal. NB: If extracting in 2 passes then the alignments will only start to "
+                "be saved out during the second pass. Set to 0 to turn off")})
         argument_list.append({
             "opts": ("-B", "--debug-landmarks"),
             "action": "store_true",
@@ -365,6 +382,28 @@ class ExtractArgs(ExtractConvertArgs):
                 "Don't run extraction in parallel. Will run each part of the extraction process "
                 "separately (one after the other) rather than all at the same time. Useful if "
                 "VRAM is at a premium.")})
+        argument_list.append({
+            "opts": ("-fc", "--frame-cache"),
+            "action": Radio,
+            "type": str.lower,
+            "dest": "frame_cache",
+            "default": "off",
+            "choices": ["auto", "disk", "off"],
+            "backend": ("nvidia", "directml", "rocm", "apple_silicon"),
+            "group": _("settings"),
+            "help": _(
+                "R|How frames are held between passes when extraction runs in more than one pass "
+                "(e.g. when 'singleprocess' is selected or there is not enough VRAM to run all "
+                "of the plugins at once). Only the areas of each frame that hold a head centered "
+                "extract of the detected faces are held, losslessly compressed, so that the "
+                "source does not need to be loaded and decoded again for each pass. The rest of "
+                "each held frame is black, so plugins that look outside of the face area will "
+                "see black pixels."
+                "\nL|auto: Hold the frames in memory, spilling them to a temporary folder on "
+                "disk once 1GB of memory has been used."
+                "\nL|disk: Hold the frames in a temporary folder on disk."
+                "\nL|off: Do not hold the frames. Load them from the source again for each "
+                "pass.")})
         argument_list.append({
             "opts": ("-s", "--skip-existing"),
             "action": "store_true",
@@ -387,6 +426,26 @@ class ExtractArgs(ExtractConvertArgs):
             "default": False,
             "group": _("settings"),
             "help": _("Skip saving the detected faces to disk. Just create an alignments file")})
+        argument_list.append({
+            "opts": ("-ca", "--columnar-alignments"),
+            "action": "store_true",
+            "dest": "columnar_alignments",
+            "default": False,
+            "group": _("settings"),
+            "help": _(
+                "Save the alignments file in the columnar binary format. Columnar alignments "
+                "files load much faster and use far less memory for long videos, as face data is "
+                "only read when it is required. NB: Columnar alignments files can only be read by "
+                "versions of Faceswap which support them. Existing alignments files are only "
+                "converted when this option is selected.")})
+        # Hidden argument to keep extract running as a persistent worker, accepting further jobs
+        # on stdin once the given input has been processed
+        argument_list.append({
+            "opts": ("--worker", ),
+            "action": "store_true",
+            "dest": "worker",
+            "default": False,
+            "help": argparse.SUPPRESS})
         # Deprecated multi-character switches
         argument_list.append({
             "opts": ("-min", ),
@@ -683,6 +742,18 @@ class ConvertArgs(ExtractConvertArgs):
                 "will use the maximum available. No matter what you set this to, it will never "
                 "attempt to use more processes than are available on your system. If "
                 "singleprocess is enabled this setting will be ignored.")})
+        argument_list.append({
+            "opts": ("-pp", "--patch-processes"),
+            "action": "store_true",
+            "dest": "patch_processes",
+            "default": False,
+            "group": _("settings"),
+            "help": _(
+                "Patch the swapped faces onto the frames in separate worker processes rather than "
+                "in threads. The number of worker processes is set by the number of parallel "
+                "jobs (-j). Can be faster for high resolution output or heavy color adjustments, "
+                "at the cost of more system RAM. If singleprocess is enabled this setting will be "
+                "ignored.")})
         argument_list.append({
             "opts": ("-T", "--on-the-fly"),
             "action": "store_true",
@@ -10,6 +10,7 @@ import typing as T
 from importlib import import_module
 
 from lib.gpu_stats import set_exclude_devices, GPUStats
+from lib.image import set_face_index
 from lib.logger import crash_log, log_setup
 from lib.utils import (FaceswapError, get_backend, get_tf_version,
                        safe_shutdown, set_backend, set_system_verbosity)
@@ -215,6 +216,7 @@ class ScriptExecutor():
         set_system_verbosity(arguments.loglevel)
         is_gui = hasattr(arguments, "redirect_gui") and arguments.redirect_gui
         log_setup(arguments.loglevel, arguments.logfile, self._command, is_gui)
+        set_face_index(getattr(arguments, "face_index", False))
         success = False
 
         if self._command != "gui":
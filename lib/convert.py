@@ -64,7 +64,7 @@ class Converter():
         frame. Only available with certain writer plugins.
     pre_encode: python function
         Some writer plugins support the pre-encoding of images prior to saving out. As patching is
-        done in multiple threads, but writing is done in a single thread, it can speed up the
+        done in multiple processes, but writing is done in a single thread, it can speed up the
         process to do any pre-encoding as part of the converter process.
     arguments: :class:`argparse.Namespace`
         The arguments that were passed to the convert process as generated from Faceswap's command
@@ -97,6 +97,7 @@ class Converter():
         self._face_scale = 1.0 - arguments.face_scale / 100.
         self._adjustments = Adjustments()
         self._full_frame_output: bool = arguments.writer != "patch"
+        self._error_logged = False
 
         self._load_plugins()
         logger.debug("Initialized %s", self.__class__.__name__)
@@ -184,7 +185,6 @@ class Converter():
         """
         logger.debug("Starting convert process. (in_queue: %s, out_queue: %s)",
                      in_queue, out_queue)
-        logged = False
         while True:
             inbound: T.Literal["EOF"] | ConvertItem | list[ConvertItem] = in_queue.get()
             if inbound == "EOF":
@@ -199,25 +199,42 @@ class Converter():
             for item in items:
                 logger.trace("Patch queue got: '%s'",  # type: ignore[attr-defined]
                              item.inbound.filename)
-                try:
-                    image = self._patch_image(item)
-                except Exception as err:  # pylint:disable=broad-except
-                    # Log error and output original frame
-                    logger.error("Failed to convert image: '%s'. Reason: %s",
-                                 item.inbound.filename, str(err))
-                    image = item.inbound.image
-
-                    lvl = logger.trace if logged else logger.warning  # type: ignore[attr-defined]
-                    lvl("Convert error traceback:", exc_info=True)
-                    logged = True
-                    # UNCOMMENT THIS CODE BLOCK TO PRINT TRACEBACK ERRORS
-                    # import sys; import traceback
-                    # exc_info = sys.exc_info(); traceback.print_exception(*exc_info)
+                image = self.patch(item)
                 logger.trace("Out queue put: %s",  # type: ignore[attr-defined]
                              item.inbound.filename)
                 out_queue.put((item.inbound.filename, image))
         logger.debug("Completed convert process")
 
+    def patch(self, item: ConvertItem) -> np.ndarray | list[bytes]:
+        """ Patch the swapped faces for a single frame, outputting the original frame if the
+        patching fails.
+
+        Parameters
+        ----------
+        item: :class:`~scripts.convert.ConvertItem`
+            The output from :class:`scripts.convert.Predictor`.
+
+        Returns
+        -------
+        :class: `numpy.ndarray` or pre-encoded image output
+            The final frame ready for writing by a :mod:`plugins.convert.writer` plugin, or the
+            original frame if patching failed
+        """
+        try:
+            return self._patch_image(item)
+        except Exception as err:  # pylint:disable=broad-except
+            # Log error and output original frame
+            logger.error("Failed to convert image: '%s'. Reason: %s",
+                         item.inbound.filename, str(err))
+            lvl = (logger.trace  # type: ignore[attr-defined]
+                   if self._error_logged else logger.warning)
+            lvl("Convert error traceback:", exc_info=True)
+            self._error_logged = True
+            # UNCOMMENT THIS CODE BLOCK TO PRINT TRACEBACK ERRORS
+            # import sys; import traceback
+            # exc_info = sys.exc_info(); traceback.print_exception(*exc_info)
+            return item.inbound.image
+
     def _get_warp_matrix(self, matrix: np.ndarray, size: int) -> np.ndarray:
         """ Obtain the final scaled warp transformation matrix based on face scaling from the
         original transformation matrix
@@ -264,24 +281,18 @@ class Converter():
         logger.trace("Patching image: '%s'",  # type: ignore[attr-defined]
                      predicted.inbound.filename)
         frame_size = (predicted.inbound.image.shape[1], predicted.inbound.image.shape[0])
-        new_image, background = self._get_new_image(predicted, frame_size)
 
         if self._full_frame_output:
-            patched_face = self._post_warp_adjustments(background, new_image)
-            patched_face = self._scale_image(patched_face)
-            patched_face *= 255.0
-            patched_face = np.rint(patched_face,
-                                   out=np.empty(patched_face.shape, dtype="uint8"),
-                                   casting='unsafe')
+            patched_face = self._scale_image(self._composite_frame(predicted))
         else:
-            patched_face = new_image
+            patched_face = self._get_new_image(predicted)
 
         if self._writer_pre_encode is None:
             retval: np.ndarray | list[bytes] = patched_face
         else:
             kwargs: dict[str, T.Any] = {}
             if self.cli_arguments.writer == "patch":
-                kwargs["canvas_size"] = (background.shape[1], background.shape[0])
+                kwargs["canvas_size"] = frame_size
                 kwargs["matrices"] = np.array([self._get_warp_matrix(face.adjusted_matrix,
                                                                      patched_face.shape[1])
                                                for face in predicted.reference_faces],
@@ -295,7 +306,8 @@ class Converter():
                        reference: AlignedFace,
                        face: np.ndarray,
                        frame: np.ndarray,
-                       multiple_faces: bool) -> None:
+                       multiple_faces: bool,
+                       offset: tuple[int, int] = (0, 0)) -> None:
         """ Perform affine transformation to place a face patch onto the given frame.
 
         Affine is done in place on the `frame` array, so this function does not return a value
@@ -307,13 +319,19 @@ class Converter():
         face: :class:`numpy.ndarray`
             The swapped face patch
         frame: :class:`numpy.ndarray`
-            The frame to affine the face onto
+            The frame, or region of the frame, to affine the face onto
         multiple_faces: bool
             Controls the border mode to use. Uses BORDER_CONSTANT if there is only 1 face in
             the image, otherwise uses the inferior BORDER_TRANSPARENT
+        offset: tuple, optional
+            The (`x`, `y`) location of the top left of `frame` within the full frame, when warping
+            into a region of the frame. Default: `(0, 0)`
         """
         # Warp face with the mask
         mat = self._get_warp_matrix(reference.adjusted_matrix, face.shape[0])
+        if offset != (0, 0):
+            mat = mat.copy()
+            mat[:, 2] += mat[:, :2] @ np.array(offset, dtype=mat.dtype)
         border = cv2.BORDER_TRANSPARENT if multiple_faces else cv2.BORDER_CONSTANT
         cv2.warpAffine(face,
                        mat,
@@ -322,63 +340,189 @@ class Converter():
                        flags=cv2.WARP_INVERSE_MAP | reference.interpolators[1],
                        borderMode=border)
 
-    def _get_new_image(self,
-                       predicted: ConvertItem,
-                       frame_size: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
-        """ Get the new face from the predictor and apply pre-warp manipulations.
-
-        Applies any requested adjustments to the raw output of the Faceswap model
-        before transforming the image into the target frame.
+    def _get_adjusted_faces(self, predicted: ConvertItem) -> list[np.ndarray]:
+        """ Get the new faces from the predictor with any pre-warp manipulations applied.
 
         Parameters
         ----------
         predicted: :class:`~scripts.convert.ConvertItem`
             The output from :class:`scripts.convert.Predictor`.
-        frame_size: tuple
-            The (`width`, `height`) of the final frame in pixels
 
         Returns
         -------
-        placeholder:  :class: `numpy.ndarray`
-            The original frame with the swapped faces patched onto it
-        background:  :class: `numpy.ndarray`
-            The original frame
+        list
+            The swapped faces, at model output size, with the mask in the alpha channel
         """
-        logger.trace("Getting: (filename: '%s', faces: %s)",  # type: ignore[attr-defined]
-                     predicted.inbound.filename, len(predicted.swapped_faces))
-
-        placeholder = np.zeros((frame_size[1], frame_size[0], 4), dtype="float32")
-        if self._full_frame_output:
-            background = predicted.inbound.image / np.array(255.0, dtype="float32")
-            placeholder[:, :, :3] = background
-        else:
-            faces = []  # Collect the faces into final array
-            background = placeholder  # Used for obtaining original frame dimensions
-
+        retval = []
         for new_face, detected_face, reference_face in zip(predicted.swapped_faces,
                                                            predicted.inbound.detected_faces,
                                                            predicted.reference_faces):
             predicted_mask = new_face[:, :, -1] if new_face.shape[2] == 4 else None
             new_face = new_face[:, :, :3]
-            new_face = self._pre_warp_adjustments(new_face,
-                                                  detected_face,
-                                                  reference_face,
-                                                  predicted_mask)
+            retval.append(self._pre_warp_adjustments(new_face,
+                                                     detected_face,
+                                                     reference_face,
+                                                     predicted_mask))
+        return retval
 
-            if self._full_frame_output:
-                self._warp_to_frame(reference_face,
-                                    new_face, placeholder,
-                                    len(predicted.swapped_faces) > 1)
-            else:
-                faces.append(new_face)
+    def _get_new_image(self, predicted: ConvertItem) -> np.ndarray:
+        """ Get the new faces from the predictor and apply pre-warp manipulations for output by
+        writers that output the face patches rather than the full frame.
 
-        if not self._full_frame_output:
-            placeholder = np.array(faces, dtype="float32")
+        Parameters
+        ----------
+        predicted: :class:`~scripts.convert.ConvertItem`
+            The output from :class:`scripts.convert.Predictor`.
 
-        logger.trace("Got filename: '%s'. (placeholders: %s)",  # type: ignore[attr-defined]
-                     predicted.inbound.filename, placeholder.shape)
+        Returns
+        -------
+        :class: `numpy.ndarray`
+            The swapped faces, with pre-warp adjustments applied, as a single array
+        """
+        logger.trace("Getting: (filename: '%s', faces: %s)",  # type: ignore[attr-defined]
+                     predicted.inbound.filename, len(predicted.swapped_faces))
+        faces = self._get_adjusted_faces(predicted)
+        retval = np.array(faces, dtype="float32")
+        logger.trace("Got filename: '%s'. (faces: %s)",  # type: ignore[attr-defined]
+                     predicted.inbound.filename, retval.shape)
+        return retval
 
-        return placeholder, background
+    def _get_roi(self,
+                 reference: AlignedFace,
+                 size: int,
+                 frame_size: tuple[int, int],
+                 padding: int) -> tuple[int, int, int, int] | None:
+        """ Obtain the region of the frame that a face patch will be warped into.
+
+        Parameters
+        ----------
+        reference: :class:`lib.align.AlignedFace`
+            The object holding the original aligned face
+        size: int
+            The size of the face patch, in pixels
+        frame_size: tuple
+            The (`width`, `height`) of the final frame in pixels
+        padding: int
+            The amount of padding, in pixels, to add around the face patch's footprint
+
+        Returns
+        -------
+        tuple or ``None``
+            The (`left`, `top`, `right`, `bottom`) of the region within the frame, or ``None`` if
+            the face patch does not fall within the frame
+        """
+        mat = cv2.invertAffineTransform(self._get_warp_matrix(reference.adjusted_matrix, size))
+        # Expand the face patch to account for the interpolation kernel at its edges
+        corners = np.array([[-4, -4], [size + 4, -4], [size + 4, size + 4], [-4, size + 4]],
+                           dtype="float64")
+        points = corners @ mat[:, :2].T + mat[:, 2]
+        left, top = np.floor(points.min(axis=0)).astype(int) - padding - 1
+        right, bottom = np.ceil(points.max(axis=0)).astype(int) + padding + 2
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(frame_size[0], right), min(frame_size[1], bottom)
+        if left >= right or top >= bottom:
+            return None
+        return left, top, right, bottom
+
+    @classmethod
+    def _group_rois(cls,
+                    rois: list[tuple[int, int, int, int] | None]
+                    ) -> list[tuple[tuple[int, int, int, int], list[int]]]:
+        """ Merge overlapping regions of interest, so that faces that interact with each other are
+        composited together.
+
+        Parameters
+        ----------
+        rois: list
+            The (`left`, `top`, `right`, `bottom`) region for each face, or ``None`` if the face
+            does not fall within the frame
+
+        Returns
+        -------
+        list
+            Tuples of the (`left`, `top`, `right`, `bottom`) merged region and the indices of the
+            faces, in their original order, that fall within the region
+        """
+        groups = [(roi, [idx]) for idx, roi in enumerate(rois) if roi is not None]
+        merged = True
+        while merged:
+            merged = False
+            for idx, (roi, faces) in enumerate(groups):
+                for other_idx in range(idx + 1, len(groups)):
+                    other, other_faces = groups[other_idx]
+                    if (roi[0] >= other[2] or other[0] >= roi[2]
+                            or roi[1] >= other[3] or other[1] >= roi[3]):
+                        continue
+                    groups[idx] = ((min(roi[0], other[0]), min(roi[1], other[1]),
+                                    max(roi[2], other[2]), max(roi[3], other[3])),
+                                   sorted(faces + other_faces))
+                    del groups[other_idx]
+                    merged = True
+                    break
+                if merged:
+                    break
+        return groups
+
+    def _composite_frame(self, predicted: ConvertItem) -> np.ndarray:
+        """ Patch the swapped faces onto the original frame.
+
+        Faces are only warped and blended within the regions of the frame that they cover, so
+        the remainder of the frame is never converted to floating point. Faces that do not fall
+        within the frame are skipped. Frames that have no faces to patch are output without
+        being copied.
+
+        Parameters
+        ----------
+        predicted: :class:`~scripts.convert.ConvertItem`
+            The output from :class:`scripts.convert.Predictor`.
+
+        Returns
+        -------
+        :class: `numpy.ndarray`
+            The final frame, in `uint8` format, with the swapped faces patched onto it
+        """
+        image = predicted.inbound.image
+        frame_size = (image.shape[1], image.shape[0])
+        faces = self._get_adjusted_faces(predicted)
+        multiple_faces = len(predicted.swapped_faces) > 1
+        padding = (0 if self._adjustments.sharpening is None
+                   else self._adjustments.sharpening.padding(frame_size[0]))
+        groups = self._group_rois([self._get_roi(reference, face.shape[0], frame_size, padding)
+                                   for face, reference in zip(faces, predicted.reference_faces)])
+        logger.trace("Compositing: (filename: '%s', faces: %s, "  # type: ignore[attr-defined]
+                     "regions: %s)", predicted.inbound.filename, len(faces),
+                     [roi for roi, _ in groups])
+
+        if not groups and not self._draw_transparent:
+            return image
+
+        patches = []
+        for (left, top, right, bottom), indices in groups:
+            background = image[top:bottom, left:right] / np.array(255.0, dtype="float32")
+            placeholder = np.zeros((bottom - top, right - left, 4), dtype="float32")
+            placeholder[:, :, :3] = background
+            for idx in indices:
+                self._warp_to_frame(predicted.reference_faces[idx],
+                                    faces[idx],
+                                    placeholder,
+                                    multiple_faces,
+                                    offset=(left, top))
+            patch = self._post_warp_adjustments(background, placeholder, frame_size[0])
+            patch *= 255.0
+            patches.append((slice(top, bottom), slice(left, right), np.rint(
+                patch,
+                out=np.empty(patch.shape, dtype="uint8"),
+                casting="unsafe")))
+
+        if self._draw_transparent:
+            retval = np.zeros((frame_size[1], frame_size[0], 4), dtype="uint8")
+            if len(predicted.swapped_faces) != 1:  # Single faces are warped with a blank border
+                retval[:, :, :3] = image
+        else:
+            retval = image.copy()
+        for rows, cols, patch in patches:
+            retval[rows, cols] = patch
+        return retval
 
     def _pre_warp_adjustments(self,
                               new_face: np.ndarray,
@@ -467,16 +611,22 @@ class Converter():
         logger.trace("Got mask. Image shape: %s", new_face.shape)  # type: ignore[attr-defined]
         return new_face, raw_mask
 
-    def _post_warp_adjustments(self, background: np.ndarray, new_image: np.ndarray) -> np.ndarray:
+    def _post_warp_adjustments(self,
+                               background: np.ndarray,
+                               new_image: np.ndarray,
+                               frame_width: int) -> np.ndarray:
         """ Perform any requested adjustments to the swapped faces after they have been transformed
         into the final frame.
 
         Parameters
         ----------
         background: :class:`numpy.ndarray`
-            The original frame
+            The region of the original frame being patched
         new_image: :class:`numpy.ndarray`
-            A blank frame of original frame size with the faces warped onto it
+            The region of the original frame being patched with the faces warped onto it and the
+            face masks in the alpha channel
+        frame_width: int
+            The width of the full frame, in pixels
 
         Returns
         -------
@@ -484,7 +634,7 @@ class Converter():
             The final merged and swapped frame with any requested post-warp adjustments applied
         """
         if self._adjustments.sharpening is not None:
-            new_image = self._adjustments.sharpening.run(new_image)
+            new_image = self._adjustments.sharpening.run(new_image, frame_width=frame_width)
 
         if self._draw_transparent:
             frame = new_image
@@ -508,7 +658,7 @@ class Converter():
         Parameters
         ----------
         frame: :class:`numpy.ndarray`
-            The final frame with faces swapped
+            The final `uint8` frame with faces swapped
 
         Returns
         -------
@@ -523,5 +673,4 @@ class Converter():
                 round((frame.shape[0] / 2 * self._scale) * 2))
         frame = cv2.resize(frame, dims, interpolation=interp)
         logger.trace("resized frame: %s", frame.shape)  # type: ignore[attr-defined]
-        np.clip(frame, 0.0, 1.0, out=frame)
         return frame
@@ -221,6 +221,7 @@ class _Cache():
         self._data: dict[int, _CacheData] = {}
         self._carry_over: dict[int, EventData] = {}
         self._loss_labels: list[str] = []
+        self._last_live_step = 0
         logger.debug("Initialized: %s", self.__class__.__name__)
 
     def is_cached(self, session_id: int) -> bool:
@@ -395,7 +396,46 @@ class _Cache():
             del l_loss[-1]
             del l_timestamps[-1]
 
-        return l_timestamps, l_loss
+        return self._fill_steps(sorted(data)[:len(l_loss)], l_timestamps, l_loss, is_live)
+
+    def _fill_steps(self,
+                    steps: list[int],
+                    timestamps: list[float],
+                    loss: list[list[float]],
+                    is_live: bool) -> tuple[list[float], list[list[float]]]:
+        """ Repeat the values for any step that was logged as the summary of several iterations,
+        so that the data holds an entry for every iteration.
+
+        Parameters
+        ----------
+        steps: list[int]
+            The step that each timestamp and loss value was logged at
+        timestamps: list[float]
+            The timestamps for each logged step
+        loss: list[list[float]]
+            The loss values for each logged step
+        is_live: bool
+            ``True`` if the data is from a live training session otherwise ``False``.
+
+        Returns
+        -------
+        timestamps: list
+            The timestamps with an entry for every iteration
+        loss: list
+            The loss values with an entry for every iteration
+        """
+        if not steps:
+            return timestamps, loss
+        previous = self._last_live_step if is_live and steps[0] > self._last_live_step else 0
+        if is_live:
+            self._last_live_step = steps[-1]
+        repeats = np.diff([previous] + steps).clip(min=1)
+        if np.all(repeats == 1):
+            return timestamps, loss
+        logger.debug("Filling summarized steps: (logged: %s, iterations: %s)",
+                     len(steps), repeats.sum())
+        return ([stamp for stamp, count in zip(timestamps, repeats) for _ in range(count)],
+                [vals for vals, count in zip(loss, repeats) for _ in range(count)])
 
     def _add_latest_live(self, session_id: int, loss: np.ndarray, timestamps: np.ndarray) -> None:
         """ Append the latest received live training data to the cached data.
@@ -62,10 +62,11 @@ class GlobalSession():
 
     @property
     def batch_sizes(self) -> dict[int, int]:
-        """ dict: The batch sizes for each session_id for the model. """
+        """ dict: The batch sizes for each session_id for the model. For sessions that used
+        gradient accumulation this is the effective batch size of each iteration. """
         if not self._state:
             return {}
-        return {int(sess_id): sess["batchsize"]
+        return {int(sess_id): sess["batchsize"] * sess.get("accumulation_steps", 1)
                 for sess_id, sess in self._state.get("sessions", {}).items()}
 
     @property
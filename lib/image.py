@@ -13,6 +13,8 @@ import typing as T
 from ast import literal_eval
 from bisect import bisect
 from concurrent import futures
+from copy import deepcopy
+from threading import Lock
 from zlib import crc32
 
 import cv2
@@ -23,6 +25,7 @@ from tqdm import tqdm
 
 from lib.multithreading import MultiThread
 from lib.queue_manager import queue_manager, QueueEmpty
+from lib.serializer import get_serializer
 from lib.utils import convert_to_secs, FaceswapError, VIDEO_EXTENSIONS, get_image_paths
 
 if T.TYPE_CHECKING:
@@ -30,6 +33,8 @@ if T.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_USE_FACE_INDEX = False
+
 # ################### #
 # <<< IMAGE UTILS >>> #
 # ################### #
@@ -148,6 +153,64 @@ class FfmpegReader(imageio.plugins.ffmpeg.FfmpegFormat.Reader):  # type:ignore
         logger.trace("keyframe pts_time: %s, keyframe: %s", prev_pts_time, prev_keyframe)
         return prev_pts_time, prev_keyframe
 
+    @property
+    def position(self):
+        """ int: The index of the last frame that was read from the video. ``-1`` if no frames
+        have been read yet """
+        return self._pos
+
+    @property
+    def has_index(self):
+        """ bool: ``True`` if the keyframe and pts_time index is held for the video """
+        return self._frame_pts is not None and self._keyframes is not None
+
+    def is_sequential(self, index):
+        """ Check whether reading forward from the current position to the given index is cheaper
+        than seeking.
+
+        Parameters
+        ----------
+        index: int
+            The frame index that is to be read
+
+        Returns
+        -------
+        bool
+            ``True`` if the requested frame is ahead of the current position and there is no
+            keyframe between the current position and the requested frame (or, if the keyframe
+            index is not available, the requested frame is within 100 frames of the current
+            position)
+        """
+        if index <= self._pos:
+            return index == self._pos
+        if not self.use_patch or not self.has_index:
+            return index <= self._pos + 100
+        return self._previous_keyframe_info(index)[1] <= self._pos + 1
+
+    def _get_data(self, index):
+        """ Replace ImageIO _get_data with a version that uses keyframes for forward seeks.
+
+        Notes
+        -----
+        ImageIO will read forward when the requested frame is within 100 frames of the current
+        position, otherwise it re-initializes the reader. When the keyframe index is available,
+        forward reads only re-initialize when a keyframe lies between the current position and
+        the requested frame, so no frames are decoded that do not need to be. Without the index,
+        forward reads never re-initialize, as the un-patched seek does not always land on the
+        correct frame.
+        """
+        if index <= self._pos or not self.use_patch:
+            return super()._get_data(index)
+        if self.has_index and not self.is_sequential(index):
+            logger.trace("Seeking to keyframe for index %s from position %s",  # type:ignore
+                         index, self._pos)
+            self._initialize(index)
+        else:
+            self._skip_frames(index - self._pos - 1)
+        result, is_new = self._read_frame()
+        self._pos = index
+        return result, dict(new=is_new)
+
     def _initialize(self, index=0):  # noqa:C901
         """ Replace ImageIO _initialize with a version that explictly uses keyframes.
 
@@ -258,6 +321,229 @@ class FfmpegReader(imageio.plugins.ffmpeg.FfmpegFormat.Reader):  # type:ignore
 imageio.plugins.ffmpeg.FfmpegFormat.Reader = FfmpegReader  # type: ignore
 
 
+class VideoFrameReader():
+    """ Random access to the frames of a single video file.
+
+    Holds a small pool of open (keyframe patched) ffmpeg decoders for the video. Each request is
+    served by the decoder that can reach the requested frame by reading forward the fewest frames.
+    If no decoder can read forward to the frame without passing a keyframe, then the least
+    recently used decoder seeks to the keyframe preceding the requested frame.
+
+    The keyframe/pts_time index is shared between all decoders. It can be passed in from the
+    `video_meta_data` stored in an alignments file, otherwise it is generated the first time that
+    a seek is required and can then be retrieved from :attr:`video_meta_data` to be persisted.
+
+    Parameters
+    ----------
+    path: str
+        Full path to the video file
+    video_meta_data: dict, optional
+        Existing video meta information containing the `pts_time` and `keyframes` for the video,
+        as returned from :attr:`lib.align.Alignments.video_meta_data`. ``None`` if this
+        information is not available. Default: ``None``
+    pool_size: int, optional
+        The maximum number of decoders to hold open for the video. Default: `2`
+    """
+    def __init__(self,
+                 path: str,
+                 video_meta_data: dict[str, list[int] | list[float] | None] | None = None,
+                 pool_size: int = 2) -> None:
+        logger.debug("Initializing %s: (path: '%s', video_meta_data: %s, pool_size: %s)",
+                     self.__class__.__name__, path,
+                     {k: None if v is None else len(v)
+                      for k, v in (video_meta_data or {}).items()}, pool_size)
+        self._path = path
+        self._pool_size = max(1, pool_size)
+        self._frame_pts: list[float] | None = None
+        self._keyframes: list[int] | None = None
+        self._decoders: list[FfmpegReader] = []
+        self._lock = Lock()
+        if video_meta_data is not None:
+            self.set_video_meta_data(video_meta_data)
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    @property
+    def path(self) -> str:
+        """ str: The full path to the video file """
+        return self._path
+
+    @property
+    def video_meta_data(self) -> dict[str, list[int] | list[float] | None]:
+        """ dict: The `pts_time` and `keyframes` index for the video. Values are ``None`` if the
+        index has not been provided or generated """
+        return {"pts_time": self._frame_pts, "keyframes": self._keyframes}
+
+    @property
+    def frame_count(self) -> int:
+        """ int: The accurate number of frames in the video. The video will be analyzed to build
+        the keyframe index if it is not already available """
+        with self._lock:
+            if self._frame_pts is None:
+                self._build_index(self._get_decoder(0))
+            assert self._frame_pts is not None
+            return len(self._frame_pts)
+
+    def set_video_meta_data(self,
+                            video_meta_data: dict[str, list[int] | list[float] | None]) -> None:
+        """ Set the keyframe index for the video from existing video meta data.
+
+        Parameters
+        ----------
+        video_meta_data: dict
+            The video meta information containing the `pts_time` and `keyframes` for the video.
+            If either value is ``None`` then the index is not updated
+        """
+        pts_time = video_meta_data.get("pts_time")
+        keyframes = video_meta_data.get("keyframes")
+        if not pts_time or not keyframes:
+            return
+        with self._lock:
+            self._frame_pts = T.cast(list[float], pts_time)
+            self._keyframes = T.cast(list[int], keyframes)
+            for decoder in self._decoders:
+                decoder.get_frame_info(frame_pts=self._frame_pts, keyframes=self._keyframes)
+
+    def _build_index(self, decoder: FfmpegReader) -> None:
+        """ Analyze the video with the given decoder to obtain the keyframe index and share it
+        with all other decoders in the pool.
+
+        Parameters
+        ----------
+        decoder: :class:`FfmpegReader`
+            The decoder to analyze the video with
+        """
+        logger.debug("Building keyframe index for '%s'", self._path)
+        _, meta = decoder.get_frame_info()
+        self._frame_pts = meta["pts_time"]
+        self._keyframes = meta["keyframes"]
+        for dec in self._decoders:
+            if dec is not decoder:
+                dec.get_frame_info(frame_pts=self._frame_pts, keyframes=self._keyframes)
+
+    def _open_decoder(self) -> FfmpegReader:
+        """ Open a new keyframe patched decoder for the video and add it to the pool.
+
+        Returns
+        -------
+        :class:`FfmpegReader`
+            The newly opened decoder
+        """
+        decoder = imageio.get_reader(self._path, "ffmpeg")
+        decoder.use_patch = True
+        if self._frame_pts is not None:
+            decoder.get_frame_info(frame_pts=self._frame_pts, keyframes=self._keyframes)
+        self._decoders.append(decoder)
+        logger.debug("Opened decoder %s for '%s'", len(self._decoders), self._path)
+        return decoder
+
+    def _get_decoder(self, index: int) -> FfmpegReader:
+        """ Obtain the decoder from the pool that can most cheaply reach the requested frame.
+
+        Parameters
+        ----------
+        index: int
+            The frame index that is to be read
+
+        Returns
+        -------
+        :class:`FfmpegReader`
+            The decoder to read the frame from. The decoder is moved to the end of the pool, so
+            that the first decoder in the pool is always the least recently used
+        """
+        candidates = [dec for dec in self._decoders if dec.is_sequential(index)]
+        if candidates:
+            decoder = max(candidates, key=lambda d: d.position)
+        elif len(self._decoders) < self._pool_size:
+            decoder = self._open_decoder()
+        else:
+            decoder = self._decoders[0]
+        self._decoders.remove(decoder)
+        self._decoders.append(decoder)
+        return decoder
+
+    def get_frame(self, index: int) -> np.ndarray:
+        """ Obtain a single frame from the video.
+
+        Parameters
+        ----------
+        index: int
+            The frame index to obtain. NB: The first frame is index `0`
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The requested frame in BGR format
+        """
+        with self._lock:
+            decoder = self._get_decoder(index)
+            if self._frame_pts is None and not decoder.is_sequential(index):
+                self._build_index(decoder)
+            logger.trace("Reading frame %s from decoder at position %s",  # type:ignore
+                         index, decoder.position)
+            frame = decoder.get_data(index)[..., ::-1]
+        return frame
+
+    def close(self) -> None:
+        """ Close all of the open decoders for the video """
+        with self._lock:
+            for decoder in self._decoders:
+                decoder.close()
+            self._decoders = []
+        logger.debug("Closed decoders for '%s'", self._path)
+
+
+_VIDEO_READERS: dict[str, VideoFrameReader] = {}
+_VIDEO_READERS_LOCK = Lock()
+
+
+def get_video_reader(path: str,
+                     video_meta_data: dict[str, list[int] | list[float] | None] | None = None
+                     ) -> VideoFrameReader:
+    """ Obtain the shared :class:`VideoFrameReader` for a video file, creating it if it does
+    not already exist.
+
+    Parameters
+    ----------
+    path: str
+        Full path to the video file
+    video_meta_data: dict, optional
+        Existing video meta information containing the `pts_time` and `keyframes` for the video.
+        If provided, and the reader does not already hold an index, then it is used to seek
+        without analyzing the video. Default: ``None``
+
+    Returns
+    -------
+    :class:`VideoFrameReader`
+        The shared frame reader for the given video
+    """
+    key = os.path.abspath(path)
+    with _VIDEO_READERS_LOCK:
+        if key not in _VIDEO_READERS:
+            _VIDEO_READERS[key] = VideoFrameReader(path)
+        reader = _VIDEO_READERS[key]
+    if video_meta_data is not None and reader.video_meta_data["pts_time"] is None:
+        reader.set_video_meta_data(video_meta_data)
+    return reader
+
+
+def close_video_readers() -> dict[str, dict[str, list[int] | list[float] | None]]:
+    """ Close all shared :class:`VideoFrameReader` objects and their open decoders
+
+    Returns
+    -------
+    dict
+        The :attr:`VideoFrameReader.video_meta_data` for each closed reader, keyed by the full
+        path to the video file, so that any keyframe index built whilst reading can be stored
+    """
+    with _VIDEO_READERS_LOCK:
+        retval = {key: reader.video_meta_data for key, reader in _VIDEO_READERS.items()}
+        for reader in _VIDEO_READERS.values():
+            reader.close()
+        _VIDEO_READERS.clear()
+    logger.debug("Closed video readers: %s", list(retval))
+    return retval
+
+
 def read_image(filename, raise_error=False, with_metadata=False):
     """ Read an image file from a file location.
 
@@ -445,6 +731,177 @@ def read_image_meta(filename):
     return retval
 
 
+def set_face_index(enabled: bool) -> None:
+    """ Enable or disable the use of the per-folder sidecar index of image metadata within
+    :func:`read_image_meta_batch`.
+
+    Parameters
+    ----------
+    enabled: bool
+        ``True`` to read and maintain a :class:`FaceMetaIndex` for each folder that metadata is
+        requested from. ``False`` to always read metadata directly from the image files
+
+    Example
+    -------
+    >>> set_face_index(True)  # Cache face metadata in a sidecar index for each folder
+    """
+    global _USE_FACE_INDEX  # pylint:disable=global-statement
+    logger.debug("Setting face metadata index: %s", enabled)
+    _USE_FACE_INDEX = enabled
+
+
+class FaceMetaIndex():
+    """ A sidecar index, stored alongside the images in a folder, of the metadata returned from
+    :func:`read_image_meta` for each image.
+
+    The index holds the parsed Faceswap header information (including the alignments, and
+    therefore the landmarks, of each face) along with the modification time and size of the file
+    that it was read from. Entries are validated against the files on disk by their stat
+    information only, so images that have not changed do not need to be opened. Entries for
+    images that have been added or changed are updated and entries for images that no longer
+    exist are removed.
+
+    Parameters
+    ----------
+    folder: str
+        The full path to the folder of images that this index is for
+    """
+    filename = ".faceswap_meta_index"
+    _version = 1
+
+    def __init__(self, folder: str) -> None:
+        logger.debug("Initializing %s: (folder: '%s')", self.__class__.__name__, folder)
+        self._path = os.path.join(folder, self.filename)
+        self._serializer = get_serializer("compressed")
+        self._entries: dict[str, tuple[int, int, dict[str, T.Any]]] = self._load()
+        self._pending: dict[str, tuple[int, int]] = {}
+        self._modified = False
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    def _load(self) -> dict[str, tuple[int, int, dict[str, T.Any]]]:
+        """ Load the index from disk, if it exists and is valid
+
+        Returns
+        -------
+        dict
+            The file name of each indexed image mapped to its modification time (ns), file size
+            and metadata
+        """
+        if not os.path.exists(self._path):
+            logger.debug("No face metadata index at '%s'", self._path)
+            return {}
+        try:
+            data = self._serializer.load(self._path)
+        except Exception as err:  # pylint:disable=broad-except
+            logger.warning("Discarding unreadable face metadata index '%s': %s", self._path, err)
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self._version:
+            logger.debug("Discarding outdated face metadata index '%s'", self._path)
+            return {}
+        logger.debug("Loaded %s entries from '%s'", len(data["entries"]), self._path)
+        return data["entries"]
+
+    def partition(self, filenames: list[str]) -> tuple[dict[str, dict[str, T.Any]], list[str]]:
+        """ Split the given images into those that have a valid index entry and those that need
+        to be read from disk. Index entries for images that no longer exist are removed.
+
+        Parameters
+        ----------
+        filenames: list
+            The full paths to the images, within this index's folder, to obtain metadata for
+
+        Returns
+        -------
+        cached: dict
+            The full path of each image with a valid index entry mapped to its metadata
+        stale: list
+            The full paths of the images whose metadata must be read from the image file and
+            passed to :func:`add`
+        """
+        folder = os.path.dirname(self._path)
+        stats = {entry.name: entry.stat() for entry in os.scandir(folder) if entry.is_file()}
+        for name in [name for name in self._entries if name not in stats]:
+            del self._entries[name]
+            self._modified = True
+
+        cached: dict[str, dict[str, T.Any]] = {}
+        stale: list[str] = []
+        for filename in filenames:
+            name = os.path.basename(filename)
+            stat = stats.get(name)
+            entry = self._entries.get(name)
+            if stat is not None and entry is not None and entry[:2] == (stat.st_mtime_ns,
+                                                                        stat.st_size):
+                cached[filename] = entry[2]
+                continue
+            if stat is not None:
+                self._pending[name] = (stat.st_mtime_ns, stat.st_size)
+            stale.append(filename)
+        logger.debug("Face metadata index '%s': (cached: %s, stale: %s)",
+                     self._path, len(cached), len(stale))
+        return cached, stale
+
+    def add(self, filename: str, metadata: dict[str, T.Any]) -> None:
+        """ Add the metadata read from an image returned as stale from :func:`partition` to the
+        index
+
+        Parameters
+        ----------
+        filename: str
+            The full path to the image that the metadata was read from
+        metadata: dict
+            The metadata returned from :func:`read_image_meta` for the image
+        """
+        stat = self._pending.pop(os.path.basename(filename), None)
+        if stat is None:
+            return
+        self._entries[os.path.basename(filename)] = (*stat, deepcopy(metadata))
+        self._modified = True
+
+    def save(self) -> None:
+        """ Save the index to disk if it has changed. Failure to write the index (for example for
+        a read-only folder) is logged and otherwise ignored """
+        if not self._modified:
+            return
+        logger.debug("Saving %s entries to '%s'", len(self._entries), self._path)
+        tmp_path = f"{self._path}.tmp"
+        try:
+            with open(tmp_path, "wb") as out_file:
+                out_file.write(self._serializer.marshal({"version": self._version,
+                                                         "entries": self._entries}))
+            os.replace(tmp_path, self._path)
+        except OSError as err:
+            logger.warning("Unable to save face metadata index '%s': %s", self._path, err)
+            return
+        self._modified = False
+
+
+def _read_image_meta_threaded(filenames):
+    """ Read the Faceswap metadata from a batch of images with a thread pool, yielding results as
+    they are read.
+
+    Parameters
+    ----------
+    filenames: list
+        A list of ``str`` full paths to the images to be loaded.
+
+    Yields
+    -------
+    tuple
+        (**filename** (`str`), **metadata** (`dict`) )
+    """
+    executor = futures.ThreadPoolExecutor()
+    with executor:
+        logger.debug("Submitting %s items to executor", len(filenames))
+        read_meta = {executor.submit(read_image_meta, filename): filename
+                     for filename in filenames}
+        logger.debug("Succesfully submitted %s items to executor", len(filenames))
+        for future in futures.as_completed(read_meta):
+            retval = (read_meta[future], future.result())
+            logger.trace("Yielding: %s", retval)
+            yield retval
+
+
 def read_image_meta_batch(filenames):
     """ Read the Faceswap metadata stored in a batch extracted faces' exif headers.
 
@@ -452,6 +909,10 @@ def read_image_meta_batch(filenames):
     leading to vastly reduced image read times. Creates a generator to retrieve filenames
     with their metadata as they are calculated.
 
+    If the face metadata index has been enabled with :func:`set_face_index` then the metadata for
+    images that have not changed since they were last read is returned from each folder's
+    :class:`FaceMetaIndex`, and only new or changed images are read from disk.
+
     Notes
     -----
     The order of returned values is non-deterministic so will most likely not be returned in the
@@ -474,16 +935,24 @@ def read_image_meta_batch(filenames):
     >>>         <do something>
     """
     logger.trace("Requested batch: '%s'", filenames)
-    executor = futures.ThreadPoolExecutor()
-    with executor:
-        logger.debug("Submitting %s items to executor", len(filenames))
-        read_meta = {executor.submit(read_image_meta, filename): filename
-                     for filename in filenames}
-        logger.debug("Succesfully submitted %s items to executor", len(filenames))
-        for future in futures.as_completed(read_meta):
-            retval = (read_meta[future], future.result())
-            logger.trace("Yielding: %s", retval)
-            yield retval
+    if not _USE_FACE_INDEX:
+        yield from _read_image_meta_threaded(filenames)
+        return
+
+    folders: dict[str, list[str]] = {}
+    for filename in filenames:
+        folders.setdefault(os.path.dirname(filename), []).append(filename)
+    for folder, folder_files in folders.items():
+        index = FaceMetaIndex(folder)
+        cached, stale = index.partition(folder_files)
+        try:
+            for filename, metadata in _read_image_meta_threaded(stale):
+                index.add(filename, metadata)
+                yield filename, metadata
+        finally:
+            # Saved before yielding cached entries so the index cannot be altered by the caller
+            index.save()
+        yield from cached.items()
 
 
 def pack_to_itxt(metadata):
@@ -1061,6 +1530,10 @@ class ImagesLoader(ImageIO):
         If the number of images that the loader will encounter is already known, it can be passed
         in here to skip the image counting step, which can save time at launch. Set to ``None`` if
         the count is not already known. Default: ``None``
+    video_meta_data: dict, optional
+        Existing video meta information containing the `pts_time` and `keyframes` for the video.
+        If provided, frames in the skip list are seeked past using the keyframe index rather than
+        being decoded. Default: ``None``
 
     Examples
     --------
@@ -1076,13 +1549,15 @@ class ImagesLoader(ImageIO):
                  queue_size=8,
                  fast_count=True,
                  skip_list=None,
-                 count=None):
+                 count=None,
+                 video_meta_data=None):
         logger.debug("Initializing %s: (path: %s, queue_size: %s, fast_count: %s, skip_list: %s, "
-                     "count: %s)", self.__class__.__name__, path, queue_size, fast_count,
-                     skip_list, count)
+                     "count: %s, video_meta_data: %s)", self.__class__.__name__, path, queue_size,
+                     fast_count, skip_list, count, video_meta_data is not None)
 
         super().__init__(path, queue_size=queue_size)
         self._skip_list = set() if skip_list is None else set(skip_list)
+        self._video_meta_data = {} if video_meta_data is None else video_meta_data
         self._is_video = self._check_for_video()
         self._fps = self._get_fps()
 
@@ -1241,15 +1716,28 @@ class ImagesLoader(ImageIO):
         """
         logger.debug("Loading frames from video: '%s'", self.location)
         reader = imageio.get_reader(self.location, "ffmpeg")
-        for idx, frame in enumerate(reader):
+        if self._skip_list:
+            # Read past skipped frames without converting them, seeking where a keyframe allows
+            reader.use_patch = True
+            if self._video_meta_data.get("pts_time") and self._video_meta_data.get("keyframes"):
+                reader.get_frame_info(frame_pts=self._video_meta_data["pts_time"],
+                                      keyframes=self._video_meta_data["keyframes"])
+        idx = 0
+        while True:
             if idx in self._skip_list:
                 logger.trace("Skipping frame %s due to skip list", idx)
+                idx += 1
                 continue
+            try:
+                frame = reader.get_data(idx)
+            except IndexError:
+                break
             # Convert to BGR for cv2 compatibility
             frame = frame[:, :, ::-1]
             filename = self._dummy_video_framename(idx)
             logger.trace("Loading video frame: '%s'", filename)
             yield filename, frame
+            idx += 1
         reader.close()
 
     def _dummy_video_framename(self, index):
@@ -1410,9 +1898,8 @@ class SingleFrameLoader(ImagesLoader):
     def __init__(self, path, video_meta_data=None):
         logger.debug("Initializing %s: (path: %s, video_meta_data: %s)",
                      self.__class__.__name__, path, video_meta_data)
-        self._video_meta_data = dict() if video_meta_data is None else video_meta_data
         self._reader = None
-        super().__init__(path, queue_size=1, fast_count=False)
+        super().__init__(path, queue_size=1, fast_count=False, video_meta_data=video_meta_data)
 
     @property
     def video_meta_data(self):
@@ -1428,12 +1915,9 @@ class SingleFrameLoader(ImagesLoader):
 
     def _get_count_and_filelist(self, fast_count, count):
         if self._is_video:
-            self._reader = imageio.get_reader(self.location, "ffmpeg")
-            self._reader.use_patch = True
-            count, video_meta_data = self._reader.get_frame_info(
-                frame_pts=self._video_meta_data.get("pts_time", None),
-                keyframes=self._video_meta_data.get("keyframes", None))
-            self._video_meta_data = video_meta_data
+            self._reader = get_video_reader(self.location, video_meta_data=self._video_meta_data)
+            count = self._reader.frame_count
+            self._video_meta_data = self._reader.video_meta_data
         super()._get_count_and_filelist(fast_count, count)
 
     def image_from_index(self, index):
@@ -1454,16 +1938,16 @@ class SingleFrameLoader(ImagesLoader):
 
         Notes
         -----
-        Retrieving frames from video files can be slow as the whole video file needs to be
-        iterated to retrieve the requested frame. If a frame has already been retrieved, then
-        retrieving frames of a higher index will be quicker than retrieving frames of a lower
-        index, as iteration needs to start from the beginning again when navigating backwards.
+        Frames are retrieved from video files through the shared :class:`VideoFrameReader` for
+        the video, which seeks to the keyframe preceding the requested frame, so only the frames
+        between that keyframe and the requested frame need to be decoded. Retrieving the frame
+        after the previously retrieved frame is quickest.
 
         We do not use a background thread for this task, as it is assumed that requesting an image
         by index will be done when required.
         """
         if self.is_video:
-            image = self._reader.get_data(index)[..., ::-1]
+            image = self._reader.get_frame(index)
             filename = self._dummy_video_framename(index)
         else:
             file_list = [f for idx, f in enumerate(self._file_list)
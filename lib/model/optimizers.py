@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """ Custom Optimizers for TensorFlow 2.x/tf.keras """
+from __future__ import annotations
 
 import inspect
 import sys
@@ -393,6 +394,150 @@ class AdaBelief(tf.keras.optimizers.Optimizer):
         return config
 
 
+class GradientAccumulator():
+    """ Mixin for a Keras Optimizer that accumulates the gradients of several batches and only
+    updates the model's weights with their mean once every `accumulation_steps` batches.
+
+    This gives the same update as training on a batch `accumulation_steps` times larger, without
+    the extra VRAM. Accumulation happens before the optimizer's gradient transformers, so
+    :class:`lib.model.autoclip.AutoClipper` clips the accumulated gradients once per update.
+    Mixed precision's :class:`~tf.keras.mixed_precision.LossScaleOptimizer` unscales the gradients
+    before they reach this optimizer and skips any batch with non-finite gradients, so a skipped
+    batch is not counted towards the accumulation.
+
+    Use :func:`accumulate_gradients` to add gradient accumulation to an optimizer, rather than
+    inheriting from this class directly.
+
+    Parameters
+    ----------
+    accumulation_steps: int, optional
+        The number of batches to accumulate gradients for before updating the weights. Default: 1
+    """
+    def __init__(self, *args, accumulation_steps: int = 1, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._accumulation_steps = accumulation_steps
+        self._accumulation_step: tf.Variable | None = None
+
+    @property
+    def accumulation_steps(self) -> int:
+        """ int: The number of batches that gradients are accumulated for """
+        return self._accumulation_steps
+
+    def _create_all_weights(self, var_list):
+        """ Create the optimizer's weights along with the count of accumulated batches
+
+        Parameters
+        ----------
+        var_list: list
+            List of tensorflow variables to create weights for
+        """
+        super()._create_all_weights(var_list)  # type:ignore[misc]
+        if self._accumulation_steps > 1 and self._accumulation_step is None:
+            self._accumulation_step = self.add_weight(  # type:ignore[attr-defined]
+                "accumulation_step",
+                shape=[],
+                dtype=tf.int64,
+                initializer="zeros",
+                trainable=False,
+                aggregation=tf.VariableAggregation.ONLY_FIRST_REPLICA)
+
+    def _create_slots(self, var_list):
+        """ Create the optimizer's slots along with a slot to accumulate the gradients for each
+        variable
+
+        Parameters
+        ----------
+        var_list: list
+            List of tensorflow variables to create slots for
+        """
+        super()._create_slots(var_list)  # type:ignore[misc]
+        if self._accumulation_steps > 1:
+            for var in var_list:
+                self.add_slot(var, "accumulated_gradient")  # type:ignore[attr-defined]
+
+    def apply_gradients(self, grads_and_vars, name=None, experimental_aggregate_gradients=True):
+        """ Add the gradients to the accumulated gradients and, once they have been accumulated
+        for :attr:`accumulation_steps` batches, apply their mean to the variables.
+
+        Parameters
+        ----------
+        grads_and_vars: list
+            List of (gradient, variable) pairs
+        name: str, optional
+            Name for the returned operation. Default: ``None``
+        experimental_aggregate_gradients: bool, optional
+            Whether to sum gradients from different replicas. Default: ``True``
+
+        Returns
+        -------
+        :class:`tf.Operation`
+            The operation that accumulates, and if due, applies the gradients
+        """
+        apply = super().apply_gradients  # type:ignore[misc]
+        if self._accumulation_steps == 1:
+            return apply(grads_and_vars,
+                         name=name,
+                         experimental_aggregate_gradients=experimental_aggregate_gradients)
+
+        grads_and_vars = [(grad, var) for grad, var in grads_and_vars if grad is not None]
+        variables = [var for _, var in grads_and_vars]
+        with tf.init_scope():
+            self._create_all_weights(variables)
+        assert self._accumulation_step is not None
+        accumulators = [self.get_slot(var, "accumulated_gradient")  # type:ignore[attr-defined]
+                        for var in variables]
+        for accumulator, (grad, _) in zip(accumulators, grads_and_vars):
+            accumulator.assign_add(tf.cast(tf.convert_to_tensor(grad), accumulator.dtype))
+        step = self._accumulation_step.assign_add(1)
+
+        def _apply() -> tf.Operation:
+            """ Apply the mean accumulated gradients and reset the accumulation """
+            update = apply([(accumulator / self._accumulation_steps, var)
+                            for accumulator, var in zip(accumulators, variables)],
+                           name=name,
+                           experimental_aggregate_gradients=experimental_aggregate_gradients)
+            assert self._accumulation_step is not None
+            with tf.control_dependencies([update]):
+                resets = [accumulator.assign(tf.zeros_like(accumulator))
+                          for accumulator in accumulators]
+                resets.append(self._accumulation_step.assign(0))
+            return tf.group(resets)
+
+        return tf.cond(step >= self._accumulation_steps, _apply, tf.no_op)
+
+    def get_config(self):
+        """ Returns the config of the optimizer, including the number of accumulation steps.
+
+        Returns
+        -------
+        dict
+            The optimizer configuration.
+        """
+        config = super().get_config()  # type:ignore[misc]
+        config["accumulation_steps"] = self._accumulation_steps
+        return config
+
+
+def accumulate_gradients(optimizer: type[tf.keras.optimizers.Optimizer]
+                         ) -> type[tf.keras.optimizers.Optimizer]:
+    """ Obtain a version of a Keras Optimizer class that supports gradient accumulation.
+
+    The returned class takes the additional keyword argument `accumulation_steps`. See
+    :class:`GradientAccumulator`.
+
+    Parameters
+    ----------
+    optimizer: :class:`tf.keras.optimizers.Optimizer`
+        The optimizer class to add gradient accumulation to
+
+    Returns
+    -------
+    :class:`tf.keras.optimizers.Optimizer`
+        A subclass of the given optimizer, with the same name, that accumulates gradients
+    """
+    return type(optimizer.__name__, (GradientAccumulator, optimizer), {})
+
+
 # Update layers into Keras custom objects
 for _name, obj in inspect.getmembers(sys.modules[__name__]):
     if inspect.isclass(obj) and obj.__module__ == __name__:
@@ -8,6 +8,7 @@ from .augmentation import ImageAugmentation
 from .generator import Feeder
 from .lr_finder import LearningRateFinder
 from .preview_cv import PreviewBuffer, TriggerType
+from .train_step import CompiledTrainStep
 
 if T.TYPE_CHECKING:
     from .preview_cv import PreviewBase
@@ -3,8 +3,11 @@
 from __future__ import annotations
 import logging
 import os
+import tempfile
 import typing as T
+import weakref
 
+from multiprocessing import get_all_start_methods, get_context, shared_memory
 from threading import Lock
 
 import cv2
@@ -16,11 +19,13 @@ from lib.image import read_image_batch, read_image_meta_batch
 from lib.utils import FaceswapError
 
 if T.TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
     from lib.align.alignments import PNGHeaderAlignmentsDict, PNGHeaderDict
     from lib.config import ConfigValueType
 
 logger = logging.getLogger(__name__)
 _FACE_CACHES: dict[str, "_Cache"] = {}
+_IMAGE_CACHES: dict[str, "_ImageCache"] = {}
 
 
 def get_cache(side: T.Literal["a", "b"],
@@ -67,6 +72,60 @@ def get_cache(side: T.Literal["a", "b"],
     return _FACE_CACHES[side]
 
 
+def get_worker_context() -> BaseContext:
+    """ Obtain the multiprocessing context that training worker processes are started from.
+
+    Workers are not forked, as forking a process that has initialized Tensorflow and has running
+    threads can deadlock. The `forkserver` start method is used where it is available, otherwise
+    `spawn`.
+
+    Returns
+    -------
+    :class:`multiprocessing.context.BaseContext`
+        The context for starting training worker processes
+    """
+    return get_context("forkserver" if "forkserver" in get_all_start_methods() else "spawn")
+
+
+def get_image_cache(side: T.Literal["a", "b"],
+                    config: dict[str, ConfigValueType] | None = None,
+                    filenames: list[str] | None = None) -> "_ImageCache | None":
+    """ Obtain an :class:`_ImageCache` object for the given side. If the object does not pre-exist
+    then create it.
+
+    Parameters
+    ----------
+    side: str
+        `"a"` or `"b"`. The side of the model to obtain the decoded image cache for
+    config: dict, optional
+        The user selected training configuration options. Must be passed for the first call of this
+        function for each side. For subsequent calls this parameter is ignored. Default: ``None``
+    filenames: list, optional
+        The full paths to the training images for the side. Must be passed for the first call of
+        this function for each side. For subsequent calls this parameter is ignored.
+        Default: ``None``
+
+    Returns
+    -------
+    :class:`_ImageCache` or ``None``
+        The decoded image cache for the requested side or ``None`` if the decoded image cache has
+        not been enabled
+    """
+    if side not in _IMAGE_CACHES:
+        assert config is not None, ("config must be provided for first call to image cache")
+        budget = T.cast(int, config.get("image_cache_size", 0))
+        if budget <= 0:
+            logger.debug("Decoded image cache disabled for side: %s", side)
+            return None
+        policy = T.cast(T.Literal["fixed", "lru"], config.get("image_cache_policy", "fixed"))
+        logger.debug("Creating image cache. side: %s, budget: %sMB, policy: %s",
+                     side, budget, policy)
+        assert filenames is not None, ("filenames must be provided for first call to image "
+                                       "cache")
+        _IMAGE_CACHES[side] = _ImageCache(budget, policy, filenames)
+    return _IMAGE_CACHES[side]
+
+
 def _check_reset(face_cache: "_Cache") -> bool:
     """ Check whether a given cache needs to be reset because a face centering change has been
     detected in the other cache.
@@ -494,6 +553,303 @@ class _Cache():
         return mask
 
 
+class _ImageCache():
+    """ A process safe cache of decoded uint8 training images, keyed by filename.
+
+    Decoding the PNG training images is the largest per-iteration CPU cost when feeding a model.
+    This cache holds the decoded pixels in a single memory-mapped array backed by a temporary file,
+    so that each face only needs to be read from disk and decoded once for the lifetime of the
+    training session. The backing file is shared by all of the generators (training, preview and
+    time-lapse) for a side, and by any augmentation worker processes for the side, which receive
+    the cache when the generator is handed to them.
+
+    Only the side's training images are cached. The index of which image is held in which slot is
+    held in the backing file alongside the images, so that it is shared between processes. Any
+    other images are always read from disk.
+
+    The memory-mapped array is allocated on first population, when the shape of the training
+    images is known. The number of images that can be held is dictated by the given RAM budget.
+    When a training set is larger than the budget, one of the following eviction policies is used:
+
+        * **fixed** - The first images loaded are kept and any further images are always read from
+          disk. As training images are accessed uniformly at random, this gives the best hit rate
+          that can be achieved for the given budget with no overhead.
+        * **lru** - The least recently used image is evicted to make room for the newest image.
+
+    Parameters
+    ----------
+    budget: int
+        The maximum amount of RAM, in megabytes, that the decoded images may occupy
+    policy: ["fixed", "lru"]
+        The eviction policy to use when the training set does not fit within the budget
+    filenames: list
+        The full paths or base names of the training images that may be cached
+    """
+    def __init__(self,
+                 budget: int,
+                 policy: T.Literal["fixed", "lru"],
+                 filenames: list[str]) -> None:
+        logger.debug("Initializing: %s (budget: %s, policy: %s, filenames: %s)",
+                     self.__class__.__name__, budget, policy, len(filenames))
+        assert policy in ("fixed", "lru")
+        self._lock = get_worker_context().Lock()
+        self._budget = budget * 1024 * 1024
+        self._policy = policy
+        self._keys = {os.path.basename(filename): idx for idx, filename in enumerate(filenames)}
+
+        self._filename: str | None = None
+        self._finalizer: weakref.finalize | None = None
+        self._index: np.ndarray | None = None
+        self._images: np.ndarray | None = None
+        self._capacity = 0
+        self._image_shape: tuple[int, ...] = ()
+        self._dtype = "|u1"
+        self._stats = {"hits": 0, "misses": 0}
+        logger.debug("Initialized: %s", self.__class__.__name__)
+
+    def __getstate__(self) -> dict[str, T.Any]:
+        """ Remove the memory maps and statistics when pickling for a worker process. The worker
+        attaches to the same backing file when it is unpickled.
+
+        Returns
+        -------
+        dict
+            The picklable state of this object
+        """
+        assert not self._budget or self._images is not None, (
+            "The image cache must be allocated prior to handing it to a worker process")
+        return {key: val for key, val in self.__dict__.items()
+                if key not in ("_finalizer", "_index", "_images", "_stats")}
+
+    def __setstate__(self, state: dict[str, T.Any]) -> None:
+        """ Attach to the owning process' backing file when unpickled in a worker process.
+
+        Parameters
+        ----------
+        state: dict
+            The pickled state of the owning process' cache
+        """
+        self.__dict__.update(state)
+        self._finalizer = None
+        self._index = self._images = None
+        self._stats = {"hits": 0, "misses": 0}
+        if self._filename is not None:
+            self._map_file()
+
+    @property
+    def capacity(self) -> int:
+        """ int: The number of images that the cache can hold. 0 if not yet allocated """
+        return self._capacity
+
+    @property
+    def hit_rate(self) -> float:
+        """ float: The ratio of requested images that were served from the cache """
+        total = self._stats["hits"] + self._stats["misses"]
+        return self._stats["hits"] / total if total else 0.0
+
+    @property
+    def cached(self) -> list[str]:
+        """ list: The base names of the images currently held in the cache """
+        if self._index is None:
+            return []
+        slot_of = self._index[:len(self._keys)]
+        return [key for key, idx in self._keys.items() if slot_of[idx] >= 0]
+
+    def _map_file(self) -> None:
+        """ Memory map the slot index and the images from the backing file.
+
+        The index holds the slot of each key, the key held in each slot, the last time each slot
+        was used and the counters for the number of filled slots and the current time.
+        """
+        assert self._filename is not None
+        index_length = len(self._keys) + 2 * self._capacity + 2
+        self._index = np.memmap(self._filename, dtype="int64", mode="r+", shape=(index_length, ))
+        self._images = np.memmap(self._filename,
+                                 dtype=self._dtype,
+                                 mode="r+",
+                                 offset=self._index.nbytes,
+                                 shape=(self._capacity, *self._image_shape))
+
+    def _allocate(self, image_shape: tuple[int, ...], dtype: np.dtype) -> bool:
+        """ Allocate the memory-mapped backing file for holding the decoded images.
+
+        Parameters
+        ----------
+        image_shape: tuple
+            The shape of a single decoded image
+        dtype: :class:`numpy.dtype`
+            The datatype of the decoded images
+
+        Returns
+        -------
+        bool
+            ``True`` if the cache could be allocated. ``False`` if the budget is too small to hold
+            a single image
+        """
+        self._capacity = min(len(self._keys),
+                             self._budget // int(np.prod(image_shape) * np.dtype(dtype).itemsize))
+        if self._capacity < 1:
+            logger.warning("The selected image cache size is too small to hold a single training "
+                           "image. Image caching disabled.")
+            self._budget = 0
+            return False
+        self._image_shape = image_shape
+        self._dtype = np.dtype(dtype).str
+        handle, self._filename = tempfile.mkstemp(prefix="faceswap_image_cache_")
+        size = (len(self._keys) + 2 * self._capacity + 2) * 8 + int(
+            np.prod((self._capacity, *image_shape))) * np.dtype(dtype).itemsize
+        os.ftruncate(handle, size)
+        os.close(handle)
+        self._finalizer = weakref.finalize(self, _remove_file, self._filename)
+        self._map_file()
+        assert self._index is not None
+        self._index[:] = -1
+        self._index[-2:] = 0
+        logger.debug("Allocated image cache: (filename: '%s', capacity: %s, shape: %s)",
+                     self._filename, self._capacity, image_shape)
+        return True
+
+    def prepare_for_workers(self, filename: str) -> None:
+        """ Allocate the cache, if it has not already been allocated, so that it can be handed to
+        worker processes. Worker processes attach to the allocated cache rather than creating
+        their own.
+
+        Parameters
+        ----------
+        filename: str
+            The full path to a training image, which is read to obtain the shape of the images
+        """
+        if self._budget and self._images is None:
+            self.read([filename])
+
+    def _touch(self, slot: int) -> None:
+        """ Mark a slot as the most recently used. Must be called whilst holding the lock
+
+        Parameters
+        ----------
+        slot: int
+            The slot to mark as used
+        """
+        assert self._index is not None
+        self._index[len(self._keys) + self._capacity + slot] = self._index[-1]
+        self._index[-1] += 1
+
+    def _get_slot(self, key: int) -> int | None:
+        """ Obtain the slot in the cache array to store a new image in, evicting the least recently
+        used item if required. Must be called whilst holding the lock
+
+        Parameters
+        ----------
+        key: int
+            The index of the key to obtain a slot for
+
+        Returns
+        -------
+        int or ``None``
+            The index into the cache array to store the image in. ``None`` if the image should not
+            be cached
+        """
+        assert self._index is not None
+        num_keys = len(self._keys)
+        filled = int(self._index[-2])
+        if filled < self._capacity:
+            self._index[-2] = filled + 1
+            return filled
+        if self._policy == "fixed":
+            return None
+        slot = int(np.argmin(self._index[num_keys + self._capacity:num_keys + 2 * self._capacity]))
+        evicted = int(self._index[num_keys + slot])
+        self._index[evicted] = -1
+        logger.trace("Evicted slot %s for key %s", slot, key)  # type: ignore
+        return slot
+
+    def store(self, filenames: list[str], images: np.ndarray) -> None:
+        """ Store a batch of decoded images in the cache.
+
+        Parameters
+        ----------
+        filenames: list
+            The filenames that correspond to the given images
+        images: :class:`numpy.ndarray`
+            The batch of decoded images to be cached
+        """
+        if not self._budget or images.ndim < 2:
+            return
+        with self._lock:
+            if self._images is None and not self._allocate(images.shape[1:], images.dtype):
+                return
+            assert self._images is not None and self._index is not None
+            if images.shape[1:] != self._images.shape[1:]:
+                return
+            for filename, image in zip(filenames, images):
+                key = self._keys.get(os.path.basename(filename))
+                if key is None or self._index[key] >= 0:
+                    continue
+                slot = self._get_slot(key)
+                if slot is None:
+                    continue
+                self._images[slot] = image
+                self._index[key] = slot
+                self._index[len(self._keys) + slot] = key
+                self._touch(slot)
+
+    def read(self, filenames: list[str]) -> np.ndarray:
+        """ Obtain a batch of decoded images, reading and caching any images which are not yet in
+        the cache from disk.
+
+        Parameters
+        ----------
+        filenames: list
+            List of full paths to the images to be obtained
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The batch of decoded images in the order of the given filenames
+        """
+        if self._images is None or self._index is None:
+            retval = read_image_batch(filenames)
+            self._stats["misses"] += len(filenames)
+            self.store(filenames, retval)
+            return retval
+
+        keys = [self._keys.get(os.path.basename(filename)) for filename in filenames]
+        with self._lock:
+            slots = [None if key is None or self._index[key] < 0 else int(self._index[key])
+                     for key in keys]
+            hits = [idx for idx, slot in enumerate(slots) if slot is not None]
+            if self._policy == "lru":
+                for idx in hits:
+                    self._touch(T.cast(int, slots[idx]))
+            retval = np.empty((len(filenames), *self._images.shape[1:]), dtype=self._images.dtype)
+            if hits:
+                retval[hits] = self._images[[slots[idx] for idx in hits]]
+        self._stats["hits"] += len(hits)
+
+        misses = [filename for filename, slot in zip(filenames, slots) if slot is None]
+        self._stats["misses"] += len(misses)
+        if misses:
+            loaded = read_image_batch(misses)
+            retval[[idx for idx, slot in enumerate(slots) if slot is None]] = loaded
+            self.store(misses, loaded)
+        logger.trace("Image cache hits: %s, misses: %s", len(hits), len(misses))  # type: ignore
+        return retval
+
+
+def _remove_file(filename: str) -> None:
+    """ Remove an image cache's backing file when the cache is no longer required
+
+    Parameters
+    ----------
+    filename: str
+        The full path to the backing file to remove
+    """
+    try:
+        os.remove(filename)
+    except OSError as err:  # The file may still be mapped on some platforms
+        logger.debug("Unable to remove image cache file '%s': %s", filename, str(err))
+
+
 class RingBuffer():
     """ Rolling buffer for holding training/preview batches
 
@@ -533,3 +889,104 @@ class RingBuffer():
         retval = self._buffer[self._index]
         self._index += 1 if self._index < self._max_index else -self._max_index
         return retval
+
+
+class SharedRingBuffer():
+    """ Rolling buffer for holding training batches in shared memory, so that batches compiled in
+    worker processes can be handed back to the training process without being pickled.
+
+    Each slot in the buffer holds one complete batch, made up of one array for each of the given
+    shapes. Slots are allocated as a single block of shared memory each, with the arrays laid out
+    consecutively within the block.
+
+    Unlike :class:`RingBuffer`, the order in which slots are used is dictated by the caller, as
+    batches from worker processes complete out of order.
+
+    Parameters
+    ----------
+    shapes: list
+        The shape of each array that makes up a single batch
+    buffer_size: int
+        The number of batches to hold in the buffer
+    dtype: str, optional
+        The datatype to create the buffer as. Default: `"float32"`
+    names: list, optional
+        The names of existing shared memory blocks to attach to, as obtained from :attr:`names` of
+        the buffer that created them. ``None`` to create new shared memory blocks.
+        Default: ``None``
+    """
+    def __init__(self,
+                 shapes: list[tuple[int, ...]],
+                 buffer_size: int,
+                 dtype: str = "float32",
+                 names: list[str] | None = None) -> None:
+        logger.debug("Initializing: %s (shapes: %s, buffer_size: %s, dtype: %s, names: %s)",
+                     self.__class__.__name__, shapes, buffer_size, dtype, names)
+        assert names is None or len(names) == buffer_size
+        self._is_owner = names is None
+        self._shapes = shapes
+        self._dtype = np.dtype(dtype)
+        self._sizes = [int(np.prod(shape)) * self._dtype.itemsize for shape in shapes]
+
+        if names is None:
+            self._memory = [shared_memory.SharedMemory(create=True, size=sum(self._sizes))
+                            for _ in range(buffer_size)]
+        else:
+            self._memory = [shared_memory.SharedMemory(name=name) for name in names]
+        self._buffer = [self._get_arrays(memory) for memory in self._memory]
+        logger.debug("Initialized: %s", self.__class__.__name__)  # type: ignore
+
+    @property
+    def names(self) -> list[str]:
+        """ list: The names of the shared memory blocks that make up this buffer """
+        return [memory.name for memory in self._memory]
+
+    def __len__(self) -> int:
+        """ int: The number of slots in the buffer """
+        return len(self._buffer)
+
+    def __getitem__(self, index: int) -> list[np.ndarray]:
+        """ Obtain the arrays for a slot in the buffer
+
+        Parameters
+        ----------
+        index: int
+            The slot to obtain the arrays for
+
+        Returns
+        -------
+        list
+            The :class:`numpy.ndarray` views into shared memory for the requested slot
+        """
+        return self._buffer[index]
+
+    def _get_arrays(self, memory: shared_memory.SharedMemory) -> list[np.ndarray]:
+        """ Obtain the arrays that make up a batch for a block of shared memory
+
+        Parameters
+        ----------
+        memory: :class:`multiprocessing.shared_memory.SharedMemory`
+            The shared memory block to obtain the arrays for
+
+        Returns
+        -------
+        list
+            The :class:`numpy.ndarray` views into the shared memory block
+        """
+        retval = []
+        offset = 0
+        for shape, size in zip(self._shapes, self._sizes):
+            retval.append(np.ndarray(shape, dtype=self._dtype, buffer=memory.buf, offset=offset))
+            offset += size
+        return retval
+
+    def close(self) -> None:
+        """ Release the shared memory. If this object created the shared memory blocks, then they
+        are also destroyed. """
+        logger.debug("Closing %s (is_owner: %s)", self.__class__.__name__, self._is_owner)
+        self._buffer = []
+        for memory in self._memory:
+            memory.close()
+            if self._is_owner:
+                memory.unlink()
+        self._memory = []
@@ -3,14 +3,20 @@
 from __future__ import annotations
 import logging
 import os
+import queue
+import random
+import time
+import traceback
 import typing as T
 
+from collections import deque
 from concurrent import futures
 from random import shuffle, choice
 
 import cv2
 import numpy as np
 import numexpr as ne
+import tensorflow as tf
 from lib.align import AlignedFace, DetectedFace
 from lib.align.aligned_face import CenteringType
 from lib.image import read_image_batch
@@ -18,18 +24,70 @@ from lib.multithreading import BackgroundGenerator
 from lib.utils import FaceswapError
 
 from . import ImageAugmentation
-from .cache import get_cache, RingBuffer
+from .cache import (get_cache, get_image_cache, get_worker_context, RingBuffer,
+                    SharedRingBuffer)
+from .nearest import NearestLandmarks
 
 if T.TYPE_CHECKING:
     from collections.abc import Generator
+    from multiprocessing.process import BaseProcess
+    from multiprocessing.queues import Queue
     from lib.config import ConfigValueType
     from plugins.train.model._base import ModelBase
-    from .cache import _Cache
+    from .cache import _Cache, _ImageCache
 
 logger = logging.getLogger(__name__)
 BatchType = tuple[np.ndarray, list[np.ndarray]]
 
 
+def _augmentation_worker(generator: DataGenerator,
+                         buffer_names: list[str],
+                         shapes: list[tuple[int, ...]],
+                         tasks: Queue,
+                         results: Queue) -> None:
+    """ Compile batches for a :class:`DataGenerator` within a worker process.
+
+    Lists of filenames are taken from the tasks queue, and the compiled feed and targets are
+    written directly into the requested slot of the shared memory ring buffer. The slot index is
+    placed into the results queue when the batch is complete.
+
+    Parameters
+    ----------
+    generator: :class:`DataGenerator`
+        The generator that batches are to be compiled for
+    buffer_names: list
+        The names of the shared memory blocks that make up the ring buffer
+    shapes: list
+        The shapes of the feed and each of the target arrays for a batch
+    tasks: :class:`multiprocessing.Queue`
+        Queue holding tuples of (`buffer slot`, `list of filenames`) for each batch to compile, or
+        ``None`` to indicate that the worker should exit
+    results: :class:`multiprocessing.Queue`
+        Queue to put tuples of (`buffer slot`, `error`) into. `error` is ``None`` on success,
+        otherwise it is the formatted traceback of the error that occurred in the worker
+    """
+    seed = int.from_bytes(os.urandom(4), "little")
+    random.seed(seed)
+    np.random.seed(seed)
+    buffer = SharedRingBuffer(shapes, len(buffer_names), names=buffer_names)
+    try:
+        generator.init_worker()
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, filenames = task
+            feed, targets = generator._process_batch(  # pylint:disable=protected-access
+                filenames)
+            for dst, src in zip(buffer[slot], [feed, *targets]):
+                dst[...] = src
+            results.put((slot, None))
+    except Exception:  # pylint:disable=broad-except
+        results.put((-1, traceback.format_exc()))
+    finally:
+        buffer.close()
+
+
 class DataGenerator():
     """ Parent class for Training and Preview Data Generators.
 
@@ -83,8 +141,25 @@ class DataGenerator():
                                              config=self._config,
                                              size=self._process_size,
                                              coverage_ratio=self._coverage_ratio)
+        self._image_cache: _ImageCache | None = get_image_cache(side,
+                                                                config=self._config,
+                                                                filenames=images)
+        self._workers = 0
         logger.debug("Initialized %s", self.__class__.__name__)
 
+    def __getstate__(self) -> dict[str, T.Any]:
+        """ Remove the face cache and buffer when pickling for a worker process. These are
+        recreated in the worker by :func:`init_worker`. The decoded image cache is shared with the
+        worker.
+
+        Returns
+        -------
+        dict
+            The picklable state of this object
+        """
+        return {key: val for key, val in self.__dict__.items()
+                if key not in ("_buffer", "_face_cache")}
+
     @property
     def _total_channels(self) -> int:
         """int: The total number of channels, including mask channels that the target image
@@ -149,11 +224,31 @@ class DataGenerator():
             The first 3 channels are (rgb/bgr). The 4th channel is the face mask. Any subsequent
             channels are area masks (e.g. eye/mouth masks)
         """
-        logger.debug("do_shuffle: %s", do_shuffle)
+        logger.debug("do_shuffle: %s, workers: %s", do_shuffle, self._workers)
+        if self._workers:
+            return self._minibatch_workers(do_shuffle)
         args = (do_shuffle, )
         batcher = BackgroundGenerator(self._minibatch, args=args)
         return batcher.iterator()
 
+    def init_worker(self) -> None:
+        """ Initialize this generator for running inside a worker process.
+
+        The face cache and batch buffer are recreated for the worker. The decoded image cache, if
+        enabled, is the side's cache from the training process, which is shared by all of the
+        workers.
+        """
+        logger.debug("Initializing worker for %s (side: %s, pid: %s)",
+                     self.__class__.__name__, self._side, os.getpid())
+        self._buffer = RingBuffer(self._batch_size,
+                                  (self._process_size, self._process_size, self._total_channels),
+                                  dtype="uint8")
+        self._face_cache = get_cache(self._side,
+                                     filenames=self._images,
+                                     config=self._config,
+                                     size=self._process_size,
+                                     coverage_ratio=self._coverage_ratio)
+
     # << INTERNAL METHODS >> #
     def _validate_samples(self) -> None:
         """ Ensures that the total number of images within :attr:`images` is greater or equal to
@@ -201,7 +296,24 @@ class DataGenerator():
         """
         logger.debug("Loading minibatch generator: (image_count: %s, do_shuffle: %s)",
                      len(self._images), do_shuffle)
+        img_iter = self._image_batches(do_shuffle)
+        while True:
+            retval = self._process_batch(next(img_iter))  # pylint:disable=stop-iteration-return
+            yield retval
+
+    def _image_batches(self, do_shuffle: bool) -> Generator[list[str], None, None]:
+        """ Infinite iterator for recursing through the image list and reshuffling at each epoch
+
+        Parameters
+        ----------
+        do_shuffle: bool, optional
+            Whether data should be shuffled at each epoch
 
+        Yields
+        ------
+        list
+            The full paths to the images for the next batch
+        """
         def _img_iter(imgs):
             """ Infinite iterator for recursing through image list and reshuffling at each epoch"""
             while True:
@@ -212,10 +324,108 @@ class DataGenerator():
 
         img_iter = _img_iter(self._images[:])
         while True:
-            img_paths = [next(img_iter)  # pylint:disable=stop-iteration-return
-                         for _ in range(self._batch_size)]
-            retval = self._process_batch(img_paths)
-            yield retval
+            yield [next(img_iter)  # pylint:disable=stop-iteration-return
+                   for _ in range(self._batch_size)]
+
+    def _minibatch_workers(self, do_shuffle: bool) -> Generator[BatchType, None, None]:
+        """ A generator function that yields the augmented and target images for the current batch
+        on the current side, with the compilation of batches sharded across worker processes.
+
+        Workers are started from a clean interpreter rather than forked from the training
+        process. Batches are returned from the workers through a :class:`SharedRingBuffer`. The
+        arrays that are yielded are views into shared memory, which remain valid until 2 further
+        batches have been requested from this generator.
+
+        Parameters
+        ----------
+        do_shuffle: bool, optional
+            Whether data should be shuffled prior to loading from disk. If true, each time the full
+            list of filenames are processed, the data will be reshuffled to make sure they are not
+            returned in the same order. Default: ``True``
+
+        Yields
+        ------
+        feed: list
+            4-dimensional array of faces to feed the training the model
+        targets: list
+            List of 4-dimensional :class:`numpy.ndarray` objects in the order and size of each
+            output of the model
+        """
+        hold = 2
+        shapes = [(self._batch_size, self._model_input_size, self._model_input_size, 3)] + [
+            (self._batch_size, size, size, self._total_channels) for size in self._output_sizes]
+        if self._image_cache is not None:
+            self._image_cache.prepare_for_workers(self._images[0])
+        buffer = SharedRingBuffer(shapes, self._workers * 2 + hold)
+        context = get_worker_context()
+        tasks: Queue = context.Queue()
+        results: Queue = context.Queue()
+        processes = [context.Process(target=_augmentation_worker,
+                                     name=f"augmentation_{self._side}_{idx}",
+                                     args=(self, buffer.names, shapes, tasks, results),
+                                     daemon=True)
+                     for idx in range(self._workers)]
+        logger.debug("Starting %s augmentation workers (side: %s, shapes: %s, buffer_size: %s, "
+                     "start method: '%s')", self._workers, self._side, shapes, len(buffer),
+                     context.get_start_method())
+        for process in processes:
+            process.start()
+
+        img_iter = self._image_batches(do_shuffle)
+        in_use: deque[int] = deque()
+        try:
+            for slot in range(len(buffer)):
+                tasks.put((slot, next(img_iter)))
+            while True:
+                slot, error = self._get_worker_result(results, processes)
+                if error is not None:
+                    logger.error("Error in augmentation worker (side: %s):\n%s",
+                                 self._side, error)
+                    raise RuntimeError("An augmentation worker process has failed. Check the log "
+                                       "for details.")
+                in_use.append(slot)
+                if len(in_use) > hold:
+                    tasks.put((in_use.popleft(), next(img_iter)))
+                feed, *targets = buffer[slot]
+                yield feed, targets
+        finally:
+            logger.debug("Shutting down augmentation workers (side: %s)", self._side)
+            for _ in processes:
+                tasks.put(None)
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            buffer.close()
+
+    @classmethod
+    def _get_worker_result(cls,
+                           results: Queue,
+                           processes: list[BaseProcess]) -> tuple[int, str | None]:
+        """ Obtain the next completed batch from the augmentation workers, monitoring that the
+        workers are still alive.
+
+        Parameters
+        ----------
+        results: :class:`multiprocessing.Queue`
+            The queue that completed batches are placed into by the workers
+        processes: list
+            The running worker processes
+
+        Returns
+        -------
+        slot: int
+            The slot in the ring buffer that holds the completed batch
+        error: str or ``None``
+            The traceback of any error that occurred within the worker, or ``None`` on success
+        """
+        while True:
+            try:
+                return results.get(timeout=1)
+            except queue.Empty:
+                dead = [proc.name for proc in processes if not proc.is_alive()]
+                if dead:
+                    return -1, f"Augmentation worker(s) exited unexpectedly: {dead}"
 
     def _get_images_with_meta(self, filenames: list[str]) -> tuple[np.ndarray, list[DetectedFace]]:
         """ Obtain the raw face images with associated :class:`DetectedFace` objects for this
@@ -224,6 +434,9 @@ class DataGenerator():
         If this is the first time a face has been loaded, then it's meta data is extracted
         from the png header and added to :attr:`_face_cache`.
 
+        If the decoded image cache is enabled, then images are served from, and added to,
+        :attr:`_image_cache` rather than being decoded from disk on every epoch.
+
         Parameters
         ----------
         filenames: list
@@ -239,6 +452,10 @@ class DataGenerator():
         """
         if not self._face_cache.cache_full:
             raw_faces = self._face_cache.cache_metadata(filenames)
+            if self._image_cache is not None:
+                self._image_cache.store(filenames, raw_faces)
+        elif self._image_cache is not None:
+            raw_faces = self._image_cache.read(filenames)
         else:
             raw_faces = read_image_batch(filenames)
 
@@ -431,8 +648,31 @@ class TrainingDataGenerator(DataGenerator):
                                              self._process_size,
                                              self._config)
         self._nearest_landmarks: dict[str, tuple[str, ...]] = {}
+        self._match_landmarks: dict[str, np.ndarray] = {}
+        self._other_landmarks: tuple[dict[str, np.ndarray], int] | None = None
+        self._workers = T.cast(int, self._config.get("augmentation_workers", 0))
         logger.debug("Initialized %s", self.__class__.__name__)
 
+    def _minibatch_workers(self, do_shuffle: bool) -> Generator[BatchType, None, None]:
+        """ Take a snapshot of the opposite side's landmarks for warp-to-landmarks prior to
+        launching the worker processes, as workers do not have access to the other side's cache.
+
+        Parameters
+        ----------
+        do_shuffle: bool, optional
+            Whether data should be shuffled prior to loading from disk.
+
+        Yields
+        ------
+        tuple
+            The feed and targets for each batch
+        """
+        if self._warp_to_landmarks:
+            other_cache = get_cache("a" if self._side == "b" else "b")
+            self._other_landmarks = (other_cache.aligned_landmarks, other_cache.size)
+            self._cache_closest_matches(self._get_other_landmarks())
+        yield from super()._minibatch_workers(do_shuffle)
+
     def _create_targets(self, batch: np.ndarray) -> list[np.ndarray]:
         """ Compile target images, with masks, for the model output sizes.
 
@@ -545,6 +785,29 @@ class TrainingDataGenerator(DataGenerator):
 
         return feed, targets
 
+    def _get_other_landmarks(self) -> dict[str, np.ndarray]:
+        """ Obtain the aligned landmarks from the opposite training set, scaled to the size of
+        this side's training images.
+
+        Returns
+        -------
+        dict
+            The filenames from the opposite side with their aligned landmarks
+        """
+        lm_side: T.Literal["a", "b"] = "a" if self._side == "b" else "b"
+        if self._other_landmarks is None:
+            other_cache = get_cache(lm_side)
+            landmarks, other_size = other_cache.aligned_landmarks, other_cache.size
+        else:
+            landmarks, other_size = self._other_landmarks
+
+        # Resize mismatched training image size landmarks
+        sizes = {self._side: self._face_cache.size, lm_side: other_size}
+        if len(set(sizes.values())) > 1:
+            scale = sizes[self._side] / sizes[lm_side]
+            landmarks = {key: lms * scale for key, lms in landmarks.items()}
+        return landmarks
+
     def _get_closest_match(self, filenames: list[str], batch_src_points: np.ndarray) -> np.ndarray:
         """ Only called if the :attr:`_warp_to_landmarks` is ``True``. Gets the closest
         matched 68 point landmarks from the opposite training set.
@@ -564,55 +827,35 @@ class TrainingDataGenerator(DataGenerator):
         logger.trace(  # type:ignore[attr-defined]
             "Retrieving closest matched landmarks: (filenames: '%s', src_points: '%s')",
             filenames, batch_src_points)
-        lm_side: T.Literal["a", "b"] = "a" if self._side == "b" else "b"
-        other_cache = get_cache(lm_side)
-        landmarks = other_cache.aligned_landmarks
-
-        try:
-            closest_matches = [self._nearest_landmarks[os.path.basename(filename)]
-                               for filename in filenames]
-        except KeyError:
-            # Resize mismatched training image size landmarks
-            sizes = {side: cache.size for side, cache in zip((self._side, lm_side),
-                                                             (self._face_cache, other_cache))}
-            if len(set(sizes.values())) > 1:
-                scale = sizes[self._side] / sizes[lm_side]
-                landmarks = {key: lms * scale for key, lms in landmarks.items()}
-            closest_matches = self._cache_closest_matches(filenames, batch_src_points, landmarks)
+        if not self._nearest_landmarks:
+            self._cache_closest_matches(self._get_other_landmarks())
+        landmarks = self._match_landmarks
+        closest_matches = [self._nearest_landmarks[os.path.basename(filename)]
+                           for filename in filenames]
 
         batch_dst_points = np.array([landmarks[choice(fname)] for fname in closest_matches])
         logger.trace("Returning: (batch_dst_points: %s)",  # type:ignore[attr-defined]
                      batch_dst_points.shape)
         return batch_dst_points
 
-    def _cache_closest_matches(self,
-                               filenames: list[str],
-                               batch_src_points: np.ndarray,
-                               landmarks: dict[str, np.ndarray]) -> list[tuple[str, ...]]:
-        """ Cache the nearest landmarks for this batch
+    def _cache_closest_matches(self, landmarks: dict[str, np.ndarray]) -> None:
+        """ Cache the nearest landmarks from the opposite side for every face in this side's
+        training set.
+
+        The matches are saved in the training folder, so are only searched for if the landmarks
+        on either side have changed since they were last saved.
 
         Parameters
         ----------
-        filenames: list
-            Filenames for current batch
-        batch_src_points: :class:`np.ndarray`
-            The source landmarks for the current batch
         landmarks: dict
             The destination landmarks with associated filenames
-
         """
-        logger.trace("Caching closest matches")  # type:ignore
-        dst_landmarks = list(landmarks.items())
-        dst_points = np.array([lm[1] for lm in dst_landmarks])
-        batch_closest_matches: list[tuple[str, ...]] = []
-
-        for filename, src_points in zip(filenames, batch_src_points):
-            closest = (np.mean(np.square(src_points - dst_points), axis=(1, 2))).argsort()[:10]
-            closest_matches = tuple(dst_landmarks[i][0] for i in closest)
-            self._nearest_landmarks[os.path.basename(filename)] = closest_matches
-            batch_closest_matches.append(closest_matches)
-        logger.trace("Cached closest matches")  # type:ignore
-        return batch_closest_matches
+        logger.debug("Caching closest matches")
+        self._match_landmarks = landmarks
+        folder = os.path.dirname(self._images[0])
+        self._nearest_landmarks = NearestLandmarks(folder).get(self._face_cache.aligned_landmarks,
+                                                               landmarks)
+        logger.debug("Cached closest matches")
 
 
 class PreviewDataGenerator(DataGenerator):
@@ -749,6 +992,12 @@ class Feeder():
         The configuration for this trainer
     include_preview: bool, optional
         ``True`` to create a feeder for generating previews. Default: ``True``
+
+    Notes
+    -----
+    If the `prefetch_batches` configuration option is greater than 0 then the model inputs and
+    targets for the next training iterations are assembled in a background thread whilst the
+    current iteration is running, so that :func:`get_batch` does not need to wait for them.
     """
     def __init__(self,
                  images: dict[T.Literal["a", "b"], list[str]],
@@ -769,8 +1018,22 @@ class Feeder():
 
         self._display_feeds = {"preview": self._set_preview_feed() if include_preview else {},
                                "timelapse": {}}
+
+        self._prefetch_depth = T.cast(int, config.get("prefetch_batches", 0))
+        self._prefetch_to_device = bool(config.get("prefetch_to_device", False))
+        self._prefetcher: Generator[tuple[tuple[list[list[T.Any]], ...], float],
+                                    None, None] | None = None
+        self._timings: dict[T.Literal["feed", "wait"], float] = {"feed": 0.0, "wait": 0.0}
         logger.debug("Initialized %s:", self.__class__.__name__)
 
+    @property
+    def timings(self) -> dict[T.Literal["feed", "wait"], float]:
+        """ dict: The time, in seconds, taken to assemble the most recent batch (`feed`) and the
+        time that the training thread was blocked waiting for it in :func:`get_batch` (`wait`).
+        When batches are prefetched, a `wait` time close to 0 means that batch assembly is
+        keeping up with training. """
+        return self._timings
+
     def _load_generator(self,
                         side: T.Literal["a", "b"],
                         is_display: bool,
@@ -831,9 +1094,8 @@ class Feeder():
                                                 batch_size=batchsize).minibatch_ab()
         return retval
 
-    def get_batch(self) -> tuple[list[list[np.ndarray]], ...]:
-        """ Get the feed data and the targets for each training side for feeding into the model's
-        train function.
+    def _assemble_batch(self) -> tuple[list[list[np.ndarray]], ...]:
+        """ Assemble the feed data and the targets for each training side.
 
         Returns
         -------
@@ -856,6 +1118,89 @@ class Feeder():
 
         return model_inputs, model_targets
 
+    def _stage_batch(self,
+                     model_inputs: list[list[np.ndarray]],
+                     model_targets: list[list[np.ndarray]]) -> tuple[list[list[T.Any]], ...]:
+        """ Stage a prefetched batch so that it remains valid whilst it waits to be trained on.
+
+        Batches from augmentation workers are views into shared memory which is reused, so they
+        are copied. If `prefetch_to_device` is enabled then the batch is copied into tensors on
+        the training device.
+
+        Parameters
+        ----------
+        model_inputs: list
+            The inputs to the model for each side A and B
+        model_targets: list
+            The targets for the model for each side A and B
+
+        Returns
+        -------
+        model_inputs: list
+            The staged inputs to the model for each side A and B
+        model_targets: list
+            The staged targets for the model for each side A and B
+        """
+        retval: tuple[list[list[T.Any]], ...] = (model_inputs, model_targets)
+        if self._config.get("augmentation_workers", 0):
+            # Tensors on the CPU can share memory with the array, so copy prior to staging
+            retval = tuple([[arr.copy() for arr in side] for side in batch] for batch in retval)
+        if self._prefetch_to_device:
+            device = "/GPU:0" if tf.config.list_logical_devices("GPU") else "/CPU:0"
+            with tf.device(device):
+                retval = tuple([[tf.identity(arr) for arr in side] for side in batch]
+                               for batch in retval)
+        return retval
+
+    def _prefetch_batches(self) -> Generator[tuple[tuple[list[list[T.Any]], ...], float],
+                                             None, None]:
+        """ Infinite generator that assembles and stages batches for the prefetch thread
+
+        Yields
+        ------
+        batch: tuple
+            The staged model inputs and model targets
+        float
+            The time, in seconds, taken to assemble and stage the batch
+        """
+        while True:
+            start = time.perf_counter()
+            batch = self._stage_batch(*self._assemble_batch())
+            yield batch, time.perf_counter() - start
+
+    def get_batch(self) -> tuple[list[list[T.Any]], ...]:
+        """ Get the feed data and the targets for each training side for feeding into the model's
+        train function.
+
+        If prefetching is enabled, the batch is taken from the batches that have been assembled
+        in the background, otherwise it is assembled now. The time taken is recorded in
+        :attr:`timings`.
+
+        Returns
+        -------
+        model_inputs: list
+            The inputs to the model for each side A and B
+        model_targets: list
+            The targets for the model for each side A and B
+        """
+        start = time.perf_counter()
+        if not self._prefetch_depth:
+            retval = self._assemble_batch()
+            elapsed = time.perf_counter() - start
+            self._timings = {"feed": elapsed, "wait": elapsed}
+            return retval
+
+        if self._prefetcher is None:
+            logger.debug("Starting batch prefetch (depth: %s, to_device: %s)",
+                         self._prefetch_depth, self._prefetch_to_device)
+            self._prefetcher = BackgroundGenerator(self._prefetch_batches,
+                                                   prefetch=self._prefetch_depth,
+                                                   name="prefetch_batches").iterator()
+        retval, feed_time = next(self._prefetcher)
+        self._timings = {"feed": feed_time, "wait": time.perf_counter() - start}
+        logger.trace("Batch timings: %s", self._timings)  # type:ignore[attr-defined]
+        return retval
+
     def generate_preview(self, is_timelapse: bool = False
                          ) -> dict[T.Literal["a", "b"], list[np.ndarray]]:
         """ Generate the images for preview window or timelapse
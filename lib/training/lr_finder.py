@@ -130,11 +130,14 @@ class LearningRateFinder:
                     desc="Current: N/A      Best: N/A    ",
                     leave=False)
         for idx in pbar:
-            model_inputs, model_targets = self._feeder.get_batch()
-            loss: list[float] = self._model.model.train_on_batch(model_inputs, y=model_targets)
-            if np.isnan(loss[0]):
+            losses: list[float] = []
+            for _ in range(self._model.accumulation_steps):  # 1 update per accumulated batch
+                model_inputs, model_targets = self._feeder.get_batch()
+                losses.append(self._model.model.train_on_batch(model_inputs, y=model_targets)[0])
+            loss = float(np.mean(losses))
+            if np.isnan(loss):
                 break
-            self._on_batch_end(idx, loss[0])
+            self._on_batch_end(idx, loss)
             self._update_description(pbar)
 
     def _reset_model(self, original_lr: float, new_lr: float) -> None:
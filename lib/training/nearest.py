@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+""" Nearest neighbour search of aligned landmarks, for Faceswap's warp-to-landmarks training
+augmentation """
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import sys
+
+import numpy as np
+from tqdm import tqdm
+
+from lib.serializer import get_serializer
+from lib.utils import FaceswapError
+
+logger = logging.getLogger(__name__)
+
+
+class NearestLandmarks():
+    """ Finds the closest matching landmarks from the opposite side of the model for every face in
+    a training folder.
+
+    Distances are the mean squared distance between the landmark points. The search is performed
+    in tiles with matrix multiplication, so that memory use is bounded regardless of the size of
+    the training sets. The closest candidates from each tile are then re-ranked on their exact
+    distance, so the results match a brute force search.
+
+    The results are saved in the training folder, keyed by a hash of the landmarks from both sides,
+    so that they can be reused when training is restarted.
+
+    Parameters
+    ----------
+    folder: str
+        The training folder that holds the faces that matches are being found for
+    count: int, optional
+        The number of closest matches to find for each face. Default: `10`
+    memory_limit: int, optional
+        The approximate maximum number of bytes to use for each tile of distance calculations.
+        Default: 256MB
+    """
+    filename = ".faceswap_nearest_landmarks"
+    """ str: The name of the file, within the training folder, that holds the saved matches """
+
+    def __init__(self,
+                 folder: str,
+                 count: int = 10,
+                 memory_limit: int = 256 * 1024 * 1024) -> None:
+        logger.debug("Initializing %s: (folder: '%s', count: %s, memory_limit: %s)",
+                     self.__class__.__name__, folder, count, memory_limit)
+        self._filename = os.path.join(folder, self.filename)
+        self._count = count
+        self._memory_limit = memory_limit
+        self._serializer = get_serializer("compressed")
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    def _get_key(self,
+                 source: dict[str, np.ndarray],
+                 destination: dict[str, np.ndarray]) -> str:
+        """ Obtain a hash of the landmarks for both sides and the number of matches requested
+
+        Parameters
+        ----------
+        source: dict
+            The filenames and aligned landmarks of the faces to find matches for
+        destination: dict
+            The filenames and aligned landmarks of the faces to search
+
+        Returns
+        -------
+        str
+            The hex digest of the hash
+        """
+        digest = hashlib.sha1(str(self._count).encode("utf-8"))
+        for landmarks in (source, destination):
+            for key in sorted(landmarks):
+                digest.update(key.encode("utf-8"))
+                digest.update(np.ascontiguousarray(landmarks[key]).tobytes())
+            digest.update(b"|")
+        return digest.hexdigest()
+
+    def _load(self, key: str) -> dict[str, tuple[str, ...]] | None:
+        """ Load previously saved matches, if they exist for the given key
+
+        Parameters
+        ----------
+        key: str
+            The hash of the landmarks that the matches must have been generated for
+
+        Returns
+        -------
+        dict or ``None``
+            The saved matches or ``None`` if no valid matches were saved for the given key
+        """
+        if not os.path.isfile(self._filename):
+            return None
+        try:
+            data = self._serializer.load(self._filename)
+        except FaceswapError as err:
+            logger.debug("Unable to load nearest landmarks: %s", str(err))
+            return None
+        if not isinstance(data, dict) or data.get("key") != key:
+            logger.debug("Saved nearest landmarks are out of date")
+            return None
+        logger.info("Loaded closest landmark matches from '%s'", self._filename)
+        return data["matches"]
+
+    def _save(self, key: str, matches: dict[str, tuple[str, ...]]) -> None:
+        """ Save the matches to the training folder
+
+        Parameters
+        ----------
+        key: str
+            The hash of the landmarks that the matches were generated for
+        matches: dict
+            The filenames with the closest matching filenames from the other side
+        """
+        try:
+            self._serializer.save(f"{self._filename}.tmp", {"key": key, "matches": matches})
+            os.replace(f"{self._filename}.tmp", self._filename)
+        except (FaceswapError, OSError) as err:
+            logger.warning("Unable to save closest landmark matches to '%s': %s",
+                           self._filename, str(err))
+            return
+        logger.debug("Saved nearest landmarks to '%s'", self._filename)
+
+    def search(self, source: np.ndarray, destination: np.ndarray) -> np.ndarray:
+        """ Find the indices of the closest destination landmarks for each source landmark
+
+        Parameters
+        ----------
+        source: :class:`numpy.ndarray`
+            The (`N`, `points`, 2) landmarks to find matches for
+        destination: :class:`numpy.ndarray`
+            The (`M`, `points`, 2) landmarks to search
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The (`N`, `count`) indices into `destination` of the closest matches for each source
+            item, closest first
+        """
+        count = min(self._count, destination.shape[0])
+        candidates = min(2 * count, destination.shape[0])
+        src = source.reshape(source.shape[0], -1).astype("float64")
+        dst = destination.reshape(destination.shape[0], -1).astype("float64")
+        dst_sq = np.sum(np.square(dst), axis=1)
+        rows = max(1, self._memory_limit // (8 * dst.shape[0]))
+
+        retval = np.empty((src.shape[0], count), dtype="int64")
+        for start in tqdm(range(0, src.shape[0], rows),
+                          desc="Matching landmarks",
+                          file=sys.stdout,
+                          leave=False):
+            tile = src[start:start + rows]
+            distances = np.sum(np.square(tile), axis=1)[:, None] + dst_sq - 2.0 * tile @ dst.T
+            nearest = np.argpartition(distances, candidates - 1, axis=1)[:, :candidates]
+            nearest.sort(axis=1)
+            # Re-rank the candidates on the same distance calculation as a brute force search
+            exact = np.mean(np.square(source[start:start + rows, None] - destination[nearest]),
+                            axis=(2, 3))
+            order = np.lexsort((nearest, exact), axis=-1)[:, :count]
+            retval[start:start + rows] = np.take_along_axis(nearest, order, axis=1)
+        return retval
+
+    def get(self,
+            source: dict[str, np.ndarray],
+            destination: dict[str, np.ndarray]) -> dict[str, tuple[str, ...]]:
+        """ Obtain the closest matching destination filenames for every source face, loading
+        saved matches if they exist, otherwise searching for and saving the matches.
+
+        Parameters
+        ----------
+        source: dict
+            The filenames and aligned landmarks of the faces to find matches for
+        destination: dict
+            The filenames and aligned landmarks of the faces to search
+
+        Returns
+        -------
+        dict
+            The source filenames with the closest matching destination filenames, closest first
+        """
+        key = self._get_key(source, destination)
+        retval = self._load(key)
+        if retval is not None:
+            return retval
+
+        logger.info("Finding closest landmark matches for %s faces from %s faces...",
+                    len(source), len(destination))
+        src_names = list(source)
+        dst_names = list(destination)
+        indices = self.search(np.array([source[name] for name in src_names]),
+                              np.array([destination[name] for name in dst_names]))
+        retval = {name: tuple(dst_names[idx] for idx in matches)
+                  for name, matches in zip(src_names, indices)}
+        self._save(key, retval)
+        return retval
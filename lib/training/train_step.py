@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+""" Compiled training step for Faceswap models.
+
+Keras' :func:`train_on_batch` returns the loss for every iteration as Python floats, which forces
+the host to wait for the device to finish each step before the next batch can be queued. The
+:class:`CompiledTrainStep` runs the model's own training step inside a single
+:func:`tf.function`, optionally compiled with XLA, and returns the losses as a tensor that stays on
+the device until it is explicitly fetched.
+"""
+from __future__ import annotations
+import logging
+import typing as T
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.python.framework import (  # pylint:disable=no-name-in-module
+    errors_impl as tf_errors)
+
+if T.TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledTrainStep():
+    """ Runs a compiled Keras model's training step inside a :func:`tf.function`.
+
+    The step is equivalent to calling :func:`tf.keras.Model.train_on_batch` on the model: the
+    model's own :func:`train_step` is used, so the compiled loss functions, regularization losses,
+    loss scaling for mixed precision and any optimizer gradient clipping are all applied in the
+    same way. The loss metrics are reset at the start of each step, so the returned losses are for
+    the current batch only, and the model's train counter is incremented for TensorBoard logging.
+
+    Parameters
+    ----------
+    model: :class:`tf.keras.Model`
+        The compiled model to train
+    jit_compile: bool, optional
+        ``True`` to compile the training step with XLA. If the model cannot be compiled with XLA
+        then the step falls back to a standard :func:`tf.function`. Default: ``False``
+    """
+    def __init__(self, model: tf.keras.Model, jit_compile: bool = False) -> None:
+        logger.debug("Initializing %s: (model: %s, jit_compile: %s)",
+                     self.__class__.__name__, model.name, jit_compile)
+        self._model = model
+        self._jit_compile = jit_compile
+        self._names = self._build_metrics()
+        self._function = self._get_function()
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    @property
+    def names(self) -> list[str]:
+        """ list: The names of the values returned from each step, in the same order as the
+        values returned from :func:`tf.keras.Model.train_on_batch` """
+        return self._names
+
+    @classmethod
+    def is_supported(cls, model: tf.keras.Model) -> bool:
+        """ Check whether the compiled training step can be used for the given model.
+
+        The model must be compiled and must not be running under a distribution strategy.
+
+        Parameters
+        ----------
+        model: :class:`tf.keras.Model`
+            The model to check
+
+        Returns
+        -------
+        bool
+            ``True`` if the model can be trained with a compiled training step
+        """
+        retval = (model.optimizer is not None and
+                  model.compiled_loss is not None and
+                  model.distribute_strategy is tf.distribute.get_strategy())
+        logger.debug("model: %s, supported: %s", model.name, retval)
+        return retval
+
+    def _build_metrics(self) -> list[str]:
+        """ Create the model's loss metrics prior to the training step being traced, so that
+        resetting them can be included in the compiled step.
+
+        Returns
+        -------
+        list
+            The names of the loss values that each step returns
+        """
+        self._model.compiled_loss.build(self._model.outputs)
+        retval = [metric.name for metric in self._model.metrics]
+        logger.debug("Loss names: %s", retval)
+        return retval
+
+    def _get_function(self) -> Callable[[list[np.ndarray], list[np.ndarray]], tf.Tensor]:
+        """ Obtain the :func:`tf.function` that runs the training step
+
+        Returns
+        -------
+        :func:`tf.function`
+            The compiled training step
+        """
+        logger.debug("Compiling training step (jit_compile: %s)", self._jit_compile)
+        return tf.function(self._step, jit_compile=self._jit_compile, reduce_retracing=True)
+
+    def _step(self, inputs: list[tf.Tensor], targets: list[tf.Tensor]) -> tf.Tensor:
+        """ Run a single training step
+
+        Parameters
+        ----------
+        inputs: list
+            The inputs to the model
+        targets: list
+            The targets for each output of the model
+
+        Returns
+        -------
+        :class:`tf.Tensor`
+            The total loss followed by the loss for each output of the model
+        """
+        for metric in self._model.metrics:
+            metric.reset_state()
+        logs = self._model.train_step((inputs, targets))
+        self._model._train_counter.assign_add(1)  # pylint:disable=protected-access
+        return tf.stack([tf.cast(logs[name], tf.float32) for name in self._names])
+
+    def __call__(self, inputs: list[np.ndarray], targets: list[np.ndarray]) -> tf.Tensor:
+        """ Run a training step on a batch.
+
+        The step is queued on the device and returns without waiting for it to complete. The loss
+        values are only copied back to the host when the returned tensor is read.
+
+        Parameters
+        ----------
+        inputs: list
+            The batch of inputs to the model
+        targets: list
+            The batch of targets for each output of the model
+
+        Returns
+        -------
+        :class:`tf.Tensor`
+            The total loss followed by the loss for each output of the model, in the same order
+            as :attr:`names`
+        """
+        try:
+            return self._function(inputs, targets)
+        except (tf_errors.InvalidArgumentError, tf_errors.UnimplementedError) as err:
+            if not self._jit_compile:
+                raise
+            logger.warning("The model could not be compiled with XLA. Falling back to the "
+                           "standard compiled training step. (%s)", str(err).splitlines()[0])
+            self._jit_compile = False
+            self._function = self._get_function()
+            return self._function(inputs, targets)
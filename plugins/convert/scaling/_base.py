@@ -37,12 +37,18 @@ class Adjustment():
         logger.debug("Config: %s", retval)
         return retval
 
-    def process(self, new_face):
+    def process(self, new_face, frame_width=None):
         """ Override for specific scaling adjustment process """
         raise NotImplementedError
 
-    def run(self, new_face):
-        """ Perform selected adjustment on face """
+    def padding(self, frame_width):  # pylint:disable=unused-argument
+        """ Override to return the number of pixels around a face that the adjustment reads from
+        when the adjustment is run on a region of a frame of the given width """
+        return 0
+
+    def run(self, new_face, frame_width=None):
+        """ Perform selected adjustment on face. If the face is a region of a larger frame, then
+        the full frame's width should be passed as `frame_width` """
         logger.trace("Performing scaling adjustment")
         # Remove Mask for processing
         reinsert_mask = False
@@ -50,7 +56,7 @@ class Adjustment():
             reinsert_mask = True
             final_mask = new_face[:, :, -1]
             new_face = new_face[:, :, :3]
-        new_face = self.process(new_face)
+        new_face = self.process(new_face, frame_width=frame_width)
         new_face = np.clip(new_face, 0.0, 1.0)
         if reinsert_mask and new_face.shape[2] != 4:
             # Reinsert Mask
@@ -9,18 +9,23 @@ from ._base import Adjustment, logger
 class Scaling(Adjustment):
     """ Sharpening Adjustments for the face applied after warp to final frame """
 
-    def process(self, new_face):
+    def process(self, new_face, frame_width=None):
         """ Sharpen using the requested technique """
         amount = self.config["amount"] / 100.0
-        kernel_center = self.get_kernel_size(new_face, self.config["radius"])
+        frame_width = new_face.shape[1] if frame_width is None else frame_width
+        kernel_center = self.get_kernel_size(frame_width, self.config["radius"])
         new_face = getattr(self, self.config["method"])(new_face, kernel_center, amount)
         return new_face
 
+    def padding(self, frame_width):
+        """ Return the radius of the sharpening kernel for the given frame width """
+        return self.get_kernel_size(frame_width, self.config["radius"])[1]
+
     @staticmethod
-    def get_kernel_size(new_face, radius_percent):
+    def get_kernel_size(frame_width, radius_percent):
         """ Return the kernel size and central point for the given radius
             relative to frame width """
-        radius = max(1, round(new_face.shape[1] * radius_percent / 100))
+        radius = max(1, round(frame_width * radius_percent / 100))
         kernel_size = int((radius * 2) + 1)
         kernel_size = (kernel_size, kernel_size)
         logger.trace(kernel_size)
@@ -5,9 +5,14 @@ import logging
 import os
 import re
 import typing as T
+import zlib
+
+from tempfile import TemporaryDirectory
+from threading import Condition
 
 import numpy as np
 
+from lib.utils import FaceswapError
 from plugins.convert._config import Config
 
 logger = logging.getLogger(__name__)
@@ -32,6 +37,23 @@ def get_config(plugin_name: str, configfile: str | None = None) -> dict:
     return Config(plugin_name, configfile=configfile).config_dict
 
 
+class _SpilledFrame(T.NamedTuple):
+    """ A frame held in the re-order cache that has been compressed to temporary storage on disk
+
+    Parameters
+    ----------
+    filename: str
+        The full path to the compressed frame
+    shape: tuple
+        The shape of the frame
+    dtype: str
+        The datatype of the frame
+    """
+    filename: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
 class Output():
     """ Parent class for writer plugins.
 
@@ -57,8 +79,37 @@ class Output():
         # Methods for making sure frames are written out in frame order
         self.re_search = re.compile(r"(\d+)(?=\.\w+$)")  # Identify frame numbers
         self.cache: dict = {}  # Cache for when frames must be written in correct order
+        self._cache_condition = Condition()
+        self._spill_folder: TemporaryDirectory | None = None
+        self._reorder_stats = {"max_depth": 0, "spilled": 0}
+        self._window_released = False
         logger.debug("Initialized %s", self.__class__.__name__)
 
+    def __getstate__(self) -> dict[str, T.Any]:
+        """ Writers are pickled when their :func:`pre_encode` method is handed to patch worker
+        processes. The re-order cache and its lock belong to the writing process, so are not
+        pickled.
+
+        Returns
+        -------
+        dict
+            The writer's state without the re-order cache
+        """
+        state = self.__dict__.copy()
+        state.update(cache={}, _cache_condition=None, _spill_folder=None)
+        return state
+
+    def __setstate__(self, state: dict[str, T.Any]) -> None:
+        """ Restore a pickled writer with an empty re-order cache
+
+        Parameters
+        ----------
+        state: dict
+            The pickled state of the writer
+        """
+        self.__dict__.update(state)
+        self._cache_condition = Condition()
+
     @property
     def is_stream(self) -> bool:
         """ bool: Whether the writer outputs a stream or a series images.
@@ -68,6 +119,12 @@ class Output():
         retval = hasattr(self, "_frame_order")
         return retval
 
+    @property
+    def reorder_depth(self) -> int:
+        """ int: The number of out of order frames currently held in the re-order cache waiting
+        for earlier frames to arrive """
+        return len(self.cache)
+
     @classmethod
     def _set_frame_order(cls,
                          total_count: int,
@@ -133,11 +190,114 @@ class Output():
         logger.trace("in filename: '%s', out filename: '%s'", filename, retval)  # type:ignore
         return retval
 
+    def _get_frame_number(self, filename: str) -> int:
+        """ Obtain the frame number from a frame's filename
+
+        Parameters
+        ----------
+        filename: str
+            The filename of the frame, where the frame index can be extracted from
+
+        Returns
+        -------
+        int
+            The frame number for the given filename
+        """
+        re_frame = re.search(self.re_search, filename)
+        assert re_frame is not None
+        return int(re_frame.group())
+
+    def is_within_window(self, filename: str) -> bool:
+        """ Check whether the given frame falls within the writer's re-order window.
+
+        Parameters
+        ----------
+        filename: str
+            The filename of the frame that is about to be queued for conversion
+
+        Returns
+        -------
+        bool
+            ``True`` if the frame can be queued for conversion without waiting. ``False`` if
+            :func:`wait_for_window` would block for the frame
+        """
+        window = self.config.get("reorder_window", 0)
+        if not self.is_stream or not window or self._window_released:
+            return True
+        frame_order: list[int] = getattr(self, "_frame_order")
+        with self._cache_condition:
+            return not frame_order or self._get_frame_number(filename) - frame_order[0] < window
+
+    def wait_for_window(self, filename: str) -> None:
+        """ Block until the given frame falls within the writer's re-order window.
+
+        Called prior to queuing a frame for conversion, so that frames cannot get further than
+        the configured `reorder_window` ahead of the next frame to be written. This stops
+        converted frames from stacking up in the re-order cache behind a slow frame. Returns
+        immediately for writers that do not write frames in order or if the re-order window is
+        disabled.
+
+        Parameters
+        ----------
+        filename: str
+            The filename of the frame that is about to be queued for conversion
+
+        Raises
+        ------
+        FaceswapError
+            If the next frame to be written has not been received for 2 minutes, as no further
+            frames can be written
+        """
+        window = self.config.get("reorder_window", 0)
+        if not self.is_stream or not window:
+            return
+        frame_no = self._get_frame_number(filename)
+        frame_order: list[int] = getattr(self, "_frame_order")
+        with self._cache_condition:
+            stalled = 0
+            while (frame_order and frame_no - frame_order[0] >= window
+                   and not self._window_released):
+                logger.trace("Waiting for re-order window. "  # type:ignore[attr-defined]
+                             "Frame no: %s, next frame: %s, depth: %s",
+                             frame_no, frame_order[0], self.reorder_depth)
+                next_frame = frame_order[0]
+                self._cache_condition.wait(timeout=1)
+                stalled = stalled + 1 if frame_order and frame_order[0] == next_frame else 0
+                if stalled >= 120:
+                    raise FaceswapError(
+                        f"Frame {next_frame} has not been received for writing for 2 minutes, so "
+                        "no further frames can be written. Check that the frame can be read. "
+                        "You can set 'reorder_window' to 0 in the writer settings to disable the "
+                        "re-order window.")
+
+    def _spill_frame(self, frame_no: int, image: np.ndarray) -> None:
+        """ Compress a frame to temporary storage and hold its location in the re-order cache
+
+        Parameters
+        ----------
+        frame_no: int
+            The frame number of the frame to spill
+        image: :class:`numpy.ndarray`
+            The frame to spill to disk
+        """
+        if self._spill_folder is None:
+            self._spill_folder = TemporaryDirectory(  # pylint:disable=consider-using-with
+                prefix="faceswap_reorder_")
+            logger.debug("Created re-order spill folder: '%s'", self._spill_folder.name)
+        filename = os.path.join(self._spill_folder.name, f"{frame_no}.bin")
+        with open(filename, "wb") as out_file:
+            out_file.write(zlib.compress(np.ascontiguousarray(image).data, 1))
+        self.cache[frame_no] = _SpilledFrame(filename, image.shape, image.dtype.str)
+        self._reorder_stats["spilled"] += 1
+        logger.trace("Spilled frame to disk: %s", frame_no)  # type:ignore[attr-defined]
+
     def cache_frame(self, filename: str, image: np.ndarray) -> None:
         """ Add the incoming converted frame to the cache ready for writing out.
 
         Used for ffmpeg and gif writers to ensure that the frames are written out in the correct
-        order.
+        order. If `reorder_ram_frames` is configured, then once the number of frames held in RAM
+        reaches this value, the frame furthest from being written is compressed to temporary
+        storage on disk.
 
         Parameters
         ----------
@@ -146,13 +306,65 @@ class Output():
         image: class:`numpy.ndarray`
             The converted frame corresponding to the given filename
         """
-        re_frame = re.search(self.re_search, filename)
-        assert re_frame is not None
-        frame_no = int(re_frame.group())
-        self.cache[frame_no] = image
+        frame_no = self._get_frame_number(filename)
+        ram_frames = self.config.get("reorder_ram_frames", 0)
+        with self._cache_condition:
+            in_ram = [key for key, val in self.cache.items()
+                      if not isinstance(val, _SpilledFrame)]
+            if ram_frames and len(in_ram) >= ram_frames and max(in_ram) > frame_no:
+                furthest = max(in_ram)
+                self._spill_frame(furthest, self.cache[furthest])
+                self.cache[frame_no] = image
+            elif ram_frames and len(in_ram) >= ram_frames:
+                self._spill_frame(frame_no, image)
+            else:
+                self.cache[frame_no] = image
+            self._reorder_stats["max_depth"] = max(self._reorder_stats["max_depth"],
+                                                   self.reorder_depth)
         logger.trace("Added to cache. Frame no: %s", frame_no)  # type: ignore
         logger.trace("Current cache: %s", sorted(self.cache.keys()))  # type:ignore
 
+    def pop_frame(self, frame_no: int) -> np.ndarray:
+        """ Remove a frame from the re-order cache for writing, loading it from temporary storage
+        if it was spilled to disk.
+
+        Parameters
+        ----------
+        frame_no: int
+            The frame number to remove from the cache
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The requested frame
+        """
+        with self._cache_condition:
+            retval = self.cache.pop(frame_no)
+            self._cache_condition.notify_all()
+        if isinstance(retval, _SpilledFrame):
+            with open(retval.filename, "rb") as in_file:
+                data = zlib.decompress(in_file.read())
+            os.remove(retval.filename)
+            retval = np.frombuffer(data, dtype=retval.dtype).reshape(retval.shape)
+        return retval
+
+    def close_cache(self) -> None:
+        """ Release any threads waiting on the re-order window, remove any temporary storage and
+        log the re-order cache statistics. """
+        with self._cache_condition:
+            self._window_released = True
+            self._cache_condition.notify_all()
+        logger.debug("Released re-order window")
+        if self._spill_folder is not None:
+            self._spill_folder.cleanup()
+            self._spill_folder = None
+        if self.is_stream:
+            logger.verbose("Frame re-order cache: (max_depth: %s, "  # type:ignore[attr-defined]
+                           "spilled_to_disk: %s, unwritten: %s)",
+                           self._reorder_stats["max_depth"],
+                           self._reorder_stats["spilled"],
+                           self.reorder_depth)
+
     def write(self, filename: str, image: T.Any) -> None:
         """ Override for specific frame writing method.
 
@@ -251,7 +251,7 @@ class Writer(Output):
                 logger.trace("Next frame not ready. Continuing")  # type:ignore[attr-defined]
                 break
             save_no = self._frame_order.pop(0)
-            save_image = self.cache.pop(save_no)
+            save_image = self.pop_frame(save_no)
             logger.trace("Rendering from cache. Frame no: %s",  # type:ignore[attr-defined]
                          save_no)
             self._writer.send(np.ascontiguousarray(save_image[:, :, ::-1]))
@@ -259,5 +259,6 @@ class Writer(Output):
 
     def close(self) -> None:
         """ Close the ffmpeg writer and mux the audio """
+        self.close_cache()
         if self._writer is not None:
             self._writer.close()
@@ -145,4 +145,33 @@ _DEFAULTS = dict(
         datatype=bool,
         group="settings",
     ),
+    reorder_window=dict(
+        default=0,
+        info="Frames are converted in parallel, so they can complete out of order, but must be "
+             "written out in order. This is the maximum number of frames that conversion can get "
+             "ahead of the next frame to be written. Frames further ahead than this are held "
+             "back until earlier frames have been written, which stops completed frames from "
+             "piling up in RAM behind a slow frame. Higher values keep conversion busier at the "
+             "cost of more RAM. Set to 0 to disable the re-order window.",
+        datatype=int,
+        rounding=1,
+        min_max=(0, 512),
+        choices=[],
+        group="frame order",
+        gui_radio=False,
+    ),
+    reorder_ram_frames=dict(
+        default=0,
+        info="The maximum number of out of order frames to hold in RAM whilst they wait for "
+             "earlier frames to be written. Once this number is reached, the frames furthest "
+             "from being written are compressed to temporary storage on disk instead. Useful for "
+             "high resolution output with a large re-order window. Set to 0 to hold all out of "
+             "order frames in RAM.",
+        datatype=int,
+        rounding=1,
+        min_max=(0, 512),
+        choices=[],
+        group="frame order",
+        gui_radio=False,
+    ),
 )
@@ -46,7 +46,8 @@ class Writer(Output):
     @property
     def _gif_params(self) -> dict:
         """ dict: The selected gif plugin configuration options. """
-        kwargs = {key: int(val) for key, val in self.config.items()}
+        kwargs = {key: int(val) for key, val in self.config.items()
+                  if not key.startswith("reorder_")}
         logger.debug(kwargs)
         return kwargs
 
@@ -137,12 +138,13 @@ class Writer(Output):
                 logger.trace("Next frame not ready. Continuing")  # type: ignore
                 break
             save_no = self._frame_order.pop(0)
-            save_image = self.cache.pop(save_no)
+            save_image = self.pop_frame(save_no)
             logger.trace("Rendering from cache. Frame no: %s", save_no)  # type: ignore
             self._writer.append_data(save_image[:, :, ::-1])
         logger.trace("Current cache size: %s", len(self.cache))  # type: ignore
 
     def close(self) -> None:
         """ Close the GIF writer on completion. """
+        self.close_cache()
         if self._writer is not None:
             self._writer.close()
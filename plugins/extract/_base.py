@@ -23,6 +23,7 @@ if T.TYPE_CHECKING:
     import cv2
     from lib.align import DetectedFace
     from lib.model.session import KSession
+    from .batch_tuner import BatchTuner
     from .align._base import AlignerBatch
     from .detect._base import DetectorBatch
     from .mask._base import MaskerBatch
@@ -202,6 +203,10 @@ class Extractor():
         """ int: Batchsize for feeding this model. The number of images the model should
         feed through at once. """
 
+        self.batch_tuner: BatchTuner | None = None
+        """ :class:`~plugins.extract.batch_tuner.BatchTuner`: Tunes the :attr:`batchsize` whilst
+        the plugin runs, if automatic batch sizing is enabled. Set by the pipeline """
+
         self._queues: dict[str, Queue] = {}
         """ dict: in + out queues and internal queues for this plugin, """
 
@@ -293,6 +298,24 @@ class Extractor():
         action is undertaken """
         return
 
+    def _run_predict(self, feed: np.ndarray) -> T.Any:
+        """ Run the plugin's :func:`predict` function, through the :attr:`batch_tuner` if one has
+        been set.
+
+        Parameters
+        ----------
+        feed: :class:`numpy.ndarray`
+            The batch to feed the model
+
+        Returns
+        -------
+        varies
+            The output from the plugin's :func:`predict` function
+        """
+        if self.batch_tuner is None:
+            return self.predict(feed)
+        return self.batch_tuner.predict(feed)
+
     def _predict(self, batch: BatchType) -> BatchType:
         """ **Override method** (at `<plugin_type>` level)
 
@@ -40,6 +40,39 @@ class Config(FaceswapConfig):
                    "This option prevents Tensorflow from allocating all of the GPU VRAM at launch "
                    "but can lead to higher VRAM fragmentation and slower performance. Should only "
                    "be enabled if you are having problems running extraction."))
+        self.add_item(
+            section=section,
+            title="auto_batchsize",
+            datatype=bool,
+            default=False,
+            group=_("settings"),
+            info=_("Automatically tune the batch size of each plugin whilst extraction runs. The "
+                   "time taken for the first batches is measured, and the batch size is grown "
+                   "for as long as it keeps getting faster and there is enough memory available. "
+                   "If the GPU runs out of memory then the batch size is lowered rather than "
+                   "stopping the extraction. The tuned batch sizes are remembered for this "
+                   "machine and used for later runs. Plugins' configured batch sizes are used as "
+                   "the starting point."))
+        self.add_item(
+            section=section,
+            title="auto_batchsize_probes",
+            datatype=int,
+            min_max=(4, 50),
+            rounding=1,
+            default=12,
+            group=_("settings"),
+            info=_("Only used if 'auto_batchsize' is enabled. The maximum number of batches to "
+                   "measure for each plugin before settling on a batch size."))
+        self.add_item(
+            section=section,
+            title="auto_batchsize_max",
+            datatype=int,
+            min_max=(1, 256),
+            rounding=1,
+            default=64,
+            group=_("settings"),
+            info=_("Only used if 'auto_batchsize' is enabled. The largest batch size that can be "
+                   "selected for any plugin."))
         self.add_item(
             section=section,
             title="aligner_min_scale",
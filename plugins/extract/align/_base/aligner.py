@@ -530,7 +530,7 @@ class Aligner(Extractor):  # pylint:disable=abstract-method
         """
         assert isinstance(batch, AlignerBatch)
         try:
-            preds = [self.predict(feed) for feed in batch.refeeds]
+            preds = [self._run_predict(feed) for feed in batch.refeeds]
             try:
                 batch.prediction = np.array(preds)
             except ValueError as err:
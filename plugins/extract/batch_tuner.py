@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+""" Automatic batch size tuning for extraction plugins.
+
+When enabled, the batch size of each plugin is measured at run time over the first batches that
+it processes. The batch size is grown for as long as the time taken to process each item keeps
+falling and there is enough memory available, and is shrunk if the device runs out of memory.
+The chosen batch sizes are stored for each machine and plugin so that later runs can start at
+the tuned value.
+"""
+from __future__ import annotations
+import logging
+import os
+import time
+import typing as T
+from threading import Lock
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.python.framework import errors_impl as tf_errors  # pylint:disable=no-name-in-module  # noqa
+
+from lib.serializer import get_serializer
+from lib.utils import FaceswapError
+
+if T.TYPE_CHECKING:
+    from ._base import Extractor
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSizeCache():
+    """ Stores the tuned batch sizes for each plugin, for the current machine, between runs.
+
+    Parameters
+    ----------
+    machine: str
+        A key that identifies the machine and device that the plugins are running on
+    filename: str, optional
+        Full path to the file that holds the tuned batch sizes. ``None`` to use the default
+        location within the faceswap config folder. Default: ``None``
+    """
+    def __init__(self, machine: str, filename: str | None = None) -> None:
+        logger.debug("Initializing %s: (machine: '%s', filename: '%s')",
+                     self.__class__.__name__, machine, filename)
+        self._machine = machine
+        self._filename = self._get_filename() if filename is None else filename
+        self._serializer = get_serializer("json")
+        self._lock = Lock()
+        self._data = self._load()
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    @classmethod
+    def _get_filename(cls) -> str:
+        """ str: The full path to the default batch size file in the faceswap config folder """
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+        return os.path.join(root, "config", ".extract_batchsize.json")
+
+    def _load(self) -> dict[str, dict[str, int]]:
+        """ Load the stored batch sizes for all machines
+
+        Returns
+        -------
+        dict
+            The machine keys with a dictionary of plugin keys to tuned batch size for each machine
+        """
+        if not os.path.isfile(self._filename):
+            logger.debug("No batch size file exists at '%s'", self._filename)
+            return {}
+        try:
+            retval = self._serializer.load(self._filename)
+        except FaceswapError as err:
+            logger.warning("Unable to load tuned batch sizes. They will be re-tuned. (%s)",
+                           str(err))
+            return {}
+        logger.debug("Loaded batch sizes: %s", retval)
+        return retval if isinstance(retval, dict) else {}
+
+    def get(self, plugin: str) -> int | None:
+        """ Obtain the stored batch size for a plugin on this machine
+
+        Parameters
+        ----------
+        plugin: str
+            The key identifying the plugin
+
+        Returns
+        -------
+        int or ``None``
+            The stored batch size for the plugin or ``None`` if one has not been stored
+        """
+        retval = self._data.get(self._machine, {}).get(plugin)
+        logger.debug("plugin: '%s', batchsize: %s", plugin, retval)
+        return retval
+
+    def set(self, plugin: str, batchsize: int) -> None:
+        """ Store the batch size for a plugin on this machine and save to disk
+
+        Parameters
+        ----------
+        plugin: str
+            The key identifying the plugin
+        batchsize: int
+            The batch size to store for the plugin
+        """
+        logger.debug("plugin: '%s', batchsize: %s", plugin, batchsize)
+        with self._lock:
+            self._data.setdefault(self._machine, {})[plugin] = batchsize
+            try:
+                self._serializer.save(f"{self._filename}.tmp", self._data)
+                os.replace(f"{self._filename}.tmp", self._filename)
+            except (FaceswapError, OSError) as err:
+                logger.warning("Unable to save tuned batch sizes: %s", str(err))
+
+
+class BatchTuner():
+    """ Tunes the batch size of an extraction plugin whilst it runs.
+
+    Predictions for the plugin are routed through :func:`predict`. For the first
+    :attr:`probe_batches` batches, the time taken to process each item is measured at the current
+    batch size. The batch size is then doubled for as long as this time keeps improving and the
+    device has enough free memory for the larger batch. Once tuning is complete, the best batch
+    size found is stored in the :class:`BatchSizeCache`.
+
+    If a stored batch size exists for the plugin then it is used from the outset and no further
+    tuning takes place. Running out of memory at any point halves the batch size and retries the
+    prediction in smaller chunks, rather than stopping the extraction.
+
+    Parameters
+    ----------
+    plugin: :class:`~plugins.extract._base.Extractor`
+        The plugin to tune the batch size for
+    cache: :class:`BatchSizeCache`
+        The store for tuned batch sizes
+    probe_batches: int, optional
+        The maximum number of batches to measure before settling on a batch size. Default: `12`
+    max_batchsize: int, optional
+        The largest batch size that can be selected. Default: `64`
+    vram_total: int, optional
+        The total VRAM, in megabytes, of the device that the plugin runs on. `0` if not known.
+        Default: `0`
+    phase: str, optional
+        Identifies the plugins that run at the same time as this plugin. Batch sizes are stored
+        separately for each phase, as a size tuned for a plugin running on its own will not fit
+        in memory alongside other plugins. Default: `""`
+    """
+    _warmup = 1
+    """ int: The number of batches to discard after each change of batch size, as they include the
+    time taken to trace the model for the new size """
+    _samples = 2
+    """ int: The number of batches to measure at each batch size """
+    _min_improvement = 0.05
+    """ float: The fraction by which the time taken per item must fall for a larger batch size to
+    be selected """
+
+    def __init__(self,
+                 plugin: Extractor,
+                 cache: BatchSizeCache,
+                 probe_batches: int = 12,
+                 max_batchsize: int = 64,
+                 vram_total: int = 0,
+                 phase: str = "") -> None:
+        logger.debug("Initializing %s: (plugin: %s, probe_batches: %s, max_batchsize: %s, "
+                     "vram_total: %s, phase: '%s')", self.__class__.__name__, plugin.name,
+                     probe_batches, max_batchsize, vram_total, phase)
+        self._plugin = plugin
+        self._cache = cache
+        plugin_type = plugin._plugin_type  # pylint:disable=protected-access
+        self._key = f"{plugin_type}.{plugin.name}_{plugin.input_size}"
+        self._key += f"|{phase}" if phase else ""
+        self._max_batchsize = max(max_batchsize, 1)
+        self._vram_total = vram_total
+
+        cached = cache.get(self._key)
+        self._probes_remaining = 0 if cached else probe_batches
+        self._plugin.batchsize = min(cached or plugin.batchsize, self._max_batchsize)
+        if cached:
+            logger.verbose("Using tuned batch size of %s for %s",  # type:ignore[attr-defined]
+                           self._plugin.batchsize, plugin.name)
+        self._times: list[float] = []
+        self._seen = 0
+        self._best: tuple[int, float] | None = None
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    @property
+    def is_tuning(self) -> bool:
+        """ bool: ``True`` if the batch size is still being tuned """
+        return self._probes_remaining > 0
+
+    def predict(self, feed: np.ndarray) -> T.Any:
+        """ Run the plugin's predict function, measuring the time taken whilst tuning and falling
+        back to smaller batches if the device runs out of memory
+
+        Parameters
+        ----------
+        feed: :class:`numpy.ndarray`
+            The batch to feed the model
+
+        Returns
+        -------
+        varies
+            The prediction from the plugin for each item in the feed
+        """
+        start = time.perf_counter()
+        try:
+            retval = self._plugin.predict(feed)
+        except tf_errors.ResourceExhaustedError:
+            if len(feed) <= 1:
+                raise
+            self._shrink(len(feed))
+            return self._predict_chunks(feed)
+        if self.is_tuning:
+            self._measure(len(feed), time.perf_counter() - start)
+        return retval
+
+    def _predict_chunks(self, feed: np.ndarray) -> T.Any:
+        """ Predict a feed in chunks of the current batch size, joining the results
+
+        Parameters
+        ----------
+        feed: :class:`numpy.ndarray`
+            The batch to feed the model
+
+        Returns
+        -------
+        varies
+            The prediction from the plugin for each item in the feed
+        """
+        size = self._plugin.batchsize
+        chunks = [self.predict(feed[idx:idx + size]) for idx in range(0, len(feed), size)]
+        if not all(isinstance(chunk, np.ndarray) for chunk in chunks):
+            return [item for chunk in chunks for item in chunk]
+        if (all(chunk.dtype != object for chunk in chunks)
+                and len(set(chunk.shape[1:] for chunk in chunks)) == 1):
+            return np.concatenate(chunks)
+        # Object arrays (e.g. a variable number of detections per item) take their shape from
+        # the contents of each chunk, so join them item by item
+        retval = np.empty(sum(len(chunk) for chunk in chunks), dtype="object")
+        for idx, item in enumerate(item for chunk in chunks for item in chunk):
+            retval[idx] = item
+        return retval
+
+    def _shrink(self, feed_size: int) -> None:
+        """ Halve the batch size after running out of memory, and store the new value
+
+        Parameters
+        ----------
+        feed_size: int
+            The number of items in the feed that could not be processed
+        """
+        batchsize = min(self._plugin.batchsize, max(1, feed_size // 2))
+        logger.warning("Ran out of memory running %s at a batch size of %s. Lowering the batch "
+                       "size to %s", self._plugin.name, feed_size, batchsize)
+        self._plugin.batchsize = batchsize
+        self._max_batchsize = min(self._max_batchsize, batchsize)
+        if self.is_tuning:
+            self._best = None if self._best is None or self._best[0] > batchsize else self._best
+            self._finish()
+            return
+        self._cache.set(self._key, batchsize)
+
+    def _measure(self, feed_size: int, elapsed: float) -> None:
+        """ Record the time taken to process a batch whilst tuning and move to the next batch size
+        once enough measurements have been taken
+
+        Parameters
+        ----------
+        feed_size: int
+            The number of items in the batch that was processed
+        elapsed: float
+            The time, in seconds, that the batch took to process
+        """
+        batchsize = self._plugin.batchsize
+        if feed_size < batchsize:  # Final or compacted batch
+            return
+        self._probes_remaining -= 1
+        self._seen += 1
+        if self._seen > self._warmup:
+            self._times.append(elapsed / feed_size)
+        if len(self._times) < self._samples and self.is_tuning:
+            return
+        if not self._times:
+            self._finish()
+            return
+
+        per_item = float(np.median(self._times))
+        logger.debug("%s batch size %s: %.3fms per item",
+                     self._plugin.name, batchsize, per_item * 1000)
+        if self._best is not None and per_item > self._best[1] * (1.0 - self._min_improvement):
+            self._finish()
+            return
+        self._best = (batchsize, per_item)
+        next_size = min(batchsize * 2, self._max_batchsize)
+        if not self.is_tuning or next_size == batchsize or not self._has_headroom(next_size):
+            self._finish()
+            return
+        logger.debug("Trying batch size %s for %s", next_size, self._plugin.name)
+        self._plugin.batchsize = next_size
+        self._times = []
+        self._seen = 0
+
+    def _has_headroom(self, batchsize: int) -> bool:
+        """ Check whether there is enough VRAM to grow to the given batch size.
+
+        Uses the peak memory that Tensorflow has allocated, plus the plugin's estimated VRAM
+        requirement for each extra item. If the memory use cannot be obtained (for example when
+        running on the CPU) then growth is permitted, relying on falling back if memory runs out
+
+        Parameters
+        ----------
+        batchsize: int
+            The batch size to check
+
+        Returns
+        -------
+        bool
+            ``True`` if there is expected to be enough VRAM for the given batch size
+        """
+        if not self._vram_total or not tf.config.list_logical_devices("GPU"):
+            return True
+        try:
+            peak = tf.config.experimental.get_memory_info("GPU:0")["peak"] / (1024 * 1024)
+        except (ValueError, tf_errors.NotFoundError):
+            return True
+        required = peak + self._plugin.vram_per_batch * (batchsize - self._plugin.batchsize)
+        retval = required < self._vram_total
+        logger.debug("%s: peak: %sMB, required: %sMB, total: %sMB, has_headroom: %s",
+                     self._plugin.name, int(peak), int(required), self._vram_total, retval)
+        return retval
+
+    def _finish(self) -> None:
+        """ Stop tuning, select the best batch size that was found and store it """
+        self._probes_remaining = 0
+        batchsize = self._plugin.batchsize if self._best is None else self._best[0]
+        self._plugin.batchsize = batchsize
+        logger.info("Tuned batch size for %s: %s", self._plugin.name, batchsize)
+        self._cache.set(self._key, batchsize)
@@ -280,70 +280,70 @@ class Detector(Extractor):  # pylint:disable=abstract-method
     # <<< PROTECTED ACCESS METHODS >>> #
     # <<< PREDICT WRAPPER >>> #
     def _predict(self, batch: BatchType) -> DetectorBatch:
-        """ Wrap models predict function in rotations """
+        """ Wrap models predict function in rotations
+
+        The full batch is predicted at the first angle. For each subsequent rotation angle, only
+        those images that have not yet had any faces detected are rotated and compiled into a
+        compacted sub-batch for prediction. The results are then scattered back into their
+        original positions in the batch.
+        """
         assert isinstance(batch, DetectorBatch)
         batch.rotation_matrix = [np.array([]) for _ in range(len(batch.feed))]
         found_faces: list[np.ndarray] = [np.array([]) for _ in range(len(batch.feed))]
         for angle in self.rotation:
-            # Rotate the batch and insert placeholders for already found faces
-            self._rotate_batch(batch, angle)
-            try:
-                pred = self.predict(batch.feed)
-                if angle == 0:
-                    batch.prediction = pred
-                else:
-                    try:
-                        batch.prediction = np.array([b if b.any() else p
-                                                    for b, p in zip(batch.prediction, pred)])
-                    except ValueError as err:
-                        # If batches are different sizes after rotation Numpy will error, so we
-                        # need to explicitly set the dtype to 'object' rather than let it infer
-                        # numpy error:
-                        # ValueError: setting an array element with a sequence. The requested array
-                        # has an inhomogeneous shape after 1 dimensions. The detected shape was
-                        # (8,) + inhomogeneous part
-                        if "inhomogeneous" in str(err):
-                            batch.prediction = np.array([b if b.any() else p
-                                                         for b, p in zip(batch.prediction, pred)],
-                                                        dtype="object")
-                            logger.trace(  # type:ignore[attr-defined]
-                                "Mismatched array sizes, setting dtype to object: %s",
-                                [p.shape for p in batch.prediction])
-                        else:
-                            raise
-
-                logger.trace("angle: %s, filenames: %s, "  # type:ignore[attr-defined]
-                             "prediction: %s",
-                             angle, batch.filename, pred)
-            except tf_errors.ResourceExhaustedError as err:
-                msg = ("You do not have enough GPU memory available to run detection at the "
-                       "selected batch size. You can try a number of things:"
-                       "\n1) Close any other application that is using your GPU (web browsers are "
-                       "particularly bad for this)."
-                       "\n2) Lower the batchsize (the amount of images fed into the model) by "
-                       "editing the plugin settings (GUI: Settings > Configure extract settings, "
-                       "CLI: Edit the file faceswap/config/extract.ini)."
-                       "\n3) Enable 'Single Process' mode.")
-                raise FaceswapError(msg) from err
-
-            if angle != 0 and any(face.any() for face in batch.prediction):
+            indices = [idx for idx, faces in enumerate(found_faces) if not faces.any()]
+            if not indices:
+                logger.trace("Faces found for all images")  # type:ignore[attr-defined]
+                break
+
+            feed, rotmats = self._rotate_batch(batch, angle, indices)
+            pred = self._predict_feed(feed)
+            logger.trace("angle: %s, filenames: %s, "  # type:ignore[attr-defined]
+                         "prediction: %s",
+                         angle, [batch.filename[idx] for idx in indices], pred)
+
+            for idx, faces, rotmat in zip(indices, pred, rotmats):
+                found_faces[idx] = faces
+                if faces.any():
+                    batch.rotation_matrix[idx] = rotmat
+
+            if angle != 0 and any(faces.any() for faces in pred):
                 logger.verbose("found face(s) by rotating image %s "  # type:ignore[attr-defined]
                                "degrees",
                                angle)
 
-            found_faces = T.cast(list[np.ndarray], ([face if not found.any() else found
-                                                     for face, found in zip(batch.prediction,
-                                                                            found_faces)]))
-            if all(face.any() for face in found_faces):
-                logger.trace("Faces found for all images")  # type:ignore[attr-defined]
-                break
-
         batch.prediction = np.array(found_faces, dtype="object")
         logger.trace("detect_prediction output: (filenames: %s, "  # type:ignore[attr-defined]
                      "prediction: %s, rotmat: %s)",
                      batch.filename, batch.prediction, batch.rotation_matrix)
         return batch
 
+    def _predict_feed(self, feed: np.ndarray) -> np.ndarray:
+        """ Run the model's predict function on the given feed, handling out of memory errors.
+
+        Parameters
+        ----------
+        feed: :class:`numpy.ndarray`
+            The (potentially compacted) batch of images to predict on
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The predictions for each image in the feed
+        """
+        try:
+            return self._run_predict(feed)
+        except tf_errors.ResourceExhaustedError as err:
+            msg = ("You do not have enough GPU memory available to run detection at the "
+                   "selected batch size. You can try a number of things:"
+                   "\n1) Close any other application that is using your GPU (web browsers are "
+                   "particularly bad for this)."
+                   "\n2) Lower the batchsize (the amount of images fed into the model) by "
+                   "editing the plugin settings (GUI: Settings > Configure extract settings, "
+                   "CLI: Edit the file faceswap/config/extract.ini)."
+                   "\n3) Enable 'Single Process' mode.")
+            raise FaceswapError(msg) from err
+
     # <<< DETECTION IMAGE COMPILATION METHODS >>> #
     def _compile_detection_image(self, item: ExtractMedia
                                  ) -> tuple[np.ndarray, float, tuple[int, int]]:
@@ -555,38 +555,43 @@ class Detector(Extractor):  # pylint:disable=abstract-method
         logger.debug("Rotation Angles: %s", rotation_angles)
         return rotation_angles
 
-    def _rotate_batch(self, batch: DetectorBatch, angle: int) -> None:
-        """ Rotate images in a batch by given angle
+    def _rotate_batch(self,
+                      batch: DetectorBatch,
+                      angle: int,
+                      indices: list[int]) -> tuple[np.ndarray, list[np.ndarray]]:
+        """ Compile a feed of the requested images from a batch, rotated by the given angle
 
-            if any faces have already been detected for a batch, store the existing rotation
-            matrix and replace the feed image with a placeholder
+        Parameters
+        ----------
+        batch: :class:`DetectorBatch`
+            The batch to obtain the rotated images from
+        angle: int
+            The amount of degrees to rotate the images by
+        indices: list
+            The indices of the images within the batch that should be rotated and compiled into
+            the feed
 
-            Parameters
-            ----------
-            batch: :class:`DetectorBatch`
-                The batch to apply rotation to
-            angle: int
-                The amount of degrees to rotate the image by
-            """
+        Returns
+        -------
+        feed: :class:`numpy.ndarray`
+            The compacted batch of rotated images for the requested indices
+        rotation_matrix: list
+            The rotation matrix used for each image in the returned feed
+        """
         if angle == 0:
             # Set the initial batch so we always rotate from zero
-            batch.initial_feed = batch.feed.copy()
-            return
+            batch.initial_feed = batch.feed
+            return batch.feed, [np.array([]) for _ in indices]
 
         feeds: list[np.ndarray] = []
         rotmats: list[np.ndarray] = []
-        for img, faces, rotmat in zip(batch.initial_feed,
-                                      batch.prediction,
-                                      batch.rotation_matrix):
-            if faces.any():
-                image = np.zeros_like(img)
-                matrix = rotmat
-            else:
-                image, matrix = self._rotate_image_by_angle(img, angle)
+        for idx in indices:
+            image, matrix = self._rotate_image_by_angle(batch.initial_feed[idx], angle)
             feeds.append(image)
             rotmats.append(matrix)
-        batch.feed = np.array(feeds, dtype="float32")
-        batch.rotation_matrix = rotmats
+        logger.trace("Rotated %s of %s images by %s degrees",  # type:ignore[attr-defined]
+                     len(indices), len(batch.initial_feed), angle)
+        return np.array(feeds, dtype="float32"), rotmats
 
     @staticmethod
     def _rotate_face(face: DetectedFace, rotation_matrix: np.ndarray) -> DetectedFace:
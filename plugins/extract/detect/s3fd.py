@@ -403,38 +403,58 @@ class S3fd(KSession):
         ----------
         bounding_boxes_scales: list
             The output predictions from the S3FD model
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The detected bounding boxes, with score, for each image in the batch
         """
-        ret = []
-        batch_size = range(bounding_boxes_scales[0].shape[0])
-        for img in batch_size:
-            bboxlist = [scale[img:img+1] for scale in bounding_boxes_scales]
-            boxes = self._post_process(bboxlist)
-            finallist = self._nms(boxes, 0.5)
-            ret.append(finallist)
+        batch_size = bounding_boxes_scales[0].shape[0]
+        boxes, indices = self._post_process(bounding_boxes_scales)
+        ret = self._nms(boxes, indices, 0.5, batch_size)
         return np.array(ret, dtype="object")
 
-    def _post_process(self, bboxlist: list[np.ndarray]) -> np.ndarray:
-        """ Perform post processing on output
-            TODO: do this on the batch.
+    def _post_process(self, bboxlist: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """ Perform post processing on output for the full batch.
+
+        The candidate boxes for every scale and every image in the batch are selected and decoded
+        together.
+
+        Parameters
+        ----------
+        bboxlist: list
+            The output predictions from the S3FD model
+
+        Returns
+        -------
+        boxes: :class:`numpy.ndarray`
+            The decoded (`x1`, `y1`, `x2`, `y2`, `score`) candidate boxes for the batch. Boxes are
+            grouped by image, and within each image are in order of scale and then position
+        indices: :class:`numpy.ndarray`
+            The index of the image within the batch that each candidate box belongs to
         """
-        retval = []
+        boxes = []
+        indices = []
         for i in range(len(bboxlist) // 2):
-            bboxlist[i * 2] = self.softmax(bboxlist[i * 2], axis=3)
-        for i in range(len(bboxlist) // 2):
-            ocls, oreg = bboxlist[i * 2], bboxlist[i * 2 + 1]
+            ocls = self.softmax(bboxlist[i * 2], axis=3)[..., 1]
+            oreg = bboxlist[i * 2 + 1]
             stride = 2 ** (i + 2)    # 4,8,16,32,64,128
-            poss = zip(*np.where(ocls[:, :, :, 1] > 0.05))
-            for _, hindex, windex in poss:
-                axc, ayc = stride / 2 + windex * stride, stride / 2 + hindex * stride
-                score = ocls[0, hindex, windex, 1]
-                if score >= self.confidence:
-                    loc = np.ascontiguousarray(oreg[0, hindex, windex, :]).reshape((1, 4))
-                    priors = np.array([[axc / 1.0, ayc / 1.0, stride * 4 / 1.0, stride * 4 / 1.0]])
-                    box = self.decode(loc, priors)
-                    x_1, y_1, x_2, y_2 = box[0] * 1.0
-                    retval.append([x_1, y_1, x_2, y_2, score])
-        return_numpy = np.array(retval) if len(retval) != 0 else np.zeros((1, 5))
-        return return_numpy
+            img_idx, hindex, windex = np.nonzero((ocls > 0.05) & (ocls >= self.confidence))
+            if img_idx.size == 0:
+                continue
+            priors = np.empty((img_idx.shape[0], 4), dtype="float64")
+            priors[:, 0] = stride / 2 + windex * stride
+            priors[:, 1] = stride / 2 + hindex * stride
+            priors[:, 2:] = stride * 4
+            decoded = self.decode(oreg[img_idx, hindex, windex], priors)
+            boxes.append(np.concatenate([decoded, ocls[img_idx, hindex, windex, None]], axis=1))
+            indices.append(img_idx)
+
+        if not boxes:
+            return np.zeros((0, 5)), np.zeros((0, ), dtype="int64")
+        all_indices = np.concatenate(indices)
+        order = np.argsort(all_indices, kind="stable")
+        return np.concatenate(boxes)[order], all_indices[order]
 
     @staticmethod
     def softmax(inp, axis: int) -> np.ndarray:
@@ -466,29 +486,60 @@ class S3fd(KSession):
         return boxes
 
     @staticmethod
-    def _nms(boxes: np.ndarray, threshold: float) -> np.ndarray:
-        """ Perform Non-Maximum Suppression """
+    def _nms(boxes: np.ndarray,
+             indices: np.ndarray,
+             threshold: float,
+             batch_size: int) -> list[np.ndarray]:
+        """ Perform Non-Maximum Suppression with score weighted box voting for a batch of images.
+
+        Boxes are processed in descending score order across the whole batch, but are only
+        compared against, and suppressed by, boxes that belong to the same image.
+
+        Parameters
+        ----------
+        boxes: :class:`numpy.ndarray`
+            The (`x1`, `y1`, `x2`, `y2`, `score`) candidate boxes for the batch
+        indices: :class:`numpy.ndarray`
+            The index of the image within the batch that each candidate box belongs to
+        threshold: float
+            The IoU threshold above which overlapping boxes are suppressed
+        batch_size: int
+            The number of images in the batch
+
+        Returns
+        -------
+        list
+            The retained boxes for each image in the batch. Images without any detected faces
+            receive a single box of zeros
+        """
         retained_box_indices = []
 
         areas = (boxes[:, 2] - boxes[:, 0] + 1) * (boxes[:, 3] - boxes[:, 1] + 1)
         ranked_indices = boxes[:, 4].argsort()[::-1]
         while ranked_indices.size > 0:
-            best_rest = ranked_indices[0], ranked_indices[1:]
+            best = ranked_indices[0]
+            same_image = indices[ranked_indices[1:]] == indices[best]
+            rest = ranked_indices[1:][same_image]
 
-            max_of_xy = np.maximum(boxes[best_rest[0], :2], boxes[best_rest[1], :2])
-            min_of_xy = np.minimum(boxes[best_rest[0], 2:4], boxes[best_rest[1], 2:4])
+            max_of_xy = np.maximum(boxes[best, :2], boxes[rest, :2])
+            min_of_xy = np.minimum(boxes[best, 2:4], boxes[rest, 2:4])
             width_height = np.maximum(0, min_of_xy - max_of_xy + 1)
             intersection_areas = width_height[:, 0] * width_height[:, 1]
-            iou = intersection_areas / (areas[best_rest[0]] +
-                                        areas[best_rest[1]] - intersection_areas)
+            iou = intersection_areas / (areas[best] + areas[rest] - intersection_areas)
 
-            overlapping_boxes = (iou > threshold).nonzero()[0]
-            if len(overlapping_boxes) != 0:
-                overlap_set = ranked_indices[overlapping_boxes + 1]
+            overlapping = iou > threshold
+            if np.any(overlapping):
+                overlap_set = rest[overlapping]
                 vote = np.average(boxes[overlap_set, :4], axis=0, weights=boxes[overlap_set, 4])
-                boxes[best_rest[0], :4] = vote
-            retained_box_indices.append(best_rest[0])
-
-            non_overlapping_boxes = (iou <= threshold).nonzero()[0]
-            ranked_indices = ranked_indices[non_overlapping_boxes + 1]
-        return boxes[retained_box_indices]
+                boxes[best, :4] = vote
+            retained_box_indices.append(best)
+
+            keep = np.ones_like(ranked_indices[1:], dtype="bool")
+            keep[np.nonzero(same_image)[0][overlapping]] = False
+            ranked_indices = ranked_indices[1:][keep]
+
+        retained = boxes[retained_box_indices]
+        retained_indices = indices[retained_box_indices]
+        return [retained[retained_indices == idx]
+                if np.any(retained_indices == idx) else np.zeros((1, 5))
+                for idx in range(batch_size)]
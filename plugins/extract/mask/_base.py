@@ -238,7 +238,7 @@ class Masker(Extractor):  # pylint:disable=abstract-method
             else:
                 feed = batch.feed
 
-            batch.prediction = self.predict(feed)
+            batch.prediction = self._run_predict(feed)
             return batch
         except tf_errors.ResourceExhaustedError as err:
             msg = ("You do not have enough GPU memory available to run detection at the "
@@ -11,6 +11,7 @@ plugins either in parallel or in series, giving easy access to input and output.
 from __future__ import annotations
 import logging
 import os
+import platform
 import typing as T
 
 from lib.align import LandmarkType
@@ -21,6 +22,8 @@ from lib.serializer import get_serializer
 from lib.utils import get_backend, FaceswapError
 from plugins.plugin_loader import PluginLoader
 
+from .batch_tuner import BatchSizeCache, BatchTuner
+
 if T.TYPE_CHECKING:
     from collections.abc import Generator
     from ._base import Extractor as PluginExtractor
@@ -799,7 +802,79 @@ class Extractor():
         vram_per_batch_requirements and the number of plugins being loaded in the current phase.
         Only adjusts if the the configured batch size requires more vram than is available. Nvidia
         only.
+
+        If automatic batch sizing has been enabled, then a batch tuner is also added to each plugin
+        with a configurable batch size.
+        """
+        requested = [plugin.batchsize for plugin in self._all_plugins]
+        self._set_vram_batchsize()
+        vram_batchsizes = {plugin: plugin.batchsize
+                           for plugin, batchsize in zip(self._all_plugins, requested)
+                           if plugin.batchsize < batchsize}
+        self._set_batch_tuners(vram_batchsizes)
+
+    def _get_phase_keys(self) -> dict[PluginExtractor, str]:
+        """ Obtain a key for each plugin that identifies the plugins that run in the same phase
+
+        Returns
+        -------
+        dict
+            The plugin with the type and name of all plugins in its phase, sorted and joined
         """
+        retval: dict[PluginExtractor, str] = {}
+        for phase in self._phases:
+            plugins = []
+            for flow_phase in phase:
+                plugin_type, idx = self._get_plugin_type_and_index(flow_phase)
+                attr = getattr(self, f"_{plugin_type}")
+                plugins.append((plugin_type, attr[idx] if idx is not None else attr))
+            key = "+".join(sorted(f"{plugin_type}.{plugin.name}"
+                                  for plugin_type, plugin in plugins))
+            retval.update({plugin: key for _, plugin in plugins})
+        logger.debug({plugin.name: key for plugin, key in retval.items()})
+        return retval
+
+    def _set_batch_tuners(self, vram_batchsizes: dict[PluginExtractor, int]) -> None:
+        """ Add a :class:`~plugins.extract.batch_tuner.BatchTuner` to each plugin that has a
+        configurable batch size, if automatic batch sizing has been enabled.
+
+        Tuned batch sizes are stored against the host, the backend and the GPU device, so that
+        tuned values are not shared between different hardware, and against the plugins that run
+        in the same phase, so that values tuned for a plugin running alone are not used when it
+        runs in parallel with other plugins.
+
+        Parameters
+        ----------
+        vram_batchsizes: dict
+            The plugin with the batch size that it was lowered to, to fit within the
+            available VRAM, for any plugins that were lowered. Tuned batch sizes are capped at this
+            value
+        """
+        plugins = [plugin for plugin in self._all_plugins
+                   if "batch-size" in plugin.config and plugin.config.get("auto_batchsize")]
+        if not plugins:
+            logger.debug("Automatic batch sizing not enabled")
+            return
+        config = plugins[0].config
+        cache = BatchSizeCache(f"{platform.node()}|{get_backend()}|{self._vram_stats['device']}")
+        vram_total = 0
+        if self._vram_stats["count"]:
+            vram_total = T.cast(int, self._vram_stats["vram_total"])
+        phase_keys = self._get_phase_keys()
+        for plugin in plugins:
+            logger.debug("Adding batch tuner to %s", plugin.name)
+            max_batchsize = min(config["auto_batchsize_max"],
+                                vram_batchsizes.get(plugin, config["auto_batchsize_max"]))
+            plugin.batch_tuner = BatchTuner(plugin,
+                                            cache,
+                                            probe_batches=config["auto_batchsize_probes"],
+                                            max_batchsize=max_batchsize,
+                                            vram_total=vram_total,
+                                            phase=phase_keys.get(plugin, ""))
+
+    def _set_vram_batchsize(self) -> None:
+        """ Sets the batch size of the plugins in the current phase to fit within the available
+        VRAM, based on the plugins' static VRAM estimates. """
         backend = get_backend()
         if backend not in ("nvidia", "directml", "rocm"):
             logger.debug("Not updating batchsize requirements for backend: '%s'", backend)
@@ -95,6 +95,7 @@ class Identity(Extractor):  # pylint:disable=abstract-method
 
         self._plugin_type = "recognition"
         self._filter = IdentityFilter(self.config["save_filtered"])
+        self._output_matches: list[bool] = []  # Identity filter results for the output faces
         logger.debug("Initialized _base %s", self.__class__.__name__)
 
     def _get_detected_from_aligned(self, item: ExtractMedia) -> None:
@@ -225,7 +226,7 @@ class Identity(Extractor):  # pylint:disable=abstract-method
         assert isinstance(batch, RecogBatch)
         try:
             # slightly hacky workaround to deal with landmarks based masks:
-            batch.prediction = self.predict(batch.feed)
+            batch.prediction = self._run_predict(batch.feed)
             return batch
         except tf_errors.ResourceExhaustedError as err:
             msg = ("You do not have enough GPU memory available to run recognition at the "
@@ -260,19 +261,24 @@ class Identity(Extractor):  # pylint:disable=abstract-method
         assert isinstance(self.name, str)
         for identity, face in zip(batch.prediction, batch.detected_faces):
             face.add_identity(self.name.lower(), identity)
+        matches = self._filter.get_matches(batch.prediction).tolist()
         del batch.feed
 
         logger.trace("Item out: %s",  # type: ignore
                      {key: val.shape if isinstance(val, np.ndarray) else val
                                       for key, val in batch.__dict__.items()})
 
-        for filename, face in zip(batch.filename, batch.detected_faces):
+        for filename, face, match in zip(batch.filename, batch.detected_faces, matches):
             self._output_faces.append(face)
+            self._output_matches.append(match)
             if len(self._output_faces) != self._faces_per_filename[filename]:
                 continue
 
             output = self._extract_media.pop(filename)
-            self._output_faces = self._filter(self._output_faces, output.sub_folders)
+            self._output_faces = self._filter(self._output_faces,
+                                              output.sub_folders,
+                                              self._output_matches)
+            self._output_matches = []
 
             output.add_detected_faces(self._output_faces)
             self._output_faces = []
@@ -323,7 +329,10 @@ class IdentityFilter():
         logger.debug("Initialized %s", self.__class__.__name__)
 
     def add_filters(self, filters: np.ndarray, nfilters: np.ndarray, threshold) -> None:
-        """ Add identity encodings to the filter and set whether each filter is enabled
+        """ Add identity encodings to the filter and set whether each filter is enabled.
+
+        The encodings for each filter are normalized once, here, so that matching a batch of faces
+        against every reference identity is a single matrix product.
 
         Parameters
         ----------
@@ -336,50 +345,45 @@ class IdentityFilter():
         """
         logger.debug("Adding filters: %s, nfilters: %s, threshold: %s",
                      filters.shape, nfilters.shape, threshold)
-        self._filter = filters
-        self._nfilter = nfilters
         self._threshold = threshold
-        self._filter_enabled = bool(np.any(self._filter))
-        self._nfilter_enabled = bool(np.any(self._nfilter))
+        self._filter_enabled = bool(np.any(filters))
+        self._nfilter_enabled = bool(np.any(nfilters))
+        self._filter = self._normalize(filters) if self._filter_enabled else None
+        self._nfilter = self._normalize(nfilters) if self._nfilter_enabled else None
         self._active = self._filter_enabled or self._nfilter_enabled
         logger.debug("filter active: %s, nfilter active: %s, all active: %s",
                      self._filter_enabled, self._nfilter_enabled, self._active)
 
     @classmethod
-    def _find_cosine_similiarity(cls,
-                                 source_identities: np.ndarray,
-                                 test_identity: np.ndarray) -> np.ndarray:
-        """ Find the cosine similarity between a source face identity and a test face identity
+    def _normalize(cls, identities: np.ndarray) -> np.ndarray:
+        """ L2 normalize identity encodings so that their dot product is the cosine similarity
 
         Parameters
         ---------
-        source_identities: :class:`numpy.ndarray`
-            The identity encoding for the source face identities
-        test_identity: :class:`numpy.ndarray`
-            The identity encoding for the face identity to test against the sources
+        identities: :class:`numpy.ndarray`
+            The (`N`, `encoding size`) identity encodings to normalize
 
         Returns
         -------
         :class:`numpy.ndarray`:
-            The cosine similarity between a face identity and the source identities
+            The normalized identity encodings as float32
         """
-        s_norm = np.linalg.norm(source_identities, axis=1)
-        i_norm = np.linalg.norm(test_identity)
-        retval = source_identities @ test_identity / (s_norm * i_norm)
-        return retval
+        retval = np.asarray(identities, dtype="float32").reshape(len(identities), -1)
+        norms = np.linalg.norm(retval, axis=1, keepdims=True)
+        return retval / np.maximum(norms, np.finfo("float32").tiny)
 
     def _get_matches(self,
                      filter_type: T.Literal["filter", "nfilter"],
                      identities: np.ndarray) -> np.ndarray:
-        """ Obtain the average and minimum distances for each face against the source identities
-        to test against
+        """ Obtain whether each face should be filtered against the source identities for the
+        given filter type
 
         Parameters
         ----------
         filter_type ["filter", "nfilter"]
             The filter type to use for calculating the distance
         identities: :class:`numpy.ndarray`
-            The identity encodings for the current face(s) being checked
+            The normalized identity encodings for the current face(s) being checked
 
         Returns
         -------
@@ -388,8 +392,7 @@ class IdentityFilter():
         """
         encodings = self._filter if filter_type == "filter" else self._nfilter
         assert encodings is not None
-        distances = np.array([self._find_cosine_similiarity(encodings, identity)
-                              for identity in identities])
+        distances = identities @ encodings.T
         is_match = np.any(distances >= self._threshold, axis=-1)
         # Invert for filter (set the `True` match to `False` for should filter)
         retval = np.invert(is_match) if filter_type == "filter" else is_match
@@ -397,6 +400,31 @@ class IdentityFilter():
                      "retval: %s", filter_type, distances.shape, is_match, retval)
         return retval
 
+    def get_matches(self, identities: np.ndarray) -> np.ndarray:
+        """ Obtain whether each of the given faces should be filtered by either of the filter or
+        nfilter identities
+
+        Parameters
+        ----------
+        identities: :class:`numpy.ndarray`
+            The (`N`, `encoding size`) identity encodings for the faces to be checked
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Boolean array. ``True`` if identity should be filtered otherwise ``False``
+        """
+        retval = np.zeros((len(identities), ), dtype="bool")
+        if not self._active or not len(identities):
+            return retval
+        normalized = self._normalize(identities)
+        for f_type in T.get_args(T.Literal["filter", "nfilter"]):
+            if not getattr(self, f"_{f_type}_enabled"):
+                continue
+            # If any of the filter or nfilter evaluate to 'should filter' then filter out face
+            retval |= self._get_matches(f_type, normalized)
+        return retval
+
     def _filter_faces(self,
                       faces: list[DetectedFace],
                       sub_folders: list[str | None],
@@ -442,7 +470,8 @@ class IdentityFilter():
 
     def __call__(self,
                  faces: list[DetectedFace],
-                 sub_folders: list[str | None]) -> list[DetectedFace]:
+                 sub_folders: list[str | None],
+                 matches: list[bool] | None = None) -> list[DetectedFace]:
         """ Call the identity filter function
 
         Parameters
@@ -452,6 +481,10 @@ class IdentityFilter():
         sub_folders: list
             List of subfolder locations for any faces that have already been filtered when
             config option `save_filtered` has been enabled.
+        matches: list, optional
+            The result of :func:`get_matches` for each face in :attr:`faces`, if it has already
+            been calculated for the batch that the faces came from. ``None`` to calculate the
+            matches for the given faces. Default: ``None``
 
         Returns
         -------
@@ -462,25 +495,17 @@ class IdentityFilter():
         if not self._active:
             return faces
 
-        identities = np.array([face.identity["vggface2"] for face, fldr in zip(faces, sub_folders)
-                               if fldr is None])
-        logger.trace("face_count: %s, already_filtered: %s, identity_shape: %s",  # type: ignore
-                     len(faces), sum(x is not None for x in sub_folders), identities.shape)
+        if matches is None:
+            matches = self.get_matches(np.array([face.identity["vggface2"]
+                                                 for face in faces])).tolist()
+        final_filter = [match for match, fldr in zip(matches, sub_folders) if fldr is None]
+        logger.trace("face_count: %s, already_filtered: %s, final_filter: %s",  # type: ignore
+                     len(faces), sum(x is not None for x in sub_folders), final_filter)
 
-        if not np.any(identities):
+        if not final_filter:
             logger.trace("All faces already filtered: %s", sub_folders)  # type: ignore
             return faces
 
-        should_filter: list[np.ndarray] = []
-        for f_type in T.get_args(T.Literal["filter", "nfilter"]):
-            if not getattr(self, f"_{f_type}_enabled"):
-                continue
-            should_filter.append(self._get_matches(f_type, identities))
-
-        # If any of the filter or nfilter evaluate to 'should filter' then filter out face
-        final_filter: list[bool] = np.array(should_filter).max(axis=0).tolist()
-        logger.trace("should_filter: %s, final_filter: %s",  # type: ignore
-                     should_filter, final_filter)
         return self._filter_faces(faces, sub_folders, final_filter)
 
     def output_counts(self):
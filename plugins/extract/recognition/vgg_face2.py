@@ -3,11 +3,14 @@
 
 from __future__ import annotations
 import logging
+import sys
 import typing as T
 
 import numpy as np
 import psutil
 from fastcluster import linkage, linkage_vector
+from sklearn.cluster import MiniBatchKMeans
+from tqdm import tqdm
 
 from lib.model.layers import L2_normalize
 from lib.model.session import KSession
@@ -113,15 +116,37 @@ class Cluster():  # pylint:disable=too-few-public-methods
         The clustering method to use.
     threshold: float, optional
         The threshold to start creating bins for. Set to ``None`` to disable binning
+    mode: ['auto', 'exact', 'scalable'], optional
+        `'exact'` performs linkage on the full set of predictions, which requires memory that
+        grows with the square of the number of predictions. `'scalable'` partitions the
+        predictions with mini-batch k-means and only performs linkage within each partition, so
+        memory use is bounded by :attr:`leaf_size`. `'auto'` uses exact linkage if there is enough
+        RAM available, otherwise scalable clustering. Default: `'auto'`
+    leaf_size: int, optional
+        The maximum number of predictions to perform exact linkage on when using scalable
+        clustering. Default: `2000`
+    seed: int, optional
+        The random seed for scalable clustering. The output is deterministic for a given seed.
+        Default: `0`
     """
+    _max_branches = 256
+    """ int: The maximum number of partitions to split a group of predictions into at each level
+    of scalable clustering """
 
     def __init__(self,
                  predictions: np.ndarray,
                  method: T.Literal["single", "centroid", "median", "ward"],
-                 threshold: float | None = None) -> None:
-        logger.debug("Initializing: %s (predictions: %s, method: %s, threshold: %s)",
-                     self.__class__.__name__, predictions.shape, method, threshold)
+                 threshold: float | None = None,
+                 mode: T.Literal["auto", "exact", "scalable"] = "auto",
+                 leaf_size: int = 2000,
+                 seed: int = 0) -> None:
+        logger.debug("Initializing: %s (predictions: %s, method: %s, threshold: %s, mode: %s, "
+                     "leaf_size: %s, seed: %s)", self.__class__.__name__, predictions.shape,
+                     method, threshold, mode, leaf_size, seed)
         self._num_predictions = predictions.shape[0]
+        self._mode = mode
+        self._leaf_size = max(leaf_size, 2)
+        self._seed = seed
 
         self._should_output_bins = threshold is not None
         self._threshold = 0.0 if threshold is None else threshold
@@ -186,10 +211,32 @@ class Cluster():  # pylint:disable=too-few-public-methods
         logger.debug(retval)
         return retval
 
+    def _use_scalable_linkage(self) -> bool:
+        """ Decide whether scalable clustering should be used for the selected :attr:`_mode`
+
+        Returns
+        -------
+        bool
+            ``True`` if scalable clustering should be used. ``False`` if exact linkage should be
+            used
+        """
+        if self._mode != "auto":
+            return self._mode == "scalable"
+        free_ram = psutil.virtual_memory().available
+        linkage_required = (self._num_predictions ** 2) * 24 / 1.8
+        retval = self._num_predictions > self._leaf_size and linkage_required >= free_ram
+        if retval:
+            logger.info("Not enough RAM to perform linkage clustering on %s faces. Using "
+                        "scalable clustering", self._num_predictions)
+        logger.debug("free_ram: %sMB, linkage_required: %sMB, scalable: %s",
+                     int(free_ram / (1024 * 1024)), int(linkage_required / (1024 * 1024)),
+                     retval)
+        return retval
+
     def _do_linkage(self,
                     predictions: np.ndarray,
                     method: T.Literal["single", "centroid", "median", "ward"]) -> np.ndarray:
-        """ Use FastCluster to perform vector or standard linkage
+        """ Use FastCluster to perform vector or standard linkage, or perform scalable linkage
 
         Parameters
         ----------
@@ -205,13 +252,214 @@ class Cluster():  # pylint:disable=too-few-public-methods
             The [`num_predictions`, 4] linkage vector
         """
         dims = predictions.shape[-1]
-        if self._use_vector_linkage(dims):
+        if self._use_scalable_linkage():
+            retval = self._scalable_linkage(predictions, method)
+        elif self._use_vector_linkage(dims):
             retval = linkage_vector(predictions, method=method)
         else:
             retval = linkage(predictions, method=method, preserve_input=False)
         logger.debug("Linkage shape: %s", retval.shape)
         return retval
 
+    def _scalable_linkage(self,
+                          predictions: np.ndarray,
+                          method: T.Literal["single", "centroid", "median", "ward"]
+                          ) -> np.ndarray:
+        """ Build a linkage tree for a large number of predictions with bounded memory use.
+
+        The predictions are recursively partitioned with mini-batch k-means until each partition
+        holds no more than :attr:`_leaf_size` predictions. Exact linkage is performed within each
+        partition, and the partitions are then merged on the distances between their centroids.
+
+        Parameters
+        ----------
+        predictions: :class:`numpy.ndarray`
+            A stacked matrix of vgg_face2 predictions of the shape (`N`, `D`)
+        method: ['single','centroid','median','ward']
+            The clustering method to use within each partition. Partitions are merged with ward
+            distances for the `'ward'` method, otherwise with the distance between centroids
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The [`num_predictions` - 1, 4] linkage vector in the same format as fastcluster
+        """
+        rows: list[list[float]] = []
+        with tqdm(total=self._num_predictions,
+                  desc="Clustering",
+                  file=sys.stdout,
+                  leave=False) as pbar:
+            self._build_tree(predictions, np.arange(self._num_predictions), method, rows, pbar)
+        return np.array(rows, dtype="float64")
+
+    def _build_tree(self,
+                    predictions: np.ndarray,
+                    indices: np.ndarray,
+                    method: T.Literal["single", "centroid", "median", "ward"],
+                    rows: list[list[float]],
+                    pbar: tqdm) -> int:
+        """ Recursively add the linkage rows for a group of predictions to the linkage tree
+
+        Parameters
+        ----------
+        predictions: :class:`numpy.ndarray`
+            The full matrix of vgg_face2 predictions
+        indices: :class:`numpy.ndarray`
+            The indices into :attr:`predictions` of the group to add
+        method: ['single','centroid','median','ward']
+            The clustering method to use
+        rows: list
+            The linkage rows that have been created so far. Rows for this group are appended
+        pbar: :class:`tqdm.tqdm`
+            The progress bar to update with the number of predictions that have been clustered
+
+        Returns
+        -------
+        int
+            The node id in the linkage tree of the root of the group
+        """
+        if len(indices) <= self._leaf_size:
+            return self._leaf_linkage(predictions, indices, method, rows, pbar)
+
+        count = min(int(np.ceil(len(indices) / self._leaf_size)), self._max_branches)
+        data = predictions if len(indices) == self._num_predictions else predictions[indices]
+        labels = MiniBatchKMeans(n_clusters=count,
+                                 batch_size=max(1024, 4 * count),
+                                 n_init=3,
+                                 random_state=self._seed).fit_predict(data)
+        del data
+        if len(np.unique(labels)) < 2:  # Identical predictions. Split into equal groups
+            labels = np.arange(len(indices)) * count // len(indices)
+
+        nodes: list[int] = []
+        sizes: list[int] = []
+        centroids: list[np.ndarray] = []
+        for label in np.unique(labels):
+            members = indices[labels == label]
+            nodes.append(self._build_tree(predictions, members, method, rows, pbar))
+            sizes.append(len(members))
+            centroids.append(predictions[members].mean(axis=0, dtype="float64"))
+        return self._merge_nodes(nodes, np.array(sizes), np.array(centroids), method, rows)
+
+    def _leaf_linkage(self,
+                      predictions: np.ndarray,
+                      indices: np.ndarray,
+                      method: T.Literal["single", "centroid", "median", "ward"],
+                      rows: list[list[float]],
+                      pbar: tqdm) -> int:
+        """ Perform exact linkage on a group of predictions and add the rows to the linkage tree
+
+        Parameters
+        ----------
+        predictions: :class:`numpy.ndarray`
+            The full matrix of vgg_face2 predictions
+        indices: :class:`numpy.ndarray`
+            The indices into :attr:`predictions` of the group to perform linkage on
+        method: ['single','centroid','median','ward']
+            The clustering method to use
+        rows: list
+            The linkage rows that have been created so far. Rows for this group are appended
+        pbar: :class:`tqdm.tqdm`
+            The progress bar to update with the number of predictions that have been clustered
+
+        Returns
+        -------
+        int
+            The node id in the linkage tree of the root of the group
+        """
+        pbar.update(len(indices))
+        if len(indices) == 1:
+            return int(indices[0])
+        local = linkage(predictions[indices], method=method, preserve_input=False)
+        offset = self._num_predictions + len(rows)
+        # Map the local leaf and node ids to their ids in the full tree
+        lookup = np.concatenate([indices, np.arange(offset, offset + local.shape[0])])
+        local[:, :2] = lookup[local[:, :2].astype("int64")]
+        rows.extend(local.tolist())
+        return offset + local.shape[0] - 1
+
+    @classmethod
+    def _node_distances(cls,
+                        centroid: np.ndarray,
+                        size: int,
+                        centroids: np.ndarray,
+                        sizes: np.ndarray,
+                        method: T.Literal["single", "centroid", "median", "ward"]
+                        ) -> np.ndarray:
+        """ Obtain the distances between a node and a set of nodes from their centroids
+
+        Parameters
+        ----------
+        centroid: :class:`numpy.ndarray`
+            The centroid of the node to obtain distances from
+        size: int
+            The number of predictions within the node
+        centroids: :class:`numpy.ndarray`
+            The centroids of the nodes to obtain distances to
+        sizes: :class:`numpy.ndarray`
+            The number of predictions within each of the nodes to obtain distances to
+        method: ['single','centroid','median','ward']
+            The clustering method in use
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The distance to each node. Ward distances for the `'ward'` method, otherwise the
+            euclidean distance between centroids
+        """
+        retval = np.linalg.norm(centroids - centroid, axis=-1)
+        if method == "ward":
+            retval *= np.sqrt(2.0 * size * sizes / (size + sizes))
+        return retval
+
+    def _merge_nodes(self,
+                     nodes: list[int],
+                     sizes: np.ndarray,
+                     centroids: np.ndarray,
+                     method: T.Literal["single", "centroid", "median", "ward"],
+                     rows: list[list[float]]) -> int:
+        """ Agglomerate the root nodes of partitions into a single tree
+
+        Parameters
+        ----------
+        nodes: list
+            The node ids of the roots of each partition
+        sizes: :class:`numpy.ndarray`
+            The number of predictions within each partition
+        centroids: :class:`numpy.ndarray`
+            The centroid of each partition
+        method: ['single','centroid','median','ward']
+            The clustering method in use
+        rows: list
+            The linkage rows that have been created so far. Merge rows are appended
+
+        Returns
+        -------
+        int
+            The node id in the linkage tree of the root of the merged partitions
+        """
+        count = len(nodes)
+        distances = np.array([self._node_distances(centroid, size, centroids, sizes, method)
+                              for centroid, size in zip(centroids, sizes)])
+        np.fill_diagonal(distances, np.inf)
+        merged = 0
+        for _ in range(count - 1):
+            merged, other = sorted(divmod(int(np.argmin(distances)), count))
+            total = sizes[merged] + sizes[other]
+            rows.append([nodes[merged], nodes[other], distances[merged, other], total])
+            centroids[merged] = (centroids[merged] * sizes[merged] +
+                                 centroids[other] * sizes[other]) / total
+            sizes[merged] = total
+            nodes[merged] = self._num_predictions + len(rows) - 1
+
+            distances[other, :] = np.inf
+            distances[:, other] = np.inf
+            update = self._node_distances(centroids[merged], total, centroids, sizes, method)
+            update[np.isinf(distances[merged])] = np.inf  # Already merged and self
+            distances[merged, :] = update
+            distances[:, merged] = update
+        return nodes[merged]
+
     def _process_leaf_node(self,
                            current_index: int,
                            current_bin: int) -> list[tuple[int, int]]:
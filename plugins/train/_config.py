@@ -274,6 +274,37 @@ class Config(FaceswapConfig):
                 "reason (e.g. power outage, Out of Memory Error, NaN detected) then the "
                 "optimizer weights will NOT be saved."))
 
+        self.add_item(
+            section=section,
+            title="background_save",
+            datatype=bool,
+            default=False,
+            fixed=False,
+            group=_("saving"),
+            info=_(
+                "Save the model in the background. The model's weights are copied to system "
+                "memory at each save iteration and are then written to disk in a background "
+                "thread, so that training can continue while the model is being saved. This can "
+                "significantly reduce the time that training is paused for on each save for large "
+                "models, at the cost of holding a copy of the model in system memory.\n"
+                "NB: Saves that include the optimizer weights (see 'save_optimizer') are always "
+                "performed in the foreground."))
+        self.add_item(
+            section=section,
+            title="background_save_queue",
+            datatype=int,
+            default=1,
+            min_max=(1, 4),
+            rounding=1,
+            fixed=False,
+            group=_("saving"),
+            info=_(
+                "The maximum number of background saves that can be waiting to be written to "
+                "disk. If this number is reached, then training will pause until the oldest save "
+                "has been written. Higher values can help smooth out slow disks, but each waiting "
+                "save holds a full copy of the model's weights in system memory. Only used if "
+                "'background_save' is enabled."))
+
         self.add_item(
             section=section,
             title="lr_finder_iterations",
@@ -335,6 +366,24 @@ class Config(FaceswapConfig):
             fixed=False,
             gui_radio=True,
             group=_("optimizer"))
+        self.add_item(
+            section=section,
+            title="gradient_accumulation",
+            datatype=int,
+            default=1,
+            min_max=(1, 32),
+            rounding=1,
+            group=_("optimizer"),
+            info=_(
+                "The number of batches to accumulate gradients over before the model's weights "
+                "are updated. Each iteration trains this many batches, so the effective batch "
+                "size is the batch size multiplied by this value, without needing the VRAM for "
+                "the larger batch. Useful for training with a larger batch size than your GPU "
+                "can hold. Iterations will take proportionally longer. Set to 1 to update the "
+                "weights after every batch."
+                "\n\nNB: Gradient accumulation is not used with the 'mirrored' or "
+                "'central-storage' distribution strategies."),
+            fixed=True)
         self.add_item(
             section=section,
             title="reflect_padding",
@@ -390,6 +439,62 @@ class Config(FaceswapConfig):
                 "protection will stop training immediately in the event of a NaN. The last save "
                 "will not contain the NaN, so you may still be able to rescue your model."),
             fixed=False)
+        self.add_item(
+            section=section,
+            title="compiled_step",
+            datatype=str,
+            default="off",
+            choices=["off", "function", "xla"],
+            gui_radio=True,
+            group=_("network"),
+            info=_(
+                "Run each training iteration as a single compiled step rather than through "
+                "Keras' default training loop. Loss values are kept on the GPU and are only "
+                "fetched every 'loss_fetch_interval' iterations, so the GPU does not need to wait "
+                "for the CPU between iterations. This gives the greatest speed up for small "
+                "models."
+                "\n\toff - Use Keras' default training loop."
+                "\n\tfunction - Run the training iteration as a compiled Tensorflow function."
+                "\n\txla - As 'function', but also compile the training iteration with XLA. "
+                "This can be faster again, but the first iteration will take longer to start. "
+                "If the model cannot be compiled with XLA then 'function' is used instead."
+                "\n\nNB: The compiled step is not used with the 'mirrored' or 'central-storage' "
+                "distribution strategies."),
+            fixed=False)
+        self.add_item(
+            section=section,
+            title="loss_fetch_interval",
+            datatype=int,
+            default=10,
+            min_max=(1, 100),
+            rounding=1,
+            group=_("network"),
+            info=_(
+                "[Compiled step only] The number of iterations between fetching the loss values "
+                "from the GPU. The loss is displayed, logged to TensorBoard and checked for NaNs "
+                "for every iteration when it is fetched. Higher values reduce the time the GPU "
+                "waits for the CPU, but the loss display is updated less often and a NaN may not "
+                "be detected until up to this many iterations after it occurs. Loss is always "
+                "fetched before the model is saved."),
+            fixed=False)
+        self.add_item(
+            section=section,
+            title="log_interval",
+            datatype=int,
+            default=1,
+            min_max=(1, 1000),
+            rounding=1,
+            group=_("network"),
+            info=_(
+                "The number of iterations to collect loss values for before they are logged. The "
+                "mean loss over the interval is displayed and logged to TensorBoard, with the "
+                "minimum and maximum loss logged under 'loss_min' and 'loss_max'. The loss for "
+                "every iteration is still stored in the model's history. Higher values give much "
+                "smaller TensorBoard logs that are quicker for the GUI to read, but the loss "
+                "display is updated less often and a NaN may not be detected until up to this "
+                "many iterations after it occurs. Loss is always logged before the model is "
+                "saved."),
+            fixed=False)
         self.add_item(
             section=section,
             title="convert_batchsize",
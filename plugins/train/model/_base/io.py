@@ -7,6 +7,7 @@ The objects in this module should not be called directly, but are called from
 
 This module handles:
     - The loading, saving and backing up of keras models to and from disk.
+    - The writing of model saves to disk in a background thread.
     - The loading and freezing of weights for model plugins.
 """
 from __future__ import annotations
@@ -15,9 +16,13 @@ import os
 import sys
 import typing as T
 
+from queue import Full, Queue
+
+import numpy as np
 import tensorflow as tf
 
 from lib.model.backup_restore import Backup
+from lib.multithreading import MultiThread
 from lib.utils import FaceswapError
 
 if T.TYPE_CHECKING:
@@ -55,6 +60,112 @@ def get_all_sub_models(
     return models
 
 
+class _Checkpoint(T.NamedTuple):
+    """ A snapshot of the model, taken at a save iteration, to be written to disk by
+    :class:`_CheckpointWriter` """
+    weights: list[np.ndarray]
+    """list: The model weights copied to host memory """
+    state: bytes
+    """bytes: The serialized state file contents """
+    backup: bool
+    """bool: ``True`` if the existing model and state files should be backed up before being
+    replaced """
+    message: str
+    """str: The message to log once the save has completed """
+
+
+class _CheckpointWriter():
+    """ Writes snapshots of a model to disk in a background thread, so that training is not
+    blocked whilst the model is serialized.
+
+    The snapshot's weights are loaded into a copy of the model held on the CPU, which is then
+    saved to a temporary file. The temporary files are renamed over the existing model and state
+    files once they have been fully written, so an interrupted save can never leave a partially
+    written model in place.
+
+    Parameters
+    ----------
+    model: :class:`tensorflow.keras.models.Model`
+        The model that snapshots are taken from
+    filenames: tuple[str, str]
+        The full paths to the model file and the state file
+    queue_depth: int
+        The maximum number of snapshots that can be waiting to be written. Requests to write
+        further snapshots block until there is space in the queue
+    """
+    def __init__(self,
+                 model: tf.keras.models.Model,
+                 filenames: tuple[str, str],
+                 queue_depth: int) -> None:
+        logger.debug("Initializing %s: (model: %s, filenames: %s, queue_depth: %s)",
+                     self.__class__.__name__, model.name, filenames, queue_depth)
+        self._model = model
+        self._filenames = filenames
+        self._shadow: tf.keras.models.Model | None = None
+        self._queue: Queue[_Checkpoint] = Queue(maxsize=queue_depth)
+        self._thread = MultiThread(self._run, name="checkpoint_writer")
+        self._thread.start()
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    def put(self, checkpoint: _Checkpoint) -> None:
+        """ Queue a snapshot for writing to disk. Blocks whilst the queue is full.
+
+        Parameters
+        ----------
+        checkpoint: :class:`_Checkpoint`
+            The snapshot to write to disk
+        """
+        while True:
+            self._thread.check_and_raise_error()
+            try:
+                self._queue.put(checkpoint, timeout=1)
+                break
+            except Full:
+                logger.debug("Waiting for background saves to complete")
+        logger.debug("Queued background save (pending: %s)", self._queue.unfinished_tasks)
+
+    def flush(self) -> None:
+        """ Block until all queued snapshots have been written to disk """
+        while self._queue.unfinished_tasks and self._thread.is_alive():
+            self._thread.check_and_raise_error()
+            with self._queue.all_tasks_done:
+                self._queue.all_tasks_done.wait(timeout=1)
+        self._thread.check_and_raise_error()
+
+    def _run(self) -> None:
+        """ Write queued snapshots to disk until the process exits """
+        while True:
+            checkpoint = self._queue.get()
+            self._write(checkpoint)
+            self._queue.task_done()
+
+    def _write(self, checkpoint: _Checkpoint) -> None:
+        """ Write a snapshot to temporary files and rename them over the model and state files.
+
+        Parameters
+        ----------
+        checkpoint: :class:`_Checkpoint`
+            The snapshot to write to disk
+        """
+        model_file, state_file = self._filenames
+        logger.debug("Writing background save: '%s'", model_file)
+        if self._shadow is None:
+            with tf.device("/CPU:0"):
+                self._shadow = kmodels.model_from_json(self._model.to_json())
+        self._shadow.set_weights(checkpoint.weights)
+        self._shadow.save(f"{model_file}.tmp", include_optimizer=False, save_format="h5")
+        with open(f"{state_file}.tmp", "wb") as out_file:
+            out_file.write(checkpoint.state)
+
+        if checkpoint.backup:
+            Backup.backup_model(model_file)
+            Backup.backup_model(state_file)
+        os.replace(f"{model_file}.tmp", model_file)
+        os.replace(f"{state_file}.tmp", state_file)
+        print("")  # Insert a new line to avoid spamming the same row as loss output
+        logger.info(checkpoint.message)
+
+
 class IO():
     """ Model saving and loading functions.
 
@@ -74,16 +185,22 @@ class IO():
         When to save the optimizer weights. `"never"` never saves the optimizer weights. `"always"`
         always saves the optimizer weights. `"exit"` only saves the optimizer weights on an exit
         request.
+    background_queue: int, optional
+        The maximum number of model saves that can be waiting to be written to disk in the
+        background. `0` to save the model in the foreground. Default: `0`
     """
     def __init__(self,
                  plugin: ModelBase,
                  model_dir: str,
                  is_predict: bool,
-                 save_optimizer: T.Literal["never", "always", "exit"]) -> None:
+                 save_optimizer: T.Literal["never", "always", "exit"],
+                 background_queue: int = 0) -> None:
         self._plugin = plugin
         self._is_predict = is_predict
         self._model_dir = model_dir
         self._save_optimizer = save_optimizer
+        self._background_queue = 0 if is_predict else background_queue
+        self._writer: _CheckpointWriter | None = None
         self._history: list[list[float]] = [[], []]  # Loss histories per save iteration
         self._backup = Backup(self._model_dir, self._plugin.name)
 
@@ -187,18 +304,38 @@ class IO():
         the current save iteration. This is not a bug, but protection against long save times, as
         models can get quite large, so renaming the current model file rather than copying it can
         save substantial amount of time.
+
+        When saving in the background, the model weights and state are copied to host memory and
+        the save is queued for writing to disk. Saves that include the optimizer weights, and
+        saves on exit, are always written in the foreground, after any queued saves have been
+        written.
         """
         logger.debug("Backing up and saving models")
         print("")  # Insert a new line to avoid spamming the same row as loss output
         save_averages = self._get_save_averages()
-        if save_averages and self._should_backup(save_averages):
-            self._backup.backup_model(self.filename)
-            self._backup.backup_model(self._plugin.state.filename)
+        backup = bool(save_averages) and self._should_backup(save_averages)
 
         include_optimizer = (force_save_optimizer or
                              self._save_optimizer == "always" or
                              (self._save_optimizer == "exit" and is_exit))
 
+        msg = "[Saved optimizer state for Snapshot]" if force_save_optimizer else "[Saved model]"
+        if save_averages:
+            lossmsg = [f"face_{side}: {avg:.5f}"
+                       for side, avg in zip(("a", "b"), save_averages)]
+            msg += f" - Average loss since last save: {', '.join(lossmsg)}"
+
+        if self._background_queue and not include_optimizer and not is_exit:
+            self._save_background(backup, msg)
+            return
+
+        if self._writer is not None:
+            self._writer.flush()
+
+        if backup:
+            self._backup.backup_model(self.filename)
+            self._backup.backup_model(self._plugin.state.filename)
+
         try:
             self._plugin.model.save(self.filename, include_optimizer=include_optimizer)
         except ValueError as err:
@@ -210,14 +347,29 @@ class IO():
                 raise
 
         self._plugin.state.save()
-
-        msg = "[Saved optimizer state for Snapshot]" if force_save_optimizer else "[Saved model]"
-        if save_averages:
-            lossmsg = [f"face_{side}: {avg:.5f}"
-                       for side, avg in zip(("a", "b"), save_averages)]
-            msg += f" - Average loss since last save: {', '.join(lossmsg)}"
         logger.info(msg)
 
+    def _save_background(self, backup: bool, message: str) -> None:
+        """ Snapshot the model weights and state to host memory and queue them for writing to disk
+        in the background.
+
+        Parameters
+        ----------
+        backup: bool
+            ``True`` if the existing model files should be backed up prior to being replaced
+        message: str
+            The message to log once the model has been written
+        """
+        if self._writer is None:
+            self._writer = _CheckpointWriter(self._plugin.model,
+                                             (self.filename, self._plugin.state.filename),
+                                             self._background_queue)
+        logger.debug("Queueing background save")
+        self._writer.put(_Checkpoint(self._plugin.model.get_weights(),
+                                     self._plugin.state.serialize(),
+                                     backup,
+                                     message))
+
     def _get_save_averages(self) -> list[float]:
         """ Return the average loss since the last save iteration and reset historical loss """
         logger.debug("Getting save averages")
@@ -276,6 +428,8 @@ class IO():
         the latest save, hence iteration being reduced by 1.
         """
         logger.debug("Performing snapshot. Iterations: %s", self._plugin.iterations)
+        if self._writer is not None:
+            self._writer.flush()
         self._backup.snapshot_models(self._plugin.iterations - 1)
         logger.debug("Performed snapshot")
 
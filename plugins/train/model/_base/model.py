@@ -79,6 +79,7 @@ class ModelBase():
         self._args = arguments
         self._is_predict = predict
         self._model: tf.keras.models.Model | None = None
+        self._accumulation_steps = 1
 
         self._configfile = arguments.configfile if hasattr(arguments, "configfile") else None
         self._load_config()
@@ -93,7 +94,12 @@ class ModelBase():
                                 "use. Please select a mask or disable 'Learn Mask'.")
 
         self._mixed_precision = self.config["mixed_precision"]
-        self._io = IO(self, model_dir, self._is_predict, self.config["save_optimizer"])
+        background_queue = self.config["background_save_queue"]
+        self._io = IO(self,
+                      model_dir,
+                      self._is_predict,
+                      self.config["save_optimizer"],
+                      background_queue if self.config["background_save"] else 0)
         self._check_multiple_models()
 
         self._state = State(model_dir,
@@ -179,6 +185,12 @@ class ModelBase():
         """ int: The total number of iterations that the model has trained. """
         return self._state.iterations
 
+    @property
+    def accumulation_steps(self) -> int:
+        """ int: The number of batches that gradients are accumulated over for each update of the
+        model's weights. Each training iteration trains this many batches. """
+        return self._accumulation_steps
+
     # Private properties
     @property
     def _config_section(self) -> str:
@@ -381,10 +393,17 @@ class ModelBase():
         if self.state.model_needs_rebuild:
             self._model = self._settings.check_model_precision(self._model, self._state)
 
+        self._accumulation_steps = T.cast(int, self.config.get("gradient_accumulation", 1))
+        if self._accumulation_steps > 1 and tf.distribute.has_strategy():
+            logger.warning("Gradient accumulation is not supported with the selected distribution "
+                           "strategy. Disabling.")
+            self._accumulation_steps = 1
+
         optimizer = Optimizer(self.config["optimizer"],
                               self.config["learning_rate"],
                               self.config["autoclip"],
-                              10 ** int(self.config["epsilon_exponent"])).optimizer
+                              10 ** int(self.config["epsilon_exponent"]),
+                              accumulation_steps=self._accumulation_steps).optimizer
         if self._settings.use_mixed_precision:
             optimizer = self._settings.loss_scale_optimizer(optimizer)
 
@@ -573,16 +592,21 @@ class State():
         logger.debug("Adding session loss_names: %s", loss_names)
         self._sessions[self._session_id]["loss_names"] = loss_names
 
-    def add_session_batchsize(self, batch_size: int) -> None:
+    def add_session_batchsize(self, batch_size: int, accumulation_steps: int = 1) -> None:
         """ Add the session batch size to the sessions dictionary.
 
         Parameters
         ----------
         batch_size: int
             The batch size for the current training session
+        accumulation_steps: int, optional
+            The number of batches trained for each iteration of the current training session when
+            gradient accumulation is enabled. Default: `1`
         """
-        logger.debug("Adding session batch size: %s", batch_size)
+        logger.debug("Adding session batch size: %s (accumulation_steps: %s)",
+                     batch_size, accumulation_steps)
         self._sessions[self._session_id]["batchsize"] = batch_size
+        self._sessions[self._session_id]["accumulation_steps"] = accumulation_steps
 
     def increment_iterations(self) -> None:
         """ Increment :attr:`iterations` and session iterations by 1. """
@@ -620,16 +644,29 @@ class State():
         logger.debug("Loaded state: %s", state)
         self._replace_config(config_changeable_items)
 
+    def _get_state(self) -> dict[str, T.Any]:
+        """ dict: The state values to be saved to the serialized state file """
+        return {"name": self._name,
+                "sessions": self._sessions,
+                "lowest_avg_loss": self._lowest_avg_loss,
+                "iterations": self._iterations,
+                "mixed_precision_layers": self._mixed_precision_layers,
+                "config": _CONFIG}
+
+    def serialize(self) -> bytes:
+        """ Serialize the current state values, for writing to the state file at a later time.
+
+        Returns
+        -------
+        bytes
+            The state values in the format of the serialized state file
+        """
+        return self._serializer.marshal(self._get_state())
+
     def save(self) -> None:
         """ Save the state values to the serialized state file. """
         logger.debug("Saving State")
-        state = {"name": self._name,
-                 "sessions": self._sessions,
-                 "lowest_avg_loss": self._lowest_avg_loss,
-                 "iterations": self._iterations,
-                 "mixed_precision_layers": self._mixed_precision_layers,
-                 "config": _CONFIG}
-        self._serializer.save(self._filename, state)
+        self._serializer.save(self._filename, self._get_state())
         logger.debug("Saved State")
 
     def _replace_config(self, config_changeable_items) -> None:
@@ -655,7 +692,8 @@ class State():
                                                         "mask_loss_function": "mse",
                                                         "l2_reg_term": 100,
                                                         "optimizer": "adam",
-                                                        "mixed_precision": False}
+                                                        "mixed_precision": False,
+                                                        "gradient_accumulation": 1}
         for key, val in _CONFIG.items():
             if key not in self._config.keys():
                 setting: ConfigValueType = legacy_defaults.get(key, val)
@@ -290,15 +290,19 @@ class Optimizer():  # pylint:disable=too-few-public-methods
         ``True`` if AutoClip should be enabled otherwise ``False``
     epsilon: float
         The value to use for the epsilon of the optimizer
+    accumulation_steps: int, optional
+        The number of batches to accumulate gradients for before updating the model's weights.
+        Default: `1` (no gradient accumulation)
     """
     def __init__(self,
                  optimizer: str,
                  learning_rate: float,
                  autoclip: bool,
-                 epsilon: float) -> None:
+                 epsilon: float,
+                 accumulation_steps: int = 1) -> None:
         logger.debug("Initializing %s: (optimizer: %s, learning_rate: %s, autoclip: %s, "
-                     ", epsilon: %s)", self.__class__.__name__, optimizer, learning_rate,
-                     autoclip, epsilon)
+                     ", epsilon: %s, accumulation_steps: %s)", self.__class__.__name__, optimizer,
+                     learning_rate, autoclip, epsilon, accumulation_steps)
         valid_optimizers = {"adabelief": (optimizers.AdaBelief,
                                           {"beta_1": 0.5, "beta_2": 0.99, "epsilon": epsilon}),
                             "adam": (optimizers.Adam,
@@ -310,7 +314,7 @@ class Optimizer():  # pylint:disable=too-few-public-methods
         self._optimizer: Callable = optimizer_info[0]
         self._kwargs: dict[str, T.Any] = optimizer_info[1]
 
-        self._configure(learning_rate, autoclip)
+        self._configure(learning_rate, autoclip, accumulation_steps)
         logger.verbose("Using %s optimizer", optimizer.title())  # type:ignore[attr-defined]
         logger.debug("Initialized: %s", self.__class__.__name__)
 
@@ -321,7 +325,8 @@ class Optimizer():  # pylint:disable=too-few-public-methods
 
     def _configure(self,
                    learning_rate: float,
-                   autoclip: bool) -> None:
+                   autoclip: bool,
+                   accumulation_steps: int) -> None:
         """ Configure the optimizer based on user settings.
 
         Parameters
@@ -330,8 +335,14 @@ class Optimizer():  # pylint:disable=too-few-public-methods
             The selected learning rate to use
         autoclip: bool
             ``True`` if AutoClip should be enabled otherwise ``False``
+        accumulation_steps: int
+            The number of batches to accumulate gradients for before updating the weights
         """
         self._kwargs["learning_rate"] = learning_rate
+        if accumulation_steps > 1:
+            logger.info("Enabling Gradient Accumulation over %s batches", accumulation_steps)
+            self._optimizer = optimizers.accumulate_gradients(self._optimizer)
+            self._kwargs["accumulation_steps"] = accumulation_steps
         if not autoclip:
             return
 
@@ -9,6 +9,7 @@ with "original" unique code split out to the original plugin.
 from __future__ import annotations
 import logging
 import os
+import threading
 import time
 import typing as T
 
@@ -20,7 +21,8 @@ from tensorflow.python.framework import (  # pylint:disable=no-name-in-module
     errors_impl as tf_errors)
 
 from lib.image import hex_to_rgb
-from lib.training import Feeder, LearningRateFinder
+from lib.multithreading import MultiThread
+from lib.training import CompiledTrainStep, Feeder, LearningRateFinder
 from lib.utils import FaceswapError, get_folder, get_image_paths
 from plugins.train._config import Config
 
@@ -88,11 +90,12 @@ class TrainerBase():
         if self._exit_early:
             return
 
-        self._model.state.add_session_batchsize(batch_size)
+        self._model.state.add_session_batchsize(batch_size, self._model.accumulation_steps)
         self._images = images
         self._sides = sorted(key for key in self._images.keys())
 
         self._tensorboard = self._set_tensorboard()
+        self._renderer = _PreviewRenderer()
         self._samples = _Samples(self._model,
                                  self._model.coverage_ratio,
                                  T.cast(int, self._config["mask_opacity"]),
@@ -106,7 +109,12 @@ class TrainerBase():
                                      T.cast(int, self._config["mask_opacity"]),
                                      T.cast(str, self._config["mask_color"]),
                                      self._feeder,
-                                     self._images)
+                                     self._images,
+                                     self._renderer)
+        self._train_step = self._get_train_step()
+        self._pending_loss: list[tuple[tf.Tensor, dict[T.Literal["feed", "wait"], float]]] = []
+        self._loss_buffer = _LossBuffer(T.cast(int, self._config.get("log_interval", 1)))
+        self._session_steps = 0
         logger.debug("Initialized %s", self.__class__.__name__)
 
     @property
@@ -167,6 +175,24 @@ class TrainerBase():
                     f"{learning_rate:.1e}")
         return False
 
+    def _get_train_step(self) -> CompiledTrainStep | None:
+        """ Obtain the compiled training step, if it has been requested in the configuration
+
+        Returns
+        -------
+        :class:`~lib.training.train_step.CompiledTrainStep` or ``None``
+            The compiled training step or ``None`` if Keras' default training loop is to be used
+        """
+        mode = self._config.get("compiled_step", "off")
+        if mode == "off":
+            return None
+        if not CompiledTrainStep.is_supported(self._model.model):
+            logger.warning("The compiled training step is not supported for the selected "
+                           "distribution strategy. Using Keras' default training loop.")
+            return None
+        logger.info("Using compiled training step (%s)", mode)
+        return CompiledTrainStep(self._model.model, jit_compile=mode == "xla")
+
     def _set_tensorboard(self) -> tf.keras.callbacks.TensorBoard:
         """ Set up Tensorboard callback for logging loss.
 
@@ -244,10 +270,17 @@ class TrainerBase():
                        self._model.iterations - 1 >= snapshot_interval and
                        (self._model.iterations - 1) % snapshot_interval == 0)
 
-        model_inputs, model_targets = self._feeder.get_batch()
+        force_log = do_snapshot or viewer is not None or bool(timelapse_kwargs)
 
         try:
-            loss: list[float] = self._model.model.train_on_batch(model_inputs, y=model_targets)
+            loss, timings = self._train_batches()
+            if self._train_step is not None:
+                self._pending_loss.append((T.cast(tf.Tensor, loss), timings))
+                fetch_interval = T.cast(int, self._config.get("loss_fetch_interval", 1))
+                if force_log or len(self._pending_loss) >= fetch_interval:
+                    self._fetch_loss()
+            else:
+                self._buffer_loss(T.cast(list[float], loss), timings)
         except tf_errors.ResourceExhaustedError as err:
             msg = ("You do not have enough GPU memory available to train the selected model at "
                    "the selected settings. You can try a number of things:"
@@ -259,39 +292,135 @@ class TrainerBase():
                    "\n4) Use a more lightweight model, or select the model's 'LowMem' option "
                    "(in config) if it has one.")
             raise FaceswapError(msg) from err
-        self._log_tensorboard(loss)
-        loss = self._collate_and_store_loss(loss[1:])
-        self._print_loss(loss)
+        if force_log or self._loss_buffer.is_full:
+            self._log_loss()
         if do_snapshot:
             self._model.io.snapshot()
         self._update_viewers(viewer, timelapse_kwargs)
 
-    def _log_tensorboard(self, loss: list[float]) -> None:
-        """ Log current loss to Tensorboard log files
+    def _train_batches(self) -> tuple[list[float] | tf.Tensor,
+                                      dict[T.Literal["feed", "wait"], float]]:
+        """ Train the model on the batches for one iteration.
+
+        When gradient accumulation is enabled, the model is trained on
+        :attr:`~plugins.train.model._base.ModelBase.accumulation_steps` batches, which the
+        optimizer accumulates into a single update of the model's weights.
+
+        Returns
+        -------
+        loss: list or :class:`tf.Tensor`
+            The mean loss over the batches. A tensor still held on the device if the compiled
+            training step is in use, otherwise a list of floats
+        timings: dict
+            The total batch feed timings for the batches
+        """
+        losses: list[tf.Tensor] | list[list[float]] = []
+        timings: dict[T.Literal["feed", "wait"], float] = {"feed": 0.0, "wait": 0.0}
+        for _ in range(self._model.accumulation_steps):
+            model_inputs, model_targets = self._feeder.get_batch()
+            for key, value in self._feeder.timings.items():
+                timings[key] += value
+            if self._train_step is not None:
+                losses.append(self._train_step(model_inputs, model_targets))
+            else:
+                losses.append(self._model.model.train_on_batch(model_inputs, y=model_targets))
+
+        if len(losses) == 1:
+            return losses[0], timings
+        if self._train_step is not None:
+            return tf.reduce_mean(tf.stack(losses), axis=0), timings
+        return np.mean(losses, axis=0).tolist(), timings
+
+    def flush_loss(self) -> None:
+        """ Fetch any loss values that are still held on the device by the compiled training step
+        and log, store and output all loss values that have not yet been logged.
+
+        Must be called prior to saving the model, so that the model's loss history is up to date.
+        """
+        self._fetch_loss()
+        self._log_loss()
+
+    def _fetch_loss(self) -> None:
+        """ Fetch the loss values from the compiled training step that are still held on the
+        device and add them to the loss buffer. Does nothing if the compiled training step is not
+        in use. """
+        if not self._pending_loss:
+            return
+        losses = tf.stack([loss for loss, _ in self._pending_loss]).numpy()
+        logger.trace("Fetched loss for %s iterations", len(losses))  # type:ignore[attr-defined]
+        for loss, (_, timings) in zip(losses, self._pending_loss):
+            self._buffer_loss(loss, timings)
+        self._pending_loss = []
+
+    def _buffer_loss(self,
+                     loss: list[float] | np.ndarray,
+                     timings: dict[T.Literal["feed", "wait"], float]) -> None:
+        """ Add the loss for an iteration to the loss buffer, logging the contents of the buffer
+        first if it is full
 
         Parameters
         ----------
-        loss: list
-            The list of loss ``floats`` output from the model
+        loss: list or :class:`numpy.ndarray`
+            The total loss followed by the loss for each output of the model for the iteration
+        timings: dict
+            The feeder's batch timings for the iteration
+        """
+        if self._loss_buffer.is_full:
+            self._log_loss()
+        self._loss_buffer.add(loss, timings)
+
+    def _log_loss(self) -> None:
+        """ Log the loss held in the loss buffer to Tensorboard, store it in the model's history
+        and output it to the console, then empty the buffer. """
+        loss, timings = self._loss_buffer.pop()
+        if not loss.shape[0]:
+            return
+        self._session_steps += loss.shape[0]
+        self._log_tensorboard(loss, timings)
+        combined = self._collate_and_store_loss(loss[:, 1:])
+        self._print_loss(combined.mean(axis=0).tolist())
+
+    def _log_tensorboard(self, loss: np.ndarray, timings: np.ndarray) -> None:
+        """ Log loss and batch feed timings to Tensorboard log files.
+
+        The values are logged at the last iteration that they were collected for. When they have
+        been collected for more than one iteration, the mean is logged, and the minimum and
+        maximum loss are logged outside of the 'batch_' namespace, so that the GUI does not read
+        them as loss.
+
+        Parameters
+        ----------
+        loss: :class:`numpy.ndarray`
+            The (`iterations`, `outputs`) loss values output from the model
+        timings: :class:`numpy.ndarray`
+            The (`iterations`, 2) time, in seconds, taken to assemble each batch and that training
+            waited for it
         """
         if not self._tensorboard:
             return
         logger.trace("Updating TensorBoard log")  # type: ignore
-        logs = {log[0]: log[1]
-                for log in zip(self._model.state.loss_names, loss)}
+        mean_loss = loss.mean(axis=0)
+        mean_timings = timings.mean(axis=0)
 
         # Bug in TF 2.8/2.9/2.10 where batch recording got deleted.
         # ref: https://github.com/keras-team/keras/issues/16173
         with tf.summary.record_if(True), self._tensorboard._train_writer.as_default():  # noqa:E501  pylint:disable=protected-access,not-context-manager
-            for name, value in logs.items():
-                tf.summary.scalar(
-                    "batch_" + name,
-                    value,
-                    step=self._tensorboard._train_step)  # pylint:disable=protected-access
+            for idx, name in enumerate(self._model.state.loss_names):
+                tf.summary.scalar("batch_" + name, mean_loss[idx], step=self._session_steps)
+                if loss.shape[0] > 1:
+                    tf.summary.scalar(f"loss_min/{name}",
+                                      loss[:, idx].min(),
+                                      step=self._session_steps)
+                    tf.summary.scalar(f"loss_max/{name}",
+                                      loss[:, idx].max(),
+                                      step=self._session_steps)
+            # Logged outside of the 'batch_' namespace so they are not read as loss by the GUI
+            for name, value in zip(("feed", "wait"), mean_timings):
+                tf.summary.scalar(f"feed/{name}_ms", value * 1000., step=self._session_steps)
         # TODO revert this code if fixed in tensorflow
         # self._tensorboard.on_train_batch_end(self._model.iterations, logs=logs)
 
-    def _collate_and_store_loss(self, loss: list[float]) -> list[float]:
+    def _collate_and_store_loss(self, loss: np.ndarray) -> np.ndarray:
         """ Collate the loss into totals for each side.
 
         The losses are summed into a total for each side. Loss totals are added to
@@ -301,14 +430,13 @@ class TrainerBase():
 
         Parameters
         ----------
-        loss: list
-            The list of loss ``floats`` for each side this iteration (excluding total combined
-            loss)
+        loss: :class:`numpy.ndarray`
+            The (`iterations`, `outputs`) loss for each side (excluding total combined loss)
 
         Returns
         -------
-        list
-            List of 2 ``floats`` which is the total loss for each side (eg sum of face + mask loss)
+        :class:`numpy.ndarray`
+            The (`iterations`, 2) total loss for each side (eg sum of face + mask loss)
 
         Raises
         ------
@@ -316,15 +444,18 @@ class TrainerBase():
             If a NaN is detected, a :class:`FaceswapError` will be raised
         """
         # NaN protection
-        if self._config["nan_protection"] and not all(np.isfinite(val) for val in loss):
-            logger.critical("NaN Detected. Loss: %s", loss)
+        if self._config["nan_protection"] and not np.all(np.isfinite(loss)):
+            logger.critical("NaN Detected. Loss: %s", loss[~np.all(np.isfinite(loss), axis=1)][0])
             raise FaceswapError("A NaN was detected and you have NaN protection enabled. Training "
                                 "has been terminated.")
 
-        split = len(loss) // 2
-        combined_loss = [sum(loss[:split]), sum(loss[split:])]
-        self._model.add_history(combined_loss)
-        logger.trace("original loss: %s, combined_loss: %s", loss, combined_loss)  # type: ignore
+        split = loss.shape[1] // 2
+        combined_loss = np.stack([loss[:, :split].sum(axis=1), loss[:, split:].sum(axis=1)],
+                                 axis=1)
+        for iteration_loss in combined_loss.tolist():
+            self._model.add_history(iteration_loss)
+        logger.trace("original loss: %s, combined_loss: %s",  # type: ignore
+                     loss.tolist(), combined_loss.tolist())
         return combined_loss
 
     def _print_loss(self, loss: list[float]) -> None:
@@ -352,6 +483,9 @@ class TrainerBase():
                                                str] | None) -> None:
         """ Update the preview viewer and timelapse output
 
+        The predictions for the samples are obtained on the training thread. Compiling the preview
+        images and outputting them is handed to the background renderer.
+
         Parameters
         ----------
         viewer: :func:`scripts.train.Train._show` or ``None``
@@ -363,15 +497,39 @@ class TrainerBase():
         """
         if viewer is not None:
             self._samples.images = self._feeder.generate_preview()
-            samples = self._samples.show_sample()
-            if samples is not None:
-                viewer(samples,
-                       "Training - 'S': Save Now. 'R': Refresh Preview. 'M': Toggle Mask. 'F': "
-                       "Toggle Screen Fit-Actual Size. 'ENTER': Save and Quit")
+            images, predictions = self._samples.predict()
+            self._renderer.put("preview",
+                               lambda: self._show_preview(viewer, images, predictions),
+                               replace=True)
 
         if timelapse_kwargs:
             self._timelapse.output_timelapse(timelapse_kwargs)
 
+    def _show_preview(self,
+                      viewer: Callable[[np.ndarray, str], None],
+                      images: dict[T.Literal["a", "b"], list[np.ndarray]],
+                      predictions: dict[str, np.ndarray]) -> None:
+        """ Compile the preview image and send it to the viewer. Runs in the background renderer.
+
+        Parameters
+        ----------
+        viewer: :func:`scripts.train.Train._show`
+            The function that will display the preview image
+        images: dict
+            The sample images for each side that the predictions were made from
+        predictions: dict
+            The model's predictions for the sample images
+        """
+        viewer(self._samples.compile(images, predictions),
+               "Training - 'S': Save Now. 'R': Refresh Preview. 'M': Toggle Mask. 'F': "
+               "Toggle Screen Fit-Actual Size. 'ENTER': Save and Quit")
+
+    def flush_previews(self) -> None:
+        """ Block until any preview and time-lapse images that are waiting in the background
+        renderer have been output. Called from :class:`scripts.train.Train` when training is
+        stopped. """
+        self._renderer.flush()
+
     def clear_tensorboard(self) -> None:
         """ Stop Tensorboard logging.
 
@@ -384,6 +542,129 @@ class TrainerBase():
         self._tensorboard.on_train_end(None)
 
 
+class _LossBuffer():
+    """ Holds the loss values and batch timings for each iteration in pre-allocated arrays, so that
+    they can be logged, checked and stored for several iterations at once.
+
+    Parameters
+    ----------
+    size: int
+        The number of iterations that the buffer holds
+    """
+    def __init__(self, size: int) -> None:
+        logger.debug("Initializing %s: (size: %s)", self.__class__.__name__, size)
+        self._size = size
+        self._loss = np.empty((size, 0), dtype="float32")
+        self._timings = np.empty((size, 2), dtype="float64")
+        self._count = 0
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    @property
+    def is_full(self) -> bool:
+        """ bool: ``True`` if the buffer holds values for its maximum number of iterations """
+        return self._count >= self._size
+
+    def add(self,
+            loss: list[float] | np.ndarray,
+            timings: dict[T.Literal["feed", "wait"], float]) -> None:
+        """ Add the values for an iteration to the buffer
+
+        Parameters
+        ----------
+        loss: list or :class:`numpy.ndarray`
+            The total loss followed by the loss for each output of the model for the iteration
+        timings: dict
+            The feeder's batch timings for the iteration
+        """
+        assert not self.is_full
+        if self._loss.shape[1] != len(loss):
+            self._loss = np.empty((self._size, len(loss)), dtype="float32")
+        self._loss[self._count] = loss
+        self._timings[self._count] = (timings["feed"], timings["wait"])
+        self._count += 1
+
+    def pop(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Obtain the values held in the buffer and empty it
+
+        Returns
+        -------
+        loss: :class:`numpy.ndarray`
+            The (`iterations`, `outputs`) loss values held in the buffer
+        timings: :class:`numpy.ndarray`
+            The (`iterations`, 2) feed and wait timings held in the buffer
+        """
+        retval = (self._loss[:self._count].copy(), self._timings[:self._count].copy())
+        self._count = 0
+        return retval
+
+
+class _PreviewRenderer():
+    """ Compiles and outputs preview and time-lapse images in a background thread, so that training
+    does not wait whilst the images are composited and written out.
+
+    Requests are rendered in the order that they arrive. Requests that are made with `replace`
+    (the preview display) only hold the latest request: a request that arrives whilst an earlier
+    request for the same output is still waiting to be rendered replaces it, so stale previews are
+    dropped rather than queued. All other requests (time-lapse frames) are always rendered.
+    """
+    def __init__(self) -> None:
+        logger.debug("Initializing %s", self.__class__.__name__)
+        self._pending: list[tuple[str, Callable[[], None]]] = []
+        self._is_rendering = False
+        self._condition = threading.Condition()
+        self._thread = MultiThread(self._run, name="preview_renderer")
+        self._thread.start()
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    def put(self, name: str, job: Callable[[], None], replace: bool = False) -> None:
+        """ Request an output to be rendered.
+
+        Parameters
+        ----------
+        name: str
+            The name of the output that the job renders
+        job: callable
+            The function that compiles and outputs the image
+        replace: bool, optional
+            ``True`` to replace any request for the same output that is still waiting to be
+            rendered. ``False`` to queue the request behind any waiting requests.
+            Default: ``False``
+        """
+        self._thread.check_and_raise_error()
+        with self._condition:
+            index = next((idx for idx, (pending, _) in enumerate(self._pending)
+                          if replace and pending == name), None)
+            if index is None:
+                self._pending.append((name, job))
+            else:
+                logger.debug("Dropping stale render request: '%s'", name)
+                self._pending[index] = (name, job)
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """ Block until all pending render requests have been output """
+        with self._condition:
+            while (self._pending or self._is_rendering) and self._thread.is_alive():
+                self._condition.wait(timeout=1)
+        self._thread.check_and_raise_error()
+
+    def _run(self) -> None:
+        """ Render requests as they arrive until the process exits """
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                name, job = self._pending.pop(0)
+                self._is_rendering = True
+            logger.debug("Rendering: '%s'", name)
+            try:
+                job()
+            finally:
+                with self._condition:
+                    self._is_rendering = False
+                    self._condition.notify_all()
+
+
 class _Samples():  # pylint:disable=too-few-public-methods
     """ Compile samples for display for preview and time-lapse
 
@@ -439,17 +720,56 @@ class _Samples():  # pylint:disable=too-few-public-methods
             A compiled preview image ready for display or saving
         """
         logger.debug("Showing sample")
+        return self.compile(*self.predict())
+
+    def predict(self) -> tuple[dict[T.Literal["a", "b"], list[np.ndarray]],
+                               dict[str, np.ndarray]]:
+        """ Obtain the model's predictions for the current :attr:`images`.
+
+        This is the only part of generating a preview that requires the model, so it is run on the
+        training thread. The returned values can be passed to :func:`compile` on another thread.
+
+        Returns
+        -------
+        images: dict
+            A copy of :attr:`images`, so that compiling the preview is not affected by new images
+            being set
+        predictions: dict
+            The predictions from the model
+        """
+        logger.debug("Predicting sample")
+        images = {side: [image.copy() for image in self.images[side]]
+                  for side in T.get_args(T.Literal["a", "b"])}
         feeds: dict[T.Literal["a", "b"], np.ndarray] = {}
         for idx, side in enumerate(T.get_args(T.Literal["a", "b"])):
-            feed = self.images[side][0]
+            feed = images[side][0]
             input_shape = self._model.model.input_shape[idx][1:]
             if input_shape[0] / feed.shape[1] != 1.0:
                 feeds[side] = self._resize_sample(side, feed, input_shape[0])
             else:
                 feeds[side] = feed
 
-        preds = self._get_predictions(feeds["a"], feeds["b"])
-        return self._compile_preview(preds)
+        return images, self._get_predictions(feeds["a"], feeds["b"])
+
+    def compile(self,
+                images: dict[T.Literal["a", "b"], list[np.ndarray]],
+                predictions: dict[str, np.ndarray]) -> np.ndarray:
+        """ Compile a preview image from the sample images and the model's predictions for them.
+
+        Parameters
+        ----------
+        images: dict
+            The sample images for each side, as returned from :func:`predict`
+        predictions: dict
+            The predictions from the model, as returned from :func:`predict`
+
+        Returns
+        -------
+        :class:`numpy.ndarry`
+            A compiled preview image ready for display or saving
+        """
+        logger.debug("Compiling sample")
+        return self._compile_preview(images, predictions)
 
     @classmethod
     def _resize_sample(cls,
@@ -526,11 +846,15 @@ class _Samples():  # pylint:disable=too-few-public-methods
         logger.debug("Returning predictions: %s", {key: val.shape for key, val in preds.items()})
         return preds
 
-    def _compile_preview(self, predictions: dict[str, np.ndarray]) -> np.ndarray:
+    def _compile_preview(self,
+                         images: dict[T.Literal["a", "b"], list[np.ndarray]],
+                         predictions: dict[str, np.ndarray]) -> np.ndarray:
         """ Compile predictions and images into the final preview image.
 
         Parameters
         ----------
+        images: dict
+            The sample images for each side
         predictions: dict
             The predictions from the model
 
@@ -542,14 +866,14 @@ class _Samples():  # pylint:disable=too-few-public-methods
         figures: dict[T.Literal["a", "b"], np.ndarray] = {}
         headers: dict[T.Literal["a", "b"], np.ndarray] = {}
 
-        for side, samples in self.images.items():
+        for side, samples in images.items():
             other_side = "a" if side == "b" else "b"
             preds = [predictions[f"{side}_{side}"],
                      predictions[f"{other_side}_{side}"]]
             display = self._to_full_frame(side, samples, preds)
             headers[side] = self._get_headers(side, display[0].shape[1])
             figures[side] = np.stack([display[0], display[1], display[2], ], axis=1)
-            if self.images[side][1].shape[0] % 2 == 1:
+            if images[side][1].shape[0] % 2 == 1:
                 figures[side] = np.concatenate([figures[side],
                                                 np.expand_dims(figures[side][0], 0)])
 
@@ -806,6 +1130,8 @@ class _Timelapse():  # pylint:disable=too-few-public-methods
         The feeder for generating the time-lapse images.
     image_paths: dict
         The full paths to the training images for each side of the model
+    renderer: :class:`_PreviewRenderer`
+        The background renderer that compiles and writes out the time-lapse images
     """
     def __init__(self,
                  model: ModelBase,
@@ -814,16 +1140,19 @@ class _Timelapse():  # pylint:disable=too-few-public-methods
                  mask_opacity: int,
                  mask_color: str,
                  feeder: Feeder,
-                 image_paths: dict[T.Literal["a", "b"], list[str]]) -> None:
+                 image_paths: dict[T.Literal["a", "b"], list[str]],
+                 renderer: _PreviewRenderer) -> None:
         logger.debug("Initializing %s: model: %s, coverage_ratio: %s, image_count: %s, "
-                     "mask_opacity: %s, mask_color: %s, feeder: %s, image_paths: %s)",
+                     "mask_opacity: %s, mask_color: %s, feeder: %s, image_paths: %s, "
+                     "renderer: %s)",
                      self.__class__.__name__, model, coverage_ratio, image_count, mask_opacity,
-                     mask_color, feeder, len(image_paths))
+                     mask_color, feeder, len(image_paths), renderer)
         self._num_images = image_count
         self._samples = _Samples(model, coverage_ratio, mask_opacity, mask_color)
         self._model = model
         self._feeder = feeder
         self._image_paths = image_paths
+        self._renderer = renderer
         self._output_file = ""
         logger.debug("Initialized %s", self.__class__.__name__)
 
@@ -866,6 +1195,9 @@ class _Timelapse():  # pylint:disable=too-few-public-methods
         """ Generate the time-lapse samples and output the created time-lapse to the specified
         output folder.
 
+        The predictions are obtained on the calling thread. The time-lapse image is compiled and
+        written out by the background renderer.
+
         Parameters
         ----------
         timelapse_kwargs: dict:
@@ -881,12 +1213,26 @@ class _Timelapse():  # pylint:disable=too-few-public-methods
         logger.debug("Got time-lapse samples: %s",
                      {side: len(images) for side, images in self._samples.images.items()})
 
-        image = self._samples.show_sample()
-        if image is None:
-            return
+        images, predictions = self._samples.predict()
         filename = os.path.join(self._output_file, str(int(time.time())) + ".jpg")
+        self._renderer.put("timelapse", lambda: self._write(filename, images, predictions))
+
+    def _write(self,
+               filename: str,
+               images: dict[T.Literal["a", "b"], list[np.ndarray]],
+               predictions: dict[str, np.ndarray]) -> None:
+        """ Compile the time-lapse image and write it to disk. Runs in the background renderer.
 
-        cv2.imwrite(filename, image)
+        Parameters
+        ----------
+        filename: str
+            The full path to write the time-lapse image to
+        images: dict
+            The time-lapse sample images for each side that the predictions were made from
+        predictions: dict
+            The model's predictions for the sample images
+        """
+        cv2.imwrite(filename, self._samples.compile(images, predictions))
         logger.debug("Created time-lapse: '%s'", filename)
 
 
@@ -68,6 +68,73 @@ _DEFAULTS = dict(
         info="The RGB hex color to use for the mask overlay in the training preview.",
         datatype=str,
         group="evaluation"),
+    image_cache_size=dict(
+        default=0,
+        info="The amount of RAM, in megabytes, to use for each side to hold decoded training "
+             "images. Decoding the training images from disk is CPU intensive and happens for "
+             "every image at every epoch. Caching the decoded images can significantly reduce "
+             "the CPU load when training, and can prevent the GPU from being starved of data at "
+             "larger batch sizes. The cache is held in a memory-mapped temporary file, so any "
+             "cached images that do not fit in available RAM will be paged to disk by the "
+             "operating system. The cache for each side is shared by all of that side's "
+             "augmentation workers.\nAs a guide, each 512px training image requires 0.75MB of "
+             "cache.\nSet to 0 to disable the decoded image cache.",
+        datatype=int,
+        rounding=256,
+        min_max=(0, 65536),
+        fixed=False,
+        group="cache"),
+    image_cache_policy=dict(
+        default="fixed",
+        info="The policy to use when the training images do not all fit within the selected "
+             "image cache size. This option has no effect if the image cache is disabled or all "
+             "of the training images fit within the cache."
+             "\n\tfixed - The first images loaded are kept in the cache and any further images "
+             "are always read from disk. As training images are selected at random, this gives "
+             "the best cache hit rate for the given cache size."
+             "\n\tlru - Least Recently Used. The image that has been accessed least recently is "
+             "removed from the cache to make room for a new image.",
+        datatype=str,
+        choices=["fixed", "lru"],
+        gui_radio=True,
+        fixed=False,
+        group="cache"),
+    augmentation_workers=dict(
+        default=0,
+        info="The number of worker processes to use for each side for loading and augmenting "
+             "training images. The image augmentation is CPU intensive, and by default runs in a "
+             "single thread for each side, which can leave the GPU waiting for data. Compiling "
+             "batches across several processes can allow the GPU to be fully utilized on systems "
+             "with many CPU cores. Each worker requires additional system RAM.\n"
+             "Set to 0 to compile the batches in a background thread rather than in worker "
+             "processes.",
+        datatype=int,
+        rounding=1,
+        min_max=(0, 32),
+        fixed=False,
+        group="data loading"),
+    prefetch_batches=dict(
+        default=0,
+        info="The number of complete training batches to assemble in the background whilst the "
+             "current training iteration is running. By default the inputs and targets for both "
+             "sides are collected and assembled on the training thread between iterations, which "
+             "leaves the GPU idle whilst this happens. Prefetching batches overlaps this work "
+             "with training. Each prefetched batch requires additional RAM (or VRAM if "
+             "'prefetch_to_device' is enabled).\n"
+             "Set to 0 to assemble each batch when it is required.",
+        datatype=int,
+        rounding=1,
+        min_max=(0, 8),
+        fixed=False,
+        group="data loading"),
+    prefetch_to_device=dict(
+        default=False,
+        info="[Prefetch batches only] Copy prefetched batches to the GPU in the background, so "
+             "that the batch is already resident on the GPU when the training iteration starts. "
+             "This uses additional VRAM for each prefetched batch.",
+        datatype=bool,
+        fixed=False,
+        group="data loading"),
     zoom_amount=dict(
         default=5,
         info="Percentage amount to randomly zoom each training image in and out.",
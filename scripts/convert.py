@@ -3,10 +3,13 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 import logging
+import queue
 import re
 import os
 import sys
+import traceback
 import typing as T
+from multiprocessing import get_all_start_methods, get_context, resource_tracker, shared_memory
 from threading import Event
 from time import sleep
 
@@ -29,6 +32,8 @@ from plugins.plugin_loader import PluginLoader
 if T.TYPE_CHECKING:
     from argparse import Namespace
     from collections.abc import Callable
+    from multiprocessing.process import BaseProcess
+    from multiprocessing.queues import Queue
     from plugins.convert.writer._base import Output
     from plugins.train.model._base import ModelBase
     from lib.align.aligned_face import CenteringType
@@ -204,15 +209,25 @@ class Convert():
         for qname in ("convert_in", "convert_out", "patch"):
             queue_manager.add_queue(qname, self._queue_size)
 
-    def _get_threads(self) -> MultiThread:
-        """ Get the threads for patching the converted faces onto the frames.
+    def _get_threads(self) -> MultiThread | PatchPool:
+        """ Get the threads or processes for patching the converted faces onto the frames.
+
+        Patching is run in a pool of worker processes when patch processes have been requested
+        and more than one process is available, otherwise it is run in threads.
 
         Returns
-        :class:`lib.multithreading.MultiThread`
-            The threads that perform the patching of swapped faces onto the output frames
+        :class:`lib.multithreading.MultiThread` or :class:`PatchPool`
+            The threads or processes that perform the patching of swapped faces onto the output
+            frames
         """
         save_queue = queue_manager.get_queue("convert_out")
         patch_queue = queue_manager.get_queue("patch")
+        if self._args.patch_processes and self._pool_processes > 1:
+            return PatchPool(self._converter,
+                             self._predictor,
+                             patch_queue,
+                             save_queue,
+                             self._pool_processes)
         return MultiThread(self._converter.process, patch_queue, save_queue,
                            thread_count=self._pool_processes, name="patch")
 
@@ -280,6 +295,359 @@ class Convert():
             thread.check_and_raise_error()
 
 
+def _patch_worker(converter: Converter,
+                  reference_kwargs: dict[str, T.Any],
+                  tasks: Queue,
+                  results: Queue) -> None:
+    """ Patch swapped faces onto frames within a worker process.
+
+    Frames and swapped faces are read from the shared memory slot given in each task, and the
+    patched frame is written back into the same slot, so that neither is pickled between
+    processes.
+
+    Parameters
+    ----------
+    converter: :class:`lib.convert.Converter`
+        The converter, with plugins loaded, to patch the frames with
+    reference_kwargs: dict
+        The keyword arguments for creating the model output sized reference faces from the frame
+    tasks: :class:`multiprocessing.Queue`
+        Queue holding tuples of (`slot index`, `shared memory name`, `frame layout`,
+        `swapped faces layout`, `filename`, `list of alignments`) for each frame to patch, or
+        ``None`` to indicate that the worker should exit
+    results: :class:`multiprocessing.Queue`
+        Queue to put tuples of (`slot index`, `filename`, `result`, `error`) into. `result` is the
+        (`offset`, `shape`, `dtype`) of the patched frame in the slot's output region, or the
+        output itself if it is pre-encoded or does not fit. `error` is the formatted traceback
+        of any error that occurred in the worker. ``None`` is put into the queue when the worker
+        exits.
+    """
+    cv2.setNumThreads(1)
+    memory: dict[int, shared_memory.SharedMemory] = {}
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, name, frame_layout, swapped_layout, filename, alignments = task
+            if slot not in memory or memory[slot].name != name:
+                if slot in memory:
+                    memory[slot].close()
+                memory[slot] = shared_memory.SharedMemory(name=name)
+            buffer = memory[slot].buf
+            frame = PatchPool.get_array(buffer, *frame_layout)
+            detected_faces = []
+            for alignment in alignments:
+                face = DetectedFace()
+                face.from_alignment(alignment)
+                detected_faces.append(face)
+            item = ConvertItem(ExtractMedia(filename, frame, detected_faces=detected_faces),
+                               swapped_faces=PatchPool.get_array(buffer, *swapped_layout))
+            item.reference_faces = [AlignedFace(face.landmarks_xy, image=frame, **reference_kwargs)
+                                    for face in detected_faces]
+
+            image = converter.patch(item)
+            result: T.Any = image
+            offset = swapped_layout[0] + PatchPool.aligned_size(
+                int(np.prod(swapped_layout[1])) * np.dtype(swapped_layout[2]).itemsize)
+            if isinstance(image, np.ndarray) and offset + image.nbytes <= len(buffer):
+                PatchPool.get_array(buffer, offset, image.shape, image.dtype.str)[...] = image
+                result = (offset, image.shape, image.dtype.str)
+            del item, frame, image, buffer  # Release views so the memory can be closed
+            results.put((slot, filename, result, None))
+    except Exception:  # pylint:disable=broad-except
+        results.put((-1, "", None, traceback.format_exc()))
+    finally:
+        for mem in memory.values():
+            mem.close()
+        results.put(None)
+
+
+class PatchPool():
+    """ Patch swapped faces onto frames in a pool of worker processes.
+
+    Workers are started once, each receiving a copy of the loaded converter. They are started
+    from a clean interpreter (`forkserver` where available, otherwise `spawn`) rather than forked,
+    as forking a process that has initialized Tensorflow and has running threads can deadlock.
+    Frames and swapped faces are
+    handed to the workers, and the patched frames handed back, through slots of shared memory so
+    that they are not pickled. Only the frame's alignments and small pieces of metadata are passed
+    through the task queues.
+
+    Frames are output in the order that they complete. The writers re-order frames that are
+    received out of order prior to writing, as they do when patching in threads.
+
+    Exposes the same :func:`start`, :func:`completed`, :func:`join` and
+    :func:`check_and_raise_error` methods as :class:`lib.multithreading.MultiThread` so that it can
+    be used in place of the patching threads.
+
+    Parameters
+    ----------
+    converter: :class:`lib.convert.Converter`
+        The converter, with plugins loaded, to patch the frames with
+    predictor: :class:`Predict`
+        The predictor that is feeding the patch queue
+    in_queue: :class:`~lib.queue_manager.EventQueue`
+        The queue holding the output from the predictor
+    out_queue: :class:`~lib.queue_manager.EventQueue`
+        The queue to place patched frames into for writing
+    processes: int
+        The number of worker processes to run
+    """
+    def __init__(self,
+                 converter: Converter,
+                 predictor: Predict,
+                 in_queue: EventQueue,
+                 out_queue: EventQueue,
+                 processes: int) -> None:
+        logger.debug("Initializing %s: (converter: %s, predictor: %s, in_queue: %s, "
+                     "out_queue: %s, processes: %s)", self.__class__.__name__, converter,
+                     predictor, in_queue, out_queue, processes)
+        self._converter = converter
+        self._reference_kwargs = {"centering": predictor.centering,
+                                  "size": predictor.output_size,
+                                  "coverage_ratio": predictor.coverage_ratio,
+                                  "dtype": "float32"}
+        self._in_queue = in_queue
+        self._out_queue = out_queue
+        self._process_count = processes
+
+        method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+        self._context = get_context(method)
+        self._tasks: Queue = self._context.Queue()
+        self._results: Queue = self._context.Queue()
+        self._processes: list[BaseProcess] = []
+        self._memory: list[shared_memory.SharedMemory | None] = [None] * (processes * 2)
+        self._free_slots: queue.Queue[int] = queue.Queue()
+        self._threads = {"dispatch": MultiThread(self._dispatch, name="patch_dispatch"),
+                         "collect": MultiThread(self._collect, name="patch_collect")}
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    @classmethod
+    def aligned_size(cls, size: int) -> int:
+        """ Round a size in bytes up to the next 64 byte boundary
+
+        Parameters
+        ----------
+        size: int
+            The size, in bytes, to align
+
+        Returns
+        -------
+        int
+            The size rounded up to the next 64 byte boundary
+        """
+        return -(-size // 64) * 64
+
+    @classmethod
+    def get_array(cls,
+                  buffer: memoryview,
+                  offset: int,
+                  shape: tuple[int, ...],
+                  dtype: str) -> np.ndarray:
+        """ Obtain a view of an array held within a shared memory slot
+
+        Parameters
+        ----------
+        buffer: :class:`memoryview`
+            The buffer of the shared memory slot
+        offset: int
+            The offset, in bytes, of the array within the buffer
+        shape: tuple
+            The shape of the array
+        dtype: str
+            The datatype of the array
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            A view into the shared memory for the requested array
+        """
+        return np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+
+    def start(self) -> None:
+        """ Start the worker processes and the threads that feed and collect from them """
+        logger.debug("Starting %s patch processes (start method: '%s')",
+                     self._process_count, self._context.get_start_method())
+        for idx in range(len(self._memory)):
+            self._free_slots.put(idx)
+        # Workers must share this process' tracker, or their own tracker would unlink the shared
+        # memory that they attached to when they exit
+        resource_tracker.ensure_running()
+        self._processes = [self._context.Process(target=_patch_worker,
+                                                 name=f"patch_{idx}",
+                                                 args=(self._converter,
+                                                       self._reference_kwargs,
+                                                       self._tasks,
+                                                       self._results),
+                                                 daemon=True)
+                           for idx in range(self._process_count)]
+        for process in self._processes:
+            process.start()
+        for thread in self._threads.values():
+            thread.start()
+
+    def completed(self) -> bool:
+        """ Check if all of the worker processes have returned their final frames.
+
+        Returns
+        -------
+        bool
+            ``True`` if patching has completed otherwise ``False``
+        """
+        return self._threads["collect"].completed()
+
+    def check_and_raise_error(self) -> None:
+        """ Checks for errors in the feeding and collecting threads, and by extension the worker
+        processes, and raises them in the caller.
+
+        Raises
+        ------
+        Error
+            Re-raised error from within the threads
+        """
+        for thread in self._threads.values():
+            thread.check_and_raise_error()
+
+    def join(self) -> None:
+        """ Join the threads and worker processes and release the shared memory """
+        logger.debug("Joining %s", self.__class__.__name__)
+        for thread in self._threads.values():
+            thread.join()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for memory in self._memory:
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+        self._memory = [None for _ in self._memory]
+        logger.debug("Joined %s", self.__class__.__name__)
+
+    def _get_slot(self, size: int) -> tuple[int, shared_memory.SharedMemory]:
+        """ Obtain a free shared memory slot of at least the given size, reallocating the slot's
+        memory if it is too small
+
+        Parameters
+        ----------
+        size: int
+            The minimum size, in bytes, that the slot must be
+
+        Returns
+        -------
+        slot: int
+            The index of the slot
+        memory: :class:`multiprocessing.shared_memory.SharedMemory`
+            The shared memory for the slot
+        """
+        while True:
+            try:
+                slot = self._free_slots.get(timeout=1)
+                break
+            except queue.Empty:
+                if self._in_queue.shutdown.is_set():
+                    raise RuntimeError("Patching aborted")
+        memory = self._memory[slot]
+        if memory is None or memory.size < size:
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+            logger.debug("Allocating patch slot %s: %s bytes", slot, size)
+            memory = shared_memory.SharedMemory(create=True, size=size)
+            self._memory[slot] = memory
+        return slot, memory
+
+    def _send(self, item: ConvertItem) -> None:
+        """ Copy the frame and swapped faces for an item into a free shared memory slot and hand
+        the item to the worker processes.
+
+        The slot's layout is the frame, then the swapped faces, then space for the patched frame.
+
+        Parameters
+        ----------
+        item: :class:`ConvertItem`
+            The item to be patched
+        """
+        frame = item.inbound.image
+        swapped = item.swapped_faces
+        frame_size = self.aligned_size(frame.nbytes)
+        swapped_size = self.aligned_size(swapped.nbytes)
+        out_size = self.aligned_size(frame.shape[0] * frame.shape[1] * 4)
+        slot, memory = self._get_slot(frame_size + swapped_size + out_size)
+
+        frame_layout = (0, frame.shape, frame.dtype.str)
+        swapped_layout = (frame_size, swapped.shape, swapped.dtype.str)
+        self.get_array(memory.buf, *frame_layout)[...] = frame
+        self.get_array(memory.buf, *swapped_layout)[...] = swapped
+        alignments = [face.to_alignment() for face in item.inbound.detected_faces]
+        for alignment in alignments:
+            alignment["thumb"] = None
+        logger.trace("Sending to patch slot %s: '%s'",  # type: ignore[attr-defined]
+                     slot, item.inbound.filename)
+        self._tasks.put((slot,
+                         memory.name,
+                         frame_layout,
+                         swapped_layout,
+                         item.inbound.filename,
+                         alignments))
+
+    def _dispatch(self) -> None:
+        """ Take items from the predictor and send them to the worker processes until EOF is
+        received. """
+        logger.debug("Starting patch dispatch")
+        try:
+            while True:
+                inbound: T.Literal["EOF"] | ConvertItem | list[ConvertItem] = self._in_queue.get()
+                if inbound == "EOF":
+                    logger.debug("EOF Received")
+                    self._in_queue.put(inbound)
+                    break
+                for item in inbound if isinstance(inbound, list) else [inbound]:
+                    self._send(item)
+        finally:
+            for _ in self._processes:
+                self._tasks.put(None)
+        logger.debug("Completed patch dispatch")
+
+    def _collect(self) -> None:
+        """ Collect the patched frames from the worker processes, output them to the out queue and
+        release their shared memory slots.
+
+        Raises
+        ------
+        RuntimeError
+            If an error occurs within a worker process or a worker process exits unexpectedly
+        """
+        logger.debug("Starting patch collection")
+        running = len(self._processes)
+        while running:
+            try:
+                result = self._results.get(timeout=1)
+            except queue.Empty:
+                dead = [proc.name for proc in self._processes
+                        if not proc.is_alive() and proc.exitcode != 0]
+                if dead:
+                    raise RuntimeError(  # pylint:disable=raise-missing-from
+                        f"Patch worker(s) exited unexpectedly: {dead}")
+                continue
+            if result is None:
+                running -= 1
+                continue
+            slot, filename, image, error = result
+            if error is not None:
+                logger.error("Error in patch worker:\n%s", error)
+                raise RuntimeError("A patch worker process has failed. Check the log for details.")
+            if isinstance(image, tuple):
+                memory = self._memory[slot]
+                assert memory is not None
+                image = self.get_array(memory.buf, *image).copy()
+            self._free_slots.put(slot)
+            logger.trace("Out queue put: %s", filename)  # type: ignore[attr-defined]
+            self._out_queue.put((filename, image))
+        logger.debug("Completed patch collection")
+
+
 class DiskIO():
     """ Disk Input/Output for the converter process.
 
@@ -535,6 +903,8 @@ class DiskIO():
             * Discards or passes through cli selected skipped frames
             * Pairs the frame with its :class:`~lib.align.DetectedFace` objects
             * Performs any pre-processing actions
+            * Waits for the frame to fall within the writer's re-order window, first signalling
+              the predictor to process out any partially filled batch
             * Puts the frame and detected faces to the load queue
         """
         logger.debug("Load Images: Start")
@@ -560,6 +930,11 @@ class DiskIO():
             detected_faces = self._get_detected_faces(filename, image)
             item = ConvertItem(ExtractMedia(filename, image, detected_faces))
             self._pre_process.do_actions(item.inbound)
+            if not self._writer.is_within_window(filename):
+                # Frames held in a part-filled batch must be processed for the window to move on
+                logger.trace("Outside of re-order window. Flushing batch")  # type:ignore
+                self._queues["load"].put("FLUSH")
+                self._writer.wait_for_window(filename)
             self._queues["load"].put(item)
 
         logger.debug("Putting EOF")
@@ -913,7 +1288,17 @@ class Predict():
         batch: list[ConvertItem] = []
         assert self._in_queue is not None
         while True:
-            item: T.Literal["EOF"] | ConvertItem = self._in_queue.get()
+            item: T.Literal["EOF", "FLUSH"] | ConvertItem = self._in_queue.get()
+            if item == "FLUSH":
+                # Loading is held back by the writer's re-order window until earlier frames have
+                # been written, so process out any partial batch rather than waiting for it to fill
+                if batch:
+                    logger.trace("Flush requested. Processing partial batch")  # type:ignore
+                    self._process_batch(batch, faces_seen)
+                    consecutive_no_faces = 0
+                    faces_seen = 0
+                    batch = []
+                continue
             if item == "EOF":
                 logger.debug("EOF Received")
                 if batch:  # Process out any remaining items
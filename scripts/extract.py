@@ -2,6 +2,8 @@
 """ Main entry point to the extract process of FaceSwap """
 
 from __future__ import annotations
+import hashlib
+import json
 import logging
 import os
 import sys
@@ -9,23 +11,35 @@ import typing as T
 
 from argparse import Namespace
 from multiprocessing import Process
+from queue import Empty, Full, Queue
+from tempfile import TemporaryDirectory
 
+import cv2
 import numpy as np
 from tqdm import tqdm
+from lib.align import AlignedFace, EXTRACT_RATIOS
 from lib.align.alignments import PNGHeaderDict
 
 from lib.image import encode_image, generate_thumbnail, ImagesLoader, ImagesSaver, read_image_meta
 from lib.multithreading import MultiThread
-from lib.utils import get_folder, handle_deprecated_cliopts, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+from lib.serializer import get_serializer
+from lib.utils import (FaceswapError, get_folder, handle_deprecated_cliopts, IMAGE_EXTENSIONS,
+                       VIDEO_EXTENSIONS)
 from plugins.extract import ExtractMedia, Extractor
 from scripts.fsmedia import Alignments, PostProcess, finalize
 
 if T.TYPE_CHECKING:
+    from collections.abc import Generator
+    from lib.align import DetectedFace
     from lib.align.alignments import PNGHeaderAlignmentsDict
 
 # tqdm.monitor_interval = 0  # workaround for TqdmSynchronisationWarning  # TODO?
 logger = logging.getLogger(__name__)
 
+WORKER_STATUS_PREFIX = "[extract-worker] "
+""" str: The prefix for the status lines written to stdout when extract is running as a persistent
+worker """
+
 
 class Extract():
     """ The Faceswap Face Extraction Process.
@@ -73,7 +87,10 @@ class Extract():
         self._filter = Filter(self._args.ref_threshold,
                               self._args.filter,
                               self._args.nfilter,
-                              self._extractor)
+                              self._extractor,
+                              pipeline_key=(f"{self._args.detector}_{self._args.aligner}_"
+                                            f"{normalization}_{self._args.re_feed}_"
+                                            f"{self._args.re_align}"))
 
     def _get_input_locations(self) -> list[str]:
         """ Obtain the full path to input locations. Will be a list of locations if batch mode is
@@ -145,6 +162,52 @@ class Extract():
         logger.debug("Returning output: '%s' for input: '%s'", retval, input_location)
         return retval
 
+    def _arguments_for_input(self, input_location: str) -> Namespace:
+        """ Obtain the arguments for extracting from a given input location.
+
+        If not running in batch mode, then the user supplied arguments are returned, otherwise a
+        copy of the arguments with the input and output locations set for the given input
+
+        Parameters
+        ----------
+        input_location: str
+            The full path to an input video or folder of images
+
+        Returns
+        -------
+        :class:`argparse.Namespace`
+            The arguments for extracting from the given input location
+        """
+        if not self._args.batch_mode:
+            return self._args
+        retval = Namespace(**self._args.__dict__)
+        retval.input_dir = input_location
+        retval.output_dir = self._output_for_input(input_location)
+        return retval
+
+    @property
+    def _can_stream(self) -> bool:
+        """ bool: ``True`` if streamed batch mode has been requested and the frames from all of the
+        inputs can be processed through a single run of the extraction pipeline, otherwise
+        ``False`` """
+        if (not self._args.batch_mode
+                or not getattr(self._args, "stream_batch", False)
+                or self._is_worker):
+            return False
+        reason = ""
+        if self._extractor.passes != 1:
+            reason = "the extraction pipeline is running in more than one pass"
+        elif "external" in (self._args.detector, self._args.aligner):
+            reason = "external data is being imported"
+        elif len(set(self._output_for_input(loc) for loc in self._input_locations)) != len(
+                self._input_locations):
+            reason = "more than one input shares the same name"
+        if reason:
+            logger.warning("Streamed batch mode is not available as %s. Processing each input "
+                           "individually.", reason)
+            return False
+        return True
+
     def process(self) -> None:
         """ The entry point for triggering the Extraction Process.
 
@@ -153,15 +216,19 @@ class Extract():
         logger.info('Starting, this may take a while...')
         if self._args.batch_mode:
             logger.info("Batch mode selected processing: %s", self._input_locations)
+        if self._can_stream:
+            _StreamedExtract(self._extractor,
+                             [self._arguments_for_input(location)
+                              for location in self._input_locations]).process()
+            return
         for job_no, location in enumerate(self._input_locations):
             if self._args.batch_mode:
                 logger.info("Processing job %s of %s: '%s'",
                             job_no + 1, len(self._input_locations), location)
-                arguments = Namespace(**self._args.__dict__)
-                arguments.input_dir = location
-                arguments.output_dir = self._output_for_input(location)
-            else:
-                arguments = self._args
+            arguments = self._arguments_for_input(location)
+            if self._is_worker:
+                self._run_worker_job(arguments)
+                continue
             extract = _Extract(self._extractor, arguments)
             if sys.platform == "linux" and len(self._input_locations) > 1:
                 # TODO - Running this in a process is hideously hacky. However, there is a memory
@@ -178,6 +245,84 @@ class Extract():
                 extract.process()
             self._extractor.reset_phase_index()
 
+        if self._is_worker:
+            self._process_worker_jobs()
+
+    @property
+    def _is_worker(self) -> bool:
+        """ bool: ``True`` if extract is running as a persistent worker, accepting further jobs
+        from stdin once the jobs given on the command line have completed """
+        return getattr(self._args, "worker", False)
+
+    @classmethod
+    def _send_worker_status(cls, job: str, status: str, message: str = "") -> None:
+        """ Write the status of a worker job to stdout as a single line of JSON prefixed by
+        :attr:`WORKER_STATUS_PREFIX`.
+
+        Parameters
+        ----------
+        job: str
+            The input location that the status is for
+        status: ["started", "completed", "failed"]
+            The status of the job
+        message: str, optional
+            Any additional information for the status. Default: `""`
+        """
+        print(f"{WORKER_STATUS_PREFIX}"
+              f"{json.dumps({'job': job, 'status': status, 'message': message})}",
+              flush=True)
+
+    def _run_worker_job(self, arguments: Namespace) -> None:
+        """ Run a single extraction job in worker mode, reporting its status to stdout.
+
+        The job is run in this process, with the already loaded plugins. Any error raised by the
+        job is reported as a failed job, and the worker continues to accept further jobs.
+
+        Parameters
+        ----------
+        arguments: :class:`argparse.Namespace`
+            The command line arguments for the job, with the input and output locations set
+        """
+        logger.info("Processing worker job: '%s'", arguments.input_dir)
+        self._send_worker_status(arguments.input_dir, "started")
+        try:
+            _Extract(self._extractor, arguments).process()
+        except Exception as err:  # pylint:disable=broad-except
+            message = str(err) or err.__class__.__name__
+            logger.error("Worker job failed: '%s'. %s", arguments.input_dir, message)
+            if not isinstance(err, FaceswapError):
+                logger.debug("Worker job error traceback:", exc_info=True)
+            self._send_worker_status(arguments.input_dir, "failed", message)
+            return
+        finally:
+            self._extractor.reset_phase_index()
+        self._send_worker_status(arguments.input_dir, "completed")
+
+    def _process_worker_jobs(self) -> None:
+        """ Read further extraction jobs from stdin, one per line, until stdin is closed or an
+        empty line is received.
+
+        Each job is a JSON object containing the `input` location (a video or a folder of images)
+        and the `output` folder for the extracted faces.
+        """
+        logger.info("Waiting for worker jobs")
+        for line in sys.stdin:
+            if not line.strip():
+                break
+            try:
+                job = json.loads(line)
+                arguments = Namespace(**self._args.__dict__)
+                arguments.input_dir = job["input"]
+                arguments.output_dir = job["output"]
+            except (ValueError, KeyError, TypeError) as err:
+                logger.error("Invalid worker job received: '%s'. %s", line.strip(), str(err))
+                self._send_worker_status(line.strip(), "failed", f"Invalid job: {str(err)}")
+                continue
+            arguments.batch_mode = False
+            arguments.alignments_path = None
+            self._run_worker_job(arguments)
+        logger.info("Worker jobs complete")
+
 
 class Filter():
     """ Obtains and holds face identity embeddings for any filter/nfilter image files
@@ -191,15 +336,20 @@ class Filter():
         The list of nfilter file(s) passed in as command line arguments
     extractor: :class:`~plugins.extract.pipeline.Extractor`
         The extractor pipeline for obtaining face identity from images
+    pipeline_key: str, optional
+        Identifies the extraction pipeline settings that identities are obtained with. Identities
+        that were previously extracted from the same image with the same pipeline settings are
+        loaded from the :class:`IdentityCache` rather than being extracted again. Default: `""`
     """
     def __init__(self,
                  threshold: float,
                  filter_files: list[str] | None,
                  nfilter_files: list[str] | None,
-                 extractor: Extractor) -> None:
+                 extractor: Extractor,
+                 pipeline_key: str = "") -> None:
         logger.debug("Initializing %s: (threshold: %s, filter_files: %s, nfilter_files: %s "
-                     "extractor: %s)", self.__class__.__name__, threshold, filter_files,
-                     nfilter_files, extractor)
+                     "extractor: %s, pipeline_key: '%s')", self.__class__.__name__, threshold,
+                     filter_files, nfilter_files, extractor, pipeline_key)
         self._threshold = threshold
         self._filter_files, self._nfilter_files = self._validate_inputs(filter_files,
                                                                         nfilter_files)
@@ -211,6 +361,7 @@ class Filter():
         self._embeddings: list[np.ndarray] = [np.array([]) for _ in self._filter_files]
         self._nembeddings: list[np.ndarray] = [np.array([]) for _ in self._nfilter_files]
         self._extractor = extractor
+        self._cache = IdentityCache(pipeline_key)
 
         self._get_embeddings()
         self._extractor.recognition.add_identity_filters(self.embeddings,
@@ -358,8 +509,8 @@ class Filter():
 
         return retval, True
 
-    def _process_extracted(self, item: ExtractMedia) -> None:
-        """ Process the output from the extraction pipeline.
+    def _add_identities(self, filename: str, identities: np.ndarray) -> None:
+        """ Add the identities obtained from the extraction pipeline for a filter file.
 
         If no face has been detected, or multiple faces are detected for the inclusive filter,
         embeddings and filenames are removed from the filter.
@@ -369,41 +520,55 @@ class Filter():
 
         Parameters
         ----------
-        item: :class:`plugins.extract.Pipeline.ExtracMedia`
-            The output from the extraction pipeline containing the identity encodings
+        filename: str
+            The full path to the filter file that the identities were obtained from
+        identities: :class:`numpy.ndarray`
+            The identity encodings for each face that was detected in the file
         """
-        is_filter = item.filename in self._filter_files
+        is_filter = filename in self._filter_files
         lbl = "filter" if is_filter else "nfilter"
         filelist = self._filter_files if is_filter else self._nfilter_files
         embeddings = self._embeddings if is_filter else self._nembeddings
-        identities = np.array([face.identity["vggface2"] for face in item.detected_faces])
-        idx = filelist.index(item.filename)
+        idx = filelist.index(filename)
 
-        if len(item.detected_faces) == 0:
+        if len(identities) == 0:
             logger.warning("No faces detected for %s in file '%s'. Image will not be used",
-                           lbl, os.path.basename(item.filename))
+                           lbl, os.path.basename(filename))
             filelist.pop(idx)
             embeddings.pop(idx)
             return
 
-        if len(item.detected_faces) == 1:
-            logger.debug("Adding identity for %s from file '%s'", lbl, item.filename)
+        if len(identities) == 1:
+            logger.debug("Adding identity for %s from file '%s'", lbl, filename)
             embeddings[idx] = identities
             return
 
-        if len(item.detected_faces) > 1 and is_filter:
+        if len(identities) > 1 and is_filter:
             logger.warning("%s faces detected for filter in '%s'. These identies will not be used",
-                           len(item.detected_faces), os.path.basename(item.filename))
+                           len(identities), os.path.basename(filename))
             filelist.pop(idx)
             embeddings.pop(idx)
             return
 
-        if len(item.detected_faces) > 1 and not is_filter:
+        if len(identities) > 1 and not is_filter:
             logger.warning("%s faces detected for nfilter in '%s'. All of these identies will be "
-                           "used", len(item.detected_faces), os.path.basename(item.filename))
+                           "used", len(identities), os.path.basename(filename))
             embeddings[idx] = identities
             return
 
+    def _process_extracted(self, item: ExtractMedia) -> None:
+        """ Process the output from the extraction pipeline, storing the identities in the
+        :class:`IdentityCache` and adding them to the relevant filter list
+
+        Parameters
+        ----------
+        item: :class:`plugins.extract.Pipeline.ExtracMedia`
+            The output from the extraction pipeline containing the identity encodings
+        """
+        identities = np.array([face.identity["vggface2"] for face in item.detected_faces])
+        self._cache.set(item.filename, identities)
+        self._add_identities(item.filename, identities)
+
     def _identity_from_extractor(self, file_list: list[str], aligned: list[str]) -> None:
         """ Obtain the identity embeddings from the extraction pipeline
 
@@ -452,6 +617,7 @@ class Filter():
         """ Obtain the embeddings for the given filter lists """
         needs_extraction: list[str] = []
         aligned: list[str] = []
+        cached: dict[str, np.ndarray] = {}
 
         for files, embed in zip((self._filter_files, self._nfilter_files),
                                 (self._embeddings, self._nembeddings)):
@@ -462,12 +628,22 @@ class Filter():
                     embed[idx] = identity[None, ...]
                     continue
 
+                identities = self._cache.get(file)
+                if identities is not None:
+                    logger.debug("Obtained identity from cache: '%s'", file)
+                    cached[file] = identities
+                    continue
+
                 needs_extraction.append(file)
                 if is_aligned:
                     aligned.append(file)
 
+        for file, identities in cached.items():
+            self._add_identities(file, identities)
+
         if needs_extraction:
             self._identity_from_extractor(needs_extraction, aligned)
+            self._cache.save()
 
         if not self._nfilter_files and not self._filter_files:
             logger.error("No faces were detected from your selected identity filter files")
@@ -480,6 +656,369 @@ class Filter():
                      self.n_embeddings.shape)
 
 
+class IdentityCache():
+    """ Stores the identity embeddings that have been obtained by running reference filter images
+    through the extraction pipeline, so that the same images do not need to be extracted again
+    on later runs.
+
+    Embeddings are keyed by a hash of the image file's contents and the settings of the pipeline
+    that they were obtained with, so renamed or moved images are still found and edited images
+    are extracted again.
+
+    Parameters
+    ----------
+    pipeline_key: str
+        Identifies the extraction pipeline settings that the embeddings are obtained with
+    filename: str, optional
+        Full path to the file that holds the cached embeddings. ``None`` to use the default
+        location within the faceswap config folder. Default: ``None``
+    """
+    _max_entries = 2048
+    """ int: The maximum number of images to hold embeddings for. The least recently used are
+    discarded first """
+
+    def __init__(self, pipeline_key: str, filename: str | None = None) -> None:
+        logger.debug("Initializing %s: (pipeline_key: '%s', filename: '%s')",
+                     self.__class__.__name__, pipeline_key, filename)
+        self._pipeline_key = pipeline_key
+        self._filename = self._get_filename() if filename is None else filename
+        self._serializer = get_serializer("compressed")
+        self._data = self._load()
+        self._keys: dict[str, str] = {}
+        self._is_updated = False
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    @classmethod
+    def _get_filename(cls) -> str:
+        """ str: The full path to the default cache file in the faceswap config folder """
+        root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        return os.path.join(root, "config", ".extract_identity_cache")
+
+    def _load(self) -> dict[str, np.ndarray]:
+        """ Load the cached embeddings
+
+        Returns
+        -------
+        dict
+            The cache keys with the identity embeddings for each face found in the image
+        """
+        if not os.path.isfile(self._filename):
+            logger.debug("No identity cache exists at '%s'", self._filename)
+            return {}
+        try:
+            retval = self._serializer.load(self._filename)
+        except FaceswapError as err:
+            logger.debug("Unable to load identity cache: %s", str(err))
+            return {}
+        logger.debug("Loaded %s cached identities", len(retval))
+        return retval if isinstance(retval, dict) else {}
+
+    def _get_key(self, filename: str) -> str:
+        """ Obtain the cache key for an image file
+
+        Parameters
+        ----------
+        filename: str
+            Full path to the image file
+
+        Returns
+        -------
+        str
+            The pipeline key with the hex digest of the hash of the file's contents
+        """
+        if filename not in self._keys:
+            digest = hashlib.sha1()
+            with open(filename, "rb") as in_file:
+                for chunk in iter(lambda: in_file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            self._keys[filename] = f"{self._pipeline_key}|{digest.hexdigest()}"
+        return self._keys[filename]
+
+    def get(self, filename: str) -> np.ndarray | None:
+        """ Obtain the cached identity embeddings for an image file
+
+        Parameters
+        ----------
+        filename: str
+            Full path to the image file
+
+        Returns
+        -------
+        :class:`numpy.ndarray` or ``None``
+            The identity embeddings for each face found in the image or ``None`` if the image is
+            not cached
+        """
+        key = self._get_key(filename)
+        retval = self._data.pop(key, None)
+        if retval is not None:
+            self._data[key] = retval  # Move to most recently used
+        logger.trace("filename: '%s', key: '%s', cached: %s",  # type:ignore[attr-defined]
+                     filename, key, retval is not None)
+        return retval
+
+    def set(self, filename: str, identities: np.ndarray) -> None:
+        """ Add the identity embeddings for an image file to the cache
+
+        Parameters
+        ----------
+        filename: str
+            Full path to the image file
+        identities: :class:`numpy.ndarray`
+            The identity embeddings for each face found in the image
+        """
+        key = self._get_key(filename)
+        self._data.pop(key, None)
+        self._data[key] = identities
+        while len(self._data) > self._max_entries:
+            del self._data[next(iter(self._data))]
+        self._is_updated = True
+
+    def save(self) -> None:
+        """ Save the cache to disk, if it has been updated """
+        if not self._is_updated:
+            return
+        try:
+            self._serializer.save(f"{self._filename}.tmp", self._data)
+            os.replace(f"{self._filename}.tmp", self._filename)
+        except (FaceswapError, OSError) as err:
+            logger.warning("Unable to save reference identities to '%s': %s",
+                           self._filename, str(err))
+            return
+        self._is_updated = False
+        logger.debug("Saved %s cached identities to '%s'", len(self._data), self._filename)
+
+
+class FrameStore():
+    """ Holds the frames between the passes of a multi-pass extraction, so that later passes do
+    not need to load and decode the frames from the source again.
+
+    Only the area of each frame that later passes can use is held. This is the area covering the
+    head centered aligned face, at :attr:`coverage_ratio`, for each of the frame's detected faces,
+    losslessly compressed. When a frame is restored, the remainder of the frame is black. Frames
+    that contain no faces hold no image data at all.
+
+    Frames are queued with :func:`put` and compressed into the store from the loader thread (see
+    :func:`PipelineLoader.hold`), so that the output of the extraction pass is not held up.
+
+    Parameters
+    ----------
+    mode: ["auto", "disk"]
+        `"auto"` to hold the frames in memory until :attr:`memory_limit` is reached, and then to
+        spill any further frames to a temporary folder on disk. `"disk"` to hold all frames on disk
+    memory_limit: int, optional
+        The number of bytes of compressed frame data to hold in memory in `"auto"` mode.
+        Default: 1GB
+    """
+    coverage_ratio = 1.0
+    """ float: The coverage ratio of the largest head centered aligned face that later passes
+    extract from the frame """
+
+    def __init__(self,
+                 mode: T.Literal["auto", "disk"],
+                 memory_limit: int = 1024 * 1024 * 1024) -> None:
+        logger.debug("Initializing %s: (mode: '%s', memory_limit: %s)",
+                     self.__class__.__name__, mode, memory_limit)
+        self._memory_limit = memory_limit if mode == "auto" else 0
+        self._memory_used = 0
+        self._items: dict[str, tuple[ExtractMedia,
+                                     tuple[int, int, int],
+                                     tuple[int, int, int, int] | None,
+                                     bytes | str | None]] = {}
+        self._queue: Queue[ExtractMedia | T.Literal["EOF"]] = Queue(maxsize=16)
+        self._folder: TemporaryDirectory | None = None
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    def __len__(self) -> int:
+        """ int: The number of frames held in the store """
+        return len(self._items)
+
+    def _face_roi(self, face: DetectedFace) -> np.ndarray:
+        """ Obtain the area of the frame covered by the head centered aligned face for a detected
+        face.
+
+        If the face has landmarks then the area is the exact footprint of the aligned face within
+        the frame. If the face only has a detected bounding box (i.e. the aligner has not yet
+        run) then the aligned face is estimated from the box, centered on the box at the size
+        that a head centered extract takes relative to the face and allowing for any rotation.
+
+        Parameters
+        ----------
+        face: :class:`~lib.align.DetectedFace`
+            The detected face to obtain the area for
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The (`left`, `top`, `right`, `bottom`) area of the frame, unclipped
+        """
+        if face._landmarks_xy is not None:  # pylint:disable=protected-access
+            roi = AlignedFace(face.landmarks_xy,
+                              centering="head",
+                              coverage_ratio=self.coverage_ratio).original_roi
+            return np.concatenate([roi.min(axis=0), roi.max(axis=0) + 1]).astype("float64")
+
+        assert face.left is not None and face.top is not None
+        assert face.width is not None and face.height is not None
+        size = max(face.width, face.height)
+        half = size * self.coverage_ratio / (1 - EXTRACT_RATIOS["head"]) * np.sqrt(2) / 2
+        center = (face.left + face.width / 2, face.top + face.height / 2)
+        return np.array([center[0] - half, center[1] - half, center[0] + half, center[1] + half])
+
+    def _get_roi(self, extract_media: ExtractMedia) -> tuple[int, int, int, int] | None:
+        """ Obtain the area of the frame to hold for the frame's detected faces
+
+        Parameters
+        ----------
+        extract_media: :class:`~plugins.extract.extract_media.ExtractMedia`
+            The frame to obtain the area for
+
+        Returns
+        -------
+        tuple or ``None``
+            The (`left`, `top`, `right`, `bottom`) area of the frame to hold, or ``None`` if the
+            frame has no detected faces
+        """
+        if not extract_media.detected_faces:
+            return None
+        height, width = extract_media.image_shape[:2]
+        areas = np.array([self._face_roi(face) for face in extract_media.detected_faces])
+        # Pad by 2 pixels for interpolation when warping the aligned face from the frame
+        return (int(np.clip(np.floor(areas[:, 0].min()) - 2, 0, width)),
+                int(np.clip(np.floor(areas[:, 1].min()) - 2, 0, height)),
+                int(np.clip(np.ceil(areas[:, 2].max()) + 2, 0, width)),
+                int(np.clip(np.ceil(areas[:, 3].max()) + 2, 0, height)))
+
+    def put(self,
+            item: ExtractMedia | T.Literal["EOF"],
+            timeout: float | None = None) -> bool:
+        """ Queue the output from an extraction pass to be added to the store from the loader
+        thread. ``"EOF"`` is queued once the pass is complete.
+
+        Parameters
+        ----------
+        item: :class:`~plugins.extract.extract_media.ExtractMedia` or ``"EOF"``
+            The output from the extraction pass or ``"EOF"`` to indicate that the pass is complete
+        timeout: float, optional
+            The number of seconds to wait for space in the queue. ``None`` to wait indefinitely.
+            Default: ``None``
+
+        Returns
+        -------
+        bool
+            ``True`` if the item was queued. ``False`` if the queue was still full at timeout
+        """
+        try:
+            self._queue.put(item, timeout=timeout)
+        except Full:
+            return False
+        return True
+
+    def get(self, timeout: float | None = None) -> ExtractMedia | T.Literal["EOF"] | None:
+        """ Obtain the next item queued by :func:`put`. Called from the loader thread, which adds
+        the item to the store with :func:`add`.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            The number of seconds to wait for an item. ``None`` to wait indefinitely.
+            Default: ``None``
+
+        Returns
+        -------
+        :class:`~plugins.extract.extract_media.ExtractMedia`, ``"EOF"`` or ``None``
+            The next queued item, or ``None`` if no item was queued before timeout
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def add(self, extract_media: ExtractMedia) -> None:
+        """ Add a frame to the store. The frame's image is removed from the given object.
+
+        Parameters
+        ----------
+        extract_media: :class:`~plugins.extract.extract_media.ExtractMedia`
+            The output from an extraction pass to hold for the next pass
+        """
+        roi = self._get_roi(extract_media)
+        data: bytes | str | None = None
+        if roi is not None and roi[2] > roi[0] and roi[3] > roi[1]:
+            crop = extract_media.image[roi[1]:roi[3], roi[0]:roi[2]]
+            data = cv2.imencode(".png", crop, [cv2.IMWRITE_PNG_COMPRESSION, 1])[1].tobytes()
+            if self._memory_used + len(data) > self._memory_limit:
+                data = self._spill(data)
+            else:
+                self._memory_used += len(data)
+        else:
+            roi = None
+        logger.trace("Storing frame: '%s', roi: %s, size: %s",  # type:ignore[attr-defined]
+                     extract_media.filename, roi, None if data is None else len(data))
+        shape = extract_media.image_shape
+        extract_media.remove_image()
+        self._items[extract_media.filename] = (extract_media, shape, roi, data)
+
+    def _spill(self, data: bytes) -> str:
+        """ Write compressed frame data to the temporary folder on disk
+
+        Parameters
+        ----------
+        data: bytes
+            The compressed frame data
+
+        Returns
+        -------
+        str
+            The full path to the file that the data has been written to
+        """
+        if self._folder is None:
+            self._folder = TemporaryDirectory(prefix="faceswap_frames_")
+            logger.debug("Spilling frames to: '%s'", self._folder.name)
+        retval = os.path.join(self._folder.name, f"{len(self._items)}.png")
+        with open(retval, "wb") as out_file:
+            out_file.write(data)
+        return retval
+
+    def frames(self) -> Generator[ExtractMedia, None, None]:
+        """ Remove each frame from the store, in the order that they were added, with its image
+        restored. The store is empty once all frames have been yielded.
+
+        Yields
+        ------
+        :class:`~plugins.extract.extract_media.ExtractMedia`
+            The frame with its image restored
+        """
+        try:
+            while self._items:
+                filename = next(iter(self._items))
+                extract_media, shape, roi, data = self._items.pop(filename)
+                image = np.zeros(shape, dtype="uint8")
+                if isinstance(data, str):
+                    with open(data, "rb") as in_file:
+                        encoded = in_file.read()
+                    os.remove(data)
+                else:
+                    encoded = data
+                    self._memory_used -= 0 if data is None else len(data)
+                if roi is not None and encoded is not None:
+                    image[roi[1]:roi[3], roi[0]:roi[2]] = cv2.imdecode(
+                        np.frombuffer(encoded, dtype="uint8"), cv2.IMREAD_UNCHANGED
+                    ).reshape(roi[3] - roi[1], roi[2] - roi[0], -1)
+                extract_media.set_image(image)
+                yield extract_media
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """ Remove any frames held and clean up the temporary folder """
+        self._items = {}
+        self._memory_used = 0
+        if self._folder is not None:
+            logger.debug("Removing frame spill folder: '%s'", self._folder.name)
+            self._folder.cleanup()
+            self._folder = None
+
+
 class PipelineLoader():
     """ Handles loading and reloading images into the extraction pipeline.
 
@@ -534,6 +1073,19 @@ class PipelineLoader():
         """
         self._images.add_skip_list(skip_list)
 
+    def frames(self) -> Generator[ExtractMedia, None, None]:
+        """ Load the images that are to be processed from :class:`lib.image.ImagesLoader`
+
+        Yields
+        ------
+        :class:`~plugins.extract.extract_media.ExtractMedia`
+            The loaded image, formatted for input into
+            :class:`plugins.extract.Pipeline.Extractor`
+        """
+        for filename, image in self._images.load():
+            is_aligned = filename in self._aligned_filenames
+            yield ExtractMedia(filename, image[..., :3], is_aligned=is_aligned)
+
     def launch(self) -> None:
         """ Launch the image loading pipeline """
         self._threaded_redirector("load")
@@ -542,6 +1094,11 @@ class PipelineLoader():
         """ Reload images for multiple pipeline passes """
         self._threaded_redirector("reload", (detected_faces, ))
 
+    def hold(self, store: FrameStore) -> None:
+        """ Hold the output of the current pass in a frame store and restore the images for the
+        next pass once the current pass is complete, for multiple pipeline passes """
+        self._threaded_redirector("hold", (store, ))
+
     def check_thread_error(self) -> None:
         """ Check if any errors have occurred in the running threads and raise their errors """
         for thread in self._threads:
@@ -577,12 +1134,10 @@ class PipelineLoader():
         """
         logger.debug("Load Images: Start")
         load_queue = self._extractor.input_queue
-        for filename, image in self._images.load():
+        for item in self.frames():
             if load_queue.shutdown.is_set():
                 logger.debug("Load Queue: Stop signal received. Terminating")
                 break
-            is_aligned = filename in self._aligned_filenames
-            item = ExtractMedia(filename, image[..., :3], is_aligned=is_aligned)
             load_queue.put(item)
         load_queue.put("EOF")
         logger.debug("Load Images: Complete")
@@ -615,6 +1170,49 @@ class PipelineLoader():
         load_queue.put("EOF")
         logger.debug("Reload Images: Complete")
 
+    def _hold(self, store: FrameStore) -> None:
+        """ Compress the output from the current extraction pass into the frame store as it is
+        queued, then restore the images into the extraction queue once ``"EOF"`` is received.
+
+        Parameters
+        ----------
+        store: :class:`FrameStore`
+            The store to hold the output from the current extraction pass
+        """
+        logger.debug("Hold Images: Start")
+        load_queue = self._extractor.input_queue
+        while True:
+            if load_queue.shutdown.is_set():
+                logger.debug("Hold Queue: Stop signal received. Terminating")
+                store.close()
+                return
+            item = store.get(timeout=1.0)
+            if item is None:
+                continue
+            if isinstance(item, str):
+                break
+            store.add(item)
+        logger.debug("Hold Images: Complete. Frame Count: %s", len(store))
+        self._restore(store)
+
+    def _restore(self, store: FrameStore) -> None:
+        """ Restore the images held in a frame store and pass back into the extraction queue
+
+        Parameters
+        ----------
+        store: :class:`FrameStore`
+            The store holding the output from the previous extraction pass
+        """
+        logger.debug("Restore Images: Start. Frame Count: %s", len(store))
+        load_queue = self._extractor.input_queue
+        for extract_media in store.frames():
+            if load_queue.shutdown.is_set():
+                logger.debug("Restore Queue: Stop signal received. Terminating")
+                break
+            load_queue.put(extract_media)
+        load_queue.put("EOF")
+        logger.debug("Restore Images: Complete")
+
 
 class _Extract():
     """ The Actual extraction process.
@@ -650,8 +1248,19 @@ class _Extract():
 
         self._post_process = PostProcess(arguments)
         self._verify_output = False
+
+        self._size = self._args.size if hasattr(self._args, "size") else 256
+        self._frame_cache: str = getattr(self._args, "frame_cache", "off")
+        self._saver: ImagesSaver | None = None
+        self._unsaved: list[str] = []
+        self._output_count = 0
         logger.debug("Initialized %s", self.__class__.__name__)
 
+    @property
+    def loader(self) -> PipelineLoader:
+        """ :class:`PipelineLoader`: The loader for the images in this job's input location """
+        return self._loader
+
     @property
     def _save_interval(self) -> int | None:
         """ int: The number of frames to be processed between each saving of the alignments file if
@@ -702,6 +1311,34 @@ class _Extract():
         self._loader.launch()
         self._run_extraction()
         self._loader.join()
+        self.complete()
+
+    def output(self, extract_media: ExtractMedia) -> None:
+        """ Output the results for a frame from the final pass of the extraction pipeline.
+
+        Processes and saves the faces, adds the frame to the alignments data and saves the
+        alignments file if the save interval has been reached.
+
+        Parameters
+        ----------
+        extract_media: :class:`~plugins.extract.extract_media.ExtractMedia`
+            Output from :class:`plugins.extract.pipeline.Extractor`
+        """
+        if self._saver is None and self._output_dir is not None:
+            self._saver = ImagesSaver(self._output_dir, as_bytes=True)
+        self._unsaved.append(os.path.basename(extract_media.filename))
+        self._output_processing(extract_media, self._size)
+        self._output_faces(self._saver, extract_media)
+        self._output_count += 1
+        if self._save_interval and self._output_count % self._save_interval == 0:
+            self._alignments.save_frames(self._unsaved)
+            self._unsaved = []
+
+    def complete(self) -> None:
+        """ Complete the job once all frames have been output. Waits for the faces to be saved,
+        saves the alignments file and outputs the summary for the job """
+        if self._saver is not None:
+            self._saver.close()
         self._alignments.save()
         finalize(self._loader.process_count + self._existing_count,
                  self._alignments.faces_count,
@@ -714,37 +1351,52 @@ class _Extract():
         faces and data (if on the final pass) or reprocesses data through the pipeline for serial
         processing.
         """
-        size = self._args.size if hasattr(self._args, "size") else 256
-        saver = None if self._args.skip_saving_faces else ImagesSaver(self._output_dir,
-                                                                      as_bytes=True)
         for phase in range(self._extractor.passes):
             is_final = self._extractor.final_pass
             detected_faces: dict[str, ExtractMedia] = {}
+            store = None if is_final or self._frame_cache == "off" else FrameStore(
+                T.cast(T.Literal["auto", "disk"], self._frame_cache))
+            if store is not None:
+                self._loader.hold(store)
             self._extractor.launch()
             self._loader.check_thread_error()
             ph_desc = "Extraction" if self._extractor.passes == 1 else self._extractor.phase_text
             desc = f"Running pass {phase + 1} of {self._extractor.passes}: {ph_desc}"
-            for idx, extract_media in enumerate(tqdm(self._extractor.detected_faces(),
-                                                     total=self._loader.process_count,
-                                                     file=sys.stdout,
-                                                     desc=desc,
-                                                     leave=False)):
+            for extract_media in tqdm(self._extractor.detected_faces(),
+                                      total=self._loader.process_count,
+                                      file=sys.stdout,
+                                      desc=desc,
+                                      leave=False):
                 self._loader.check_thread_error()
                 if is_final:
-                    self._output_processing(extract_media, size)
-                    self._output_faces(saver, extract_media)
-                    if self._save_interval and (idx + 1) % self._save_interval == 0:
-                        self._alignments.save()
+                    self.output(extract_media)
+                elif store is not None:
+                    self._hold_frame(store, extract_media)
                 else:
                     extract_media.remove_image()
                     # cache extract_media for next run
                     detected_faces[extract_media.filename] = extract_media
 
-            if not is_final:
+            if store is not None:
+                logger.debug("Restoring images")
+                self._hold_frame(store, "EOF")
+            elif not is_final:
                 logger.debug("Reloading images")
                 self._loader.reload(detected_faces)
-        if saver is not None:
-            saver.close()
+
+    def _hold_frame(self, store: FrameStore, item: ExtractMedia | T.Literal["EOF"]) -> None:
+        """ Queue the output of an extraction pass into the frame store, checking for errors in
+        the loader thread whilst waiting for space in the queue
+
+        Parameters
+        ----------
+        store: :class:`FrameStore`
+            The store holding the output of the current extraction pass
+        item: :class:`~plugins.extract.extract_media.ExtractMedia` or ``"EOF"``
+            The output from the extraction pass or ``"EOF"`` once the pass is complete
+        """
+        while not store.put(item, timeout=1.0):
+            self._loader.check_thread_error()
 
     def _output_processing(self, extract_media: ExtractMedia, size: int) -> None:
         """ Prepare faces for output
@@ -824,3 +1476,89 @@ class _Extract():
         self._alignments.data[os.path.basename(extract_media.filename)] = {"faces": final_faces,
                                                                            "video_meta": {}}
         del extract_media
+
+
+class _StreamedExtract():
+    """ Extraction for batch mode, streaming the frames from every input through a single run of
+    the extraction pipeline.
+
+    Frames are loaded from each input in turn, so that the pipeline stays full across the
+    boundaries between inputs. The job that each frame belongs to is recorded as it is loaded, and
+    the output for the frame is routed to the alignments and faces folder for that job. Each job
+    is completed as soon as all of its frames have been received back from the pipeline.
+
+    Parameters
+    ----------
+    extractor: :class:`~plugins.extract.pipeline.Extractor`
+        The extractor pipeline for running extractions. Must run in a single pass
+    arguments: list
+        The :class:`argparse.Namespace` arguments for each job, with the input and output locations
+        set
+    """
+    def __init__(self, extractor: Extractor, arguments: list[Namespace]) -> None:
+        logger.debug("Initializing %s: (extractor: %s, jobs: %s)",
+                     self.__class__.__name__, extractor, len(arguments))
+        assert extractor.passes == 1, "Streamed extraction requires a single pass"
+        self._extractor = extractor
+        self._arguments = arguments
+        self._jobs: list[_Extract] = []
+        self._routes: dict[str, int] = {}
+        self._loaded: dict[int, int] = {}
+        self._received: dict[int, int] = {}
+        self._thread = MultiThread(self._load, thread_count=1, name="StreamedLoader")
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    def _load(self) -> None:
+        """ Load the frames from each job in turn into the extraction pipeline.
+
+        Each job is initialized as it is reached. The job for each frame is recorded prior to it
+        being placed in the pipeline, and the number of frames loaded for a job is recorded once
+        all of its frames have been queued.
+        """
+        logger.debug("Streamed Load: Start")
+        load_queue = self._extractor.input_queue
+        try:
+            for job_id, arguments in enumerate(self._arguments):
+                logger.info("Loading job %s of %s: '%s'",
+                            job_id + 1, len(self._arguments), arguments.input_dir)
+                self._jobs.append(_Extract(self._extractor, arguments))
+                count = 0
+                for item in self._jobs[job_id].loader.frames():
+                    if load_queue.shutdown.is_set():
+                        logger.debug("Load Queue: Stop signal received. Terminating")
+                        return
+                    self._routes[item.filename] = job_id
+                    load_queue.put(item)
+                    count += 1
+                self._loaded[job_id] = count
+        finally:
+            load_queue.put("EOF")
+        logger.debug("Streamed Load: Complete")
+
+    def _complete_jobs(self) -> None:
+        """ Complete any jobs that have had all of their frames loaded and received back from
+        the extraction pipeline """
+        for job_id, count in list(self._loaded.items()):
+            if self._received.get(job_id, 0) != count:
+                continue
+            logger.debug("Completing job %s: '%s'", job_id, self._arguments[job_id].input_dir)
+            del self._loaded[job_id]
+            self._jobs[job_id].complete()
+
+    def process(self) -> None:
+        """ Run the extraction for all of the jobs, routing the output of each frame to the job
+        that it belongs to """
+        logger.info("Streaming %s inputs through the extraction pipeline", len(self._arguments))
+        self._extractor.launch()
+        self._thread.start()
+        for extract_media in tqdm(self._extractor.detected_faces(),
+                                  file=sys.stdout,
+                                  desc="Running streamed extraction",
+                                  leave=False):
+            self._thread.check_and_raise_error()
+            job_id = self._routes.pop(extract_media.filename)
+            self._jobs[job_id].output(extract_media)
+            self._received[job_id] = self._received.get(job_id, 0) + 1
+            self._complete_jobs()
+        self._thread.join()
+        self._complete_jobs()
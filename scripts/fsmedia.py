@@ -18,7 +18,7 @@ import numpy as np
 import imageio
 
 from lib.align import Alignments as AlignmentsBase, get_centered_size
-from lib.image import count_frames, read_image
+from lib.image import close_video_readers, count_frames, get_video_reader, read_image
 from lib.utils import (camel_case_split, get_image_paths, VIDEO_EXTENSIONS)
 
 if T.TYPE_CHECKING:
@@ -79,7 +79,9 @@ class Alignments(AlignmentsBase):
         self._args = arguments
         self._is_extract = is_extract
         folder, filename = self._set_folder_filename(input_is_video)
-        super().__init__(folder, filename=filename)
+        super().__init__(folder,
+                         filename=filename,
+                         columnar=getattr(arguments, "columnar_alignments", False))
         logger.debug("Initialized %s", self.__class__.__name__)
 
     def _set_folder_filename(self, input_is_video: bool) -> tuple[str, str]:
@@ -297,6 +299,21 @@ class Images():
             yield filename, frame
         reader.close()
 
+    def set_video_meta_data(self,
+                            video_meta_data: dict[str, list[int] | list[float] | None]) -> None:
+        """ Provide the keyframe index for the input video, so that single frames can be loaded
+        by seeking to the nearest keyframe without first analyzing the video.
+
+        Parameters
+        ----------
+        video_meta_data: dict
+            The `pts_time` and `keyframes` for the input video, as stored in the alignments file
+        """
+        if not self._is_video:
+            return
+        logger.debug("Setting video meta data for '%s'", self._args.input_dir)
+        get_video_reader(self._args.input_dir, video_meta_data=video_meta_data)
+
     def load_one_image(self, filename) -> np.ndarray:
         """ Obtain a single image for the given filename.
 
@@ -338,11 +355,23 @@ class Images():
             The image for the requested frame index,
         """
         logger.trace("Loading video frame: %s", frame_no)  # type:ignore[attr-defined]
-        reader = imageio.get_reader(self._args.input_dir, "ffmpeg")  # type:ignore[arg-type]
-        reader.set_image_index(frame_no - 1)
-        frame = reader.get_next_data()[:, :, ::-1]  # type:ignore[index]
-        reader.close()
-        return frame
+        reader = get_video_reader(self._args.input_dir)
+        return reader.get_frame(frame_no - 1)
+
+    def close(self) -> dict[str, list[int] | list[float] | None] | None:
+        """ Close the shared video reader and its decoders opened for single frame access.
+
+        Returns
+        -------
+        dict or ``None``
+            The `pts_time` and `keyframes` held by the reader for the input video, so that a
+            generated keyframe index can be stored in the alignments file. ``None`` if the input
+            is not a video or no reader was opened
+        """
+        video_meta = close_video_readers()
+        if not self._is_video:
+            return None
+        return video_meta.get(os.path.abspath(self._args.input_dir))
 
 
 class PostProcess():
@@ -358,12 +358,15 @@ class Train():
             if save_iteration or self._save_now:
                 logger.debug("Saving (save_iterations: %s, save_now: %s) Iteration: "
                              "(iteration: %s)", save_iteration, self._save_now, iteration)
+                trainer.flush_loss()
                 model.io.save(is_exit=False)
                 self._save_now = False
                 update_preview_images = True
 
         logger.debug("Training cycle complete")
+        trainer.flush_loss()
         model.io.save(is_exit=True)
+        trainer.flush_previews()
         trainer.clear_tensorboard()
         self._stop = True
 
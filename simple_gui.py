@@ -25,6 +25,9 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 class SimpleFaceSwapGUI:
+    # Prefix of the job status lines written by the extraction worker (scripts/extract.py)
+    EXTRACT_WORKER_PREFIX = "[extract-worker] "
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Simple FaceSwap - Step by Step")
@@ -41,6 +44,9 @@ class SimpleFaceSwapGUI:
         # Paths
         self.faceswap_dir = "/Users/admin/Documents/faceswap/faceswap"
         
+        # Long-lived extraction process, reused for every file extracted in a run
+        self.extract_worker: Optional[subprocess.Popen] = None
+        
         self.setup_ui()
         self.update_step_display()
         
@@ -1274,18 +1280,17 @@ You can also view training progress and model information below."""
                 target_output = os.path.join(self.project_dir, 'target_faces')
                 os.makedirs(target_output, exist_ok=True)
                 
-                for i, file in enumerate(self.target_faces_files):
-                    self.log_message(f"Processing NEW face file {i+1}/{len(self.target_faces_files)}: {os.path.basename(file)}")
-                    self.extract_faces(file, target_output, "target")
+                self.log_message(f"Processing {len(self.target_faces_files)} NEW face files")
+                self.extract_files(self.target_faces_files, target_output, "target")
                 
                 # Step 2: Extract faces from content to be converted (these become "source" faces)
                 self.update_progress("Extracting faces from content to be converted...")
                 source_output = os.path.join(self.project_dir, 'source_faces')
                 os.makedirs(source_output, exist_ok=True)
                 
-                for i, file in enumerate(self.convert_files):
-                    self.log_message(f"Extracting faces from content {i+1}/{len(self.convert_files)}: {os.path.basename(file)}")
-                    self.extract_faces(file, source_output, "content_source")
+                self.log_message(f"Extracting faces from {len(self.convert_files)} content files")
+                self.extract_files(self.convert_files, source_output, "content_source")
+                self.stop_extract_worker()
                 
                 # Check face counts (filter out metadata files)
                 source_count = len([f for f in os.listdir(source_output) 
@@ -1325,18 +1330,17 @@ You can also view training progress and model information below."""
                 source_output = os.path.join(self.project_dir, 'source_faces')
                 os.makedirs(source_output, exist_ok=True)
                 
-                for i, file in enumerate(self.source_files):
-                    self.log_message(f"Processing ORIGINAL face file {i+1}/{len(self.source_files)}: {os.path.basename(file)}")
-                    self.extract_faces(file, source_output, "source")
+                self.log_message(f"Processing {len(self.source_files)} ORIGINAL face files")
+                self.extract_files(self.source_files, source_output, "source")
                     
                 # Step 2: Extract target faces (NEW faces to put on others)
                 self.update_progress("Extracting NEW FACE training material...")
                 target_output = os.path.join(self.project_dir, 'target_faces')
                 os.makedirs(target_output, exist_ok=True)
                 
-                for i, file in enumerate(self.target_faces_files):
-                    self.log_message(f"Processing NEW face file {i+1}/{len(self.target_faces_files)}: {os.path.basename(file)}")
-                    self.extract_faces(file, target_output, "target")
+                self.log_message(f"Processing {len(self.target_faces_files)} NEW face files")
+                self.extract_files(self.target_faces_files, target_output, "target")
+                self.stop_extract_worker()
                     
                 # Check face counts (filter out metadata files)
                 source_count = len([f for f in os.listdir(source_output) 
@@ -1418,80 +1422,172 @@ You can also view training progress and model information below."""
                 self.log_message("💡 Tip: Training needs to complete successfully before conversion")
                 
         finally:
+            self.stop_extract_worker()
             self.root.after(0, self.processing_finished)
             
     def extract_faces(self, input_file: str, output_dir: str, face_type: str):
         """Extract faces from input file"""
-        try:
-            self.log_message(f"Extracting {face_type} faces from: {os.path.basename(input_file)}")
+        self.extract_files([input_file], output_dir, face_type)
+        
+    def extract_files(self, input_files: List[str], output_dir: str, face_type: str):
+        """Extract faces from input files with the persistent extraction worker
+        
+        Single images are gathered into one temporary folder and extracted as a single job, videos
+        are extracted as one job each. The detector, aligner and masker are only loaded once, when
+        the worker starts.
+        """
+        # Clean the input files first
+        cleaned_files = self.clean_input_files(input_files)
+        for skipped in sorted(set(input_files) - set(cleaned_files)):
+            self.log_message(f"⚠️ Skipping {os.path.basename(skipped)} - file has issues")
             
-            # Clean the input file first
-            cleaned_files = self.clean_input_files([input_file])
-            if not cleaned_files:
-                self.log_message(f"⚠️ Skipping {os.path.basename(input_file)} - file has issues")
-                return
+        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
+        images = [f for f in cleaned_files if os.path.splitext(f.lower())[1] in image_extensions]
+        videos = [f for f in cleaned_files if f not in images]
+        
+        if images:
+            self.extract_image_files(images, output_dir, face_type)
+                    
+        for i, input_file in enumerate(videos):
+            self.log_message(f"Extracting {face_type} faces from video {i+1}/{len(videos)}: {os.path.basename(input_file)}")
+            try:
+                self.run_extract_job(input_file, output_dir)
+            except Exception as e:
+                self.log_message(f"❌ Failed to extract faces from {os.path.basename(input_file)}: {str(e)}")
+                # Log the error but continue processing other files
                 
-            input_file = cleaned_files[0]  # Use cleaned file
+        # Clean the output directory of any metadata files that might have been created
+        self.clean_temp_directory(output_dir)
+        
+    def extract_image_files(self, images: List[str], output_dir: str, face_type: str):
+        """Extract faces from single images, gathered into one temporary folder as a single job"""
+        import shutil
+        temp_input_dir = os.path.join(os.path.dirname(output_dir), f"temp_input_{face_type}")
+        os.makedirs(temp_input_dir, exist_ok=True)
+        
+        try:
+            self.log_message(f"Extracting {face_type} faces from {len(images)} images")
+            self.link_images(images, temp_input_dir)
             
-            # Check if input is a single image file
-            image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
-            file_ext = os.path.splitext(input_file.lower())[1]
+            # Clean the temp directory of any problematic system files that might have been created
+            self.clean_temp_directory(temp_input_dir)
+            
+            self.run_extract_job(temp_input_dir, output_dir)
+            
+        except Exception as e:
+            self.log_message(f"⚠️ Error during extraction: {str(e)}")
+            # Continue processing other files instead of failing completely
             
-            if file_ext in image_extensions:
-                # For single images, create a temporary folder and copy the image
-                import shutil
-                temp_input_dir = os.path.join(os.path.dirname(output_dir), f"temp_input_{face_type}")
-                os.makedirs(temp_input_dir, exist_ok=True)
+        finally:
+            # Clean up temp folder
+            try:
+                if os.path.exists(temp_input_dir):
+                    shutil.rmtree(temp_input_dir)
+            except (OSError, IOError):
+                pass  # Ignore cleanup errors
                 
-                try:
-                    # Copy image to temp folder
-                    temp_image_path = os.path.join(temp_input_dir, os.path.basename(input_file))
-                    shutil.copy2(input_file, temp_image_path)
-                    
-                    # Clean the temp directory of any problematic system files that might have been created
-                    self.clean_temp_directory(temp_input_dir)
-                    
-                    cmd = [
-                        '/Users/admin/micromamba/envs/faceswap/bin/python', 'faceswap.py', 'extract',
-                        '-i', temp_input_dir,  # Use folder instead of single file
-                        '-o', output_dir,
-                        '-D', 's3fd',
-                        '-A', 'fan', 
-                        '-M', 'bisenet-fp'
-                    ]
-                    
-                    self.run_command(cmd)
-                    
-                    # Clean the output directory of any metadata files that might have been created
-                    self.clean_temp_directory(output_dir)
-                    
-                except Exception as e:
-                    self.log_message(f"⚠️ Error during extraction: {str(e)}")
-                    # Continue processing other files instead of failing completely
-                    
-                finally:
-                    # Clean up temp folder
-                    try:
-                        if os.path.exists(temp_input_dir):
-                            shutil.rmtree(temp_input_dir)
-                    except (OSError, IOError):
-                        pass  # Ignore cleanup errors
-            else:
-                # For videos, use the file directly
-                cmd = [
-                    '/Users/admin/micromamba/envs/faceswap/bin/python', 'faceswap.py', 'extract',
-                    '-i', input_file,
-                    '-o', output_dir,
-                    '-D', 's3fd',
-                    '-A', 'fan', 
-                    '-M', 'bisenet-fp'
-                ]
+    def link_images(self, images: List[str], folder: str):
+        """Link the images into the given folder, only copying if they cannot be linked"""
+        import shutil
+        for i, input_file in enumerate(images):
+            temp_image_path = os.path.join(folder, os.path.basename(input_file))
+            if os.path.exists(temp_image_path):  # Same filename from different folders
+                stem, ext = os.path.splitext(os.path.basename(input_file))
+                temp_image_path = os.path.join(folder, f"{stem}_{i}{ext}")
+            try:
+                os.link(input_file, temp_image_path)
+            except OSError:
+                shutil.copy2(input_file, temp_image_path)
                 
-                self.run_command(cmd)
+    def start_extract_worker(self, input_path: str, output_dir: str):
+        """Start the persistent extraction worker, extracting the given input as its first job"""
+        cmd = [
+            '/Users/admin/micromamba/envs/faceswap/bin/python', 'faceswap.py', 'extract',
+            '-i', input_path,
+            '-o', output_dir,
+            '-D', 's3fd',
+            '-A', 'fan', 
+            '-M', 'bisenet-fp',
+            '--worker'
+        ]
+        self.log_message(f"🔧 Starting extraction worker: {' '.join(cmd[:3])}...")
+        
+        self.extract_worker = subprocess.Popen(
+            cmd,
+            cwd=self.faceswap_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            universal_newlines=True
+        )
+        
+    def run_extract_job(self, input_path: str, output_dir: str):
+        """Extract faces from a video or folder of images with the persistent extraction worker,
+        streaming the worker's output to the log until the job has finished"""
+        input_path = os.path.abspath(input_path)
+        output_dir = os.path.abspath(output_dir)
+        worker = self.send_extract_job(input_path, output_dir)
+        
+        for line in worker.stdout:
+            status = self.parse_extract_worker_line(line)
+            if status is None or status["job"] != input_path:
+                continue
+            if status["status"] == "completed":
+                self.log_message("✅ Extraction completed successfully")
+                return
+            if status["status"] == "failed":
+                raise Exception(f"Extraction failed: {status['message']}")
                 
-        except Exception as e:
-            self.log_message(f"❌ Failed to extract faces from {os.path.basename(input_file)}: {str(e)}")
-            # Log the error but continue processing other files
+        # Output has closed, so the worker has exited without completing the job
+        worker.wait()
+        self.extract_worker = None
+        error_msg = f"Extraction worker exited with return code {worker.returncode}"
+        self.log_message(f"❌ Error: {error_msg}")
+        raise Exception(error_msg)
+        
+    def send_extract_job(self, input_path: str, output_dir: str) -> subprocess.Popen:
+        """Queue a job with the running extraction worker, starting a new worker with the job if
+        there is no running worker"""
+        worker = self.extract_worker
+        if worker is not None and worker.poll() is None:
+            try:
+                worker.stdin.write(json.dumps({"input": input_path, "output": output_dir}) + "\n")
+                worker.stdin.flush()
+                return worker
+            except (BrokenPipeError, OSError):
+                pass  # Worker has exited. Start a new one for this job
+        self.start_extract_worker(input_path, output_dir)
+        return self.extract_worker
+        
+    def parse_extract_worker_line(self, line: str) -> Optional[dict]:
+        """Return the job status from a line of the extraction worker's output, logging any other
+        output"""
+        line = line.strip()
+        if not line:
+            return None
+        if not line.startswith(self.EXTRACT_WORKER_PREFIX):
+            self.log_message(line)
+            return None
+        return json.loads(line[len(self.EXTRACT_WORKER_PREFIX):])
+        
+    def stop_extract_worker(self):
+        """Stop the persistent extraction worker, releasing the loaded models"""
+        worker = self.extract_worker
+        if worker is None:
+            return
+        self.extract_worker = None
+        try:
+            worker.stdin.close()  # Worker exits once it has no further jobs
+            for line in worker.stdout:
+                if line.strip():
+                    self.log_message(line.strip())
+            worker.wait()
+            self.log_message("✅ Extraction worker stopped")
+        except (OSError, ValueError) as e:
+            self.log_message(f"⚠️ Error stopping extraction worker: {str(e)}")
+            worker.kill()
         
     def train_model(self, source_dir: str, target_dir: str, model_dir: str):
         """Train the face-swapping model"""
@@ -0,0 +1,74 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.align.alignments` """
+import os
+
+from lib.align import Alignments
+from lib.align.columnar import save_columnar
+
+from .columnar_test import _assert_equal, _get_data
+
+
+def test_journal(tmp_path) -> None:
+    """ Test that frames saved to the journal are replayed on load and compacted on save """
+    folder = str(tmp_path)
+    data = _get_data()
+    first, *others = list(data)
+    save_columnar(os.path.join(folder, "alignments.fsa"), {first: data[first]}, 2.4)
+    journal = os.path.join(folder, "alignments.fsa.journal")
+
+    alignments = Alignments(folder)
+    for frame in others:
+        alignments.data[frame] = data[frame]
+        alignments.save_frames([frame])
+    assert os.path.exists(journal)
+
+    with open(journal, "ab") as out_file:  # Simulate an interrupted write
+        out_file.write(b"\x10\x00")
+    alignments = Alignments(folder)
+    _assert_equal(alignments.data, data)
+
+    alignments.save()
+    assert not os.path.exists(journal)
+    _assert_equal(Alignments(folder).data, data)
+
+
+def test_journal_only(tmp_path) -> None:
+    """ Test that alignments are recovered from a journal when the alignments file is missing """
+    folder = str(tmp_path)
+    data = _get_data()
+    filename = os.path.join(folder, "alignments.fsa")
+    save_columnar(filename, {}, 2.4)
+
+    alignments = Alignments(folder)
+    for frame, frame_data in data.items():
+        alignments.data[frame] = frame_data
+    alignments.save_frames(list(data))
+    os.remove(filename)
+
+    alignments = Alignments(folder)
+    assert alignments.have_alignments_file
+    _assert_equal(alignments.data, data)
+
+
+def test_update_video_meta_data(tmp_path) -> None:
+    """ Test that a generated keyframe index is stored only when the alignments file does not
+    already hold one and that a frame count mismatch does not raise """
+    folder = str(tmp_path)
+    data = _get_data()
+    for frame in data.values():
+        frame["video_meta"] = {}
+    save_columnar(os.path.join(folder, "alignments.fsa"), data, 2.4)
+
+    alignments = Alignments(folder)
+    alignments.update_video_meta_data({"pts_time": [0.0, 0.04], "keyframes": [0]})
+    assert Alignments(folder).video_meta_data == {"pts_time": None, "keyframes": None}
+
+    alignments = Alignments(folder)
+    alignments.update_video_meta_data({"pts_time": None, "keyframes": None})
+    alignments.update_video_meta_data({"pts_time": [0.0, 0.04, 0.08], "keyframes": [0, 2]})
+    expected = {"pts_time": [0.0, 0.04, 0.08], "keyframes": [0, 2]}
+    assert Alignments(folder).video_meta_data == expected
+
+    alignments = Alignments(folder)
+    alignments.update_video_meta_data({"pts_time": [0.0, 0.05, 0.1], "keyframes": [0]})
+    assert Alignments(folder).video_meta_data == expected
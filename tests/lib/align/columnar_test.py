@@ -0,0 +1,130 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.align.columnar` """
+import os
+import zlib
+
+import numpy as np
+
+from lib.align import Alignments
+from lib.align.columnar import ColumnarStore, is_columnar, LazyAlignments, save_columnar
+from lib.serializer import get_serializer
+
+
+def _get_face(seed: int, points: int = 68) -> dict:
+    """ Create a dummy face in alignments file format """
+    rng = np.random.default_rng(seed)
+    return {"x": seed, "y": seed + 1, "w": 64, "h": 72,
+            "landmarks_xy": rng.random((points, 2), dtype="float32") * 256,
+            "mask": {"components": {"mask": zlib.compress(rng.bytes(128)),
+                                    "affine_matrix": rng.random((2, 3)),
+                                    "interpolator": 2,
+                                    "stored_size": 128,
+                                    "stored_centering": "face"}},
+            "identity": {"vggface2": rng.random(512).tolist()},
+            "thumb": rng.integers(0, 255, (100, 1), dtype="uint8") if seed % 2 else None}
+
+
+def _get_data() -> dict:
+    """ Create dummy alignments data """
+    return {"frame_000001.png": {"faces": [_get_face(1), _get_face(2, points=4)],
+                                 "video_meta": {"pts_time": 0.0, "keyframe": True}},
+            "frame_000002.png": {"faces": [], "video_meta": {}},
+            "frame_000003.png": {"faces": [_get_face(3)],
+                                 "video_meta": {"pts_time": 0.08, "keyframe": False}}}
+
+
+def _assert_equal(data: dict, expected: dict) -> None:
+    """ Assert that loaded alignments data matches the expected data """
+    assert list(data) == list(expected)
+    for key, frame in expected.items():
+        assert data[key]["video_meta"] == frame["video_meta"]
+        assert len(data[key]["faces"]) == len(frame["faces"])
+        for face, exp_face in zip(data[key]["faces"], frame["faces"]):
+            assert sorted(face) == sorted(exp_face)
+            for item in ("x", "y", "w", "h", "identity"):
+                assert face[item] == exp_face[item]
+            np.testing.assert_array_equal(face["landmarks_xy"], exp_face["landmarks_xy"])
+            assert face["mask"]["components"]["mask"] == exp_face["mask"]["components"]["mask"]
+            if exp_face["thumb"] is None:
+                assert face["thumb"] is None
+            else:
+                np.testing.assert_array_equal(face["thumb"], exp_face["thumb"])
+
+
+def test_round_trip(tmp_path) -> None:
+    """ Test that alignments saved in columnar format load back unchanged and lazily """
+    filename = os.path.join(tmp_path, "alignments.fsa")
+    expected = _get_data()
+    save_columnar(filename, expected, 2.4)
+    assert is_columnar(filename)
+
+    store = ColumnarStore(filename)
+    assert store.version == 2.4
+    assert store.bboxes.shape == (3, 4)
+    data = LazyAlignments(store)
+    assert len(data) == 3
+    assert data.face_count("frame_000001.png") == 2
+    assert data.video_meta("frame_000003.png") == {"pts_time": 0.08, "keyframe": False}
+    assert not any(data.is_loaded(key) for key in data)
+    _assert_equal(data, expected)
+    store.close()
+
+
+def test_save_lazy_view(tmp_path) -> None:
+    """ Test that saving a lazy view keeps undecoded frames and updates edited frames """
+    filename = os.path.join(tmp_path, "alignments.fsa")
+    expected = _get_data()
+    save_columnar(filename, expected, 2.4)
+
+    data = LazyAlignments(ColumnarStore(filename))
+    data["frame_000003.png"]["faces"][0]["x"] = 99
+    expected["frame_000003.png"]["faces"][0]["x"] = 99
+    del data["frame_000002.png"]
+    del expected["frame_000002.png"]
+    data["frame_000004.png"] = expected["frame_000004.png"] = {"faces": [_get_face(4)],
+                                                               "video_meta": {}}
+    save_columnar(filename, data, 2.4)
+    assert not data.is_loaded("frame_000001.png")
+    _assert_equal(data, expected)
+
+    reloaded = LazyAlignments(ColumnarStore(filename))
+    _assert_equal(reloaded, expected)
+    assert not [fname for fname in os.listdir(tmp_path) if fname.endswith(".tmp")]
+
+
+def test_masks(tmp_path) -> None:
+    """ Test that masks can be read for a frame without decoding the rest of the frame """
+    filename = os.path.join(tmp_path, "alignments.fsa")
+    expected = _get_data()
+    del expected["frame_000003.png"]["faces"][0]["mask"]
+    save_columnar(filename, expected, 2.4)
+
+    data = LazyAlignments(ColumnarStore(filename))
+    masks = data.masks("frame_000001.png")
+    assert [mask["components"]["mask"] for mask in masks] == [
+        face["mask"]["components"]["mask"] for face in expected["frame_000001.png"]["faces"]]
+    assert data.masks("frame_000003.png") == [None]
+    assert not any(data.is_loaded(key) for key in data)
+    assert "mask" not in data["frame_000003.png"]["faces"][0]
+    data.store.close()
+
+
+def test_alignments_format(tmp_path) -> None:
+    """ Test that alignments are saved in the legacy format unless the columnar format is
+    requested, and that columnar files stay columnar """
+    filename = os.path.join(tmp_path, "alignments.fsa")
+    get_serializer("compressed").save(filename, {"__meta__": {"version": 2.4},
+                                                 "__data__": _get_data()})
+    alignments = Alignments(str(tmp_path))
+    alignments.save()
+    assert not is_columnar(filename)
+
+    alignments = Alignments(str(tmp_path), columnar=True)
+    alignments.save()
+    assert is_columnar(filename)
+    _assert_equal(alignments.data, _get_data())
+
+    alignments = Alignments(str(tmp_path))
+    alignments.save()
+    assert is_columnar(filename)
+    alignments.data.store.close()
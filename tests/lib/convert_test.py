@@ -0,0 +1,109 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.convert` """
+from __future__ import annotations
+import os
+from argparse import Namespace
+
+import cv2
+import numpy as np
+import pytest
+
+from lib.align import AlignedFace, DetectedFace
+from lib.align.constants import _MEAN_FACE, LandmarkType
+from lib.convert import Converter
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.extract import ExtractMedia
+from scripts.convert import ConvertItem
+
+_SIZE = 64
+
+
+def _get_item(faces: list[tuple[int, int, int]]) -> ConvertItem:
+    """ Create a convert item with a random frame and smooth swapped faces
+
+    Parameters
+    ----------
+    faces: list
+        The (`left`, `top`, `size`) of each face to place in the frame
+
+    Returns
+    -------
+    :class:`scripts.convert.ConvertItem`
+        The item for patching
+    """
+    rng = np.random.default_rng(len(faces))
+    frame = rng.integers(0, 255, (240, 320, 3), dtype="uint8")
+    detected_faces = [DetectedFace(left=left,
+                                   width=size,
+                                   top=top,
+                                   height=size,
+                                   landmarks_xy=(_MEAN_FACE[LandmarkType.LM_2D_51] * size +
+                                                 [left, top]).astype("float32"))
+                      for left, top, size in faces]
+    item = ConvertItem(ExtractMedia("frame.png", frame, detected_faces=detected_faces))
+    item.reference_faces = [AlignedFace(face.landmarks_xy,
+                                        image=frame,
+                                        centering="face",
+                                        size=_SIZE,
+                                        coverage_ratio=1.0,
+                                        dtype="float32") for face in detected_faces]
+    if faces:
+        item.swapped_faces = np.array([cv2.GaussianBlur(face, (9, 9), 0)
+                                       for face in rng.random((len(faces), _SIZE, _SIZE, 3),
+                                                              dtype="float32")])
+    return item
+
+
+@pytest.mark.parametrize("faces",
+                         ([], [(40, 30, 80)], [(40, 30, 80), (90, 60, 60), (-30, -30, 60)]),
+                         ids=("no_faces", "one_face", "three_faces"))
+def test_composite_frame(monkeypatch: pytest.MonkeyPatch,
+                         tmp_path,
+                         faces: list[tuple[int, int, int]]) -> None:
+    """ Test that compositing faces within their regions of the frame matches compositing over the
+    full frame, and that the remainder of the frame is untouched
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching :func:`sys.argv` so that the converter plugin configuration can be found
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the converter configuration file
+    faces: list
+        The (`left`, `top`, `size`) of each face to place in the frame
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+    monkeypatch.setattr("sys.argv", [os.path.join(root, "faceswap.py")])
+    configfile = os.path.join(tmp_path, "convert.ini")
+    open(configfile, "w", encoding="utf-8").close()  # pylint:disable=consider-using-with
+    arguments = Namespace(output_scale=100,
+                          face_scale=0,
+                          writer="opencv",
+                          mask_type="none",
+                          color_adjustment="none")
+    converter = Converter(_SIZE, 1.0, "face", False, None, arguments, configfile=configfile)
+    item = _get_item(faces)
+    frame = item.inbound.image.copy()
+
+    output = converter.patch(item)
+    np.testing.assert_array_equal(item.inbound.image, frame)
+    if not faces:
+        assert output is item.inbound.image
+        return
+
+    mask = np.ones(frame.shape[:2], dtype="bool")
+    for reference in item.reference_faces:
+        roi = converter._get_roi(reference,  # pylint:disable=protected-access
+                                 _SIZE,
+                                 (frame.shape[1], frame.shape[0]),
+                                 0)
+        if roi is not None:
+            mask[roi[1]:roi[3], roi[0]:roi[2]] = False
+    np.testing.assert_array_equal(output[mask], frame[mask])
+    assert not np.array_equal(output, frame)
+
+    monkeypatch.setattr(converter,
+                        "_get_roi",
+                        lambda *args: (0, 0, frame.shape[1], frame.shape[0]))
+    expected = converter.patch(item)
+    assert np.abs(output.astype("int32") - expected).max() <= 3
@@ -210,6 +210,23 @@ class Test_Cache:  # pylint:disable=invalid-name
         np.testing.assert_array_equal(loss, expected_loss)
         assert cache._carry_over == expected_carry_over
 
+    @staticmethod
+    def test__fill_steps() -> None:
+        """ Test _fill_steps function repeats summarized steps for each iteration """
+        cache = _Cache()
+        timestamps, loss = cache._fill_steps([1, 2], [4., 5.], [[1., 2.], [3., 4.]], False)
+        assert timestamps == [4., 5.]
+        assert loss == [[1., 2.], [3., 4.]]
+
+        timestamps, loss = cache._fill_steps([2, 4], [4., 5.], [[1., 2.], [3., 4.]], True)
+        assert timestamps == [4., 4., 5., 5.]
+        assert loss == [[1., 2.], [1., 2.], [3., 4.], [3., 4.]]
+
+        # Live data continues from the last step collected
+        timestamps, loss = cache._fill_steps([7], [6.], [[5., 6.]], True)
+        assert timestamps == [6., 6., 6.]
+        assert loss == [[5., 6.], [5., 6.], [5., 6.]]
+
     @staticmethod
     def test__add_latest_live() -> None:
         """ Test _add_latest_live function works """
@@ -0,0 +1,169 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.image` """
+from __future__ import annotations
+import os
+
+import cv2
+import imageio
+import numpy as np
+import pytest
+
+import lib.image
+from lib.image import (close_video_readers, FaceMetaIndex, get_video_reader, ImagesLoader,
+                       png_write_meta, read_image_meta_batch, VideoFrameReader)
+
+_FRAMES = 60
+
+
+@pytest.fixture(name="video_file", scope="module")
+def video_file_fixture(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """ Write a short test video with a keyframe every 10 frames, where the intensity of each
+    frame identifies its index
+
+    Parameters
+    ----------
+    tmp_path_factory: :class:`pytest.TempPathFactory`
+        Factory for creating the temporary folder to hold the video
+
+    Returns
+    -------
+    str
+        Full path to the test video
+    """
+    filename = os.path.join(str(tmp_path_factory.mktemp("video")), "test.mp4")
+    writer = imageio.get_writer(filename,
+                                fps=25,
+                                codec="libx264",
+                                macro_block_size=16,
+                                ffmpeg_params=["-g", "10", "-crf", "0"])
+    for idx in range(_FRAMES):
+        writer.append_data(np.full((64, 64, 3), idx * 4, dtype="uint8"))
+    writer.close()
+    return filename
+
+
+def _frame_index(frame: np.ndarray) -> int:
+    """ Obtain the frame index from the intensity of a frame written by :func:`video_file` """
+    return int(round(frame.mean() / 4))
+
+
+def test_video_frame_reader(video_file: str) -> None:
+    """ Test :class:`lib.image.VideoFrameReader` returns the correct frames for random access and
+    builds the keyframe index
+
+    Parameters
+    ----------
+    video_file: str
+        Full path to the test video
+    """
+    reader = VideoFrameReader(video_file, pool_size=2)
+    assert reader.video_meta_data == {"pts_time": None, "keyframes": None}
+    for index in (5, 6, 50, 12, 51, 0, 59, 30):
+        assert _frame_index(reader.get_frame(index)) == index
+    assert reader.frame_count == _FRAMES
+    meta = reader.video_meta_data
+    assert meta["keyframes"] == list(range(0, _FRAMES, 10))
+    reader.close()
+
+    reader = VideoFrameReader(video_file, video_meta_data=meta, pool_size=1)
+    for index in (45, 3, 44, 58):
+        assert _frame_index(reader.get_frame(index)) == index
+    reader.close()
+
+
+def test_close_video_readers(video_file: str) -> None:
+    """ Test :func:`lib.image.close_video_readers` closes the shared readers and returns the
+    keyframe index generated for each video
+
+    Parameters
+    ----------
+    video_file: str
+        Full path to the test video
+    """
+    reader = get_video_reader(video_file)
+    assert get_video_reader(video_file) is reader
+    assert _frame_index(reader.get_frame(30)) == 30
+    assert reader.frame_count == _FRAMES
+
+    video_meta = close_video_readers()
+    assert list(video_meta) == [os.path.abspath(video_file)]
+    assert video_meta[os.path.abspath(video_file)]["keyframes"] == list(range(0, _FRAMES, 10))
+    assert not lib.image._VIDEO_READERS
+    assert close_video_readers() == {}
+
+
+@pytest.mark.parametrize("with_meta", (True, False), ids=("with_meta", "no_meta"))
+def test_images_loader_skip_list(video_file: str, with_meta: bool) -> None:
+    """ Test :class:`lib.image.ImagesLoader` loads the correct frames from video when a skip list
+    is provided
+
+    Parameters
+    ----------
+    video_file: str
+        Full path to the test video
+    with_meta: bool
+        ``True`` to provide the keyframe index to the loader
+    """
+    meta = None
+    if with_meta:
+        reader = VideoFrameReader(video_file)
+        _ = reader.frame_count
+        meta = reader.video_meta_data
+        reader.close()
+    skip_list = list(range(2, 25)) + list(range(31, 55))
+    loader = ImagesLoader(video_file, count=_FRAMES, skip_list=skip_list, video_meta_data=meta)
+    loaded = [(fname, _frame_index(img)) for fname, img in loader.load()]
+    expected = [idx for idx in range(_FRAMES) if idx not in skip_list]
+    assert [idx for _, idx in loaded] == expected
+    assert [fname for fname, _ in loaded] == [f"test_{idx + 1:06d}.mp4" for idx in expected]
+
+
+def test_face_meta_index(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """ Test that :func:`lib.image.read_image_meta_batch` only reads new or changed faces from disk
+    when the face metadata index is enabled
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching the face index setting and counting reads from disk
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the test faces
+    """
+    filenames = []
+    for idx in range(4):
+        filename = os.path.join(tmp_path, f"face_{idx}.png")
+        image = cv2.imencode(".png", np.full((8, 8, 3), idx, dtype="uint8"))[1].tobytes()
+        with open(filename, "wb") as out_file:
+            out_file.write(png_write_meta(image, {"source": {"face_index": idx}}))
+        filenames.append(filename)
+
+    reads: list[str] = []
+    read_image_meta = lib.image.read_image_meta
+    monkeypatch.setattr(lib.image, "_USE_FACE_INDEX", True)
+    monkeypatch.setattr(lib.image,
+                        "read_image_meta",
+                        lambda filename: reads.append(filename) or read_image_meta(filename))
+
+    def _read() -> dict[str, int]:
+        """ Read the metadata for the test faces and return the face index of each face """
+        reads.clear()
+        return {os.path.basename(filename): meta["itxt"]["source"]["face_index"]
+                for filename, meta in read_image_meta_batch(filenames)}
+
+    expected = {f"face_{idx}.png": idx for idx in range(4)}
+    assert _read() == expected
+    assert sorted(reads) == filenames
+    assert os.path.exists(os.path.join(tmp_path, FaceMetaIndex.filename))
+
+    assert _read() == expected
+    assert not reads
+
+    lib.image.update_existing_metadata(filenames[1], {"source": {"face_index": 10}})
+    os.remove(filenames.pop())
+    expected["face_1.png"] = 10
+    del expected["face_3.png"]
+    assert _read() == expected
+    assert reads == [filenames[1]]
+
+    assert _read() == expected
+    assert not reads
@@ -10,9 +10,12 @@ from numpy.testing import assert_allclose
 # Ignore linting errors from Tensorflow's thoroughly broken import system
 from tensorflow.keras import optimizers as k_optimizers  # pylint:disable=import-error
 from tensorflow.keras.layers import Dense, Activation  # pylint:disable=import-error
+from tensorflow.keras.mixed_precision import LossScaleOptimizer  # noqa:E501  pylint:disable=import-error
 from tensorflow.keras.models import Sequential  # pylint:disable=import-error
+from tensorflow.keras.utils import set_random_seed  # pylint:disable=import-error
 
 from lib.model import optimizers
+from lib.model.autoclip import AutoClipper
 from lib.utils import get_backend
 
 from tests.utils import generate_test_data, to_categorical
@@ -74,3 +77,36 @@ def _test_optimizer(optimizer, target=0.75):
 def test_adabelief(dummy):  # pylint:disable=unused-argument
     """ Test for custom Adam optimizer """
     _test_optimizer(optimizers.AdaBelief(), target=0.20)
+
+
+@pytest.mark.parametrize("option", ["none", "loss_scale", "autoclip"])
+def test_gradient_accumulation(option):
+    """ Test that accumulating gradients over micro batches gives the same weights as training on
+    the full batch, including when wrapped for mixed precision or with AutoClip """
+    x_train, y_train = get_test_data()
+    x_train, y_train = x_train[:16], y_train[:16]
+
+    def get_model(accumulation_steps):
+        kwargs = {"learning_rate": 0.01}
+        if option == "autoclip":
+            kwargs["gradient_transformers"] = [AutoClipper(10, history_size=100)]
+        optimizer = optimizers.accumulate_gradients(k_optimizers.Adam)(
+            accumulation_steps=accumulation_steps, **kwargs)
+        if option == "loss_scale":
+            optimizer = LossScaleOptimizer(optimizer)
+        set_random_seed(0)
+        model = Sequential([Dense(10, input_shape=(x_train.shape[1],), activation="relu"),
+                            Dense(y_train.shape[1])])
+        model.compile(loss="mse", optimizer=optimizer)
+        return model
+
+    full = get_model(1)
+    accumulated = get_model(4)
+    for _ in range(2):
+        full.train_on_batch(x_train, y_train)
+        for idx in range(0, 16, 4):
+            accumulated.train_on_batch(x_train[idx:idx + 4], y_train[idx:idx + 4])
+
+    for expected, actual in zip(full.get_weights(), accumulated.get_weights()):
+        assert_allclose(actual, expected, atol=1e-6)
+    assert accumulated.optimizer.iterations.numpy() == 2
@@ -0,0 +1,113 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.training.cache` """
+import os
+
+import numpy as np
+import pytest
+import pytest_mock
+
+# pylint:disable=protected-access
+from lib.training import cache as cache_mod
+from lib.training.cache import _ImageCache, SharedRingBuffer
+
+
+_SHAPE = (8, 8, 3)
+
+
+def _fake_read(filenames: list[str]) -> np.ndarray:
+    """ Dummy image reader. Each image is filled with the integer in its filename """
+    return np.array([np.full(_SHAPE, int(fname.split("_")[-1]), dtype="uint8")
+                     for fname in filenames])
+
+
+@pytest.fixture(name="reader")
+def fixture_reader(mocker: pytest_mock.MockerFixture):
+    """ Patch the image reader used by the cache """
+    return mocker.patch.object(cache_mod, "read_image_batch", side_effect=_fake_read)
+
+
+@pytest.mark.parametrize("policy", ("fixed", "lru"))
+def test_read_serves_from_cache(reader, policy) -> None:
+    """ Test that images are only read from disk once when the cache has capacity """
+    names = [f"/path/img_{idx}" for idx in range(4)]
+    cache = _ImageCache(1, policy, names)
+    first = cache.read(names)
+    second = cache.read(names[::-1])
+    assert reader.call_count == 1
+    assert np.array_equal(first[::-1], second)
+    assert cache.hit_rate == 0.5
+
+
+def test_fixed_policy_does_not_evict(reader) -> None:
+    """ Test that the fixed policy keeps the first loaded images """
+    cache = _ImageCache(1, "fixed", [f"/path/img_{idx}" for idx in range(3)])
+    cache._budget = 2 * int(np.prod(_SHAPE))
+    cache.read(["/path/img_0", "/path/img_1"])
+    cache.read(["/path/img_2"])
+    assert cache.capacity == 2
+    assert cache.cached == ["img_0", "img_1"]
+    batch = cache.read(["/path/img_1", "/path/img_2"])
+    assert batch[0].max() == 1 and batch[1].max() == 2
+    assert reader.call_count == 3
+
+
+def test_lru_policy_evicts_oldest(reader) -> None:
+    """ Test that the lru policy evicts the least recently used image """
+    cache = _ImageCache(1, "lru", [f"/path/img_{idx}" for idx in range(3)])
+    cache._budget = 2 * int(np.prod(_SHAPE))
+    cache.read(["/path/img_0", "/path/img_1"])
+    cache.read(["/path/img_0"])  # img_1 is now least recently used
+    cache.read(["/path/img_2"])
+    assert cache.cached == ["img_0", "img_2"]
+    batch = cache.read(["/path/img_0", "/path/img_2"])
+    assert batch[0].max() == 0 and batch[1].max() == 2
+    assert reader.call_count == 2
+
+
+def test_get_image_cache_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """ Test that no cache is returned when the cache size is 0 """
+    monkeypatch.setattr(cache_mod, "_IMAGE_CACHES", {})
+    assert cache_mod.get_image_cache("a", config={"image_cache_size": 0}) is None
+    retval = cache_mod.get_image_cache("b", config={"image_cache_size": 16}, filenames=["img_0"])
+    assert isinstance(retval, _ImageCache)
+    assert cache_mod.get_image_cache("b") is retval
+
+
+def _store_in_worker(cache: _ImageCache, filenames: list[str]) -> None:
+    """ Store images in a cache that has been handed to a worker process """
+    cache.store(filenames, _fake_read(filenames))
+
+
+def test_image_cache_shared_with_worker(reader) -> None:
+    """ Test that images cached by a worker process are served from the training process' cache
+    without being read from disk """
+    names = [f"/path/img_{idx}" for idx in range(4)]
+    cache = _ImageCache(1, "fixed", names + ["/path/img_4"])
+    cache.prepare_for_workers(names[0])
+    assert reader.call_count == 1
+
+    process = cache_mod.get_worker_context().Process(target=_store_in_worker,
+                                                     args=(cache, names[1:]))
+    process.start()
+    process.join(timeout=60)
+    assert process.exitcode == 0
+    assert cache.cached == [os.path.basename(name) for name in names]
+
+    batch = cache.read(names[::-1] + ["/path/img_4"])
+    assert reader.call_count == 2
+    assert [img.max() for img in batch] == [3, 2, 1, 0, 4]
+
+
+def test_shared_ring_buffer() -> None:
+    """ Test that an attached :class:`~lib.training.cache.SharedRingBuffer` shares memory with the
+    buffer that created it """
+    shapes = [(2, 4, 4, 3), (2, 8, 8, 4)]
+    owner = SharedRingBuffer(shapes, 3)
+    attached = SharedRingBuffer(shapes, 3, names=owner.names)
+    assert len(owner) == 3
+    assert [arr.shape for arr in owner[1]] == shapes
+    attached[1][1][...] = 0.5
+    assert np.all(owner[1][1] == 0.5)
+    assert not np.any(owner[1][0] == 0.5)
+    attached.close()
+    owner.close()
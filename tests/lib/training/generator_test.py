@@ -0,0 +1,64 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.training.generator` """
+from collections.abc import Generator
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from lib.training.generator import Feeder
+
+
+class _Generator():
+    """ Stand in for a training data generator which yields numbered batches from a single
+    reused array, as batches from augmentation workers are views into reused shared memory """
+    def __init__(self, *args, **kwargs) -> None:  # pylint:disable=unused-argument
+        self._buffer = np.zeros((2, 4, 4, 4), dtype="float32")
+
+    def minibatch_ab(self) -> Generator[tuple[np.ndarray, list[np.ndarray]], None, None]:
+        """ Yield the batches with the batch number as the value of every pixel """
+        idx = 0
+        while True:
+            self._buffer[:] = idx
+            yield self._buffer[..., :3], [self._buffer]
+            idx += 1
+
+
+@pytest.mark.parametrize("depth,to_device", ((0, False), (2, False), (2, True)),
+                         ids=("sync", "prefetch", "device"))
+def test_feeder_prefetch(monkeypatch: pytest.MonkeyPatch, depth: int, to_device: bool) -> None:
+    """ Test that prefetched batches are returned in order and remain valid, and that batch
+    timings are recorded
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching the feeder's training data generators
+    depth: int
+        The number of batches to prefetch
+    to_device: bool
+        Whether prefetched batches are staged as tensors
+    """
+    monkeypatch.setattr(Feeder, "_load_generator", _Generator)
+    model = MagicMock()
+    model.config = {"learn_mask": True}
+    config = {"augmentation_workers": 1,
+              "prefetch_batches": depth,
+              "prefetch_to_device": to_device}
+    feeder = Feeder({"a": [], "b": []}, model, 2, config, include_preview=False)
+
+    batches = [feeder.get_batch() for _ in range(4)]
+    assert set(feeder.timings) == {"feed", "wait"}
+    assert all(val >= 0.0 for val in feeder.timings.values())
+    if not depth:
+        return
+
+    for idx, (inputs, targets) in enumerate(batches):
+        assert len(inputs) == len(targets) == 2
+        for side_inputs, side_targets in zip(inputs, targets):
+            assert len(side_inputs) == 1 and len(side_targets) == 2  # Face and learn mask
+            assert all(isinstance(arr, tf.Tensor if to_device else np.ndarray)
+                       for arr in side_inputs + side_targets)
+            assert all(np.all(np.asarray(arr) == idx) for arr in side_inputs + side_targets)
@@ -0,0 +1,65 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.training.nearest` """
+import os
+
+import numpy as np
+import pytest
+import pytest_mock
+
+from lib.training.nearest import NearestLandmarks
+
+
+def _landmarks(count: int, seed: int) -> dict[str, np.ndarray]:
+    """ Random 68 point landmarks for the given number of faces """
+    rng = np.random.default_rng(seed)
+    return {f"face_{seed}_{idx}.png": (rng.random((68, 2)) * 256).astype("float32")
+            for idx in range(count)}
+
+
+@pytest.mark.parametrize("memory_limit", (256 * 1024 * 1024, 1024), ids=("single", "tiled"))
+def test_search(memory_limit: int) -> None:
+    """ Test that the tiled search returns the same matches as a brute force search
+
+    Parameters
+    ----------
+    memory_limit: int
+        The memory limit for each tile of the search
+    """
+    source = np.array(list(_landmarks(50, 0).values()))
+    destination = np.array(list(_landmarks(300, 1).values()))
+    destination[7] = destination[3]  # Equal distances resolve to the lowest index
+    matches = NearestLandmarks("", memory_limit=memory_limit).search(source, destination)
+
+    assert matches.shape == (50, 10)
+    for src, match in zip(source, matches):
+        distances = np.mean(np.square(src - destination), axis=(1, 2))
+        np.testing.assert_array_equal(match, np.argsort(distances, kind="stable")[:10])
+
+
+def test_get(mocker: pytest_mock.MockerFixture, tmp_path) -> None:
+    """ Test that matches are saved in the training folder and only searched for again when the
+    landmarks change
+
+    Parameters
+    ----------
+    mocker: :class:`pytest_mock.MockerFixture`
+        Spying on the search function
+    tmp_path: :class:`pathlib.Path`
+        Temporary training folder
+    """
+    source = _landmarks(20, 0)
+    destination = _landmarks(30, 1)
+    search = mocker.spy(NearestLandmarks, "search")
+
+    matches = NearestLandmarks(str(tmp_path)).get(source, destination)
+    assert os.path.isfile(os.path.join(tmp_path, NearestLandmarks.filename))
+    assert list(matches) == list(source)
+    assert all(len(match) == 10 and set(match) <= set(destination) for match in matches.values())
+    assert search.call_count == 1
+
+    assert NearestLandmarks(str(tmp_path)).get(source, destination) == matches
+    assert search.call_count == 1
+
+    destination["face_1_0.png"] = destination["face_1_0.png"] + 1.0
+    NearestLandmarks(str(tmp_path)).get(source, destination)
+    assert search.call_count == 2
@@ -0,0 +1,62 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`lib.training.train_step` """
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from lib.model.losses import LossWrapper
+from lib.training.train_step import CompiledTrainStep
+
+keras = tf.keras
+
+
+def _get_model() -> keras.Model:
+    """ A small two sided autoencoder with a masked multi-loss wrapper on each output """
+    keras.utils.set_random_seed(0)
+    encoder = keras.layers.Conv2D(4, 3, padding="same", activation="relu")
+    inputs = [keras.Input((8, 8, 3), name=f"face_in_{side}") for side in "ab"]
+    outputs = [keras.layers.Conv2D(3, 3, padding="same", name=f"face_out_{side}")(encoder(inp))
+               for side, inp in zip("ab", inputs)]
+    model = keras.Model(inputs, outputs)
+    losses = []
+    for _ in outputs:
+        loss = LossWrapper()
+        loss.add_loss(keras.losses.mean_absolute_error, 1.0, -1)
+        loss.add_loss(keras.losses.mean_squared_error, 2.0, 3)
+        losses.append(loss)
+    model.compile(optimizer=keras.optimizers.Adam(learning_rate=1e-2, clipnorm=1.0), loss=losses)
+    return model
+
+
+@pytest.mark.parametrize("jit_compile", (False, True), ids=("function", "xla"))
+def test_compiled_train_step(jit_compile: bool) -> None:
+    """ Test that the compiled training step returns the same losses and trains the same weights
+    as Keras' train_on_batch
+
+    Parameters
+    ----------
+    jit_compile: bool
+        Whether to compile the training step with XLA
+    """
+    rng = np.random.default_rng(0)
+    batches = [([rng.random((2, 8, 8, 3), dtype="float32") for _ in range(2)],
+                [rng.random((2, 8, 8, 4), dtype="float32") for _ in range(2)])
+               for _ in range(3)]
+
+    reference = _get_model()
+    expected = [reference.train_on_batch(inputs, y=targets) for inputs, targets in batches]
+
+    model = _get_model()
+    assert CompiledTrainStep.is_supported(model)
+    step = CompiledTrainStep(model, jit_compile=jit_compile)
+    assert step.names == reference.metrics_names
+    results = [step(inputs, targets) for inputs, targets in batches]
+    assert all(isinstance(result, tf.Tensor) for result in results)
+
+    np.testing.assert_allclose(np.array([result.numpy() for result in results]),
+                               np.array(expected),
+                               rtol=1e-5)
+    for weight, ref_weight in zip(model.get_weights(), reference.get_weights()):
+        np.testing.assert_allclose(weight, ref_weight, rtol=1e-5, atol=1e-6)
+    assert int(model._train_counter.numpy()) == 3  # pylint:disable=protected-access
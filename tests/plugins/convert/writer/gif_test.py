@@ -0,0 +1,96 @@
+#!/usr/bin python3
+""" Pytest unit tests for the frame re-order cache of :mod:`plugins.convert.writer` """
+import os
+import time
+from threading import Thread
+
+import imageio
+import numpy as np
+import pytest
+
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.convert.writer.gif import Writer
+
+_FRAMES = 8
+
+
+@pytest.fixture(name="writer")
+def writer_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Writer:
+    """ A gif writer with a re-order window of 3 frames that spills frames to disk once 2 frames
+    are held in RAM
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching :func:`sys.argv` so that the writer plugin configuration can be found
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the configuration file and output
+
+    Returns
+    -------
+    :class:`plugins.convert.writer.gif.Writer`
+        The writer for testing
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.dirname(os.path.realpath(__file__))))))
+    monkeypatch.setattr("sys.argv", [os.path.join(root, "faceswap.py")])
+    configfile = os.path.join(tmp_path, "convert.ini")
+    open(configfile, "w", encoding="utf-8").close()  # pylint:disable=consider-using-with
+    retval = Writer(str(tmp_path), _FRAMES, None, configfile=configfile)
+    retval.config["reorder_window"] = 3
+    retval.config["reorder_ram_frames"] = 2
+    return retval
+
+
+def _frame(index: int) -> np.ndarray:
+    """ A frame whose intensity identifies its frame number """
+    return np.full((16, 16, 3), index * 20, dtype="uint8")
+
+
+def test_reorder_cache(writer: Writer) -> None:
+    """ Test that frames received out of order are spilled to disk and written in order
+
+    Parameters
+    ----------
+    writer: :class:`plugins.convert.writer.gif.Writer`
+        The writer for testing
+    """
+    for index in (4, 3, 2, 6, 5, 8, 7):
+        writer.write(f"frame_{index:03d}.png", _frame(index))
+    assert writer.reorder_depth == 7
+    assert writer._reorder_stats["spilled"] == 5  # pylint:disable=protected-access
+    writer.write("frame_001.png", _frame(1))
+    assert writer.reorder_depth == 0
+    assert not os.listdir(writer._spill_folder.name)  # type:ignore  # pylint:disable=W0212
+    writer.close()
+    assert writer._spill_folder is None  # pylint:disable=protected-access
+
+    reader = imageio.get_reader(writer._gif_file)  # pylint:disable=protected-access
+    assert [round(frame[..., :3].mean() / 20) for frame in reader] == list(range(1, _FRAMES + 1))
+
+
+def test_reorder_window(writer: Writer) -> None:
+    """ Test that frames are held back until they fall within the re-order window
+
+    Parameters
+    ----------
+    writer: :class:`plugins.convert.writer.gif.Writer`
+        The writer for testing
+    """
+    assert writer.is_within_window("frame_003.png")
+    assert not writer.is_within_window("frame_004.png")
+    writer.wait_for_window("frame_003.png")
+    thread = Thread(target=writer.wait_for_window, args=("frame_004.png", ))
+    thread.start()
+    time.sleep(0.2)
+    assert thread.is_alive()
+
+    writer.write("frame_002.png", _frame(2))
+    time.sleep(0.2)
+    assert thread.is_alive()
+
+    writer.write("frame_001.png", _frame(1))
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert writer.is_within_window("frame_004.png")
+    writer.close()
@@ -0,0 +1,153 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`plugins.extract.batch_tuner` """
+import numpy as np
+import pytest
+from tensorflow.python.framework import errors_impl as tf_errors  # pylint:disable=no-name-in-module  # noqa
+
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.extract import batch_tuner
+from plugins.extract.batch_tuner import BatchSizeCache, BatchTuner
+
+_PER_ITEM = {4: 1.0, 8: 0.5, 16: 0.3, 32: 0.29}
+""" dict: The simulated time taken per item at each batch size """
+
+
+class _Clock():
+    """ A clock that is advanced by the simulated plugin """
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Plugin():
+    """ Stand in for an extraction plugin which simulates the time taken for each batch and runs
+    out of memory above a given batch size
+
+    Parameters
+    ----------
+    clock: :class:`_Clock`
+        The clock to advance for each prediction
+    oom_above: int
+        Batches larger than this raise an out of memory error
+    """
+    def __init__(self, clock: _Clock, oom_above: int = 1024) -> None:
+        self.name = "Test"
+        self._plugin_type = "detect"
+        self.input_size = 32
+        self.batchsize = 4
+        self.vram_per_batch = 0
+        self._clock = clock
+        self._oom_above = oom_above
+
+    def predict(self, feed: np.ndarray) -> np.ndarray:
+        """ Advance the clock by the simulated time and return the feed doubled """
+        if len(feed) > self._oom_above:
+            raise tf_errors.ResourceExhaustedError(None, None, "OOM")
+        self._clock.now += _PER_ITEM.get(len(feed), 0.3) * len(feed)
+        return feed * 2
+
+
+def _run_batches(tuner: BatchTuner, plugin: _Plugin, count: int) -> None:
+    """ Feed full batches through the tuner, checking the predictions """
+    for _ in range(count):
+        feed = np.arange(plugin.batchsize)
+        np.testing.assert_array_equal(tuner.predict(feed), feed * 2)
+
+
+def test_batch_tuner(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """ Test that the batch size is grown whilst it gets faster, stored, reused for later runs and
+    lowered when running out of memory
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching the tuner's timer
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the tuned batch sizes
+    """
+    clock = _Clock()
+    monkeypatch.setattr(batch_tuner.time, "perf_counter", clock)
+    filename = str(tmp_path / "batchsize.json")
+
+    plugin = _Plugin(clock)
+    tuner = BatchTuner(plugin, BatchSizeCache("machine", filename=filename), probe_batches=20)
+    _run_batches(tuner, plugin, 15)
+    assert not tuner.is_tuning
+    assert plugin.batchsize == 16
+
+    cache = BatchSizeCache("machine", filename=filename)
+    assert cache.get("detect.Test_32") == 16
+    assert BatchSizeCache("other", filename=filename).get("detect.Test_32") is None
+
+    plugin = _Plugin(clock, oom_above=6)
+    tuner = BatchTuner(plugin, cache)
+    assert not tuner.is_tuning
+    assert plugin.batchsize == 16
+    _run_batches(tuner, plugin, 1)
+    assert plugin.batchsize == 4
+    assert BatchSizeCache("machine", filename=filename).get("detect.Test_32") == 4
+
+    plugin = _Plugin(clock, oom_above=0)
+    tuner = BatchTuner(plugin, cache)
+    with pytest.raises(tf_errors.ResourceExhaustedError):
+        _run_batches(tuner, plugin, 1)
+
+
+def test_batch_tuner_phase(tmp_path) -> None:
+    """ Test that tuned batch sizes are stored separately for each phase and that stored batch
+    sizes are capped at the maximum batch size
+
+    Parameters
+    ----------
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the tuned batch sizes
+    """
+    cache = BatchSizeCache("machine", filename=str(tmp_path / "batchsize.json"))
+    cache.set("detect.Test_32|detect.Test", 32)
+
+    plugin = _Plugin(_Clock())
+    tuner = BatchTuner(plugin, cache, phase="align.Other+detect.Test")
+    assert tuner.is_tuning
+    assert plugin.batchsize == 4
+
+    plugin = _Plugin(_Clock())
+    tuner = BatchTuner(plugin, cache, phase="detect.Test")
+    assert not tuner.is_tuning
+    assert plugin.batchsize == 32
+
+    plugin = _Plugin(_Clock())
+    tuner = BatchTuner(plugin, cache, max_batchsize=8, phase="detect.Test")
+    assert plugin.batchsize == 8
+
+
+class _RaggedPlugin(_Plugin):
+    """ Stand in for a detector that returns an object array holding a variable number of
+    detections for each item, in the same way as S3FD """
+    def predict(self, feed: np.ndarray) -> np.ndarray:
+        """ Return a (1, 5) box for each item, or 2 boxes for items with a value of 2 """
+        super().predict(feed)
+        return np.array([np.full((2 if item == 2 else 1, 5), item, dtype="float32")
+                         for item in feed], dtype="object")
+
+
+def test_batch_tuner_ragged_chunks(tmp_path) -> None:
+    """ Test that results with a variable number of detections per item are joined item by item
+    when falling back to smaller batches after running out of memory
+
+    Parameters
+    ----------
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the tuned batch sizes
+    """
+    plugin = _RaggedPlugin(_Clock(), oom_above=2)
+    tuner = BatchTuner(plugin,
+                       BatchSizeCache("machine", filename=str(tmp_path / "batchsize.json")),
+                       probe_batches=0)
+    feed = np.arange(4)
+    result = tuner.predict(feed)
+    assert plugin.batchsize == 2
+    assert result.dtype == object and result.shape == (4, )
+    for item, boxes in zip(feed, result):
+        np.testing.assert_array_equal(boxes, np.full((2 if item == 2 else 1, 5), item))
@@ -0,0 +1,80 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`plugins.extract.detect._base` """
+import numpy as np
+import pytest
+
+# pylint:disable=protected-access
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.extract.detect._base import Detector, DetectorBatch
+
+_SIZE = 16
+
+
+class _Detector(Detector):
+    """ Stand in for a detector plugin that only finds faces in the requested images when fed at
+    the requested rotation angle
+
+    Parameters
+    ----------
+    found_at: dict
+        The index of each image in the batch that has a face, with the angle that the face is found
+        at
+    rotation: list
+        The rotation angles to try
+    """
+    def __init__(self,  # pylint:disable=super-init-not-called
+                 found_at: dict[int, int],
+                 rotation: list[int]) -> None:
+        self._found_at = found_at
+        self.rotation = rotation
+        self.input_size = _SIZE
+        self.batch_tuner = None
+        self.feeds: list[list[int]] = []
+
+    def predict(self, feed: np.ndarray) -> np.ndarray:
+        """ Record the images in the feed (identified by their value) and return a face holding
+        the image's index for each image that has a face at the current angle, or the empty
+        placeholder """
+        angle = self.rotation[len(self.feeds)]
+        images = [int(round(image[_SIZE // 2, _SIZE // 2, 0])) - 1 for image in feed]
+        self.feeds.append(images)
+        return np.array([np.array([[idx, idx, idx, idx, 0.9]]) if self._found_at.get(idx) == angle
+                         else np.zeros((1, 5)) for idx in images], dtype="object")
+
+
+def _get_batch(count: int) -> DetectorBatch:
+    """ Obtain a batch of square images where every pixel of each image holds its index + 1 """
+    feed = np.array([np.full((_SIZE, _SIZE, 3), idx + 1, dtype="float32") for idx in range(count)])
+    return DetectorBatch(filename=[f"{idx}.png" for idx in range(count)], feed=feed)
+
+
+@pytest.mark.parametrize("found_at,feeds", [
+    ({0: 0, 1: 180, 2: 90}, [[0, 1, 2, 3], [1, 2, 3], [1, 3], [3]]),
+    ({0: 0, 1: 90, 2: 0, 3: 90}, [[0, 1, 2, 3], [1, 3]])], ids=("all_angles", "early_exit"))
+def test_predict_rotation(found_at: dict[int, int], feeds: list[list[int]]) -> None:
+    """ Test that each rotated pass is only fed the images without faces, that the results are
+    scattered back to their original positions with the rotation matrix set for faces found by
+    rotating, and that rotating stops once every image has a face
+
+    Parameters
+    ----------
+    found_at: dict
+        The index of each image that has a face, with the angle that the face is found at
+    feeds: list
+        The expected images fed to the model for each angle that is run
+    """
+    detector = _Detector(found_at, [0, 90, 180, 270])
+    batch = detector._predict(_get_batch(4))
+
+    assert detector.feeds == feeds
+    assert len(batch.prediction) == len(batch.rotation_matrix) == 4
+    for idx, (faces, rotmat) in enumerate(zip(batch.prediction, batch.rotation_matrix)):
+        if idx not in found_at:
+            assert not faces.any() and rotmat.size == 0
+            continue
+        np.testing.assert_array_equal(faces, [[idx, idx, idx, idx, 0.9]])
+        if found_at[idx] == 0:
+            assert rotmat.size == 0
+        else:
+            expected = detector._rotate_image_by_angle(batch.initial_feed[idx], found_at[idx])[1]
+            np.testing.assert_allclose(rotmat, expected)
@@ -0,0 +1,79 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`plugins.extract.detect.s3fd` """
+import numpy as np
+import pytest
+
+# pylint:disable=protected-access
+from plugins.extract.detect.s3fd import S3fd
+
+
+def _reference_post_process(model: S3fd, bboxlist: list[np.ndarray]) -> np.ndarray:
+    """ The original per anchor cell post processing for a single image """
+    retval = []
+    for i in range(len(bboxlist) // 2):
+        bboxlist[i * 2] = model.softmax(bboxlist[i * 2], axis=3)
+    for i in range(len(bboxlist) // 2):
+        ocls, oreg = bboxlist[i * 2], bboxlist[i * 2 + 1]
+        stride = 2 ** (i + 2)
+        for _, hindex, windex in zip(*np.where(ocls[:, :, :, 1] > 0.05)):
+            axc, ayc = stride / 2 + windex * stride, stride / 2 + hindex * stride
+            score = ocls[0, hindex, windex, 1]
+            if score >= model.confidence:
+                loc = np.ascontiguousarray(oreg[0, hindex, windex, :]).reshape((1, 4))
+                priors = np.array([[axc, ayc, stride * 4, stride * 4]])
+                retval.append([*model.decode(loc, priors)[0], score])
+    return np.array(retval) if retval else np.zeros((1, 5))
+
+
+def _reference_nms(boxes: np.ndarray, threshold: float) -> np.ndarray:
+    """ The original single image Non-Maximum Suppression """
+    retained = []
+    areas = (boxes[:, 2] - boxes[:, 0] + 1) * (boxes[:, 3] - boxes[:, 1] + 1)
+    ranked = boxes[:, 4].argsort()[::-1]
+    while ranked.size > 0:
+        best, rest = ranked[0], ranked[1:]
+        max_of_xy = np.maximum(boxes[best, :2], boxes[rest, :2])
+        min_of_xy = np.minimum(boxes[best, 2:4], boxes[rest, 2:4])
+        width_height = np.maximum(0, min_of_xy - max_of_xy + 1)
+        inter = width_height[:, 0] * width_height[:, 1]
+        iou = inter / (areas[best] + areas[rest] - inter)
+        overlapping = (iou > threshold).nonzero()[0]
+        if len(overlapping) != 0:
+            overlap_set = ranked[overlapping + 1]
+            boxes[best, :4] = np.average(boxes[overlap_set, :4],
+                                         axis=0,
+                                         weights=boxes[overlap_set, 4])
+        retained.append(best)
+        ranked = ranked[(iou <= threshold).nonzero()[0] + 1]
+    return boxes[retained]
+
+
+@pytest.mark.parametrize("confidence", (0.5, 0.9))
+def test_finalize_predictions(confidence: float) -> None:
+    """ Test that batched post processing and NMS match the original per image implementation
+
+    Parameters
+    ----------
+    confidence: float
+        The confidence threshold to test
+    """
+    model = S3fd.__new__(S3fd)
+    model.confidence = confidence
+    rng = np.random.default_rng(0)
+    batch_size = 3
+    predictions = []
+    for size in (40, 20, 10, 5, 3, 2):
+        cls = rng.normal(size=(batch_size, size, size, 2)).astype("float32")
+        cls[1] = -10.0  # Image with no detections
+        cls[1, ..., 0] = 10.0
+        predictions.extend([cls, rng.normal(size=(batch_size, size, size, 4)).astype("float32")])
+
+    result = model.finalize_predictions([pred.copy() for pred in predictions])
+
+    assert len(result) == batch_size
+    for idx in range(batch_size):
+        expected = _reference_nms(
+            _reference_post_process(model, [pred[idx:idx + 1].copy() for pred in predictions]),
+            0.5)
+        np.testing.assert_allclose(np.asarray(result[idx], dtype="float64"), expected, rtol=1e-6)
+    assert not np.any(np.asarray(result[1], dtype="float64"))
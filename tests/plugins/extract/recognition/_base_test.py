@@ -0,0 +1,64 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`plugins.extract.recognition._base` """
+import numpy as np
+import pytest
+
+from lib.align import DetectedFace
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.extract.recognition._base import IdentityFilter
+
+
+def _expected(identities: np.ndarray,
+              filters: np.ndarray,
+              nfilters: np.ndarray,
+              threshold: float) -> list[bool]:
+    """ Whether each identity should be filtered, comparing one identity at a time """
+    retval = []
+    for identity in identities:
+        should_filter = False
+        for encodings, is_filter in ((filters, True), (nfilters, False)):
+            if not np.any(encodings):
+                continue
+            similarity = (encodings @ identity /
+                          (np.linalg.norm(encodings, axis=1) * np.linalg.norm(identity)))
+            is_match = bool(np.any(similarity >= threshold))
+            should_filter |= not is_match if is_filter else is_match
+        retval.append(should_filter)
+    return retval
+
+
+@pytest.mark.parametrize("filter_count,nfilter_count", ((3, 0), (0, 4), (3, 4)))
+def test_identity_filter(filter_count: int, nfilter_count: int) -> None:
+    """ Test that matching a batch of faces against the stacked reference identities gives the same
+    result as comparing each face against each reference identity in turn
+
+    Parameters
+    ----------
+    filter_count: int
+        The number of filter identities to use
+    nfilter_count: int
+        The number of nfilter identities to use
+    """
+    rng = np.random.default_rng(0)
+    filters = rng.standard_normal((filter_count, 512)) if filter_count else np.array([])
+    nfilters = rng.standard_normal((nfilter_count, 512)) if nfilter_count else np.array([])
+    # Faces close to the references, scaled to check that the magnitude is ignored
+    near = [ref * 3.0 + rng.standard_normal(512) * 0.5 for ref in (*filters, *nfilters)]
+    identities = np.array(near + list(rng.standard_normal((8, 512))), dtype="float32")
+    expected = _expected(identities, filters, nfilters, 0.4)
+
+    id_filter = IdentityFilter(save_output=False)
+    assert id_filter.get_matches(identities).tolist() == [False] * len(identities)
+    id_filter.add_filters(filters, nfilters, 0.4)
+    assert id_filter.get_matches(identities).tolist() == expected
+    assert any(expected) and not all(expected)
+
+    faces = []
+    for identity in identities:
+        face = DetectedFace()
+        face.add_identity("vggface2", identity)
+        faces.append(face)
+    sub_folders: list[str | None] = [None for _ in faces]
+    sub_folders[0] = "_already_filtered"
+    kept = id_filter(faces, sub_folders)
+    assert kept == [faces[0]] + [face for face, filt in zip(faces[1:], expected[1:]) if not filt]
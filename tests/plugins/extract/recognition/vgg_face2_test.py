@@ -0,0 +1,66 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`plugins.extract.recognition.vgg_face2` """
+import numpy as np
+import pytest
+
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.extract.recognition.vgg_face2 import Cluster
+
+
+def _get_predictions(seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """ Random predictions drawn around well separated identities
+
+    Parameters
+    ----------
+    seed: int
+        The seed for the random predictions
+
+    Returns
+    -------
+    predictions: :class:`numpy.ndarray`
+        The (`N`, 64) shuffled predictions
+    identities: :class:`numpy.ndarray`
+        The identity that each prediction belongs to
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((4, 64)) * 10.0
+    identities = rng.permutation(np.repeat(np.arange(4), 150))
+    predictions = centers[identities] + rng.standard_normal((len(identities), 64)) * 0.5
+    return predictions.astype("float32"), identities
+
+
+@pytest.mark.parametrize("mode", ("exact", "scalable"))
+def test_cluster(mode: str) -> None:
+    """ Test that faces of the same identity are sorted together and binned together for exact and
+    scalable clustering
+
+    Parameters
+    ----------
+    mode: ["exact", "scalable"]
+        The clustering mode to test
+    """
+    predictions, identities = _get_predictions(0)
+    result = Cluster(predictions.copy(), "ward", threshold=0.1, mode=mode, leaf_size=64)()
+
+    order = [idx for idx, _ in result]
+    assert sorted(order) == list(range(len(identities)))
+    # Each identity is contiguous in the sorted order
+    sorted_ids = identities[order]
+    assert np.count_nonzero(np.diff(sorted_ids)) == 3
+    bins = np.array([bin_id for _, bin_id in result])
+    for identity in range(4):
+        assert len(np.unique(bins[identities[order] == identity])) == 1
+    assert len(np.unique(bins)) > 1
+
+
+def test_cluster_scalable_deterministic() -> None:
+    """ Test that scalable clustering gives the same output for the same seed and that exact
+    linkage is selected when the predictions fit in a single leaf """
+    predictions, _ = _get_predictions(1)
+    results = [Cluster(predictions.copy(), "ward", mode="scalable", leaf_size=32, seed=seed)()
+               for seed in (3, 3)]
+    assert results[0] == results[1]
+
+    exact = Cluster(predictions.copy(), "ward", mode="exact")()
+    auto = Cluster(predictions.copy(), "ward", mode="auto", leaf_size=len(predictions))()
+    assert auto == exact
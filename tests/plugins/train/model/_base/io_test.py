@@ -0,0 +1,85 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`plugins.train.model._base.io` """
+import json
+import os
+import typing as T
+from argparse import Namespace
+
+import numpy as np
+
+# Ignore linting errors from Tensorflow's thoroughly broken import system
+from tensorflow.keras import Input, Model, layers  # pylint:disable=import-error
+from tensorflow.keras.models import load_model  # pylint:disable=import-error
+
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.train.model._base.io import IO
+
+
+class _State():
+    """ Minimal stand in for :class:`plugins.train.model._base.model.State` """
+    def __init__(self, model_dir: str) -> None:
+        self.filename = os.path.join(model_dir, "test_state.json")
+        self.lowest_avg_loss: dict[str, float] = {}
+        self.iterations = 0
+
+    def serialize(self) -> bytes:
+        """ Serialize the iteration count """
+        return json.dumps({"iterations": self.iterations}).encode("utf-8")
+
+    def save(self) -> None:
+        """ Save the iteration count """
+        with open(self.filename, "wb") as out_file:
+            out_file.write(self.serialize())
+
+
+def _get_model() -> Model:
+    """ A small model containing a nested sub-model """
+    inputs = Input((8, ))
+    encoder = Model(inputs, layers.Dense(4, name="dense_enc")(inputs), name="encoder")
+    outputs = layers.Dense(2, name="dense_dec")(encoder(inputs))
+    return Model(inputs, outputs, name="test")
+
+
+def test_background_save(tmp_path) -> None:
+    """ Test that background saves write the model and state as they were when the save was
+    requested, and that saves on exit wait for the background saves to complete
+
+    Parameters
+    ----------
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the model files
+    """
+    model_dir = str(tmp_path)
+    plugin = T.cast(T.Any, Namespace(name="test",
+                                     model=_get_model(),
+                                     state=_State(model_dir),
+                                     iterations=0))
+    model_io = IO(plugin, model_dir, False, "never", background_queue=2)
+    expected = []
+    for iteration in range(1, 4):
+        plugin.state.iterations = iteration
+        model_io.history[0].append(1.0 / iteration)
+        model_io.history[1].append(1.0 / iteration)
+        model_io.save()
+        expected = plugin.model.get_weights()
+        plugin.model.set_weights([weight + 1.0 for weight in expected])
+
+    assert model_io._writer is not None  # pylint:disable=protected-access
+    model_io._writer.flush()  # pylint:disable=protected-access
+    assert sorted(os.listdir(model_dir)) == ["test.h5",
+                                             "test.h5.bk",
+                                             "test_state.json",
+                                             "test_state.json.bk"]
+    for saved, weight in zip(load_model(model_io.filename, compile=False).get_weights(),
+                             expected):
+        np.testing.assert_array_equal(saved, weight)
+    with open(plugin.state.filename, "rb") as in_file:
+        assert json.loads(in_file.read()) == {"iterations": 3}
+
+    plugin.state.iterations = 4
+    model_io.save(is_exit=True)
+    for saved, weight in zip(load_model(model_io.filename, compile=False).get_weights(),
+                             plugin.model.get_weights()):
+        np.testing.assert_array_equal(saved, weight)
+    with open(plugin.state.filename, "rb") as in_file:
+        assert json.loads(in_file.read()) == {"iterations": 4}
@@ -0,0 +1,81 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`plugins.train.trainer._base` """
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from lib.utils import FaceswapError, get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.train.trainer._base import TrainerBase, _LossBuffer, _PreviewRenderer
+
+
+def _get_trainer(log_interval: int) -> TrainerBase:
+    """ Obtain a trainer with just the attributes required for logging loss
+
+    Parameters
+    ----------
+    log_interval: int
+        The number of iterations to collect loss for before logging
+
+    Returns
+    -------
+    :class:`TrainerBase`
+        The partially initialized trainer
+    """
+    trainer = TrainerBase.__new__(TrainerBase)
+    trainer._config = {"nan_protection": True}
+    trainer._model = MagicMock()
+    trainer._model.iterations = 1
+    trainer._tensorboard = None
+    trainer._pending_loss = []
+    trainer._loss_buffer = _LossBuffer(log_interval)
+    trainer._session_steps = 0
+    return trainer
+
+
+def test_log_loss() -> None:
+    """ Test that loss is buffered for the logging interval, the history receives every iteration
+    and that NaNs are detected when the buffer is logged """
+    trainer = _get_trainer(3)
+    timings = {"feed": 0.1, "wait": 0.0}
+    for idx in range(4):
+        trainer._buffer_loss([float(idx * 3), float(idx), float(idx * 2)], timings)
+        assert trainer._session_steps == (3 if idx == 3 else 0)
+    assert trainer._model.add_history.call_count == 3
+    assert [call.args[0] for call in trainer._model.add_history.call_args_list] == [
+        [0., 0.], [1., 2.], [2., 4.]]
+
+    trainer.flush_loss()
+    assert trainer._session_steps == 4
+    assert trainer._model.add_history.call_args.args[0] == [3., 6.]
+
+    trainer._buffer_loss([np.nan, np.nan, 1.], timings)
+    with pytest.raises(FaceswapError):
+        trainer.flush_loss()
+
+
+def test_preview_renderer() -> None:
+    """ Test that the preview renderer only renders the latest waiting request for replaceable
+    outputs, renders every time-lapse request, that flushing waits for all requests to be rendered
+    and that errors are raised in the caller
+    """
+    renderer = _PreviewRenderer()
+    release = threading.Event()
+    rendered: list[str] = []
+
+    renderer.put("preview",
+                 lambda: (release.wait(), rendered.append("preview_0")),
+                 replace=True)
+    while renderer._pending:  # Wait for the worker to pick up the first request
+        release.wait(0.01)
+    for idx in range(1, 4):
+        renderer.put("preview", lambda idx=idx: rendered.append(f"preview_{idx}"), replace=True)
+        renderer.put("timelapse", lambda idx=idx: rendered.append(f"timelapse_{idx}"))
+    release.set()
+    renderer.flush()
+    assert rendered == ["preview_0", "preview_3", "timelapse_1", "timelapse_2", "timelapse_3"]
+
+    renderer.put("preview", lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        renderer.flush()
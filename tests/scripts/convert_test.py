@@ -0,0 +1,95 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`scripts.convert` """
+from __future__ import annotations
+import os
+import typing as T
+from argparse import Namespace
+from queue import Queue
+from threading import Event
+
+import numpy as np
+import pytest
+
+from lib.align import AlignedFace, DetectedFace
+from lib.align.constants import _MEAN_FACE, LandmarkType
+from lib.convert import Converter
+from lib.utils import get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.extract import ExtractMedia
+from scripts.convert import ConvertItem, PatchPool
+
+_SIZE = 64
+
+
+def _get_item(index: int) -> ConvertItem:
+    """ Create a convert item with a random frame and swapped face for a single face
+
+    Parameters
+    ----------
+    index: int
+        The index of the frame. Used as the random seed
+
+    Returns
+    -------
+    :class:`scripts.convert.ConvertItem`
+        The item for patching. Every third item has no faces
+    """
+    rng = np.random.default_rng(index)
+    frame = rng.integers(0, 255, (120, 160, 3), dtype="uint8")
+    faces = []
+    if index % 3:
+        landmarks = _MEAN_FACE[LandmarkType.LM_2D_51] * 50 + [55, 40]
+        faces.append(DetectedFace(left=40,
+                                  width=64,
+                                  top=30,
+                                  height=64,
+                                  landmarks_xy=landmarks.astype("float32")))
+    item = ConvertItem(ExtractMedia(f"frame_{index:03d}.png", frame, detected_faces=faces))
+    item.reference_faces = [AlignedFace(face.landmarks_xy,
+                                        image=frame,
+                                        centering="face",
+                                        size=_SIZE,
+                                        coverage_ratio=1.0,
+                                        dtype="float32") for face in faces]
+    if faces:
+        item.swapped_faces = rng.random((len(faces), _SIZE, _SIZE, 3), dtype="float32")
+    return item
+
+
+def test_patch_pool(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """ Test that frames patched in :class:`scripts.convert.PatchPool` match those patched in
+    process
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching :func:`sys.argv` so that the converter plugin configuration can be found
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the converter configuration file
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+    monkeypatch.setattr("sys.argv", [os.path.join(root, "faceswap.py")])
+    arguments = Namespace(output_scale=100,
+                          face_scale=0,
+                          writer="opencv",
+                          mask_type="none",
+                          color_adjustment="none")
+    configfile = os.path.join(tmp_path, "convert.ini")
+    open(configfile, "w", encoding="utf-8").close()  # pylint:disable=consider-using-with
+    converter = Converter(_SIZE, 1.0, "face", False, None, arguments, configfile=configfile)
+    predictor = T.cast(T.Any, Namespace(centering="face", output_size=_SIZE, coverage_ratio=1.0))
+    in_queue: T.Any = Queue()
+    out_queue: T.Any = Queue()
+    in_queue.shutdown = Event()
+    pool = PatchPool(converter, predictor, in_queue, out_queue, 2)
+    pool.start()
+    for index in range(0, 12, 3):
+        in_queue.put([_get_item(idx) for idx in range(index, index + 3)])
+    in_queue.put("EOF")
+    results = dict(out_queue.get(timeout=60) for _ in range(12))
+    pool.join()
+    pool.check_and_raise_error()
+    assert pool.completed()
+
+    for index in range(12):
+        item = _get_item(index)
+        np.testing.assert_array_equal(results[item.inbound.filename], converter.patch(item))
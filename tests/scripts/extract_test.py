@@ -0,0 +1,217 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`scripts.extract` """
+import io
+import json
+import os
+import typing as T
+from argparse import Namespace
+from collections.abc import Generator
+from queue import Queue
+from threading import Event
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from lib.align import AlignedFace, DetectedFace
+from lib.align.constants import _MEAN_FACE, LandmarkType
+from lib.utils import FaceswapError, get_backend  # pylint:disable=unused-import  # noqa:F401
+from plugins.extract import ExtractMedia
+from scripts import extract
+from scripts.extract import (Extract, FrameStore, IdentityCache, PipelineLoader,
+                             WORKER_STATUS_PREFIX, _StreamedExtract)
+
+
+def test_worker_jobs(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    """ Test that extract in worker mode runs the command line job and then each job received on
+    stdin with the same extractor, reporting the status of each
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching the extraction job and stdin
+    capsys: :class:`pytest.CaptureFixture`
+        Capturing the status lines written to stdout
+    """
+    jobs: list[tuple[str, str]] = []
+
+    def _extract_job(extractor: T.Any, arguments: Namespace) -> MagicMock:
+        """ Record the job and fail for missing or broken inputs """
+        assert extractor is process._extractor  # pylint:disable=protected-access
+        if arguments.input_dir == "missing":
+            raise FaceswapError("Input does not exist")
+        if arguments.input_dir == "broken":
+            raise RuntimeError("Unexpected error")
+        jobs.append((arguments.input_dir, arguments.output_dir))
+        return MagicMock()
+
+    monkeypatch.setattr(extract, "_Extract", _extract_job)
+    monkeypatch.setattr("sys.stdin", io.StringIO(
+        json.dumps({"input": "video.mp4", "output": "faces_1"}) + "\n"
+        + "not json\n"
+        + json.dumps({"input": "missing", "output": "faces_2"}) + "\n"
+        + json.dumps({"input": "broken", "output": "faces_2"}) + "\n"
+        + json.dumps({"input": "folder", "output": "faces_3"}) + "\n"
+        + "\n"
+        + json.dumps({"input": "ignored", "output": "faces_4"}) + "\n"))
+
+    process = Extract.__new__(Extract)
+    process._args = Namespace(input_dir="first",  # pylint:disable=protected-access
+                              output_dir="faces_0",
+                              batch_mode=False,
+                              alignments_path=None,
+                              worker=True)
+    process._input_locations = ["first"]  # pylint:disable=protected-access
+    process._extractor = MagicMock()  # pylint:disable=protected-access
+    process.process()
+
+    assert jobs == [("first", "faces_0"), ("video.mp4", "faces_1"), ("folder", "faces_3")]
+    statuses = [json.loads(line[len(WORKER_STATUS_PREFIX):])
+                for line in capsys.readouterr().out.splitlines()
+                if line.startswith(WORKER_STATUS_PREFIX)]
+    assert [(status["job"], status["status"]) for status in statuses] == [
+        ("first", "started"), ("first", "completed"),
+        ("video.mp4", "started"), ("video.mp4", "completed"),
+        ("not json", "failed"),
+        ("missing", "started"), ("missing", "failed"),
+        ("broken", "started"), ("broken", "failed"),
+        ("folder", "started"), ("folder", "completed")]
+
+
+class _StreamedJob():
+    """ Stand in for :class:`scripts.extract._Extract` recording the frames output to the job """
+    def __init__(self, extractor: T.Any, arguments: Namespace) -> None:
+        self.extractor = extractor
+        self.arguments = arguments
+        self.frames = [os.path.join(arguments.input_dir, f"{idx}.png")
+                       for idx in range(int(arguments.input_dir[-1]))]
+        self.loader = Namespace(frames=lambda: (ExtractMedia(frame, np.zeros((4, 4, 3), "uint8"))
+                                                for frame in self.frames))
+        self.output_frames: list[str] = []
+        self.completed = False
+
+    def output(self, extract_media: ExtractMedia) -> None:
+        """ Record the frame routed to this job """
+        assert not self.completed
+        self.output_frames.append(extract_media.filename)
+
+    def complete(self) -> None:
+        """ Record that the job has completed """
+        assert not self.completed
+        self.completed = True
+
+
+def test_streamed_extract(monkeypatch: pytest.MonkeyPatch) -> None:
+    """ Test that streamed batch mode feeds the frames from every input through a single run of
+    the pipeline and routes the output of each frame to the job that it came from
+
+    Parameters
+    ----------
+    monkeypatch: :class:`pytest.MonkeyPatch`
+        Monkey patching the extraction jobs
+    """
+    jobs: list[_StreamedJob] = []
+
+    def _job(extractor: T.Any, arguments: Namespace) -> _StreamedJob:
+        jobs.append(_StreamedJob(extractor, arguments))
+        return jobs[-1]
+
+    monkeypatch.setattr(extract, "_Extract", _job)
+    in_queue: T.Any = Queue()
+    in_queue.shutdown = Event()
+
+    def _detected_faces() -> Generator[ExtractMedia, None, None]:
+        """ Pass the loaded frames straight through the pipeline, in reverse order """
+        items = list(iter(in_queue.get, "EOF"))
+        yield from reversed(items)
+
+    extractor = MagicMock(input_queue=in_queue, passes=1, detected_faces=_detected_faces)
+    inputs = ["input_3", "input_0", "input_2"]
+    _StreamedExtract(extractor, [Namespace(input_dir=loc) for loc in inputs]).process()
+
+    extractor.launch.assert_called_once()
+    assert [job.arguments.input_dir for job in jobs] == inputs
+    for job in jobs:
+        assert job.completed
+        assert job.output_frames == list(reversed(job.frames))
+
+
+@pytest.mark.parametrize("mode", ("auto", "disk"))
+def test_frame_store(mode: T.Literal["auto", "disk"]) -> None:
+    """ Test that frames held between extraction passes are compressed in the loader thread and
+    restored in order, with the area of each head centered aligned face intact and the remainder
+    of the frame black
+
+    Parameters
+    ----------
+    mode: ["auto", "disk"]
+        The frame store mode to test
+    """
+    rng = np.random.default_rng(0)
+    landmarks = _MEAN_FACE[LandmarkType.LM_2D_51] * 24 + [100, 40]
+    faces = [[], [(10, 20, 16)], [(0, 0, 8), (70, 40, 20)], [landmarks]]
+    frames = [rng.integers(0, 255, (96, 160, 3), dtype="uint8") for _ in faces]
+    in_queue: T.Any = Queue()
+    in_queue.shutdown = Event()
+    loader = PipelineLoader.__new__(PipelineLoader)
+    loader._extractor = MagicMock(input_queue=in_queue)
+    loader._threads = []
+
+    store = FrameStore(mode, memory_limit=1)
+    loader.hold(store)
+    items = []
+    for idx, (frame, boxes) in enumerate(zip(frames, faces)):
+        detected_faces = [DetectedFace(landmarks_xy=box) if isinstance(box, np.ndarray)
+                          else DetectedFace(left=box[0], width=box[2], top=box[1], height=box[2])
+                          for box in boxes]
+        items.append(ExtractMedia(f"{idx}.png", frame.copy(), detected_faces=detected_faces))
+        assert store.put(items[-1])
+    assert store.put("EOF")
+
+    restored = list(iter(in_queue.get, "EOF"))
+    loader.join()
+    loader.check_thread_error()
+    assert len(store) == 0
+    assert store._folder is None  # pylint:disable=protected-access
+
+    for idx, item in enumerate(restored):
+        assert item is items[idx]
+        if not faces[idx]:
+            assert not item.image.any()
+        for box in faces[idx]:
+            if isinstance(box, np.ndarray):
+                aligned = [AlignedFace(box, image=image, centering="head", size=64).face
+                           for image in (item.image, frames[idx])]
+                np.testing.assert_array_equal(*aligned)
+                continue
+            left, top, size = box
+            mask = np.zeros(frames[idx].shape[:2], dtype="bool")
+            mask[max(0, top - size):top + 2 * size, max(0, left - size):left + 2 * size] = True
+            np.testing.assert_array_equal(item.image[mask], frames[idx][mask])
+
+
+def test_identity_cache(tmp_path) -> None:
+    """ Test that reference identities are cached by file contents and pipeline settings
+
+    Parameters
+    ----------
+    tmp_path: :class:`pathlib.Path`
+        Temporary folder for holding the reference images and cache
+    """
+    filename = str(tmp_path / "cache")
+    image = tmp_path / "ref.png"
+    image.write_bytes(b"image")
+    identities = np.random.default_rng(0).random((2, 512)).astype("float32")
+
+    cache = IdentityCache("pipeline", filename=filename)
+    assert cache.get(str(image)) is None
+    cache.set(str(image), identities)
+    cache.save()
+
+    moved = tmp_path / "moved.png"
+    image.rename(moved)
+    np.testing.assert_array_equal(IdentityCache("pipeline", filename=filename).get(str(moved)),
+                                  identities)
+    assert IdentityCache("other", filename=filename).get(str(moved)) is None
+    moved.write_bytes(b"edited")
+    assert IdentityCache("pipeline", filename=filename).get(str(moved)) is None
@@ -7,7 +7,6 @@ import typing as T
 from operator import itemgetter
 from unittest.mock import MagicMock
 
-import cv2
 import numpy as np
 import pytest
 import pytest_mock
@@ -17,6 +16,7 @@ from lib.logger import log_setup
 log_setup("DEBUG", f"{__name__}.log", "PyTest, False")
 
 # pylint:disable=wrong-import-position,protected-access
+from lib.image import VideoFrameReader  # noqa:E402
 from lib.utils import FaceswapError  # noqa:E402
 from tools.alignments.media import (AlignmentData, Faces, ExtractedFaces,  # noqa:E402
                                     Frames, MediaLoader)
@@ -255,7 +255,7 @@ class TestMediaLoader:
         media_loader_instance: :class:`~tools.alignments.media.MediaLoader`
             The class instance for testing
         mocker: :class:`pytest_mock.MockerFixture`
-            Fixture for mocking cv2 calls
+            Fixture for mocking video reader calls
         """
         media_loader = media_loader_instance
         filename = "test_0001.png"
@@ -265,12 +265,12 @@ class TestMediaLoader:
         mocker.patch("tools.alignments.media.MediaLoader.is_video",
                      new_callable=mocker.PropertyMock(return_value=True))
         expected = np.random.rand(256, 256, 3)
-        vid_cap = mocker.MagicMock(cv2.VideoCapture)
-        vid_cap.read.side_effect = ((1, expected), )
+        vid_reader = mocker.MagicMock(VideoFrameReader)
+        vid_reader.get_frame.return_value = expected
 
-        media_loader._vid_reader = T.cast(MagicMock,  vid_cap)  # type:ignore
+        media_loader._vid_reader = T.cast(MagicMock,  vid_reader)  # type:ignore
         output = media_loader.load_video_frame(filename)
-        vid_cap.set.assert_called_once()
+        vid_reader.get_frame.assert_called_once_with(0)
         np.testing.assert_equal(output, expected)
 
     def test_stream(self,
@@ -0,0 +1,93 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`tools.sort.pairwise` """
+import cv2
+import numpy as np
+import pytest
+
+from tools.sort.pairwise import PairwiseDistance
+
+_MEMORY_LIMITS = (256 * 1024 * 1024, 4096)
+
+
+def _get_features(metric: str) -> np.ndarray:
+    """ Fixed test features for the given metric
+
+    Parameters
+    ----------
+    metric: ["bhattacharyya", "cityblock"]
+        The metric to obtain features for
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Histograms for `"bhattacharyya"` or landmarks for `"cityblock"`
+    """
+    rng = np.random.default_rng(0)
+    if metric == "bhattacharyya":
+        images = rng.integers(0, 255, (60, 32, 32), dtype="uint8")
+        return np.array([cv2.calcHist([image], [0], None, [256], [0, 256]) for image in images])
+    return rng.random((60, 68, 2), dtype="float32") * 256
+
+
+def _distance(metric: str, feature_a: np.ndarray, feature_b: np.ndarray) -> float:
+    """ The distance between 2 features, calculated one pair at a time """
+    if metric == "bhattacharyya":
+        return cv2.compareHist(feature_a, feature_b, cv2.HISTCMP_BHATTACHARYYA)
+    return np.sum(np.absolute((feature_b - feature_a).flatten()))
+
+
+@pytest.mark.parametrize("memory_limit", _MEMORY_LIMITS, ids=("single_block", "tiled"))
+@pytest.mark.parametrize("metric", ("bhattacharyya", "cityblock"))
+def test_greedy_chain(metric: str, memory_limit: int) -> None:
+    """ Test that the greedy chain matches swapping the closest item into the next position of
+    the list one pair at a time
+
+    Parameters
+    ----------
+    metric: ["bhattacharyya", "cityblock"]
+        The metric to test
+    memory_limit: int
+        The memory limit for the distance calculation blocks
+    """
+    features = _get_features(metric)
+    expected = list(range(len(features)))
+    for i in range(len(expected) - 1):
+        min_score = float("inf")
+        j_min_score = i + 1
+        for j in range(i + 1, len(expected)):
+            score = _distance(metric, features[expected[i]], features[expected[j]])
+            if score < min_score:
+                min_score = score
+                j_min_score = j
+        expected[i + 1], expected[j_min_score] = expected[j_min_score], expected[i + 1]
+
+    engine = PairwiseDistance(features, metric, memory_limit=memory_limit)  # type:ignore
+    assert engine.greedy_chain() == expected
+
+
+@pytest.mark.parametrize("following_only", (False, True), ids=("all", "following"))
+@pytest.mark.parametrize("memory_limit", _MEMORY_LIMITS, ids=("single_block", "tiled"))
+@pytest.mark.parametrize("metric", ("bhattacharyya", "cityblock"))
+def test_distance_sums(metric: str, memory_limit: int, following_only: bool) -> None:
+    """ Test that the summed distances match summing the distance to all other (or all following)
+    items one pair at a time
+
+    Parameters
+    ----------
+    metric: ["bhattacharyya", "cityblock"]
+        The metric to test
+    memory_limit: int
+        The memory limit for the distance calculation blocks
+    following_only: bool
+        ``True`` to only sum the distances to the items that follow each item
+    """
+    features = _get_features(metric)
+    expected = [sum(_distance(metric, feature, other)
+                    for j, other in enumerate(features)
+                    if (j > i if following_only else j != i))
+                for i, feature in enumerate(features)]
+
+    engine = PairwiseDistance(features, metric, memory_limit=memory_limit)  # type:ignore
+    np.testing.assert_allclose(engine.distance_sums(following_only=following_only),
+                               expected,
+                               rtol=1e-5)
@@ -0,0 +1,33 @@
+#!/usr/bin python3
+""" Pytest unit tests for :mod:`tools.sort.sort_methods_aligned` """
+import numpy as np
+import pytest
+
+from tools.sort.sort_methods_aligned import SortFaceCNN
+
+# Fixed landmarks and the orderings given by the original pair by pair sorting loops
+_LANDMARKS = [[[5, 3], [1, 3], [5, 0]],
+              [[7, 7], [0, 6], [1, 6]],
+              [[1, 6], [8, 8], [5, 1]],
+              [[3, 2], [8, 2], [4, 3]],
+              [[1, 3], [6, 3], [5, 5]]]
+_EXPECTED = {"face-cnn": [0, 4, 3, 2, 1], "face-cnn-dissim": [1, 0, 2, 3, 4]}
+
+
+@pytest.mark.parametrize("method", ("face-cnn", "face-cnn-dissim"))
+def test_sort_landmarks(method: str) -> None:
+    """ Test that sorting by landmarks gives the same ordering as the original pair by pair
+    comparison loops
+
+    Parameters
+    ----------
+    method: ["face-cnn", "face-cnn-dissim"]
+        The sort method to test
+    """
+    sorter = SortFaceCNN.__new__(SortFaceCNN)
+    sorter._is_dissim = method == "face-cnn-dissim"
+    sorter._result = [(f"face_{idx}.png", np.array(landmarks, dtype="float32"))
+                      for idx, landmarks in enumerate(_LANDMARKS)]
+    sorter.sort()
+    assert [item[0] for item in sorter._result] == [f"face_{idx}.png"
+                                                    for idx in _EXPECTED[method]]
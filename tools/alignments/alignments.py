@@ -8,6 +8,7 @@ import typing as T
 from argparse import Namespace
 from multiprocessing import Process
 
+from lib.image import close_video_readers
 from lib.utils import FaceswapError, handle_deprecated_cliopts, VIDEO_EXTENSIONS
 from .media import AlignmentData
 from .jobs import Check, Export, Sort, Spatial  # noqa pylint:disable=unused-import
@@ -317,3 +318,13 @@ class _Alignments():
         job = job(self.alignments, self._args)
         logger.debug(job)
         job.process()
+        self._close_video_readers()
+
+    def _close_video_readers(self) -> None:
+        """ Close any video decoders opened by the job and store a keyframe index that was
+        generated for the input video in the alignments file. """
+        video_meta = close_video_readers()
+        frames = self._args.frames_dir
+        if self.alignments is None or not frames or not os.path.isfile(frames):
+            return
+        self.alignments.update_video_meta_data(video_meta.get(os.path.abspath(frames)))
@@ -39,7 +39,8 @@ class Draw():
     def __init__(self, alignments: AlignmentData, arguments: Namespace) -> None:
         logger.debug("Initializing %s: (arguments: %s)", self.__class__.__name__, arguments)
         self._alignments = alignments
-        self._frames = Frames(arguments.frames_dir)
+        self._frames = Frames(arguments.frames_dir,
+                              video_meta_data=self._alignments.video_meta_data)
         self._output_folder = self._set_output()
         logger.debug("Initialized %s", self.__class__.__name__)
 
@@ -183,7 +184,9 @@ class Extract():
         self._faces_dir = arguments.faces_dir
         self._min_size = self._get_min_size(arguments.size, arguments.min_size)
 
-        self._frames = Frames(arguments.frames_dir, self._get_count())
+        self._frames = Frames(arguments.frames_dir,
+                              self._get_count(),
+                              video_meta_data=self._alignments.video_meta_data)
         self._extracted_faces = ExtractedFaces(self._frames,
                                                self._alignments,
                                                size=arguments.size)
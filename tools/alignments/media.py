@@ -11,11 +11,8 @@ import typing as T
 import cv2
 from tqdm import tqdm
 
-# TODO imageio single frame seek seems slow. Look into this
-# import imageio
-
 from lib.align import Alignments, DetectedFace, update_legacy_png_header
-from lib.image import (count_frames, generate_thumbnail, ImagesLoader,
+from lib.image import (count_frames, generate_thumbnail, get_video_reader, ImagesLoader,
                        png_write_meta, read_image, read_image_meta_batch)
 from lib.utils import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, FaceswapError
 
@@ -23,6 +20,7 @@ if T.TYPE_CHECKING:
     from collections.abc import Generator
     import numpy as np
     from lib.align.alignments import AlignmentFileDict, PNGHeaderDict
+    from lib.image import VideoFrameReader
 
 logger = logging.getLogger(__name__)
 
@@ -85,11 +83,18 @@ class MediaLoader():
         If the total frame count is known it can be passed in here which will skip
         analyzing a video file. If the count is not passed in, it will be calculated.
         Default: ``None``
+    video_meta_data: dict, optional
+        The `pts_time` and `keyframes` for a video source, as stored in the alignments file. Used
+        to seek to the nearest keyframe when loading frames from a video. Default: ``None``
     """
-    def __init__(self, folder: str, count: int | None = None):
+    def __init__(self,
+                 folder: str,
+                 count: int | None = None,
+                 video_meta_data: dict[str, list[int] | list[float] | None] | None = None):
         logger.debug("Initializing %s: (folder: '%s')", self.__class__.__name__, folder)
         logger.info("[%s DATA]", self.__class__.__name__.upper())
         self._count = count
+        self._video_meta_data = video_meta_data
         self.folder = folder
         self._vid_reader = self.check_input_folder()
         self.file_list_sorted = self.sorted_items()
@@ -113,14 +118,14 @@ class MediaLoader():
             self._count = len(self.file_list_sorted)
         return self._count
 
-    def check_input_folder(self) -> cv2.VideoCapture | None:
+    def check_input_folder(self) -> VideoFrameReader | None:
         """ Ensure that the frames or faces folder exists and is valid.
-            If frames folder contains a video file return imageio reader object
+            If frames folder contains a video file return the shared video frame reader
 
         Returns
         -------
-        :class:`cv2.VideoCapture`
-            Object for reading a video stream
+        :class:`lib.image.VideoFrameReader`
+            Object for reading single frames from a video
         """
         err = None
         loadtype = self.__class__.__name__
@@ -136,9 +141,7 @@ class MediaLoader():
                 os.path.isfile(self.folder) and
                 os.path.splitext(self.folder)[1].lower() in VIDEO_EXTENSIONS):
             logger.verbose("Video exists at: '%s'", self.folder)  # type: ignore
-            retval = cv2.VideoCapture(self.folder)  # pylint:disable=no-member
-            # TODO ImageIO single frame seek seems slow. Look into this
-            # retval = imageio.get_reader(self.folder, "ffmpeg")
+            retval = get_video_reader(self.folder, video_meta_data=self._video_meta_data)
         else:
             logger.verbose("Folder exists at '%s'", self.folder)  # type: ignore
             retval = None
@@ -203,13 +206,7 @@ class MediaLoader():
         frame = os.path.splitext(filename)[0]
         logger.trace("Loading video frame: '%s'", frame)  # type: ignore
         frame_no = int(frame[frame.rfind("_") + 1:]) - 1
-        self._vid_reader.set(cv2.CAP_PROP_POS_FRAMES, frame_no)  # pylint:disable=no-member
-
-        _, image = self._vid_reader.read()
-        # TODO imageio single frame seek seems slow. Look into this
-        # self._vid_reader.set_image_index(frame_no)
-        # image = self._vid_reader.get_next_data()[:, :, ::-1]
-        return image
+        return self._vid_reader.get_frame(frame_no)
 
     def stream(self, skip_list: list[int] | None = None
                ) -> Generator[tuple[str, np.ndarray], None, None]:
@@ -229,7 +226,10 @@ class MediaLoader():
         numpy.ndarray
             The image that has been loaded from disk
         """
-        loader = ImagesLoader(self.folder, queue_size=32, count=self._count)
+        loader = ImagesLoader(self.folder,
+                              queue_size=32,
+                              count=self._count,
+                              video_meta_data=self._video_meta_data)
         if skip_list is not None:
             loader.add_skip_list(skip_list)
         for filename, image in loader.load():
@@ -131,6 +131,7 @@ class Preview(tk.Tk):
         """
         self._build_ui()
         self.mainloop()
+        self._samples.close()
 
     def _refresh(self, *args) -> None:
         """ Patch faces with current convert settings.
@@ -298,6 +299,7 @@ class Samples():
         if self._images.is_video:
             assert isinstance(self._images.input_images, str)
             self._alignments.update_legacy_has_source(os.path.basename(self._images.input_images))
+            self._images.set_video_meta_data(self._alignments.video_meta_data)
 
         self._filelist = self._get_filelist()
         self._indices = self._get_indices()
@@ -309,6 +311,13 @@ class Samples():
 
         logger.debug("Initialized %s", self.__class__.__name__)
 
+    def close(self) -> None:
+        """ Close the video decoders opened for sampling frames and store any keyframe index that
+        was generated for the input video in the alignments file. """
+        video_meta_data = self._images.close()
+        if video_meta_data is not None:
+            self._alignments.update_video_meta_data(video_meta_data)
+
     @property
     def available_masks(self) -> list[str]:
         """ list: The mask names that are available for every face in the alignments file """
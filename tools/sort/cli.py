@@ -201,6 +201,23 @@ class SortArgs(FaceSwapArgs):
                 "increment. Folder 0 will contain faces looking the most to the left/down whereas "
                 "the last folder will contain the faces looking the most to the right/up. NB: "
                 "Some bins may be empty if faces do not fit the criteria. \nDefault value: 5")})
+        argument_list.append({
+            "opts": ('-cm', '--cluster-mode'),
+            "action": Radio,
+            "type": str,
+            "choices": ("auto", "exact", "scalable"),
+            "dest": 'cluster_mode',
+            "group": _("sort settings"),
+            "default": "auto",
+            "help": _(
+                "R|The clustering mode to use when sorting or grouping by 'face'."
+                "\nL|'auto': Use exact clustering if there is enough RAM available, otherwise use "
+                "scalable clustering."
+                "\nL|'exact': Cluster all of the faces together. Memory use grows with the square "
+                "of the number of faces, so this is not suitable for very large face sets."
+                "\nL|'scalable': Split the faces into groups of similar faces and only cluster "
+                "within each group. Memory use is bounded and this is much faster for large face "
+                "sets, at the cost of a slightly less precise ordering.\nDefault: auto")})
         argument_list.append({
             "opts": ('-l', '--log-changes'),
             "action": 'store_true',
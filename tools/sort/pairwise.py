@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+""" Pairwise distance calculations for the sorting tool.
+
+Distances between every pair of items are calculated block by block with vectorized numpy
+operations, so that the memory used is bounded regardless of the number of items being sorted.
+"""
+from __future__ import annotations
+import logging
+import sys
+import typing as T
+
+import numpy as np
+from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+MetricType = T.Literal["bhattacharyya", "cityblock"]
+
+
+class PairwiseDistance():
+    """ Calculate distances between all pairs of a collection of feature vectors in bounded
+    memory.
+
+    Parameters
+    ----------
+    features: :class:`numpy.ndarray`
+        The features to compare, with the items in the first dimension. Any further dimensions are
+        flattened into a single feature vector for each item
+    metric: ["bhattacharyya", "cityblock"]
+        The distance metric to use. `"bhattacharyya"` gives the same distance as
+        :func:`cv2.compareHist` with ``cv2.HISTCMP_BHATTACHARYYA`` for histogram features.
+        `"cityblock"` gives the sum of the absolute differences between features
+    memory_limit: int, optional
+        The approximate maximum number of bytes to use for any block of distance calculations.
+        Default: 256MB
+    """
+    def __init__(self,
+                 features: np.ndarray,
+                 metric: MetricType,
+                 memory_limit: int = 256 * 1024 * 1024) -> None:
+        logger.debug("Initializing %s: features: %s, metric: '%s', memory_limit: %s",
+                     self.__class__.__name__, features.shape, metric, memory_limit)
+        assert metric in T.get_args(MetricType), f"Unsupported metric '{metric}'"
+        self._metric = metric
+        self._features = self._prepare(features.reshape(features.shape[0], -1))
+        self._memory_limit = memory_limit
+        logger.debug("Initialized %s", self.__class__.__name__)
+
+    def _prepare(self, features: np.ndarray) -> np.ndarray:
+        """ Pre-process the features for the selected metric.
+
+        For Bhattacharyya distance, the histograms are normalized and square rooted so that the
+        Bhattacharyya coefficient between all pairs can be obtained from a single matrix product
+
+        Parameters
+        ----------
+        features: :class:`numpy.ndarray`
+            The 2D array of feature vectors
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The float64 features ready for distance calculations
+        """
+        retval = features.astype("float64")
+        if self._metric == "bhattacharyya":
+            totals = retval.sum(axis=1, keepdims=True)
+            totals[np.abs(totals) <= np.finfo("float32").eps] = 1.0
+            retval = np.sqrt(np.maximum(retval / totals, 0.0))
+        return retval
+
+    def _block(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """ Calculate the distances between a block of rows and a block of columns
+
+        Parameters
+        ----------
+        rows: :class:`numpy.ndarray`
+            The prepared features for the rows of the block
+        columns: :class:`numpy.ndarray`
+            The prepared features for the columns of the block
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The (`rows`, `columns`) distances
+        """
+        if self._metric == "bhattacharyya":
+            return np.sqrt(np.maximum(1.0 - rows @ columns.T, 0.0))
+        return np.abs(rows[:, None, :] - columns[None, :, :]).sum(axis=-1)
+
+    def _tile_sizes(self, num_columns: int) -> tuple[int, int]:
+        """ Obtain the number of rows and columns to calculate in each block to keep within the
+        memory limit
+
+        Parameters
+        ----------
+        num_columns: int
+            The total number of columns to be compared against
+
+        Returns
+        -------
+        rows: int
+            The number of rows to process in each block
+        columns: int
+            The number of columns to process in each block
+        """
+        item_size = 8 * (self._features.shape[1] if self._metric == "cityblock" else 1)
+        columns = max(1, min(num_columns, self._memory_limit // item_size))
+        rows = max(1, self._memory_limit // (columns * item_size))
+        return rows, columns
+
+    def _distances(self, feature: np.ndarray, others: np.ndarray) -> np.ndarray:
+        """ Calculate the distance from a single feature to a collection of other features, in
+        column tiles
+
+        Parameters
+        ----------
+        feature: :class:`numpy.ndarray`
+            The prepared feature vector to obtain distances for
+        others: :class:`numpy.ndarray`
+            The prepared features to obtain the distance to
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The 1D distances from the feature to each of the other features
+        """
+        _, num_columns = self._tile_sizes(others.shape[0])
+        if num_columns >= others.shape[0]:
+            return self._block(feature[None], others)[0]
+        return np.concatenate([self._block(feature[None], others[idx:idx + num_columns])[0]
+                               for idx in range(0, others.shape[0], num_columns)])
+
+    def distance_sums(self, desc: str = "Comparing", following_only: bool = False) -> np.ndarray:
+        """ Obtain the total distance from each item to every other item
+
+        Parameters
+        ----------
+        desc: str, optional
+            The description for the progress bar. Default: `"Comparing"`
+        following_only: bool, optional
+            ``True`` to only total the distances from each item to the items that follow it (the
+            upper triangle of the distance matrix), so the last item always scores 0. ``False``
+            to total the distances to all other items. Default: ``False``
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The sum of the distances from each item to the other items
+        """
+        count = self._features.shape[0]
+        num_rows, num_columns = self._tile_sizes(count)
+        retval = np.zeros((count, ), dtype="float64")
+        with tqdm(desc=desc, total=count, file=sys.stdout, leave=False) as pbar:
+            for row in range(0, count, num_rows):
+                rows = self._features[row:row + num_rows]
+                start = row if following_only else 0
+                for col in range(start - start % num_columns, count, num_columns):
+                    block = self._block(rows, self._features[col:col + num_columns])
+                    # The distance from an item to itself (and for following_only, to any
+                    # preceding item) is excluded from the totals
+                    row_idx = np.arange(row, row + len(rows))[:, None]
+                    col_idx = np.arange(col, col + block.shape[1])[None, :]
+                    block[(col_idx <= row_idx) if following_only else (col_idx == row_idx)] = 0.0
+                    retval[row:row + len(rows)] += block.sum(axis=1)
+                pbar.update(len(rows))
+        return retval
+
+    def greedy_chain(self, desc: str = "Comparing") -> list[int]:
+        """ Order the items so that each item is followed by its closest remaining neighbour,
+        starting from the first item.
+
+        Where more than one remaining item is equally close, the ordering matches swapping the
+        closest item into the next position of a list of the items.
+
+        Parameters
+        ----------
+        desc: str, optional
+            The description for the progress bar. Default: `"Comparing"`
+
+        Returns
+        -------
+        list
+            The indices of the original items in chained order
+        """
+        features = self._features.copy()
+        order = np.arange(features.shape[0])
+        for idx in tqdm(range(features.shape[0] - 1), desc=desc, file=sys.stdout, leave=False):
+            closest = idx + 1 + int(np.argmin(self._distances(features[idx], features[idx + 1:])))
+            if closest != idx + 1:
+                features[[idx + 1, closest]] = features[[closest, idx + 1]]
+                order[[idx + 1, closest]] = order[[closest, idx + 1]]
+        return order.tolist()
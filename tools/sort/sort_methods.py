@@ -20,6 +20,7 @@ from lib.align import AlignedFace, DetectedFace, LandmarkType
 from lib.image import FacesLoader, ImagesLoader, read_image_meta_batch, update_existing_metadata
 from lib.utils import FaceswapError
 from plugins.extract.recognition.vgg_face2 import Cluster, Recognition as VGGFace
+from .pairwise import PairwiseDistance
 
 if T.TYPE_CHECKING:
     from argparse import Namespace
@@ -856,6 +857,7 @@ class SortFace(SortMethod):
         threshold = arguments.threshold
         self._output_update_info = True
         self._threshold: float | None = 0.25 if threshold < 0 else threshold
+        self._cluster_mode: T.Literal["auto", "exact", "scalable"] = arguments.cluster_mode
 
     def score_image(self,
                     filename: str,
@@ -934,7 +936,10 @@ class SortFace(SortMethod):
         """
         logger.info("Sorting by ward linkage. This may take some time...")
         preds = np.array([item[1] for item in self._result])
-        indices = Cluster(np.array(preds), "ward", threshold=self._threshold)()
+        indices = Cluster(np.array(preds),
+                          "ward",
+                          threshold=self._threshold,
+                          mode=self._cluster_mode)()
         self._result = [(self._result[idx][0], float(score)) for idx, score in indices]
 
     def binning(self) -> list[list[str]]:
@@ -983,40 +988,15 @@ class SortHistogram(SortMethod):
 
     def _sort_dissim(self) -> None:
         """ Sort histograms by dissimilarity """
-        img_list_len = len(self._result)
-        for i in tqdm(range(0, img_list_len),
-                      desc="Comparing histograms",
-                      file=sys.stdout,
-                      leave=False):
-            score_total = 0
-            for j in range(0, img_list_len):
-                if i == j:
-                    continue
-                score_total += cv2.compareHist(self._result[i][1],
-                                               self._result[j][1],
-                                               cv2.HISTCMP_BHATTACHARYYA)
-            self._result[i][2] = score_total
-
-        self._result = sorted(self._result, key=operator.itemgetter(2), reverse=True)
+        engine = PairwiseDistance(np.array([item[1] for item in self._result]), "bhattacharyya")
+        scores = engine.distance_sums(desc="Comparing histograms")
+        self._result = [self._result[idx] for idx in np.argsort(-scores, kind="stable")]
 
     def _sort_sim(self) -> None:
         """ Sort histograms by similarity """
-        img_list_len = len(self._result)
-        for i in tqdm(range(0, img_list_len - 1),
-                      desc="Comparing histograms",
-                      file=sys.stdout,
-                      leave=False):
-            min_score = float("inf")
-            j_min_score = i + 1
-            for j in range(i + 1, img_list_len):
-                score = cv2.compareHist(self._result[i][1],
-                                        self._result[j][1],
-                                        cv2.HISTCMP_BHATTACHARYYA)
-                if score < min_score:
-                    min_score = score
-                    j_min_score = j
-            (self._result[i + 1], self._result[j_min_score]) = (self._result[j_min_score],
-                                                                self._result[i + 1])
+        engine = PairwiseDistance(np.array([item[1] for item in self._result]), "bhattacharyya")
+        order = engine.greedy_chain(desc="Comparing histograms")
+        self._result = [self._result[idx] for idx in order]
 
     @classmethod
     def _get_avg_score(cls, image: np.ndarray, references: list[np.ndarray]) -> float:
@@ -13,6 +13,7 @@ from tqdm import tqdm
 
 from lib.align import AlignedFace, LandmarkType
 from lib.utils import FaceswapError
+from .pairwise import PairwiseDistance
 from .sort_methods import SortMethod
 
 if T.TYPE_CHECKING:
@@ -286,36 +287,17 @@ class SortFaceCNN(SortAlignedMetric):
 
     def _sort_landmarks_ssim(self) -> None:
         """ Sort landmarks by similarity """
-        img_list_len = len(self._result)
-        for i in tqdm(range(0, img_list_len - 1), desc="Comparing", file=sys.stdout, leave=False):
-            min_score = float("inf")
-            j_min_score = i + 1
-            for j in range(i + 1, img_list_len):
-                fl1 = self._result[i][1]
-                fl2 = self._result[j][1]
-                score = np.sum(np.absolute((fl2 - fl1).flatten()))
-                if score < min_score:
-                    min_score = score
-                    j_min_score = j
-            (self._result[i + 1], self._result[j_min_score]) = (self._result[j_min_score],
-                                                                self._result[i + 1])
+        engine = PairwiseDistance(np.array([item[1] for item in self._result]), "cityblock")
+        order = engine.greedy_chain()
+        self._result = [self._result[idx] for idx in order]
 
     def _sort_landmarks_dissim(self) -> None:
         """ Sort landmarks by dissimilarity """
         logger.info("Comparing landmarks...")
-        img_list_len = len(self._result)
-        for i in tqdm(range(0, img_list_len - 1), desc="Comparing", file=sys.stdout, leave=False):
-            score_total = 0
-            for j in range(i + 1, img_list_len):
-                if i == j:
-                    continue
-                fl1 = self._result[i][1]
-                fl2 = self._result[j][1]
-                score_total += np.sum(np.absolute((fl2 - fl1).flatten()))
-            self._result[i][2] = score_total
-
+        engine = PairwiseDistance(np.array([item[1] for item in self._result]), "cityblock")
+        scores = engine.distance_sums(following_only=True)
         logger.info("Sorting...")
-        self._result = sorted(self._result, key=operator.itemgetter(2), reverse=True)
+        self._result = [self._result[idx] for idx in np.argsort(-scores, kind="stable")]
 
     def binning(self) -> list[list[str]]:
         """ Group into bins by CNN face similarity